@@ -0,0 +1,541 @@
+"""Micro-benchmarks for every `BackendProtocol` implementation.
+
+Generates synthetic file trees, drives `ls` / `read` / `write` / `edit` /
+`grep` / `glob` / `upload_files` through each backend, and emits a JSON report
+that can be diffed against a previous run for regression tracking.
+
+Everything runs offline on Linux:
+
+- `StateBackend` is driven through a fake LangGraph config that provides
+  `CONFIG_KEY_READ` / `CONFIG_KEY_SEND` backed by a plain dict.
+- `StoreBackend` uses LangGraph's `InMemoryStore`.
+- `FilesystemBackend` / `LocalShellBackend` operate on a temporary directory.
+- `CompositeBackend` routes `/mem/` to a `StoreBackend` over a filesystem default.
+- `BaseSandbox` is exercised through `LocalSubprocessSandbox`, a fake sandbox
+  whose `execute()` runs commands with a local subprocess.
+
+Usage:
+    ```bash
+    python bench_backends.py --sizes 1000,10000 --output report.json
+    python bench_backends.py --baseline report.json --max-regression 0.25
+    ```
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables.config import var_child_runnable_config
+from langgraph._internal._constants import CONFIG_KEY_READ, CONFIG_KEY_SEND
+from langgraph.store.memory import InMemoryStore
+
+from deepagents.backends import (
+    CompositeBackend,
+    FilesystemBackend,
+    LocalShellBackend,
+    StateBackend,
+    StoreBackend,
+)
+from deepagents.backends.protocol import (
+    BackendProtocol,
+    ExecuteResponse,
+    FileDownloadResponse,
+    FileUploadResponse,
+)
+from deepagents.backends.sandbox import BaseSandbox
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+"""File counts for the generated trees."""
+
+FILES_PER_DIR = 100
+"""Number of files per synthetic directory."""
+
+SMALL_FILE_BYTES = 1024
+"""Approximate size of a file in the `small` profile."""
+
+LARGE_FILE_FACTOR = 100
+"""The `large` profile uses `n / LARGE_FILE_FACTOR` files that are this much bigger.
+
+Total bytes stay comparable between profiles, so the difference measures
+per-file overhead versus per-byte throughput.
+"""
+
+UPLOAD_BATCH = 1_000
+"""Number of files per `upload_files` call while populating a tree."""
+
+NEEDLE = "bench_needle_token"
+"""Literal that appears in roughly 1% of generated files, used by `grep`."""
+
+ALL_OPS = ("upload_files", "ls", "read", "write", "edit", "grep", "glob")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic trees
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class TreeSpec:
+    """Shape of a synthetic file tree."""
+
+    files: int
+    """Number of files in the tree."""
+
+    file_bytes: int
+    """Approximate size of each file in bytes."""
+
+    profile: str
+    """Human readable profile name (`small` or `large`)."""
+
+    @property
+    def label(self) -> str:
+        return f"{self.profile}-{self.files}"
+
+
+def tree_specs(sizes: list[int], profiles: list[str]) -> list[TreeSpec]:
+    """Build the tree matrix for the requested sizes and profiles."""
+    specs: list[TreeSpec] = []
+    for size in sizes:
+        if "small" in profiles:
+            specs.append(TreeSpec(files=size, file_bytes=SMALL_FILE_BYTES, profile="small"))
+        if "large" in profiles:
+            specs.append(
+                TreeSpec(
+                    files=max(1, size // LARGE_FILE_FACTOR),
+                    file_bytes=SMALL_FILE_BYTES * LARGE_FILE_FACTOR,
+                    profile="large",
+                )
+            )
+    return specs
+
+
+def relative_path(index: int) -> str:
+    """Return the virtual path (without prefix) of the `index`-th generated file."""
+    ext = ".py" if index % 2 else ".txt"
+    return f"/d{index // FILES_PER_DIR:04d}/f{index:06d}{ext}"
+
+
+def file_content(index: int, size: int) -> str:
+    """Return deterministic text content of roughly `size` bytes."""
+    lines: list[str] = []
+    total = 0
+    line_no = 0
+    while total < size:
+        if line_no == 3 and index % 100 == 0:
+            line = f"# {NEEDLE} {index}"
+        else:
+            line = f"line {line_no:05d} of file {index:06d}: lorem ipsum dolor sit amet"
+        lines.append(line)
+        total += len(line) + 1
+        line_no += 1
+    return "\n".join(lines) + "\n"
+
+
+def iter_tree(spec: TreeSpec) -> Iterator[tuple[str, bytes]]:
+    """Yield `(relative_path, content)` pairs for a tree."""
+    for i in range(spec.files):
+        yield relative_path(i), file_content(i, spec.file_bytes).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Fake runtimes
+# ---------------------------------------------------------------------------
+
+
+@contextlib.contextmanager
+def fake_state_runtime() -> Iterator[dict[str, Any]]:
+    """Provide the LangGraph config keys `StateBackend` reads and writes through.
+
+    The `files` channel is a plain dict with the same merge semantics as the
+    real reducer (a `None` value deletes the key).
+
+    Yields:
+        The dict holding the `files` channel.
+    """
+    channels: dict[str, dict[str, Any]] = {"files": {}}
+
+    def read(channel: str, fresh: bool = False) -> dict[str, Any]:  # noqa: ARG001, FBT001, FBT002
+        return channels.get(channel, {})
+
+    def send(writes: list[tuple[str, Any]]) -> None:
+        for channel, value in writes:
+            current = channels.setdefault(channel, {})
+            for key, item in value.items():
+                if item is None:
+                    current.pop(key, None)
+                else:
+                    current[key] = item
+
+    config = {"configurable": {CONFIG_KEY_READ: read, CONFIG_KEY_SEND: send}}
+    token = var_child_runnable_config.set(config)  # type: ignore[arg-type]
+    try:
+        yield channels["files"]
+    finally:
+        var_child_runnable_config.reset(token)
+
+
+class LocalSubprocessSandbox(BaseSandbox):
+    """Fake sandbox that runs `execute()` in a local subprocess.
+
+    Exercises the command templates of `BaseSandbox` without a remote
+    provider. Paths are real absolute paths under `root`.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+
+    @property
+    def id(self) -> str:
+        return f"local-subprocess-{self._root.name}"
+
+    def execute(self, command: str, *, timeout: int | None = None) -> ExecuteResponse:
+        result = subprocess.run(  # noqa: S602
+            command,
+            check=False,
+            shell=True,
+            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            timeout=timeout or 300,
+            cwd=str(self._root),
+        )
+        output = result.stdout
+        if result.stderr:
+            output += "\n".join(f"[stderr] {line}" for line in result.stderr.strip().split("\n"))
+        return ExecuteResponse(output=output, exit_code=result.returncode, truncated=False)
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        responses: list[FileUploadResponse] = []
+        for path, content in files:
+            target = Path(path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+            responses.append(FileUploadResponse(path=path, error=None))
+        return responses
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        responses: list[FileDownloadResponse] = []
+        for path in paths:
+            try:
+                responses.append(FileDownloadResponse(path=path, content=Path(path).read_bytes(), error=None))
+            except FileNotFoundError:
+                responses.append(FileDownloadResponse(path=path, content=None, error="file_not_found"))
+        return responses
+
+
+# ---------------------------------------------------------------------------
+# Backend cases
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class BackendCase:
+    """A backend under test plus the path prefix its files live under."""
+
+    backend: BackendProtocol
+    prefix: str = ""
+    """Prepended to every generated relative path (e.g. a real directory for sandboxes)."""
+
+
+BackendFactory = Callable[[Path], contextlib.AbstractContextManager[BackendCase]]
+
+
+@contextlib.contextmanager
+def _state_case(_: Path) -> Iterator[BackendCase]:
+    with fake_state_runtime():
+        yield BackendCase(StateBackend())
+
+
+@contextlib.contextmanager
+def _store_case(_: Path) -> Iterator[BackendCase]:
+    yield BackendCase(StoreBackend(store=InMemoryStore(), namespace=lambda _rt: ("bench", "filesystem")))
+
+
+@contextlib.contextmanager
+def _filesystem_case(workdir: Path) -> Iterator[BackendCase]:
+    yield BackendCase(FilesystemBackend(root_dir=workdir, virtual_mode=True))
+
+
+@contextlib.contextmanager
+def _local_shell_case(workdir: Path) -> Iterator[BackendCase]:
+    yield BackendCase(LocalShellBackend(root_dir=workdir, virtual_mode=True))
+
+
+@contextlib.contextmanager
+def _composite_case(workdir: Path) -> Iterator[BackendCase]:
+    store = StoreBackend(store=InMemoryStore(), namespace=lambda _rt: ("bench", "memories"))
+    backend = CompositeBackend(
+        default=FilesystemBackend(root_dir=workdir, virtual_mode=True),
+        routes={"/mem/": store},
+    )
+    # Files live under the routed prefix so every call pays the routing cost.
+    yield BackendCase(backend, prefix="/mem")
+
+
+@contextlib.contextmanager
+def _sandbox_case(workdir: Path) -> Iterator[BackendCase]:
+    yield BackendCase(LocalSubprocessSandbox(workdir), prefix=str(workdir))
+
+
+BACKENDS: dict[str, BackendFactory] = {
+    "state": _state_case,
+    "store": _store_case,
+    "filesystem": _filesystem_case,
+    "local_shell": _local_shell_case,
+    "composite": _composite_case,
+    "sandbox": _sandbox_case,
+}
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class OpResult:
+    """Timing samples for one operation on one backend and tree."""
+
+    backend: str
+    tree: str
+    profile: str
+    files: int
+    op: str
+    calls: int
+    """Backend calls per sample."""
+
+    samples_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.backend}/{self.tree}/{self.op}"
+
+    def summary(self) -> dict[str, Any]:
+        data = asdict(self)
+        if self.samples_ms:
+            data["min_ms"] = min(self.samples_ms)
+            data["median_ms"] = statistics.median(self.samples_ms)
+            data["mean_ms"] = statistics.fmean(self.samples_ms)
+            data["per_call_ms"] = data["median_ms"] / max(1, self.calls)
+        data["key"] = self.key
+        return data
+
+
+def _has_error(result: Any) -> bool:  # noqa: ANN401
+    if isinstance(result, list):
+        return any(getattr(item, "error", None) for item in result)
+    return bool(getattr(result, "error", None))
+
+
+def _timed(func: Callable[[], list[Any]]) -> tuple[float, int]:
+    start = time.perf_counter()
+    results = func()
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, sum(_has_error(r) for r in results)
+
+
+def run_case(  # noqa: PLR0913
+    name: str,
+    factory: BackendFactory,
+    spec: TreeSpec,
+    *,
+    ops: tuple[str, ...],
+    repeat: int,
+    sample: int,
+    seed: int,
+) -> list[OpResult]:
+    """Populate one backend with one tree and time every requested operation."""
+    workdir = Path(tempfile.mkdtemp(prefix=f"bench-{name}-"))
+    try:
+        with factory(workdir) as case:
+            backend, prefix = case.backend, case.prefix
+            rng = random.Random(seed)  # noqa: S311
+            picks = [rng.randrange(spec.files) for _ in range(min(sample, spec.files))]
+            results: list[OpResult] = []
+
+            def record(op: str, calls: int, func: Callable[[], list[Any]]) -> None:
+                if op not in ops:
+                    return
+                res = OpResult(name, spec.label, spec.profile, spec.files, op, calls)
+                for _ in range(repeat):
+                    elapsed, errors = _timed(func)
+                    res.samples_ms.append(round(elapsed, 4))
+                    res.errors += errors
+                results.append(res)
+
+            # upload_files doubles as population: the first sample creates the
+            # tree, later samples overwrite it in place.
+            def upload() -> list[Any]:
+                out: list[Any] = []
+                batch: list[tuple[str, bytes]] = []
+                for rel, content in iter_tree(spec):
+                    batch.append((prefix + rel, content))
+                    if len(batch) >= UPLOAD_BATCH:
+                        out.append(backend.upload_files(batch))
+                        batch = []
+                if batch:
+                    out.append(backend.upload_files(batch))
+                return out
+
+            if "upload_files" in ops:
+                record("upload_files", -(-spec.files // UPLOAD_BATCH), upload)
+            else:
+                upload()
+
+            root = prefix + "/"
+            record("ls", 2, lambda: [backend.ls(root), backend.ls(prefix + relative_path(0).rsplit("/", 1)[0])])
+            record("read", len(picks), lambda: [backend.read(prefix + relative_path(i)) for i in picks])
+
+            # write refuses to overwrite, so every sample targets a fresh directory.
+            write_round = iter(range(repeat))
+
+            def write() -> list[Any]:
+                r = next(write_round)
+                return [backend.write(f"{prefix}/new{r}/w{j:06d}.txt", "hello\n") for j in range(len(picks))]
+
+            record("write", len(picks), write)
+
+            # Each edit sample rewrites the marker left by the previous one.
+            edit_round = iter(range(repeat))
+
+            def edit() -> list[Any]:
+                r = next(edit_round)
+                old = "line 00000" if r == 0 else f"edited-{r - 1}"
+                return [
+                    backend.edit(prefix + relative_path(i), f"{old} of file {i:06d}", f"edited-{r} of file {i:06d}")
+                    for i in sorted(set(picks))
+                ]
+
+            record("edit", len(set(picks)), edit)
+            record("grep", 1, lambda: [backend.grep(NEEDLE, path=root)])
+            record("glob", 2, lambda: [backend.glob("**/*.py", path=root), backend.glob("*.txt", path=root + "d0000/")])
+            return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def build_report(results: list[OpResult], args: argparse.Namespace) -> dict[str, Any]:
+    """Assemble the JSON report."""
+    try:
+        from importlib.metadata import version  # noqa: PLC0415
+
+        deepagents_version = version("deepagents")
+    except Exception:  # noqa: BLE001
+        deepagents_version = None
+    return {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "deepagents": deepagents_version,
+            "ripgrep": shutil.which("rg") is not None,
+            "sizes": args.sizes,
+            "profiles": args.profiles,
+            "repeat": args.repeat,
+            "sample": args.sample,
+            "seed": args.seed,
+        },
+        "results": [r.summary() for r in results],
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], max_regression: float) -> list[str]:
+    """Return human readable regressions of `report` against `baseline` (by median)."""
+    previous = {r["key"]: r for r in baseline.get("results", []) if "median_ms" in r}
+    regressions: list[str] = []
+    for current in report["results"]:
+        before = previous.get(current["key"])
+        if before is None or "median_ms" not in current or before["median_ms"] <= 0:
+            continue
+        ratio = current["median_ms"] / before["median_ms"]
+        if ratio > 1 + max_regression:
+            regressions.append(f"{current['key']}: {before['median_ms']:.2f}ms -> {current['median_ms']:.2f}ms ({ratio:.2f}x)")
+    return regressions
+
+
+def print_table(results: list[OpResult]) -> None:
+    """Print a compact summary table to stderr."""
+    print(f"{'backend':<12} {'tree':<14} {'op':<13} {'median ms':>11} {'per call':>10} {'errors':>6}", file=sys.stderr)
+    for r in results:
+        s = r.summary()
+        print(
+            f"{r.backend:<12} {r.tree:<14} {r.op:<13} {s.get('median_ms', 0):>11.2f} {s.get('per_call_ms', 0):>10.3f} {r.errors:>6}",
+            file=sys.stderr,
+        )
+
+
+def _csv(value: str) -> list[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma separated file counts")
+    parser.add_argument("--profiles", default="small,large", help="comma separated profiles: small, large")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="comma separated backend names")
+    parser.add_argument("--ops", default=",".join(ALL_OPS), help="comma separated operations")
+    parser.add_argument("--repeat", type=int, default=3, help="samples per operation")
+    parser.add_argument("--sample", type=int, default=50, help="files touched by read/write/edit per sample")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("bench_backends.json"), help="JSON report path")
+    parser.add_argument("--baseline", type=Path, help="previous JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed median slowdown (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    args.sizes = [int(s) for s in _csv(args.sizes)]
+    args.profiles = _csv(args.profiles)
+    args.backends = _csv(args.backends)
+    args.ops = tuple(_csv(args.ops))
+    unknown = [b for b in args.backends if b not in BACKENDS] + [o for o in args.ops if o not in ALL_OPS]
+    if unknown:
+        parser.error(f"unknown backend/op: {', '.join(unknown)}")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    results: list[OpResult] = []
+    for spec in tree_specs(args.sizes, args.profiles):
+        for name in args.backends:
+            print(f"[bench] {name} {spec.label}", file=sys.stderr)
+            results.extend(
+                run_case(name, BACKENDS[name], spec, ops=args.ops, repeat=args.repeat, sample=args.sample, seed=args.seed)
+            )
+
+    report = build_report(results, args)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print_table(results)
+    print(f"[bench] report written to {args.output}", file=sys.stderr)
+
+    if args.baseline is not None:
+        regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.max_regression)
+        for line in regressions:
+            print(f"[regression] {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
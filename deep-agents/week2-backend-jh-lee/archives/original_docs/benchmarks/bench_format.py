@@ -0,0 +1,150 @@
+"""Benchmark for `format_content_with_line_numbers` and `truncate_if_too_long`.
+
+Times the current implementations in `deepagents.backends.utils` against a
+reference copy of the previous per-line algorithm on 2000-line (one default
+`read` window) and 100k-line inputs, and checks that both produce identical
+output. The `max_chars` case must also match formatting everything and then
+applying `truncate_if_too_long`.
+
+Usage:
+    ```bash
+    python bench_format.py
+    python bench_format.py --lines 2000,100000 --repeat 7 --output bench_format.json
+    ```
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from deepagents.backends.utils import (
+    LINE_NUMBER_WIDTH,
+    MAX_LINE_LENGTH,
+    TOOL_RESULT_TOKEN_LIMIT,
+    TRUNCATION_GUIDANCE,
+    format_content_with_line_numbers,
+    truncate_if_too_long,
+)
+
+
+def reference_format(content: str | list[str], start_line: int = 1) -> str:
+    """Previous implementation: one f-string per line, chunking in a Python loop."""
+    if isinstance(content, str):
+        lines = content.split("\n")
+        if lines and lines[-1] == "":
+            lines = lines[:-1]
+    else:
+        lines = content
+
+    result_lines = []
+    for i, line in enumerate(lines):
+        line_num = i + start_line
+        if len(line) <= MAX_LINE_LENGTH:
+            result_lines.append(f"{line_num:{LINE_NUMBER_WIDTH}d}\t{line}")
+        else:
+            num_chunks = (len(line) + MAX_LINE_LENGTH - 1) // MAX_LINE_LENGTH
+            for chunk_idx in range(num_chunks):
+                start = chunk_idx * MAX_LINE_LENGTH
+                end = min(start + MAX_LINE_LENGTH, len(line))
+                chunk = line[start:end]
+                if chunk_idx == 0:
+                    result_lines.append(f"{line_num:{LINE_NUMBER_WIDTH}d}\t{chunk}")
+                else:
+                    continuation_marker = f"{line_num}.{chunk_idx}"
+                    result_lines.append(f"{continuation_marker:>{LINE_NUMBER_WIDTH}}\t{chunk}")
+    return "\n".join(result_lines)
+
+
+def reference_truncate(result: list[str]) -> list[str]:
+    """Previous list truncation: sum every length, then slice proportionally."""
+    total_chars = sum(len(item) for item in result)
+    if total_chars > TOOL_RESULT_TOKEN_LIMIT * 4:
+        return result[: len(result) * TOOL_RESULT_TOKEN_LIMIT * 4 // total_chars] + [TRUNCATION_GUIDANCE]
+    return result
+
+
+def make_content(n_lines: int, *, long_every: int | None = None) -> str:
+    """Return source-like text; every `long_every`-th line exceeds `MAX_LINE_LENGTH`."""
+    lines = []
+    for i in range(n_lines):
+        if long_every and i % long_every == 0:
+            lines.append("x" * (MAX_LINE_LENGTH * 2 + 17))
+        else:
+            lines.append(f"    value_{i} = compute(item_{i % 97}, scale={i % 13})  # comment {i}")
+    return "\n".join(lines) + "\n"
+
+
+def _time(func: Callable[[], Any], repeat: int) -> list[float]:
+    number = 1
+    # Aim for >= 20ms per sample so tiny inputs are not dominated by timer noise.
+    while timeit.timeit(func, number=number) < 0.02 and number < 10_000:  # noqa: PLR2004
+        number *= 4
+    return [t / number * 1000 for t in timeit.repeat(func, number=number, repeat=repeat)]
+
+
+def run(line_counts: list[int], repeat: int) -> list[dict[str, Any]]:
+    """Run every case and return one result row per case."""
+    rows: list[dict[str, Any]] = []
+    budget = TOOL_RESULT_TOKEN_LIMIT * 4
+    for n in line_counts:
+        for variant, long_every in (("short-lines", None), ("with-long-lines", 100)):
+            content = make_content(n, long_every=long_every)
+            expected = reference_format(content)
+            if format_content_with_line_numbers(content) != expected:
+                msg = f"output mismatch for {variant}/{n}"
+                raise AssertionError(msg)
+            if format_content_with_line_numbers(content, max_chars=budget) != truncate_if_too_long(expected):
+                msg = f"budgeted output mismatch for {variant}/{n}"
+                raise AssertionError(msg)
+
+            cases: dict[str, Callable[[], Any]] = {
+                "format/reference": lambda c=content: reference_format(c),
+                "format/current": lambda c=content: format_content_with_line_numbers(c),
+                "format+truncate/reference": lambda c=content: truncate_if_too_long(reference_format(c)),
+                "format+truncate/current": lambda c=content: truncate_if_too_long(format_content_with_line_numbers(c)),
+                "format/current max_chars": lambda c=content: format_content_with_line_numbers(c, max_chars=budget),
+            }
+            rows.extend(_row(name, variant, n, _time(func, repeat)) for name, func in cases.items())
+
+        items = [f"/src/pkg_{i % 50}/module_{i}.py" for i in range(n)]
+        rows.append(_row("truncate_list/reference", "paths", n, _time(lambda i=items: reference_truncate(i), repeat)))
+        rows.append(_row("truncate_list/current", "paths", n, _time(lambda i=items: truncate_if_too_long(i), repeat)))
+    return rows
+
+
+def _row(case: str, variant: str, lines: int, samples: list[float]) -> dict[str, Any]:
+    return {
+        "case": case,
+        "variant": variant,
+        "lines": lines,
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "samples_ms": samples,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", default="2000,100000", help="comma separated line counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    rows = run([int(v) for v in args.lines.split(",") if v.strip()], args.repeat)
+    print(f"{'case':<28} {'variant':<16} {'lines':>7} {'median ms':>10}", file=sys.stderr)
+    for row in rows:
+        print(f"{row['case']:<28} {row['variant']:<16} {row['lines']:>7} {row['median_ms']:>10.3f}", file=sys.stderr)
+    if args.output is not None:
+        args.output.write_text(json.dumps({"results": rows}, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
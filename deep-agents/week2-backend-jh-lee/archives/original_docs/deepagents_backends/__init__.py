@@ -3,9 +3,15 @@
 from deepagents.backends.composite import CompositeBackend
 from deepagents.backends.context_hub import ContextHubBackend
 from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.instrumentation import (
+    HistogramObserver,
+    InstrumentedBackend,
+    OpenTelemetryObserver,
+    instrument,
+)
 from deepagents.backends.langsmith import LangSmithSandbox
 from deepagents.backends.local_shell import DEFAULT_EXECUTE_TIMEOUT, LocalShellBackend
-from deepagents.backends.protocol import BackendProtocol
+from deepagents.backends.protocol import BackendEvent, BackendObserver, BackendProtocol
 from deepagents.backends.state import StateBackend
 from deepagents.backends.store import (
     BackendContext,
@@ -16,13 +22,19 @@ from deepagents.backends.store import (
 __all__ = [
     "DEFAULT_EXECUTE_TIMEOUT",
     "BackendContext",
+    "BackendEvent",
+    "BackendObserver",
     "BackendProtocol",
     "CompositeBackend",
     "ContextHubBackend",
     "FilesystemBackend",
+    "HistogramObserver",
+    "InstrumentedBackend",
     "LangSmithSandbox",
     "LocalShellBackend",
     "NamespaceFactory",
+    "OpenTelemetryObserver",
     "StateBackend",
     "StoreBackend",
+    "instrument",
 ]
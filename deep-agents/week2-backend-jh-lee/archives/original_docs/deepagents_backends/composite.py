@@ -18,9 +18,12 @@ Examples:
 """
 
 from collections import defaultdict
+from collections.abc import Sequence
 from typing import cast
 
+from deepagents.backends.instrumentation import instrument
 from deepagents.backends.protocol import (
+    BackendObserver,
     BackendProtocol,
     EditResult,
     ExecuteResponse,
@@ -143,6 +146,7 @@ class CompositeBackend(BackendProtocol):
         routes: dict[str, BackendProtocol],
         *,
         artifacts_root: str = "/",
+        observers: Sequence[BackendObserver] | None = None,
     ) -> None:
         """Initialize composite backend.
 
@@ -152,7 +156,15 @@ class CompositeBackend(BackendProtocol):
                 and should end with "/" (e.g., "/memories/").
             artifacts_root: Root path for artifacts, such as messages offloaded
                 by middleware. Defaults to `"/"`.
+            observers: Optional `BackendObserver`s. When given, the default
+                backend and every route backend are wrapped with
+                `instrument()` so each call emits a `BackendEvent` labelled
+                with the route prefix that served it (`None` for the default).
         """
+        if observers:
+            default = instrument(default, observers)
+            routes = {prefix: instrument(backend, observers, route=prefix) for prefix, backend in routes.items()}
+
         # Default backend
         self.default = default
 
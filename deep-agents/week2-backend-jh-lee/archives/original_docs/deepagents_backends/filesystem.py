@@ -1,14 +1,19 @@
 """`FilesystemBackend`: Read and write files directly from the filesystem."""
 
+import asyncio
 import base64
 import errno
-import json
+import functools
 import logging
 import os
 import re
 import subprocess
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import ParamSpec, TypeVar
 
 import wcmatch.glob as wcglob
 
@@ -40,6 +45,35 @@ from deepagents.backends.utils import (
 
 logger = logging.getLogger(__name__)
 
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+DEFAULT_IO_MAX_WORKERS = 8
+"""Worker threads in the shared executor used by the async file operations.
+
+Kept separate from (and smaller than) the event loop's default executor so a
+burst of parallel tool calls cannot starve other `asyncio.to_thread` users.
+"""
+
+RIPGREP_TIMEOUT = 30
+"""Seconds before a ripgrep search is abandoned in favour of the Python fallback."""
+
+_default_io_executor: ThreadPoolExecutor | None = None
+_default_io_executor_lock = threading.Lock()
+
+
+def _get_default_io_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor for async file I/O, creating it lazily."""
+    global _default_io_executor  # noqa: PLW0603
+    if _default_io_executor is None:
+        with _default_io_executor_lock:
+            if _default_io_executor is None:
+                _default_io_executor = ThreadPoolExecutor(
+                    max_workers=DEFAULT_IO_MAX_WORKERS,
+                    thread_name_prefix="deepagents-fs",
+                )
+    return _default_io_executor
+
 
 class FilesystemBackend(BackendProtocol):
     """Backend that reads and writes files directly from the filesystem.
@@ -94,6 +128,8 @@ class FilesystemBackend(BackendProtocol):
         root_dir: str | Path | None = None,
         virtual_mode: bool | None = None,  # noqa: FBT001
         max_file_size_mb: int = 10,
+        io_executor: Executor | None = None,
+        grep_max_count: int | None = None,
     ) -> None:
         """Initialize filesystem backend.
 
@@ -123,11 +159,24 @@ class FilesystemBackend(BackendProtocol):
                 - Relative paths with `..` can escape `root_dir`
                 - Agents have unrestricted filesystem access
 
-            max_file_size_mb: Maximum file size in megabytes for operations like
-                grep's Python fallback search.
+            max_file_size_mb: Maximum file size in megabytes for grep (both
+                ripgrep and the Python fallback search).
 
                 Files exceeding this limit are skipped during search. Defaults to 10 MB.
+
+            io_executor: Executor that runs blocking file I/O for the async
+                methods (`aread`, `aglob`, ...).
+
+                Defaults to a shared, bounded pool of `DEFAULT_IO_MAX_WORKERS`
+                threads so bursts of parallel tool calls don't exhaust the
+                event loop's default executor.
+
+            grep_max_count: Optional cap on matching lines reported per file by
+                `grep`. Passed to ripgrep as `--max-count` so it stops reading a
+                file early; `None` (default) reports every match.
         """
+        self._io_executor = io_executor
+        self.grep_max_count = grep_max_count
         self.cwd = Path(root_dir).resolve() if root_dir else Path.cwd()
         if virtual_mode is None:
             warn_deprecated(
@@ -150,6 +199,12 @@ class FilesystemBackend(BackendProtocol):
         self.virtual_mode = virtual_mode
         self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
 
+    async def _run_io(self, func: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs) -> _T:
+        """Run a blocking call on the file I/O executor."""
+        loop = asyncio.get_running_loop()
+        executor = self._io_executor or _get_default_io_executor()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
     def _resolve_path(self, key: str) -> Path:
         """Resolve a file path with security checks.
 
@@ -348,6 +403,10 @@ class FilesystemBackend(BackendProtocol):
         error = "\n".join(sorted(errors)) if errors else None
         return LsResult(error=error, entries=results)
 
+    async def als(self, path: str) -> LsResult:
+        """Async version of ls."""
+        return await self._run_io(self.ls, path)
+
     def read(
         self,
         file_path: str,
@@ -405,6 +464,15 @@ class FilesystemBackend(BackendProtocol):
         except (OSError, UnicodeDecodeError) as e:
             return ReadResult(error=f"Error reading file '{file_path}': {e}")
 
+    async def aread(
+        self,
+        file_path: str,
+        offset: int = 0,
+        limit: int = 2000,
+    ) -> ReadResult:
+        """Async version of read."""
+        return await self._run_io(self.read, file_path, offset, limit)
+
     def write(
         self,
         file_path: str,
@@ -447,6 +515,14 @@ class FilesystemBackend(BackendProtocol):
         except (OSError, UnicodeEncodeError) as e:
             return WriteResult(error=f"Error writing file '{file_path}': {e}")
 
+    async def awrite(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Async version of write."""
+        return await self._run_io(self.write, file_path, content)
+
     def edit(
         self,
         file_path: str,
@@ -509,6 +585,16 @@ class FilesystemBackend(BackendProtocol):
         except (OSError, UnicodeDecodeError, UnicodeEncodeError) as e:
             return EditResult(error=f"Error editing file '{file_path}': {e}")
 
+    async def aedit(
+        self,
+        file_path: str,
+        old_string: str,
+        new_string: str,
+        replace_all: bool = False,  # noqa: FBT001, FBT002
+    ) -> EditResult:
+        """Async version of edit."""
+        return await self._run_io(self.edit, file_path, old_string, new_string, replace_all)
+
     def grep(
         self,
         pattern: str,
@@ -527,35 +613,69 @@ class FilesystemBackend(BackendProtocol):
         Returns:
             GrepResult with matches or error.
         """
-        # Resolve base path
+        base_full = self._grep_base_path(path)
+        if isinstance(base_full, GrepResult):
+            return base_full
+
+        # Try ripgrep first (with -F flag for literal search)
+        results = self._ripgrep_search(pattern, base_full, glob)
+        if results is None:
+            # Python fallback needs escaped pattern for literal search
+            results = self._python_search(re.escape(pattern), base_full, glob)
+        return _grep_result(results)
+
+    async def agrep(
+        self,
+        pattern: str,
+        path: str | None = None,
+        glob: str | None = None,
+    ) -> GrepResult:
+        """Async version of grep.
+
+        Runs ripgrep via `asyncio.create_subprocess_exec` and parses its output
+        as it streams in, so no executor thread is held for the duration of
+        the search. The Python fallback runs on the file I/O executor.
+        """
+        base_full = self._grep_base_path(path)
+        if isinstance(base_full, GrepResult):
+            return base_full
+
+        results = await self._aripgrep_search(pattern, base_full, glob)
+        if results is None:
+            results = await self._run_io(self._python_search, re.escape(pattern), base_full, glob)
+        return _grep_result(results)
+
+    def _grep_base_path(self, path: str | None) -> Path | GrepResult:
+        """Resolve the grep search root, or return the `GrepResult` to short-circuit with."""
+        search_path = path or "."
         try:
-            base_full = self._resolve_path(path or ".")
+            base_full = self._resolve_path(search_path)
         except ValueError:
             return GrepResult(matches=[])
         except (OSError, RuntimeError) as e:
-            search_path = path or "."
             return GrepResult(error=f"Error searching path '{search_path}': {e}", matches=[])
 
         try:
             if not base_full.exists():
                 return GrepResult(matches=[])
         except OSError as e:
-            search_path = path or "."
             return GrepResult(error=f"Error searching path '{search_path}': {e}", matches=[])
+        return base_full
+
+    def _ripgrep_command(self, pattern: str, base_full: Path, include_glob: str | None) -> list[str]:
+        # `--null` terminates each path with NUL, so records parse as
+        # `path\0line:text` without JSON decoding; -H keeps the path even
+        # when searching a single file. -F enables fixed-string (literal) mode.
+        cmd = ["rg", "--no-heading", "--line-number", "--with-filename", "--null", "--color", "never", "-F"]
+        cmd.extend(["--max-filesize", str(self.max_file_size_bytes)])
+        if self.grep_max_count is not None:
+            cmd.extend(["--max-count", str(self.grep_max_count)])
+        if include_glob:
+            cmd.extend(["--glob", include_glob])
+        cmd.extend(["--", pattern, str(base_full)])
+        return cmd
 
-        # Try ripgrep first (with -F flag for literal search)
-        results = self._ripgrep_search(pattern, base_full, glob)
-        if results is None:
-            # Python fallback needs escaped pattern for literal search
-            results = self._python_search(re.escape(pattern), base_full, glob)
-
-        matches: list[GrepMatch] = []
-        for fpath, items in results.items():
-            for line_num, line_text in items:
-                matches.append({"path": fpath, "line": int(line_num), "text": line_text})
-        return GrepResult(matches=matches)
-
-    def _ripgrep_search(self, pattern: str, base_full: Path, include_glob: str | None) -> dict[str, list[tuple[int, str]]] | None:  # noqa: C901  # Split except clauses for logging
+    def _ripgrep_search(self, pattern: str, base_full: Path, include_glob: str | None) -> dict[str, list[tuple[int, str]]] | None:
         """Search using ripgrep with fixed-string (literal) mode.
 
         Args:
@@ -567,58 +687,110 @@ class FilesystemBackend(BackendProtocol):
             Dict mapping file paths to list of `(line_number, line_text)` tuples.
                 Returns `None` if ripgrep is unavailable or times out.
         """
-        cmd = ["rg", "--json", "-F"]  # -F enables fixed-string (literal) mode
-        if include_glob:
-            cmd.extend(["--glob", include_glob])
-        cmd.extend(["--", pattern, str(base_full)])
-
         try:
             proc = subprocess.run(  # noqa: S603
-                cmd,
+                self._ripgrep_command(pattern, base_full, include_glob),
                 capture_output=True,
-                text=True,
-                timeout=30,
+                timeout=RIPGREP_TIMEOUT,
                 check=False,
             )
         except (subprocess.TimeoutExpired, FileNotFoundError, PermissionError):
             return None
 
         results: dict[str, list[tuple[int, str]]] = {}
-        for line in proc.stdout.splitlines():
-            try:
-                data = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if data.get("type") != "match":
+        self._collect_ripgrep_output(proc.stdout.decode("utf-8", "replace"), results, {})
+        return results
+
+    async def _aripgrep_search(self, pattern: str, base_full: Path, include_glob: str | None) -> dict[str, list[tuple[int, str]]] | None:
+        """Async version of `_ripgrep_search`; parses output incrementally."""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *self._ripgrep_command(pattern, base_full, include_glob),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except (FileNotFoundError, PermissionError):
+            return None
+
+        results: dict[str, list[tuple[int, str]]] = {}
+        virtual_paths: dict[str, str | None] = {}
+
+        async def consume() -> None:
+            assert proc.stdout is not None  # noqa: S101  # stdout=PIPE above
+            pending = b""
+            # Read fixed-size chunks rather than `readline()` so a single huge
+            # line cannot trip the StreamReader buffer limit; parse every
+            # complete line in the buffer at once.
+            while chunk := await proc.stdout.read(1 << 16):
+                pending += chunk
+                cut = pending.rfind(b"\n")
+                if cut < 0:
+                    continue
+                self._collect_ripgrep_output(pending[:cut].decode("utf-8", "replace"), results, virtual_paths)
+                pending = pending[cut + 1 :]
+            if pending:
+                self._collect_ripgrep_output(pending.decode("utf-8", "replace"), results, virtual_paths)
+            await proc.wait()
+
+        try:
+            await asyncio.wait_for(consume(), timeout=RIPGREP_TIMEOUT)
+        except TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return None
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+        return results
+
+    def _collect_ripgrep_output(
+        self,
+        output: str,
+        results: dict[str, list[tuple[int, str]]],
+        virtual_paths: dict[str, str | None],
+    ) -> None:
+        """Parse `rg --no-heading --line-number --null` output into `results`.
+
+        Args:
+            output: Complete `path\0line:text` records separated by newlines.
+            results: Dict to append `(line_number, line_text)` tuples to.
+            virtual_paths: Cache of ripgrep path -> reported path (`None` to
+                skip), so each file is resolved once rather than per match.
+        """
+        for record in output.split("\n"):
+            fpath, sep, rest = record.partition("\0")
+            if not sep:
                 continue
-            pdata = data.get("data", {})
-            ftext = pdata.get("path", {}).get("text")
-            if not ftext:
+            ln, sep, lt = rest.partition(":")
+            if not sep or not ln.isdigit():
                 continue
-            p = Path(ftext)
-            if self.virtual_mode:
-                try:
-                    virt = self._to_virtual_path(p)
-                except ValueError:
-                    logger.debug("Skipping grep result outside root: %s", p)
-                    continue
-                except (OSError, RuntimeError):
-                    logger.warning("Could not resolve grep result path: %s", p, exc_info=True)
-                    continue
+            if fpath in virtual_paths:
+                virt = virtual_paths[fpath]
             else:
-                virt = str(p)
-            ln = pdata.get("line_number")
-            lt = pdata.get("lines", {}).get("text", "").rstrip("\n")
-            if ln is None:
+                virt = virtual_paths[fpath] = self._grep_result_path(Path(fpath))
+            if virt is None:
                 continue
-            results.setdefault(virt, []).append((int(ln), lt))
-
-        return results
+            # ripgrep keeps the `\r` of CRLF lines; drop it like `splitlines()`
+            # does in the Python fallback.
+            results.setdefault(virt, []).append((int(ln), lt.removesuffix("\r")))
+
+    def _grep_result_path(self, path: Path) -> str | None:
+        """Return the path to report for a grep hit, or `None` to skip it."""
+        if not self.virtual_mode:
+            return str(path)
+        try:
+            return self._to_virtual_path(path)
+        except ValueError:
+            logger.debug("Skipping grep result outside root: %s", path)
+        except (OSError, RuntimeError):
+            logger.warning("Could not resolve grep result path: %s", path, exc_info=True)
+        return None
 
     def _python_search(self, pattern: str, base_full: Path, include_glob: str | None) -> dict[str, list[tuple[int, str]]]:  # noqa: C901, PLR0912
         """Fallback search using Python when ripgrep is unavailable.
 
-        Recursively searches files, respecting `max_file_size_bytes` limit.
+        Recursively searches files, respecting the `max_file_size_bytes` and
+        `grep_max_count` limits.
 
         Args:
             pattern: Escaped regex pattern (from re.escape) for literal search.
@@ -653,20 +825,17 @@ class FilesystemBackend(BackendProtocol):
                 content = fp.read_text()
             except (UnicodeDecodeError, PermissionError, OSError, RuntimeError):
                 continue
+            virt_path: str | None = None
             for line_num, line in enumerate(content.splitlines(), 1):
                 if regex.search(line):
-                    if self.virtual_mode:
-                        try:
-                            virt_path = self._to_virtual_path(fp)
-                        except ValueError:
-                            logger.debug("Skipping grep result outside root: %s", fp)
-                            continue
-                        except (OSError, RuntimeError):
-                            logger.warning("Could not resolve grep result path: %s", fp, exc_info=True)
-                            continue
-                    else:
-                        virt_path = str(fp)
-                    results.setdefault(virt_path, []).append((line_num, line))
+                    if virt_path is None:
+                        virt_path = self._grep_result_path(fp)
+                        if virt_path is None:
+                            break
+                    matches = results.setdefault(virt_path, [])
+                    matches.append((line_num, line))
+                    if self.grep_max_count is not None and len(matches) >= self.grep_max_count:
+                        break
 
         return results
 
@@ -756,6 +925,10 @@ class FilesystemBackend(BackendProtocol):
         results.sort(key=lambda x: x.get("path", ""))
         return GlobResult(matches=results)
 
+    async def aglob(self, pattern: str, path: str = "/") -> GlobResult:
+        """Async version of glob."""
+        return await self._run_io(self.glob, pattern, path)
+
     def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
         """Upload multiple files to the filesystem.
 
@@ -790,6 +963,10 @@ class FilesystemBackend(BackendProtocol):
 
         return responses
 
+    async def aupload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Async version of upload_files."""
+        return await self._run_io(self.upload_files, files)
+
     def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
         """Download multiple files from the filesystem.
 
@@ -819,6 +996,19 @@ class FilesystemBackend(BackendProtocol):
                 responses.append(FileDownloadResponse(path=path, content=None, error=error))
         return responses
 
+    async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        """Async version of download_files."""
+        return await self._run_io(self.download_files, paths)
+
+
+def _grep_result(results: dict[str, list[tuple[int, str]]]) -> GrepResult:
+    """Flatten `{path: [(line, text), ...]}` search results into a `GrepResult`."""
+    matches: list[GrepMatch] = []
+    for fpath, items in results.items():
+        for line_num, line_text in items:
+            matches.append({"path": fpath, "line": int(line_num), "text": line_text})
+    return GrepResult(matches=matches)
+
 
 def _map_exception_to_standard_error(exc: Exception) -> FileOperationError | None:
     """Map a caught exception to a standardized `FileOperationError` code.
@@ -0,0 +1,646 @@
+"""Per-operation timing and byte-count instrumentation for backends.
+
+Wrap any backend with `instrument()` (or `backend.with_observers(...)`) to emit
+one `BackendEvent` per call to a list of `BackendObserver`s. Two observers
+ship with the package:
+
+- `HistogramObserver`: in-process latency histograms and byte/error counters
+  per (operation, backend, route).
+- `OpenTelemetryObserver`: exports each call as an OpenTelemetry span; a
+  no-op when disabled or when `opentelemetry-api` is not installed.
+
+`CompositeBackend(..., observers=[...])` wraps the default backend and every
+route automatically, so events carry the route that served the call.
+
+Examples:
+    ```python
+    from deepagents.backends import CompositeBackend, FilesystemBackend, StoreBackend
+    from deepagents.backends.instrumentation import HistogramObserver, OpenTelemetryObserver
+
+    histogram = HistogramObserver()
+    backend = CompositeBackend(
+        default=FilesystemBackend(root_dir=".", virtual_mode=True),
+        routes={"/memories/": StoreBackend(namespace=lambda rt: ("memories",))},
+        observers=[histogram, OpenTelemetryObserver()],
+    )
+    ...
+    for row in histogram.snapshot():
+        print(row["operation"], row["route"], row["p95_s"])
+    ```
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Any
+
+from deepagents.backends.protocol import (
+    BackendEvent,
+    BackendObserver,
+    BackendProtocol,
+    EditResult,
+    ExecuteResponse,
+    FileDownloadResponse,
+    FileUploadResponse,
+    GlobResult,
+    GrepResult,
+    LsResult,
+    ReadResult,
+    SandboxBackendProtocol,
+    WriteResult,
+    execute_accepts_timeout,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _trim_read(result: ReadResult, limit: int) -> tuple[ReadResult, bool]:
+    """Cut a `limit + 1` line read back to `limit` lines.
+
+    The proxy asks the wrapped backend for one line more than the caller did;
+    getting it back means the file continues past the requested window. A file
+    with exactly `limit` lines left is therefore not reported as truncated.
+
+    Returns:
+        The result the caller would have received for `limit`, and whether
+        more lines follow it.
+    """
+    if not isinstance(result, ReadResult) or result.file_data is None:
+        return result, False
+    if result.file_data.get("encoding", "utf-8") != "utf-8":
+        return result, False
+    content = result.file_data.get("content", "")
+    if isinstance(content, list):  # legacy v1 data
+        if len(content) <= limit:
+            return result, False
+        return replace(result, file_data={**result.file_data, "content": content[:limit]}), True
+    lines = content.splitlines(keepends=True)
+    if len(lines) <= limit:
+        return result, False
+    return replace(result, file_data={**result.file_data, "content": "".join(lines[:limit])}), True
+
+
+def _describe_result(event: BackendEvent, result: object, *, truncated: bool = False) -> None:  # noqa: C901, PLR0912
+    """Fill result-derived fields of `event` from a backend return value."""
+    if isinstance(result, ReadResult):
+        event.error = result.error
+        if result.file_data is not None:
+            content = result.file_data.get("content", "")
+            if isinstance(content, list):  # legacy v1 data
+                content = "\n".join(content)
+            event.bytes_out = len(content)
+            event.result_count = content.count("\n") + (1 if content and not content.endswith("\n") else 0)
+            event.truncated = truncated
+    elif isinstance(result, LsResult):
+        event.error = result.error
+        event.result_count = len(result.entries) if result.entries is not None else None
+    elif isinstance(result, (GrepResult, GlobResult)):
+        event.error = result.error
+        event.result_count = len(result.matches) if result.matches is not None else None
+    elif isinstance(result, EditResult):
+        event.error = result.error
+        event.result_count = result.occurrences
+    elif isinstance(result, WriteResult):
+        event.error = result.error
+    elif isinstance(result, ExecuteResponse):
+        event.bytes_out = len(result.output)
+        event.truncated = result.truncated
+    elif isinstance(result, list):
+        event.result_count = len(result)
+        failed = 0
+        for item in result:
+            if isinstance(item, FileDownloadResponse) and item.content is not None:
+                event.bytes_out += len(item.content)
+            if isinstance(item, (FileDownloadResponse, FileUploadResponse)) and item.error:
+                failed += 1
+        if failed:
+            event.error = f"{failed} of {len(result)} files failed"
+    elif isinstance(result, str):
+        # Legacy backends return grep errors as plain strings.
+        event.error = result
+
+
+class InstrumentedBackend(BackendProtocol):
+    """Backend proxy that reports every call to a list of observers.
+
+    All protocol operations, sync and async, are forwarded to the wrapped
+    backend unchanged; async calls go to the wrapped backend's own `a*`
+    methods so native async implementations are preserved. The one exception
+    is `read`, which asks for one extra line to detect truncation and drops
+    it before returning. Attributes that are not part of the protocol are
+    forwarded as well.
+
+    Use `instrument()` rather than constructing this class directly so that
+    sandbox backends keep their `execute()` capability.
+    """
+
+    def __init__(
+        self,
+        backend: BackendProtocol,
+        observers: Sequence[BackendObserver],
+        *,
+        route: str | None = None,
+    ) -> None:
+        """Initialize the proxy.
+
+        Args:
+            backend: Backend to wrap.
+            observers: Observers notified after every call.
+            route: Optional route label recorded on every event.
+        """
+        self._backend = backend
+        self._observers = list(observers)
+        self._route = route
+        self._backend_name = type(backend).__name__
+
+    @property
+    def wrapped(self) -> BackendProtocol:
+        """The backend this proxy forwards to."""
+        return self._backend
+
+    @property
+    def observers(self) -> list[BackendObserver]:
+        """Observers notified after every call."""
+        return list(self._observers)
+
+    @property
+    def route(self) -> str | None:
+        """Route label recorded on every event."""
+        return self._route
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        # Only called for attributes missing on the proxy itself.
+        if name == "_backend":
+            raise AttributeError(name)
+        return getattr(self._backend, name)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._backend!r}, route={self._route!r})"
+
+    # ------------------------------------------------------------------
+    # Event plumbing
+    # ------------------------------------------------------------------
+
+    def _emit(self, event: BackendEvent) -> None:
+        for observer in self._observers:
+            try:
+                observer.on_event(event)
+            except Exception:
+                logger.exception("Backend observer %r failed handling %s event", observer, event.operation)
+
+    @contextmanager
+    def _record(
+        self,
+        operation: str,
+        path: str | None = None,
+        *,
+        is_async: bool = False,
+        bytes_in: int = 0,
+    ) -> Iterator[BackendEvent]:
+        event = BackendEvent(
+            operation=operation,
+            backend=self._backend_name,
+            route=self._route,
+            path=path,
+            is_async=is_async,
+            start_time_ns=time.time_ns(),
+            bytes_in=bytes_in,
+        )
+        start = time.perf_counter()
+        try:
+            yield event
+        except BaseException as exc:
+            event.error = type(exc).__name__
+            raise
+        finally:
+            event.duration_s = time.perf_counter() - start
+            self._emit(event)
+
+    # ------------------------------------------------------------------
+    # Protocol operations
+    # ------------------------------------------------------------------
+
+    def ls(self, path: str) -> LsResult:
+        """List directory contents via the wrapped backend."""
+        with self._record("ls", path) as event:
+            result = self._backend.ls(path)
+            _describe_result(event, result)
+        return result
+
+    async def als(self, path: str) -> LsResult:
+        """Async version of ls."""
+        with self._record("ls", path, is_async=True) as event:
+            result = await self._backend.als(path)
+            _describe_result(event, result)
+        return result
+
+    def read(self, file_path: str, offset: int = 0, limit: int = 2000) -> ReadResult:
+        """Read a file via the wrapped backend."""
+        with self._record("read", file_path) as event:
+            result, truncated = _trim_read(self._backend.read(file_path, offset, limit + 1), limit)
+            _describe_result(event, result, truncated=truncated)
+        return result
+
+    async def aread(self, file_path: str, offset: int = 0, limit: int = 2000) -> ReadResult:
+        """Async version of read."""
+        with self._record("read", file_path, is_async=True) as event:
+            result, truncated = _trim_read(await self._backend.aread(file_path, offset, limit + 1), limit)
+            _describe_result(event, result, truncated=truncated)
+        return result
+
+    def grep(self, pattern: str, path: str | None = None, glob: str | None = None) -> GrepResult:
+        """Search file contents via the wrapped backend."""
+        with self._record("grep", path) as event:
+            result = self._backend.grep(pattern, path, glob)
+            _describe_result(event, result)
+        return result
+
+    async def agrep(self, pattern: str, path: str | None = None, glob: str | None = None) -> GrepResult:
+        """Async version of grep."""
+        with self._record("grep", path, is_async=True) as event:
+            result = await self._backend.agrep(pattern, path, glob)
+            _describe_result(event, result)
+        return result
+
+    def glob(self, pattern: str, path: str = "/") -> GlobResult:
+        """Match paths via the wrapped backend."""
+        with self._record("glob", path) as event:
+            result = self._backend.glob(pattern, path)
+            _describe_result(event, result)
+        return result
+
+    async def aglob(self, pattern: str, path: str = "/") -> GlobResult:
+        """Async version of glob."""
+        with self._record("glob", path, is_async=True) as event:
+            result = await self._backend.aglob(pattern, path)
+            _describe_result(event, result)
+        return result
+
+    def write(self, file_path: str, content: str) -> WriteResult:
+        """Create a file via the wrapped backend."""
+        with self._record("write", file_path, bytes_in=len(content)) as event:
+            result = self._backend.write(file_path, content)
+            _describe_result(event, result)
+        return result
+
+    async def awrite(self, file_path: str, content: str) -> WriteResult:
+        """Async version of write."""
+        with self._record("write", file_path, is_async=True, bytes_in=len(content)) as event:
+            result = await self._backend.awrite(file_path, content)
+            _describe_result(event, result)
+        return result
+
+    def edit(
+        self,
+        file_path: str,
+        old_string: str,
+        new_string: str,
+        replace_all: bool = False,  # noqa: FBT001, FBT002
+    ) -> EditResult:
+        """Edit a file via the wrapped backend."""
+        with self._record("edit", file_path, bytes_in=len(new_string)) as event:
+            result = self._backend.edit(file_path, old_string, new_string, replace_all=replace_all)
+            _describe_result(event, result)
+        return result
+
+    async def aedit(
+        self,
+        file_path: str,
+        old_string: str,
+        new_string: str,
+        replace_all: bool = False,  # noqa: FBT001, FBT002
+    ) -> EditResult:
+        """Async version of edit."""
+        with self._record("edit", file_path, is_async=True, bytes_in=len(new_string)) as event:
+            result = await self._backend.aedit(file_path, old_string, new_string, replace_all=replace_all)
+            _describe_result(event, result)
+        return result
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Upload files via the wrapped backend."""
+        with self._record("upload_files", bytes_in=sum(len(content) for _, content in files)) as event:
+            result = self._backend.upload_files(files)
+            _describe_result(event, result)
+        return result
+
+    async def aupload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Async version of upload_files."""
+        with self._record("upload_files", is_async=True, bytes_in=sum(len(content) for _, content in files)) as event:
+            result = await self._backend.aupload_files(files)
+            _describe_result(event, result)
+        return result
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        """Download files via the wrapped backend."""
+        with self._record("download_files") as event:
+            result = self._backend.download_files(paths)
+            _describe_result(event, result)
+        return result
+
+    async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        """Async version of download_files."""
+        with self._record("download_files", is_async=True) as event:
+            result = await self._backend.adownload_files(paths)
+            _describe_result(event, result)
+        return result
+
+
+class InstrumentedSandboxBackend(InstrumentedBackend, SandboxBackendProtocol):
+    """`InstrumentedBackend` for sandbox backends; also instruments `execute()`."""
+
+    _backend: SandboxBackendProtocol
+
+    @property
+    def id(self) -> str:
+        """Identifier of the wrapped sandbox."""
+        return self._backend.id
+
+    def execute(
+        self,
+        command: str,
+        *,
+        timeout: int | None = None,
+    ) -> ExecuteResponse:
+        """Execute a command via the wrapped sandbox."""
+        with self._record("execute", bytes_in=len(command)) as event:
+            if timeout is not None and execute_accepts_timeout(type(self._backend)):
+                result = self._backend.execute(command, timeout=timeout)
+            else:
+                result = self._backend.execute(command)
+            _describe_result(event, result)
+        return result
+
+    async def aexecute(
+        self,
+        command: str,
+        *,
+        timeout: int | None = None,  # noqa: ASYNC109
+    ) -> ExecuteResponse:
+        """Async version of execute."""
+        with self._record("execute", is_async=True, bytes_in=len(command)) as event:
+            if timeout is not None and execute_accepts_timeout(type(self._backend)):
+                result = await self._backend.aexecute(command, timeout=timeout)
+            else:
+                result = await self._backend.aexecute(command)
+            _describe_result(event, result)
+        return result
+
+
+def instrument(
+    backend: BackendProtocol,
+    observers: Sequence[BackendObserver],
+    *,
+    route: str | None = None,
+) -> InstrumentedBackend:
+    """Wrap `backend` so every call is reported to `observers`.
+
+    Re-instrumenting an already instrumented backend does not stack proxies;
+    the observers are merged onto a single wrapper instead.
+
+    Args:
+        backend: Backend to wrap.
+        observers: Observers notified after every call.
+        route: Optional route label recorded on every event.
+
+    Returns:
+        An `InstrumentedSandboxBackend` if `backend` supports execution,
+        otherwise an `InstrumentedBackend`.
+    """
+    if isinstance(backend, InstrumentedBackend):
+        observers = [*backend.observers, *observers]
+        route = route if route is not None else backend.route
+        backend = backend.wrapped
+    if isinstance(backend, SandboxBackendProtocol):
+        return InstrumentedSandboxBackend(backend, observers, route=route)
+    return InstrumentedBackend(backend, observers, route=route)
+
+
+# ---------------------------------------------------------------------------
+# Built-in observers
+# ---------------------------------------------------------------------------
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = tuple(1e-5 * 2**i for i in range(24))
+"""Histogram upper bounds in seconds: 10µs doubling up to ~84s (plus overflow)."""
+
+
+class _Series:
+    """Accumulated statistics for one (operation, backend, route) key."""
+
+    __slots__ = ("buckets", "bytes_in", "bytes_out", "count", "errors", "max", "min", "results", "sum", "truncated")
+
+    def __init__(self, n_buckets: int) -> None:
+        self.buckets = [0] * (n_buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.results = 0
+        self.errors = 0
+        self.truncated = 0
+
+
+class HistogramObserver(BackendObserver):
+    """Aggregate latency histograms and counters per (operation, backend, route).
+
+    Latencies go into fixed, log-spaced buckets, so memory is constant per key
+    and snapshots from several processes can be merged by adding bucket counts.
+    Quantiles are estimated from bucket upper bounds (clamped to the observed
+    maximum).
+
+    Thread-safe.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """Initialize the observer.
+
+        Args:
+            buckets: Ascending bucket upper bounds in seconds. Durations above
+                the last bound land in an overflow bucket.
+        """
+        self._bounds = tuple(buckets)
+        self._series: dict[tuple[str, str, str | None], _Series] = {}
+        self._lock = threading.Lock()
+
+    def on_event(self, event: BackendEvent) -> None:
+        """Record a completed call."""
+        key = (event.operation, event.backend, event.route)
+        index = _bucket_index(self._bounds, event.duration_s)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self._bounds))
+            series.buckets[index] += 1
+            series.count += 1
+            series.sum += event.duration_s
+            series.min = min(series.min, event.duration_s)
+            series.max = max(series.max, event.duration_s)
+            series.bytes_in += event.bytes_in
+            series.bytes_out += event.bytes_out
+            series.results += event.result_count or 0
+            series.errors += event.error is not None
+            series.truncated += event.truncated
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Return one summary row per key, sorted by operation then route.
+
+        Each row has `operation`, `backend`, `route`, `count`, `errors`,
+        `truncated`, `bytes_in`, `bytes_out`, `results`, `sum_s`, `min_s`,
+        `max_s`, `mean_s`, `p50_s`, `p95_s`, `p99_s` and the raw `buckets`
+        (`[[upper_bound_s, count], ...]`, overflow bound is `inf`).
+        """
+        bounds = [*self._bounds, math.inf]
+        rows: list[dict[str, Any]] = []
+        with self._lock:
+            items = list(self._series.items())
+            for (operation, backend, route), s in items:
+                rows.append(
+                    {
+                        "operation": operation,
+                        "backend": backend,
+                        "route": route,
+                        "count": s.count,
+                        "errors": s.errors,
+                        "truncated": s.truncated,
+                        "bytes_in": s.bytes_in,
+                        "bytes_out": s.bytes_out,
+                        "results": s.results,
+                        "sum_s": s.sum,
+                        "min_s": s.min if s.count else 0.0,
+                        "max_s": s.max,
+                        "mean_s": s.sum / s.count if s.count else 0.0,
+                        "p50_s": _quantile(bounds, s, 0.50),
+                        "p95_s": _quantile(bounds, s, 0.95),
+                        "p99_s": _quantile(bounds, s, 0.99),
+                        "buckets": [[bound, n] for bound, n in zip(bounds, s.buckets, strict=True) if n],
+                    }
+                )
+        rows.sort(key=lambda r: (r["operation"], r["route"] or "", r["backend"]))
+        return rows
+
+    def reset(self) -> None:
+        """Drop all recorded data."""
+        with self._lock:
+            self._series.clear()
+
+
+def _bucket_index(bounds: Sequence[float], value: float) -> int:
+    # Buckets are doubling, so a log2 guess plus a short correction beats bisect.
+    if value <= bounds[0]:
+        return 0
+    guess = min(len(bounds), max(0, int(math.log2(value / bounds[0]))))
+    while guess < len(bounds) and value > bounds[guess]:
+        guess += 1
+    while guess > 0 and value <= bounds[guess - 1]:
+        guess -= 1
+    return guess
+
+
+def _quantile(bounds: Sequence[float], series: _Series, q: float) -> float:
+    if not series.count:
+        return 0.0
+    target = q * series.count
+    cumulative = 0
+    for bound, n in zip(bounds, series.buckets, strict=True):
+        cumulative += n
+        if cumulative >= target:
+            return min(bound, series.max)
+    return series.max
+
+
+class OpenTelemetryObserver(BackendObserver):
+    """Export every backend call as an OpenTelemetry span.
+
+    Spans are created after the fact with the event's real start and end
+    times, as children of whatever span is current on the calling thread
+    (typically the tool call). Attributes use the `deepagents.backend.*`
+    namespace.
+
+    The observer is a no-op when `enabled=False`, when the
+    `OTEL_SDK_DISABLED` environment variable is `"true"`, or when
+    `opentelemetry-api` is not installed, so it is safe to register
+    unconditionally.
+    """
+
+    def __init__(
+        self,
+        tracer: Any = None,  # noqa: ANN401
+        *,
+        enabled: bool = True,
+        span_prefix: str = "deepagents.backend",
+    ) -> None:
+        """Initialize the observer.
+
+        Args:
+            tracer: OpenTelemetry `Tracer` to use. Defaults to the global
+                tracer provider's `"deepagents.backends"` tracer.
+            enabled: Set to False to turn the observer into a no-op.
+            span_prefix: Span names are `f"{span_prefix}.{operation}"`.
+        """
+        self._tracer: Any = None
+        self._status_error: Any = None
+        self._span_prefix = span_prefix
+        if not enabled or os.environ.get("OTEL_SDK_DISABLED", "").strip().lower() == "true":
+            return
+        try:
+            from opentelemetry import trace  # noqa: PLC0415
+            from opentelemetry.trace import Status, StatusCode  # noqa: PLC0415
+        except ImportError:
+            if tracer is None:
+                return
+        else:
+            self._status_error = lambda description: Status(StatusCode.ERROR, description)
+            if tracer is None:
+                tracer = trace.get_tracer("deepagents.backends")
+        self._tracer = tracer
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are actually emitted."""
+        return self._tracer is not None
+
+    def on_event(self, event: BackendEvent) -> None:
+        """Emit a span for a completed call."""
+        if self._tracer is None:
+            return
+        attributes: dict[str, Any] = {
+            "deepagents.backend.operation": event.operation,
+            "deepagents.backend.name": event.backend,
+            "deepagents.backend.async": event.is_async,
+            "deepagents.backend.bytes_in": event.bytes_in,
+            "deepagents.backend.bytes_out": event.bytes_out,
+            "deepagents.backend.truncated": event.truncated,
+        }
+        if event.route is not None:
+            attributes["deepagents.backend.route"] = event.route
+        if event.path is not None:
+            attributes["deepagents.backend.path"] = event.path
+        if event.result_count is not None:
+            attributes["deepagents.backend.result_count"] = event.result_count
+        if event.error is not None:
+            attributes["deepagents.backend.error"] = event.error
+
+        span = self._tracer.start_span(
+            f"{self._span_prefix}.{event.operation}",
+            start_time=event.start_time_ns,
+            attributes=attributes,
+        )
+        if event.error is not None and self._status_error is not None:
+            span.set_status(self._status_error(event.error))
+        span.end(end_time=event.start_time_ns + int(event.duration_s * 1e9))
+
+
+__all__ = [
+    "DEFAULT_LATENCY_BUCKETS",
+    "HistogramObserver",
+    "InstrumentedBackend",
+    "InstrumentedSandboxBackend",
+    "OpenTelemetryObserver",
+    "instrument",
+]
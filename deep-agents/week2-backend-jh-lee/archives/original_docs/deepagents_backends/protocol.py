@@ -315,6 +315,62 @@ class GlobResult:
     matches: list["FileInfo"] | None = None
 
 
+@dataclass
+class BackendEvent:
+    """Structured record of a single backend call.
+
+    Emitted to every `BackendObserver` after the call returns (or raises).
+    Byte counts are measured on the values crossing the protocol boundary
+    (string length for text, `len()` for raw bytes) so that recording them
+    never re-encodes large payloads.
+
+    Attributes:
+        operation: Protocol method name without the async prefix (e.g. `"read"`).
+        backend: Class name of the backend that served the call.
+        route: Route prefix when served through `CompositeBackend`, else None.
+        path: File or directory path the call targeted, if any.
+        is_async: Whether the call came through the async (`a*`) variant.
+        start_time_ns: Wall-clock start time (`time.time_ns()`).
+        duration_s: Elapsed time in seconds.
+        bytes_in: Bytes sent to the backend (write/edit/upload payloads).
+        bytes_out: Bytes returned by the backend (read/download/execute output).
+        result_count: Number of entries, matches, or files in the result.
+        truncated: Whether the result was cut short (the file has more lines
+            after the read window, or execute output was truncated).
+        error: Error message from the result, or the exception type name if
+            the call raised.
+    """
+
+    operation: str
+    backend: str
+    route: str | None = None
+    path: str | None = None
+    is_async: bool = False
+    start_time_ns: int = 0
+    duration_s: float = 0.0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    result_count: int | None = None
+    truncated: bool = False
+    error: str | None = None
+
+
+class BackendObserver(abc.ABC):
+    """Receiver for `BackendEvent`s emitted by an instrumented backend.
+
+    Observers are called synchronously on the calling thread (or event loop),
+    so implementations should be cheap and must be thread-safe. Exceptions
+    raised by an observer are logged and never propagate to the caller.
+
+    See `deepagents.backends.instrumentation` for the built-in
+    `HistogramObserver` and `OpenTelemetryObserver`.
+    """
+
+    @abc.abstractmethod
+    def on_event(self, event: BackendEvent) -> None:
+        """Handle a completed backend call."""
+
+
 # @abstractmethod to avoid breaking subclasses that only implement a subset
 class BackendProtocol(abc.ABC):  # noqa: B024
     r"""Protocol for pluggable memory backends (single, unified).
@@ -623,6 +679,38 @@ class BackendProtocol(abc.ABC):  # noqa: B024
         """Async version of download_files."""
         return await asyncio.to_thread(self.download_files, paths)
 
+    def with_observers(
+        self,
+        *observers: "BackendObserver",
+        route: str | None = None,
+    ) -> "BackendProtocol":
+        """Return a view of this backend that reports every call to `observers`.
+
+        The returned wrapper forwards all operations (sync and async) to this
+        backend unchanged and emits one `BackendEvent` per call. Sandbox
+        backends stay sandbox backends, so `execute()` keeps working.
+
+        Args:
+            *observers: Observers to notify.
+            route: Optional route label recorded on every event.
+
+        Returns:
+            An `InstrumentedBackend` wrapping this backend.
+
+        Examples:
+            ```python
+            from deepagents.backends.instrumentation import HistogramObserver
+
+            histogram = HistogramObserver()
+            backend = FilesystemBackend(root_dir=".", virtual_mode=True).with_observers(histogram)
+            backend.read("/README.md")
+            histogram.snapshot()
+            ```
+        """
+        from deepagents.backends.instrumentation import instrument  # noqa: PLC0415  # avoid circular import
+
+        return instrument(self, list(observers), route=route)
+
     # -- deprecated methods --------------------------------------------------
 
     @deprecated(
@@ -5,10 +5,14 @@ helpers used by backends and the composite router. Structured helpers
 enable composition without fragile string parsing.
 """
 
+import operator
 import os
 import re
+import threading
+from bisect import bisect_right
 from collections.abc import Sequence
 from datetime import UTC, datetime
+from itertools import accumulate
 from pathlib import Path, PurePosixPath
 from typing import Any, Literal, overload
 
@@ -109,9 +113,89 @@ def sanitize_tool_call_id(tool_call_id: str) -> str:
     return tool_call_id.replace(".", "_").replace("/", "_").replace("\\", "_")
 
 
+_LINE_PREFIX_CACHE_MAX = 1 << 17
+"""Largest line number whose `cat -n` prefix is cached (~1 MB of strings)."""
+
+_line_prefix_cache: list[str] = []
+_line_prefix_lock = threading.Lock()
+
+
+def _line_prefixes(start_line: int, count: int) -> list[str]:
+    """Return the `cat -n` prefixes (number column plus tab) for a run of lines.
+
+    Prefixes are cached once per process so formatting a file is a single
+    `join` over prefix/line pairs instead of one f-string per line.
+    """
+    end = start_line + count
+    if start_line < 1 or end - 1 > _LINE_PREFIX_CACHE_MAX:
+        return [f"{n:{LINE_NUMBER_WIDTH}d}\t" for n in range(start_line, end)]
+    if len(_line_prefix_cache) < end - 1:
+        with _line_prefix_lock:
+            have = len(_line_prefix_cache)
+            if have < end - 1:
+                # Grow geometrically so repeated reads of a growing file stay cheap.
+                target = min(_LINE_PREFIX_CACHE_MAX, max(end - 1, 2 * have, 4096))
+                _line_prefix_cache.extend(f"{n:{LINE_NUMBER_WIDTH}d}\t" for n in range(have + 1, target + 1))
+    return _line_prefix_cache[start_line - 1 : end - 1]
+
+
+_BUDGET_BLOCK = 4096
+
+
+def _lines_within_budget(lines: Sequence[str], start_line: int, max_chars: int) -> int:
+    """Return how many leading lines fit in `max_chars` once formatted and joined.
+
+    Only valid for lines that need no chunking. Sizes are accumulated in
+    blocks, so scanning stops shortly after the budget is exhausted.
+    """
+    if max_chars < 0:
+        return 0
+    used = -1  # the first line has no preceding newline
+    for block_start in range(0, len(lines), _BUDGET_BLOCK):
+        block = lines[block_start : block_start + _BUDGET_BLOCK]
+        first = start_line + block_start
+        if first + len(block) <= 10**LINE_NUMBER_WIDTH:
+            # Every number fits the column: each line costs len + width + tab + newline.
+            totals = list(accumulate(map((LINE_NUMBER_WIDTH + 2).__add__, map(len, block)), initial=used))[1:]
+            if totals[-1] <= max_chars:
+                used = totals[-1]
+                continue
+            return block_start + bisect_right(totals, max_chars)
+        for i, line in enumerate(block):
+            used += max(LINE_NUMBER_WIDTH, len(str(first + i))) + 2 + len(line)
+            if used > max_chars:
+                return block_start + i
+    return len(lines)
+
+
+def _format_line_run(lines: Sequence[str], start_line: int) -> str:
+    """Format lines that need no chunking as one join over the number column."""
+    return "\n".join(map(operator.add, _line_prefixes(start_line, len(lines)), lines))
+
+
+def _chunk_long_line(line: str, line_num: int) -> list[str]:
+    """Split a line longer than MAX_LINE_LENGTH into numbered chunks."""
+    chunks = []
+    num_chunks = (len(line) + MAX_LINE_LENGTH - 1) // MAX_LINE_LENGTH
+    for chunk_idx in range(num_chunks):
+        start = chunk_idx * MAX_LINE_LENGTH
+        end = min(start + MAX_LINE_LENGTH, len(line))
+        chunk = line[start:end]
+        if chunk_idx == 0:
+            # First chunk: use normal line number
+            chunks.append(f"{line_num:{LINE_NUMBER_WIDTH}d}\t{chunk}")
+        else:
+            # Continuation chunks: use decimal notation (e.g., 5.1, 5.2)
+            continuation_marker = f"{line_num}.{chunk_idx}"
+            chunks.append(f"{continuation_marker:>{LINE_NUMBER_WIDTH}}\t{chunk}")
+    return chunks
+
+
 def format_content_with_line_numbers(
     content: str | list[str],
     start_line: int = 1,
+    *,
+    max_chars: int | None = None,
 ) -> str:
     """Format file content with line numbers (cat -n style).
 
@@ -120,6 +204,13 @@ def format_content_with_line_numbers(
     Args:
         content: File content as string or list of lines
         start_line: Starting line number (default: 1)
+        max_chars: Optional budget for the formatted output in characters.
+
+            Output longer than the budget is cut to `max_chars` and a
+            `TRUNCATION_GUIDANCE` line is appended, exactly as
+            `truncate_if_too_long` does with a budget of
+            `TOOL_RESULT_TOKEN_LIMIT * 4`, but lines past the cut are never
+            formatted.
 
     Returns:
         Formatted content with line numbers and continuation markers
@@ -131,28 +222,46 @@ def format_content_with_line_numbers(
     else:
         lines = content
 
-    result_lines = []
-    for i, line in enumerate(lines):
-        line_num = i + start_line
+    if not lines:
+        return ""
 
-        if len(line) <= MAX_LINE_LENGTH:
-            result_lines.append(f"{line_num:{LINE_NUMBER_WIDTH}d}\t{line}")
-        else:
-            # Split long line into chunks with continuation markers
-            num_chunks = (len(line) + MAX_LINE_LENGTH - 1) // MAX_LINE_LENGTH
-            for chunk_idx in range(num_chunks):
-                start = chunk_idx * MAX_LINE_LENGTH
-                end = min(start + MAX_LINE_LENGTH, len(line))
-                chunk = line[start:end]
-                if chunk_idx == 0:
-                    # First chunk: use normal line number
-                    result_lines.append(f"{line_num:{LINE_NUMBER_WIDTH}d}\t{chunk}")
-                else:
-                    # Continuation chunks: use decimal notation (e.g., 5.1, 5.2)
-                    continuation_marker = f"{line_num}.{chunk_idx}"
-                    result_lines.append(f"{continuation_marker:>{LINE_NUMBER_WIDTH}}\t{chunk}")
-
-    return "\n".join(result_lines)
+    # Runs of ordinary lines are joined in one go; only over-long lines take
+    # the per-chunk path.
+    if max(map(len, lines)) <= MAX_LINE_LENGTH:
+        long_lines: list[int] = []
+    else:
+        long_lines = [i for i, line in enumerate(lines) if len(line) > MAX_LINE_LENGTH]
+
+    pieces: list[str] = []
+    used = -1  # total length of "\n".join(pieces)
+    pos = 0
+    for stop in [*long_lines, len(lines)]:
+        run = lines[pos:stop]
+        if run:
+            if max_chars is not None:
+                keep = _lines_within_budget(run, start_line + pos, max_chars - used - 1)
+                if keep < len(run):
+                    # Format through the first line that crosses the budget, then cut.
+                    pieces.append(_format_line_run(run[: keep + 1], start_line + pos))
+                    return _cut_to_budget(pieces, max_chars)
+            piece = _format_line_run(run, start_line + pos)
+            pieces.append(piece)
+            used += len(piece) + 1
+        if stop == len(lines):
+            break
+        for chunk in _chunk_long_line(lines[stop], start_line + stop):
+            pieces.append(chunk)
+            used += len(chunk) + 1
+            if max_chars is not None and used > max_chars:
+                return _cut_to_budget(pieces, max_chars)
+        pos = stop + 1
+
+    return "\n".join(pieces)
+
+
+def _cut_to_budget(pieces: list[str], max_chars: int) -> str:
+    """Join formatted pieces that overflow `max_chars` and cut them like `truncate_if_too_long`."""
+    return "\n".join(pieces)[:max_chars] + "\n" + TRUNCATION_GUIDANCE
 
 
 def check_empty_content(content: str) -> str | None:
@@ -367,6 +476,9 @@ def perform_string_replacement(
     return new_content, occurrences
 
 
+_TRUNCATE_BLOCK = 1024
+
+
 @overload
 def truncate_if_too_long(result: list[str]) -> list[str]: ...
 
@@ -376,11 +488,28 @@ def truncate_if_too_long(result: str) -> str: ...
 
 
 def truncate_if_too_long(result: list[str] | str) -> list[str] | str:
-    """Truncate list or string result if it exceeds token limit (rough estimate: 4 chars/token)."""
+    """Truncate list or string result if it exceeds token limit (rough estimate: 4 chars/token).
+
+    Lists keep the longest prefix of items whose combined length fits the
+    limit; lengths are summed in blocks so scanning stops shortly after the
+    limit is crossed.
+    """
     if isinstance(result, list):
-        total_chars = sum(len(item) for item in result)
-        if total_chars > TOOL_RESULT_TOKEN_LIMIT * 4:
-            return result[: len(result) * TOOL_RESULT_TOKEN_LIMIT * 4 // total_chars] + [TRUNCATION_GUIDANCE]  # noqa: RUF005  # Concatenation preferred for clarity
+        limit = TOOL_RESULT_TOKEN_LIMIT * 4
+        total_chars = 0
+        for block_start in range(0, len(result), _TRUNCATE_BLOCK):
+            block = result[block_start : block_start + _TRUNCATE_BLOCK]
+            block_chars = sum(map(len, block))
+            if total_chars + block_chars <= limit:
+                total_chars += block_chars
+                continue
+            keep = block_start
+            for item in block:
+                total_chars += len(item)
+                if total_chars > limit:
+                    break
+                keep += 1
+            return result[:keep] + [TRUNCATION_GUIDANCE]  # noqa: RUF005  # Concatenation preferred for clarity
         return result
     # string
     if len(result) > TOOL_RESULT_TOKEN_LIMIT * 4:
@@ -0,0 +1,167 @@
+"""Tests for the local ripgrep parsing changes in `FilesystemBackend.grep`.
+
+Recorded `rg --null` output is fed to the sync and async parsers, so these
+run without ripgrep installed; the sync/async parity test needs `rg`.
+
+Run with the snapshot in `deepagents_backends/` installed as
+`deepagents.backends` (see `deepagents_backends/README.md`):
+
+    ```bash
+    pytest tests/
+    ```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from deepagents.backends import FilesystemBackend
+from deepagents.backends.filesystem import _grep_result
+
+CHUNK_SIZE = 1 << 16  # bytes `_aripgrep_search` reads per chunk
+
+
+class RecordedProcess:
+    """Stands in for an `rg` subprocess whose stdout is a recorded byte string."""
+
+    def __init__(self, output: bytes) -> None:
+        self.stdout = asyncio.StreamReader()
+        self.stdout.feed_data(output)
+        self.stdout.feed_eof()
+        self.returncode = 0
+
+    async def wait(self) -> int:
+        return self.returncode
+
+    def kill(self) -> None:
+        pass
+
+
+def _record(path: str, line: int, text: str, newline: str = "\n") -> bytes:
+    return f"{path}\0{line}:{text}{newline}".encode()
+
+
+def _recorded_output(root: Path) -> tuple[bytes, dict[str, list[tuple[int, str]]], int]:
+    """Return recorded output, the results it parses to, and where the split record starts."""
+    head = b"".join(
+        [
+            _record(f"{root}/src/app.py", 12, "url = 'http://host:8080'  # a:b"),
+            _record(f"{root}/win.txt", 3, "crlf line", newline="\r\n"),
+            _record("/elsewhere/secret.txt", 1, "outside the root"),
+            _record(f"{root}/../escape.txt", 1, "dot-dot outside the root"),
+        ]
+    )
+    # Pad with one long record so the next one straddles the first chunk boundary.
+    filler_prefix = _record(f"{root}/big.txt", 1, "")[:-1]
+    filler_text = "y" * (CHUNK_SIZE - 20 - len(head) - len(filler_prefix) - 1)
+    split_text = "한글: 청크 경계를 넘는 줄"
+    output = head + _record(f"{root}/big.txt", 1, filler_text)
+    split_start = len(output)
+    output += _record(f"{root}/split.txt", 7, split_text, newline="\r\n")
+    output += _record(f"{root}/src/app.py", 40, "last line without newline", newline="")
+
+    expected = {
+        "/src/app.py": [(12, "url = 'http://host:8080'  # a:b"), (40, "last line without newline")],
+        "/win.txt": [(3, "crlf line")],
+        "/big.txt": [(1, filler_text)],
+        "/split.txt": [(7, split_text)],
+    }
+    return output, expected, split_start
+
+
+@pytest.fixture
+def backend(tmp_path: Path) -> FilesystemBackend:
+    return FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+
+
+def _patch_ripgrep(monkeypatch: pytest.MonkeyPatch, output: bytes) -> None:
+    def run(cmd: list[str], **kwargs: Any) -> subprocess.CompletedProcess[bytes]:
+        return subprocess.CompletedProcess(cmd, 0, stdout=output, stderr=b"")
+
+    async def create_subprocess_exec(*cmd: str, **kwargs: Any) -> RecordedProcess:
+        return RecordedProcess(output)
+
+    monkeypatch.setattr(subprocess, "run", run)
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", create_subprocess_exec)
+
+
+def test_recorded_ripgrep_output_parses_the_same_sync_and_async(
+    backend: FilesystemBackend, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    output, expected, split_start = _recorded_output(backend.cwd)
+    assert split_start < CHUNK_SIZE < output.index(b"\n", split_start)
+    _patch_ripgrep(monkeypatch, output)
+
+    sync = backend._ripgrep_search("line", backend.cwd, None)
+    result = asyncio.run(backend._aripgrep_search("line", backend.cwd, None))
+
+    assert sync == expected
+    assert result == expected
+
+
+def test_collect_ripgrep_output_skips_malformed_records(backend: FilesystemBackend) -> None:
+    root = backend.cwd
+    results: dict[str, list[tuple[int, str]]] = {}
+    virtual_paths: dict[str, str | None] = {}
+    output = "\n".join(
+        [
+            "",
+            "no separator at all",
+            f"{root}/a.txt\0not-a-number:text",
+            f"{root}/a.txt\0missing colon",
+            f"{root}/a.txt\x002:kept: yes",
+            "/outside.txt\x001:skipped",
+        ]
+    )
+
+    backend._collect_ripgrep_output(output, results, virtual_paths)
+
+    assert results == {"/a.txt": [(2, "kept: yes")]}
+    assert virtual_paths == {f"{root}/a.txt": "/a.txt", "/outside.txt": None}
+
+
+def test_out_of_root_paths_are_reported_without_virtual_mode(tmp_path: Path) -> None:
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=False)
+    results: dict[str, list[tuple[int, str]]] = {}
+
+    backend._collect_ripgrep_output("/elsewhere/secret.txt\x001:text\r", results, {})
+
+    assert results == {"/elsewhere/secret.txt": [(1, "text")]}
+
+
+def test_python_search_honours_grep_max_count(tmp_path: Path) -> None:
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True, grep_max_count=2)
+    (tmp_path / "many.txt").write_text("".join(f"hit {i}\n" for i in range(5)))
+    (tmp_path / "one.txt").write_text("miss\nhit once\n")
+
+    results = backend._python_search(re.escape("hit"), tmp_path, None)
+
+    assert results == {"/many.txt": [(1, "hit 0"), (2, "hit 1")], "/one.txt": [(2, "hit once")]}
+    assert backend._ripgrep_command("hit", tmp_path, None)[-5:-3] == ["--max-count", "2"]
+
+
+@pytest.mark.skipif(shutil.which("rg") is None, reason="ripgrep (rg) is not installed")
+@pytest.mark.parametrize("grep_max_count", [None, 2])
+def test_grep_and_agrep_agree_with_ripgrep(tmp_path: Path, grep_max_count: int | None) -> None:
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True, grep_max_count=grep_max_count)
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("needle = 'a:b'\nother\nneedle: 2\nneedle 3\n")
+    (tmp_path / "win.txt").write_bytes(b"needle\r\nskip\r\nneedle again\r\n")
+    (tmp_path / "wide.txt").write_text("x" * 200_000 + " needle\n")
+
+    def matches(result: Any) -> list[tuple[str, int, str]]:
+        assert result.error is None
+        return sorted((m["path"], m["line"], m["text"]) for m in result.matches)
+
+    for glob in (None, "**/*.py"):
+        sync = matches(backend.grep("needle", glob=glob))
+        assert matches(asyncio.run(backend.agrep("needle", glob=glob))) == sync
+        fallback = backend._python_search(re.escape("needle"), backend.cwd, glob)
+        assert matches(_grep_result(fallback)) == sync
@@ -0,0 +1,125 @@
+"""Tests for the local `deepagents.backends.instrumentation` fork.
+
+Run with the snapshot in `deepagents_backends/` installed as
+`deepagents.backends` (see `deepagents_backends/README.md`):
+
+    ```bash
+    pytest tests/
+    ```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from pathlib import Path
+
+import pytest
+
+from deepagents.backends import CompositeBackend, FilesystemBackend, HistogramObserver, instrument
+from deepagents.backends.instrumentation import DEFAULT_LATENCY_BUCKETS, InstrumentedBackend
+from deepagents.backends.protocol import BackendEvent, BackendObserver
+
+
+class RecordingObserver(BackendObserver):
+    """Keeps every event it receives."""
+
+    def __init__(self) -> None:
+        self.events: list[BackendEvent] = []
+
+    def on_event(self, event: BackendEvent) -> None:
+        self.events.append(event)
+
+
+@pytest.fixture
+def backend(tmp_path: Path) -> FilesystemBackend:
+    return FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+
+
+def test_read_truncation_compares_against_total_lines(backend: FilesystemBackend) -> None:
+    recorder = RecordingObserver()
+    instrumented = instrument(backend, [recorder])
+    backend.write("/exact.txt", "a\nb\nc\n")
+    backend.write("/longer.txt", "a\nb\nc\nd\n")
+
+    exact = instrumented.read("/exact.txt", limit=3)
+    longer = instrumented.read("/longer.txt", limit=3)
+
+    # Callers get exactly what the unwrapped backend returns for `limit`.
+    assert exact == backend.read("/exact.txt", limit=3)
+    assert longer == backend.read("/longer.txt", limit=3)
+    assert [(e.truncated, e.result_count) for e in recorder.events] == [(False, 3), (True, 3)]
+
+
+def test_events_record_bytes_errors_and_async(backend: FilesystemBackend) -> None:
+    recorder = RecordingObserver()
+    instrumented = backend.with_observers(recorder)
+    assert isinstance(instrumented, InstrumentedBackend)
+
+    instrumented.write("/notes.md", "hello")
+    missing = instrumented.read("/missing.md")
+    asyncio.run(instrumented.aread("/notes.md"))
+
+    write, read_missing, aread = recorder.events
+    assert (write.operation, write.backend, write.path, write.bytes_in) == ("write", "FilesystemBackend", "/notes.md", 5)
+    assert read_missing.error == missing.error is not None
+    assert (aread.operation, aread.is_async, aread.bytes_out) == ("read", True, 5)
+    assert all(event.duration_s >= 0 for event in recorder.events)
+
+
+def test_observer_failure_does_not_reach_caller(backend: FilesystemBackend) -> None:
+    class Broken(BackendObserver):
+        def on_event(self, event: BackendEvent) -> None:
+            raise RuntimeError("boom")
+
+    recorder = RecordingObserver()
+    instrumented = instrument(backend, [Broken(), recorder])
+    assert instrumented.write("/a.txt", "x").error is None
+    assert len(recorder.events) == 1
+
+
+def test_composite_labels_events_with_route(tmp_path: Path) -> None:
+    (tmp_path / "default").mkdir()
+    (tmp_path / "memories").mkdir()
+    recorder = RecordingObserver()
+    composite = CompositeBackend(
+        default=FilesystemBackend(root_dir=tmp_path / "default", virtual_mode=True),
+        routes={"/mem/": FilesystemBackend(root_dir=tmp_path / "memories", virtual_mode=True)},
+        observers=[recorder],
+    )
+
+    composite.write("/readme.md", "default")
+    composite.write("/mem/profile.md", "routed")
+
+    assert [(e.operation, e.route) for e in recorder.events] == [("write", None), ("write", "/mem/")]
+    assert (tmp_path / "memories" / "profile.md").read_text() == "routed"
+
+
+def test_instrument_merges_observers_instead_of_nesting(backend: FilesystemBackend) -> None:
+    first, second = RecordingObserver(), RecordingObserver()
+    twice = instrument(instrument(backend, [first], route="/r/"), [second])
+
+    assert twice.wrapped is backend
+    assert twice.route == "/r/"
+    twice.ls("/")
+    assert len(first.events) == len(second.events) == 1
+
+
+def test_histogram_observer_buckets_and_quantiles() -> None:
+    histogram = HistogramObserver()
+    for duration in [0.001] * 90 + [0.1] * 10:
+        histogram.on_event(BackendEvent(operation="read", backend="B", duration_s=duration, bytes_out=10))
+    histogram.on_event(BackendEvent(operation="read", backend="B", route="/mem/", duration_s=0.5, error="x"))
+
+    default, routed = histogram.snapshot()
+    assert (default["route"], default["count"], default["errors"], default["bytes_out"]) == (None, 100, 0, 1000)
+    assert math.isclose(default["mean_s"], (90 * 0.001 + 10 * 0.1) / 100)
+    # Quantiles come from bucket upper bounds, clamped to the observed maximum.
+    p50_bound = next(b for b in DEFAULT_LATENCY_BUCKETS if b >= 0.001)
+    assert default["p50_s"] == p50_bound
+    assert default["p99_s"] == 0.1
+    assert sum(n for _, n in default["buckets"]) == 100
+    assert (routed["route"], routed["errors"], routed["p95_s"]) == ("/mem/", 1, 0.5)
+
+    histogram.reset()
+    assert histogram.snapshot() == []
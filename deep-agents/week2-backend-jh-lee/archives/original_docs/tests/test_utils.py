@@ -0,0 +1,56 @@
+"""Tests for the local changes to `deepagents.backends.utils`.
+
+Run with the snapshot in `deepagents_backends/` installed as
+`deepagents.backends` (see `deepagents_backends/README.md`):
+
+    ```bash
+    pytest tests/
+    ```
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from deepagents.backends.utils import (
+    MAX_LINE_LENGTH,
+    TOOL_RESULT_TOKEN_LIMIT,
+    TRUNCATION_GUIDANCE,
+    format_content_with_line_numbers,
+    truncate_if_too_long,
+)
+
+
+def _content(n_lines: int, *, long_every: int | None = None) -> str:
+    lines = []
+    for i in range(n_lines):
+        if long_every and i % long_every == 0:
+            lines.append("x" * (MAX_LINE_LENGTH * 2 + 17))
+        else:
+            lines.append(f"    value_{i} = compute(item_{i % 97})")
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize("long_every", [None, 100, 1])
+@pytest.mark.parametrize("n_lines", [10, 2000, 20000])
+def test_budgeted_format_matches_format_then_truncate(n_lines: int, long_every: int | None) -> None:
+    content = _content(n_lines, long_every=long_every)
+
+    budgeted = format_content_with_line_numbers(content, max_chars=TOOL_RESULT_TOKEN_LIMIT * 4)
+
+    assert budgeted == truncate_if_too_long(format_content_with_line_numbers(content))
+
+
+@pytest.mark.parametrize("start_line", [1, 999_990])
+@pytest.mark.parametrize("long_every", [None, 7])
+def test_budgeted_format_cuts_at_any_budget(start_line: int, long_every: int | None) -> None:
+    content = _content(40, long_every=long_every)
+    full = format_content_with_line_numbers(content, start_line)
+
+    # Every cut just before, at and after a line break, plus a sweep in between.
+    breaks = [i for i, char in enumerate(full) if char == "\n"]
+    budgets = {*range(0, len(full) + 2, 37), *(i + d for i in breaks for d in (-1, 0, 1))}
+    for max_chars in sorted(budgets):
+        expected = full if len(full) <= max_chars else full[:max_chars] + "\n" + TRUNCATION_GUIDANCE
+        assert format_content_with_line_numbers(content, start_line, max_chars=max_chars) == expected
+    assert format_content_with_line_numbers(content, start_line, max_chars=len(full)) == full
@@ -3,7 +3,8 @@ Access Control Module
 사용자 권한 관리 모듈
 """
 
-from typing import Dict, List, Set
+from pathlib import PurePosixPath
+from typing import Dict, FrozenSet, List, Optional, Set
 from langchain_core.documents import Document
 
 
@@ -37,6 +38,49 @@ class AccessControl:
             "guest": "기본 문서만 접근 가능",
         }
 
+        # 권한 변경 버전 (검색 단계의 사용자별 비트셋 갱신 기준)
+        self.version = 0
+
+    @staticmethod
+    def acl_tag(metadata: dict) -> str:
+        """
+        청크의 ACL 태그 (권한 단위인 문서 이름)
+
+        인덱싱 시 저장된 `acl_tag` 메타데이터를 사용하고, 없으면
+        `source` 경로의 파일 이름을 사용합니다.
+
+        Args:
+            metadata: 문서 메타데이터
+
+        Returns:
+            str: 문서 이름 (예: "langchain_overview.md")
+        """
+        tag = metadata.get("acl_tag")
+        if tag:
+            return tag
+        source = metadata.get("source", "")
+        return PurePosixPath(source.replace("\\", "/")).name if source else ""
+
+    def allowed_tags(self, user: str) -> Optional[FrozenSet[str]]:
+        """
+        사용자가 접근 가능한 ACL 태그 집합
+
+        Args:
+            user: 사용자 이름
+
+        Returns:
+            Optional[FrozenSet[str]]: 태그 집합 (None이면 모든 문서 접근 가능)
+        """
+        if user not in self.permissions:
+            return frozenset()
+        if user == "admin" and "*" in self.permissions[user]:
+            return None
+        return frozenset(self.permissions[user])
+
+    def _bump_version(self):
+        """권한 변경 시 버전 증가"""
+        self.version += 1
+
     def can_access(self, user: str, document: str) -> bool:
         """
         사용자가 특정 문서에 접근할 수 있는지 확인
@@ -73,15 +117,8 @@ class AccessControl:
 
         filtered = []
         for doc in documents:
-            # 문서 이름 추출
-            source = doc.metadata.get("source", "")
-            if "/" in source:
-                doc_name = source.split("/")[-1]
-            else:
-                doc_name = source
-
             # 권한 확인
-            if self.can_access(user, doc_name):
+            if self.can_access(user, self.acl_tag(doc.metadata)):
                 filtered.append(doc)
 
         return filtered
@@ -113,6 +150,7 @@ class AccessControl:
             self.permissions[user] = set()
 
         self.permissions[user].add(document)
+        self._bump_version()
         print(f"✅ {user}에게 {document} 접근 권한이 추가되었습니다.")
 
     def remove_permission(self, user: str, document: str):
@@ -125,6 +163,7 @@ class AccessControl:
         """
         if user in self.permissions and document in self.permissions[user]:
             self.permissions[user].remove(document)
+            self._bump_version()
             print(f"✅ {user}의 {document} 접근 권한이 제거되었습니다.")
         else:
             print(f"⚠️  {user}는 {document}에 대한 권한이 없습니다.")
@@ -149,6 +188,7 @@ class AccessControl:
         else:
             self.permissions[username] = self.permissions["guest"].copy()
 
+        self._bump_version()
         print(f"✅ 사용자 {username} ({role}) 생성 완료")
 
     def get_user_info(self, username: str) -> dict:
@@ -264,6 +304,7 @@ class RoleBasedAccessControl(AccessControl):
         # 기본 문서 권한도 업데이트
         if role in self.permissions:
             self.permissions[user] = self.permissions[role].copy()
+        self._bump_version()
 
     def get_user_permissions(self, user: str) -> dict:
         """
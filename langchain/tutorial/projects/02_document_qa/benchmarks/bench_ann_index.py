@@ -0,0 +1,139 @@
+"""
+ANN Index Benchmark
+flat 인덱스 대비 IVF / HNSW / PQ 인덱스의 recall-지연 시간 비교
+
+임베딩과 비슷하게 군집된 합성 벡터로 각 인덱스를 만들고, flat 인덱스의
+정확한 top-k를 기준으로 recall@k, 쿼리당 지연 시간(p50/p95, 단건 검색),
+생성 시간, 메모리 사용량을 측정합니다. IVF/PQ는 nprobe, HNSW는 efSearch를
+바꿔가며 recall-지연 시간 곡선을 출력합니다.
+
+사용법:
+    python benchmarks/bench_ann_index.py                          # 200k x 256
+    python benchmarks/bench_ann_index.py --count 1000000 --dim 256 --output ann.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import replace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vector_index import IndexConfig, build_index, configure_search, index_memory_bytes  # noqa: E402
+
+SWEEPS = {
+    "flat": ("-", [None]),
+    "ivf": ("nprobe", [1, 4, 16, 64]),
+    "hnsw": ("ef_search", [16, 64, 256]),
+    "pq": ("nprobe", [4, 16, 64]),
+}
+
+
+def make_dataset(count: int, dim: int, queries: int, seed: int = 0):
+    """
+    군집 구조를 가진 합성 데이터셋 생성 (정규화된 벡터)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (데이터 벡터, 쿼리 벡터)
+    """
+    rng = np.random.default_rng(seed)
+    clusters = max(16, count // 1000)
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    labels = rng.integers(0, clusters, count + queries)
+    data = centers[labels] + 0.35 * rng.standard_normal((count + queries, dim), dtype=np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    return np.ascontiguousarray(data[:count]), np.ascontiguousarray(data[count:])
+
+
+def measure_queries(index, queries: np.ndarray, k: int):
+    """단건 검색을 반복하여 결과와 쿼리별 지연 시간(ms) 반환"""
+    results = np.empty((len(queries), k), dtype=np.int64)
+    latencies = np.empty(len(queries))
+    for i in range(len(queries)):
+        started = time.perf_counter()
+        _, positions = index.search(queries[i : i + 1], k)
+        latencies[i] = (time.perf_counter() - started) * 1000
+        results[i] = positions[0]
+    return results, latencies
+
+
+def recall_at_k(results: np.ndarray, truth: np.ndarray) -> float:
+    """정답 top-k 중 찾은 비율의 평균"""
+    k = truth.shape[1]
+    return float(np.mean([len(set(r) & set(t)) / k for r, t in zip(results, truth)]))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ANN 인덱스 recall-지연 시간 벤치마크")
+    parser.add_argument("--count", type=int, default=200_000, help="벡터 수")
+    parser.add_argument("--dim", type=int, default=256, help="벡터 차원")
+    parser.add_argument("--queries", type=int, default=500, help="쿼리 수")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k")
+    parser.add_argument(
+        "--types", type=str, default="flat,ivf,hnsw,pq", help="측정할 인덱스 타입 (쉼표 구분)"
+    )
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    print(f"🔨 합성 데이터셋 생성 중: {args.count:,}개 x {args.dim}차원, 쿼리 {args.queries}개")
+    data, queries = make_dataset(args.count, args.dim, args.queries)
+    base_config = IndexConfig(train_threshold=0)
+
+    truth_index = build_index(data, base_config)
+    truth, _ = measure_queries(truth_index, queries, args.k)
+    del truth_index
+
+    rows = []
+    for index_type in args.types.split(","):
+        param, values = SWEEPS[index_type]
+        config = replace(base_config, index_type=index_type)
+
+        started = time.perf_counter()
+        index = build_index(data, config)
+        build_s = time.perf_counter() - started
+        memory_mb = index_memory_bytes(index) / 2**20
+
+        for value in values:
+            if value is not None:
+                configure_search(index, replace(config, **{param: value}))
+            results, latencies = measure_queries(index, queries, args.k)
+            rows.append(
+                {
+                    "index_type": index_type,
+                    "param": f"{param}={value}" if value is not None else "-",
+                    "recall": recall_at_k(results, truth),
+                    "p50_ms": float(np.percentile(latencies, 50)),
+                    "p95_ms": float(np.percentile(latencies, 95)),
+                    "build_s": build_s,
+                    "memory_mb": memory_mb,
+                }
+            )
+        del index
+
+    print(
+        f"\n{'타입':<6}{'파라미터':<16}{'recall@' + str(args.k):>10}{'p50(ms)':>10}"
+        f"{'p95(ms)':>10}{'생성(s)':>10}{'메모리(MB)':>12}"
+    )
+    for row in rows:
+        print(
+            f"{row['index_type']:<6}{row['param']:<16}{row['recall']:>10.3f}{row['p50_ms']:>10.3f}"
+            f"{row['p95_ms']:>10.3f}{row['build_s']:>10.1f}{row['memory_mb']:>12.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"count": args.count, "dim": args.dim, "queries": args.queries, "k": args.k, "rows": rows},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
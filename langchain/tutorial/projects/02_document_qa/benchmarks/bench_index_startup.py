@@ -0,0 +1,206 @@
+"""
+Index Startup Benchmark
+FAISS(pickle) 포맷과 네이티브(메모리 맵) 포맷의 콜드 스타트 비교
+
+같은 합성 벡터/문서로 두 포맷의 인덱스를 만든 뒤, 각각 새 프로세스에서
+로드 시간, 첫 검색 시간, 최대 RSS를 측정합니다. 매 실행마다 새 프로세스를
+띄우므로 인터프리터/모듈 캐시의 영향이 없습니다 (OS 페이지 캐시는 공유).
+
+사용법:
+    python benchmarks/bench_index_startup.py                      # 1M x 256
+    python benchmarks/bench_index_startup.py --count 100000 --dim 128 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from native_index import NativeVectorStore  # noqa: E402
+
+
+class RandomEmbeddings(Embeddings):
+    """쿼리용 고정 난수 벡터를 반환하는 임베딩 (API 호출 없음)"""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+        return rng.standard_normal(self.dim, dtype=np.float32).tolist()
+
+
+def build_indexes(root: str, count: int, dim: int) -> dict:
+    """
+    합성 데이터로 FAISS/네이티브 인덱스 생성
+
+    Args:
+        root: 인덱스를 만들 디렉토리
+        count: 벡터 수
+        dim: 벡터 차원
+
+    Returns:
+        dict: 포맷별 경로와 생성 시간
+    """
+    import faiss
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.documents import Document
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((count, dim), dtype=np.float32)
+    ids = [f"doc{i // 20:06d}.md#{i:08x}#{i % 20}" for i in range(count)]
+    texts = [f"합성 청크 {i}: LangChain 문서 내용입니다. " * 4 for i in range(count)]
+    metadatas = [
+        {"source": f"/docs/doc{i // 20:06d}.md", "acl_tag": f"doc{i // 20:06d}.md", "length": len(texts[i])}
+        for i in range(count)
+    ]
+
+    paths = {"faiss": os.path.join(root, "faiss"), "native": os.path.join(root, "native")}
+    timings = {}
+
+    started = time.perf_counter()
+    index = faiss.IndexFlatL2(dim)
+    index.add(vectors)
+    store = FAISS(
+        embedding_function=RandomEmbeddings(dim),
+        index=index,
+        docstore=InMemoryDocstore(
+            {
+                doc_id: Document(id=doc_id, page_content=text, metadata=metadata)
+                for doc_id, text, metadata in zip(ids, texts, metadatas)
+            }
+        ),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+    store.save_local(paths["faiss"])
+    timings["faiss"] = time.perf_counter() - started
+    del store, index
+
+    started = time.perf_counter()
+    NativeVectorStore.write(paths["native"], vectors, texts, metadatas, ids)
+    timings["native"] = time.perf_counter() - started
+
+    return {"paths": paths, "build_s": timings}
+
+
+def peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS (MB)"""
+    # ru_maxrss는 fork 시 부모 값을 물려받으므로 /proc의 VmHWM을 우선 사용
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_worker(index_format: str, path: str, dim: int) -> dict:
+    """단일 프로세스에서 인덱스 로드 + 첫 검색 측정"""
+    embeddings = RandomEmbeddings(dim)
+    query = embeddings.embed_query("LangChain")
+
+    started = time.perf_counter()
+    if index_format == "native":
+        store = NativeVectorStore.load(path, embeddings)
+    else:
+        from langchain_community.vectorstores import FAISS
+
+        store = FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+    load_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = store.similarity_search_with_score_by_vector(query, k=5)
+    first_query_s = time.perf_counter() - started
+
+    return {
+        "load_s": load_s,
+        "first_query_s": first_query_s,
+        "top_ids": [doc.id for doc, _ in results],
+        "max_rss_mb": peak_rss_mb(),
+    }
+
+
+def measure(index_format: str, path: str, dim: int, repeat: int) -> dict:
+    """새 프로세스를 `repeat`번 띄워 측정하고 중앙값 반환"""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, __file__, "--worker", index_format, "--path", path, "--dim", str(dim)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {
+        "load_s": statistics.median(run["load_s"] for run in runs),
+        "first_query_s": statistics.median(run["first_query_s"] for run in runs),
+        "max_rss_mb": statistics.median(run["max_rss_mb"] for run in runs),
+        "top_ids": runs[0]["top_ids"],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="인덱스 콜드 스타트 벤치마크")
+    parser.add_argument("--count", type=int, default=1_000_000, help="벡터 수")
+    parser.add_argument("--dim", type=int, default=256, help="벡터 차원")
+    parser.add_argument("--repeat", type=int, default=3, help="포맷별 측정 횟수")
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--worker", choices=["faiss", "native"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.path, args.dim)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as root:
+        print(f"🔨 합성 인덱스 생성 중: {args.count:,}개 x {args.dim}차원")
+        built = build_indexes(root, args.count, args.dim)
+
+        report = {"count": args.count, "dim": args.dim, "repeat": args.repeat, "formats": {}}
+        for index_format, path in built["paths"].items():
+            result = measure(index_format, path, args.dim, args.repeat)
+            result["build_s"] = built["build_s"][index_format]
+            result["disk_mb"] = sum(
+                os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)
+            ) / 2**20
+            report["formats"][index_format] = result
+
+    faiss_result, native_result = report["formats"]["faiss"], report["formats"]["native"]
+    report["same_results"] = faiss_result["top_ids"] == native_result["top_ids"]
+
+    print(f"\n{'포맷':<8}{'로드(s)':>10}{'첫 검색(s)':>12}{'RSS(MB)':>10}{'디스크(MB)':>12}{'생성(s)':>10}")
+    for index_format, result in report["formats"].items():
+        print(
+            f"{index_format:<8}{result['load_s']:>10.3f}{result['first_query_s']:>12.3f}"
+            f"{result['max_rss_mb']:>10.0f}{result['disk_mb']:>12.0f}{result['build_s']:>10.1f}"
+        )
+    print(f"\n⚡ 로드 속도 향상: {faiss_result['load_s'] / max(native_result['load_s'], 1e-9):.0f}배")
+    print(f"{'✅' if report['same_results'] else '❌'} 검색 결과 일치: {report['same_results']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0 if report["same_results"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Quantization Benchmark
+float32 대비 fp16 / int8 스칼라 양자화와 IVF-PQ 인덱스의 메모리-recall-지연 시간 비교
+
+`bench_ann_index.py`와 같은 합성 데이터셋으로 각 압축 방식의 인덱스를
+만들고, 재순위 없이(rerank_factor=1) 검색한 결과와 `k * rerank_factor`개
+후보를 원본 float 벡터로 다시 정렬한 결과의 recall@k, 쿼리당 지연 시간
+(p50/p95, 재순위 포함), 인덱스 메모리를 측정합니다. 재순위용 원본 벡터는
+메모리 맵 파일에서 후보 행만 읽는다고 가정하여 인덱스 메모리에 포함하지
+않습니다.
+
+사용법:
+    python benchmarks/bench_quantization.py                           # 200k x 256
+    python benchmarks/bench_quantization.py --count 1000000 --dim 768 --output quant.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_ann_index import make_dataset, measure_queries, recall_at_k  # noqa: E402
+from vector_index import IndexConfig, build_index, exact_rerank, index_memory_bytes  # noqa: E402
+
+VARIANTS = {
+    "float32": {"index_type": "flat", "quantization": "none"},
+    "fp16": {"index_type": "flat", "quantization": "fp16"},
+    "int8": {"index_type": "flat", "quantization": "int8"},
+    "ivf-int8": {"index_type": "ivf", "quantization": "int8"},
+    "pq": {"index_type": "pq", "quantization": "none"},
+}
+
+
+def measure_reranked(index, data: np.ndarray, queries: np.ndarray, k: int, rerank_factor: int):
+    """후보 `k * rerank_factor`개를 검색 후 원본 벡터로 다시 정렬하며 지연 시간(ms) 측정"""
+    results = np.full((len(queries), k), -1, dtype=np.int64)
+    latencies = np.empty(len(queries))
+    for i in range(len(queries)):
+        started = time.perf_counter()
+        _, candidates = index.search(queries[i : i + 1], k * rerank_factor)
+        candidates = candidates[0][candidates[0] >= 0]
+        _, positions = exact_rerank(data, queries[i], candidates, k)
+        latencies[i] = (time.perf_counter() - started) * 1000
+        results[i, : len(positions)] = positions
+    return results, latencies
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="벡터 양자화 메모리-recall-지연 시간 벤치마크")
+    parser.add_argument("--count", type=int, default=200_000, help="벡터 수")
+    parser.add_argument("--dim", type=int, default=256, help="벡터 차원")
+    parser.add_argument("--queries", type=int, default=500, help="쿼리 수")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k")
+    parser.add_argument("--rerank-factor", type=int, default=4, help="재순위 후보 배수")
+    parser.add_argument(
+        "--variants", type=str, default=",".join(VARIANTS), help="측정할 압축 방식 (쉼표 구분)"
+    )
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    print(f"🔨 합성 데이터셋 생성 중: {args.count:,}개 x {args.dim}차원, 쿼리 {args.queries}개")
+    data, queries = make_dataset(args.count, args.dim, args.queries)
+
+    truth_index = build_index(data, IndexConfig(train_threshold=0))
+    truth, _ = measure_queries(truth_index, queries, args.k)
+    del truth_index
+
+    rows = []
+    for name in args.variants.split(","):
+        config = IndexConfig(train_threshold=0, nprobe=64, **VARIANTS[name])
+
+        started = time.perf_counter()
+        index = build_index(data, config)
+        build_s = time.perf_counter() - started
+        memory_mb = index_memory_bytes(index) / 2**20
+
+        factors = [1, args.rerank_factor] if config.compressed else [1]
+        for factor in factors:
+            if factor == 1:
+                results, latencies = measure_queries(index, queries, args.k)
+            else:
+                results, latencies = measure_reranked(index, data, queries, args.k, factor)
+            rows.append(
+                {
+                    "variant": name,
+                    "rerank_factor": factor,
+                    "recall": recall_at_k(results, truth),
+                    "p50_ms": float(np.percentile(latencies, 50)),
+                    "p95_ms": float(np.percentile(latencies, 95)),
+                    "build_s": build_s,
+                    "memory_mb": memory_mb,
+                }
+            )
+        del index
+
+    print(
+        f"\n{'방식':<10}{'재순위':>6}{'recall@' + str(args.k):>10}{'p50(ms)':>10}"
+        f"{'p95(ms)':>10}{'생성(s)':>10}{'메모리(MB)':>12}"
+    )
+    for row in rows:
+        rerank = f"x{row['rerank_factor']}" if row["rerank_factor"] > 1 else "-"
+        print(
+            f"{row['variant']:<10}{rerank:>6}{row['recall']:>10.3f}{row['p50_ms']:>10.3f}"
+            f"{row['p95_ms']:>10.3f}{row['build_s']:>10.1f}{row['memory_mb']:>12.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "count": args.count,
+                    "dim": args.dim,
+                    "queries": args.queries,
+                    "k": args.k,
+                    "rows": rows,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""
+Retrieval Benchmark
+청크 크기/중첩, k, 검색 방식(벡터/하이브리드), 하이브리드 가중치, 인덱스 타입에 따른
+검색 품질과 지연 시간 비교
+
+질문 → 관련 문서(source) 레이블 세트로 파라미터 조합마다 파이프라인을 구축하고
+`RAGPipeline.search_similar_documents()` / `HybridRAGPipeline.hybrid_search()`의
+recall@k(관련 문서 중 top-k 청크의 출처로 찾은 비율), MRR, 쿼리당 지연 시간
+(p50/p95, 쿼리 임베딩 포함), 인덱스 메모리를 측정합니다.
+
+임베딩은 API 호출 없이 토큰 해싱으로 만든 결정적 벡터(`HashingEmbeddings`)를
+사용하므로 결과를 그대로 재현할 수 있습니다. 실제 임베딩 모델의 품질이 아니라
+청킹/검색 설정 간의 상대 비교용입니다.
+
+레이블 파일 (JSON 리스트 또는 JSONL):
+    {"question": "LangChain의 체인이란?", "relevant_sources": ["langchain_overview.md"]}
+
+관련 문서는 `--docs` 기준 상대 경로(또는 파일명)로 적습니다. `--docs`를 지정하지
+않으면 내장 합성 코퍼스와 레이블을 사용합니다.
+
+사용법:
+    python benchmarks/bench_retrieval.py                                   # 내장 코퍼스
+    python benchmarks/bench_retrieval.py --docs ./docs --qrels qrels.jsonl \\
+        --chunk-sizes 500,1000 --chunk-overlaps 100,200 --k 3,5 \\
+        --modes vector,hybrid --fusion-weights 0.3:0.7,0.5:0.5 --index-types flat,hnsw \\
+        --output retrieval.json --markdown retrieval.md
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import zlib
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bm25_index import tokenize  # noqa: E402
+from document_loader import DocumentLoader  # noqa: E402
+from rag_pipeline import HybridRAGPipeline  # noqa: E402
+
+COLUMNS = [
+    ("chunk_size", "청크"),
+    ("chunk_overlap", "중첩"),
+    ("index_type", "인덱스"),
+    ("mode", "검색"),
+    ("fusion_weights", "가중치(BM25:벡터)"),
+    ("k", "k"),
+    ("recall", "recall@k"),
+    ("mrr", "MRR"),
+    ("p50_ms", "p50(ms)"),
+    ("p95_ms", "p95(ms)"),
+    ("index_memory_mb", "메모리(MB)"),
+]
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    토큰 해싱 기반 결정적 임베딩 (오프라인 벤치마크용)
+
+    `bm25_index.tokenize()`로 나눈 토큰을 crc32로 `dim`차원에 부호와 함께
+    누적하고 L2 정규화합니다. 프로세스가 달라도 같은 텍스트는 같은 벡터가 됩니다.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in tokenize(text):
+            code = zlib.crc32(token.encode("utf-8"))
+            vector[code % self.dim] += 1.0 if code & 0x80000000 else -1.0
+        norm = float(np.linalg.norm(vector))
+        return (vector / norm if norm else vector).tolist()
+
+
+def synthetic_corpus(topics: int = 40, paragraphs: int = 12, seed: int = 0) -> Tuple[List[Document], List[dict]]:
+    """
+    주제별 어휘를 가진 합성 Markdown 문서와 레이블 생성
+
+    각 문서는 고유 어휘와 모든 문서가 공유하는 어휘를 섞은 문단으로 이루어지고,
+    질문은 한 문서의 고유 어휘 일부와 공유 어휘로 만듭니다.
+
+    Returns:
+        Tuple[List[Document], List[dict]]: (문서, 레이블)
+    """
+    rng = np.random.default_rng(seed)
+
+    def words(count: int) -> List[str]:
+        # 임의의 한글 3음절 단어 (토큰화 시 하나의 단어 + bigram)
+        syllables = rng.integers(0xAC00, 0xD7A4, (count, 3))
+        return ["".join(chr(c) for c in row) for row in syllables]
+
+    shared = words(200)
+    documents, qrels = [], []
+    for topic in range(topics):
+        source = f"topic_{topic:03d}.md"
+        vocabulary = words(30)
+        lines = [f"# 주제 {topic}\n"]
+        for _ in range(paragraphs):
+            sentence = list(rng.choice(vocabulary, 6)) + list(rng.choice(shared, 14))
+            rng.shuffle(sentence)
+            lines.append(" ".join(sentence) + ".\n")
+        documents.append(Document(page_content="\n".join(lines), metadata={"source": source}))
+
+        for _ in range(3):
+            question = list(rng.choice(vocabulary, 2)) + list(rng.choice(shared, 3))
+            rng.shuffle(question)
+            qrels.append({"question": " ".join(question) + "?", "relevant_sources": [source]})
+    return documents, qrels
+
+
+def load_qrels(path: str) -> List[dict]:
+    """JSON 리스트 또는 JSONL 레이블 파일 로드"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        qrels = json.loads(text)
+    else:
+        qrels = [json.loads(line) for line in text.splitlines() if line.strip()]
+    for item in qrels:
+        if "question" not in item or not item.get("relevant_sources"):
+            raise ValueError(f"question과 relevant_sources가 필요합니다: {item}")
+    return qrels
+
+
+def source_key(source: str, docs_path: Optional[str]) -> str:
+    """출처를 비교용 키(문서 디렉토리 기준 상대 경로)로 변환"""
+    if docs_path and os.path.isabs(source):
+        source = os.path.relpath(source, docs_path)
+    elif docs_path and source.startswith(docs_path):
+        source = os.path.relpath(source, docs_path)
+    return Path(source).as_posix()
+
+
+def matches(source: str, label: str) -> bool:
+    """레이블이 파일명만 적힌 경우 파일명으로 비교"""
+    return source == label or ("/" not in label and Path(source).name == label)
+
+
+def chunk_documents(
+    chunk_size: int, chunk_overlap: int, docs_path: Optional[str], documents: Optional[List[Document]]
+) -> List[Document]:
+    """문서 로더 설정으로 청크 분할 (내장 코퍼스면 메모리의 문서를 분할)"""
+    loader = DocumentLoader(docs_path or ".", chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    with contextlib.redirect_stdout(io.StringIO()):
+        chunks = loader.load_documents() if documents is None else loader.text_splitter.split_documents(documents)
+    for i, chunk in enumerate(chunks):
+        chunk.id = f"chunk-{i}"
+    return chunks
+
+
+def evaluate(
+    pipeline: HybridRAGPipeline, qrels: List[dict], k: int, mode: str, docs_path: Optional[str]
+) -> Dict[str, float]:
+    """
+    레이블 세트로 recall@k, MRR, 지연 시간 측정
+
+    Returns:
+        Dict[str, float]: recall, mrr, p50_ms, p95_ms
+    """
+
+    def retrieve(question: str) -> List[Document]:
+        if mode == "hybrid":
+            return [doc for doc, _ in pipeline.hybrid_search(question, k=k, fetch_k=max(20, k))]
+        return [doc for doc, _ in pipeline.search_similar_documents(question, k=k)]
+
+    retrieve(qrels[0]["question"])  # 워밍업
+
+    recalls, reciprocal_ranks, latencies = [], [], []
+    for item in qrels:
+        started = time.perf_counter()
+        documents = retrieve(item["question"])
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        sources = [source_key(doc.metadata.get("source", ""), docs_path) for doc in documents]
+        labels = item["relevant_sources"]
+        found = {label for label in labels if any(matches(source, label) for source in sources)}
+        recalls.append(len(found) / len(labels))
+        rank = next(
+            (i + 1 for i, source in enumerate(sources) if any(matches(source, label) for label in labels)),
+            None,
+        )
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+    return {
+        "recall": float(np.mean(recalls)),
+        "mrr": float(np.mean(reciprocal_ranks)),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def to_markdown(rows: List[dict]) -> str:
+    """결과 행을 Markdown 표로 변환"""
+    lines = [
+        "| " + " | ".join(title for _, title in COLUMNS) + " |",
+        "|" + "|".join("---:" if key not in ("index_type", "mode", "fusion_weights") else "---" for key, _ in COLUMNS) + "|",
+    ]
+    for row in rows:
+        cells = []
+        for key, _ in COLUMNS:
+            value = row[key]
+            if key == "fusion_weights":
+                value = ":".join(f"{w:g}" for w in value) if value else "-"
+            elif isinstance(value, float):
+                value = f"{value:.3f}"
+            cells.append(str(value))
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def parse_list(value: str, cast=str) -> list:
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+
+def parse_weights(value: str) -> List[Tuple[float, float]]:
+    weights = []
+    for item in parse_list(value):
+        bm25, dense = item.split(":")
+        weights.append((float(bm25), float(dense)))
+    return weights
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="검색 품질/지연 시간 벤치마크")
+    parser.add_argument("--docs", type=str, default=None, help="Markdown 문서 디렉토리 (기본: 내장 합성 코퍼스)")
+    parser.add_argument("--qrels", type=str, default=None, help="질문→관련 문서 레이블 파일 (JSON/JSONL)")
+    parser.add_argument("--chunk-sizes", type=str, default="300,1000", help="청크 크기 목록")
+    parser.add_argument("--chunk-overlaps", type=str, default="0,100", help="청크 중첩 목록")
+    parser.add_argument("--k", type=str, default="3,5", help="검색 개수 목록")
+    parser.add_argument("--modes", type=str, default="vector,hybrid", help="검색 방식 (vector, hybrid)")
+    parser.add_argument(
+        "--fusion-weights", type=str, default="0.3:0.7,0.5:0.5", help="하이브리드 (BM25:벡터) 가중치 목록"
+    )
+    parser.add_argument("--index-types", type=str, default="flat", help="벡터 인덱스 타입 목록")
+    parser.add_argument("--train-threshold", type=int, default=0, help="ANN 인덱스 학습 최소 청크 수")
+    parser.add_argument("--dim", type=int, default=256, help="해싱 임베딩 차원")
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--markdown", type=str, default=None, help="결과 Markdown 표 저장 경로")
+    args = parser.parse_args(argv)
+
+    if args.docs:
+        if not args.qrels:
+            parser.error("--docs를 지정하면 --qrels도 필요합니다.")
+        documents, qrels = None, load_qrels(args.qrels)
+    else:
+        documents, qrels = synthetic_corpus()
+        if args.qrels:
+            qrels = load_qrels(args.qrels)
+
+    modes = parse_list(args.modes)
+    unknown = set(modes) - {"vector", "hybrid"}
+    if unknown:
+        parser.error(f"지원하지 않는 검색 방식입니다: {', '.join(sorted(unknown))}")
+
+    embeddings = HashingEmbeddings(args.dim)
+    print(f"🔨 레이블 {len(qrels)}개로 검색 벤치마크 실행 중...")
+
+    rows = []
+    for chunk_size, chunk_overlap in product(parse_list(args.chunk_sizes, int), parse_list(args.chunk_overlaps, int)):
+        if chunk_overlap >= chunk_size:
+            continue
+        chunks = chunk_documents(chunk_size, chunk_overlap, args.docs, documents)
+
+        for index_type in parse_list(args.index_types):
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                pipeline = HybridRAGPipeline(
+                    chunks,
+                    index_options={"index_type": index_type, "train_threshold": args.train_threshold},
+                    embeddings=embeddings,
+                    llm=FakeListChatModel(responses=[""]),
+                )
+            build_s = time.perf_counter() - started
+            memory_mb = pipeline.get_stats()["index_memory_mb"]
+            print(f"📦 chunk_size={chunk_size}, overlap={chunk_overlap}, {index_type}: {len(chunks)}개 청크")
+
+            for mode, k in product(modes, parse_list(args.k, int)):
+                for weights in parse_weights(args.fusion_weights) if mode == "hybrid" else [None]:
+                    if weights:
+                        pipeline.fusion_weights = weights
+                    rows.append(
+                        {
+                            "chunk_size": chunk_size,
+                            "chunk_overlap": chunk_overlap,
+                            "index_type": index_type,
+                            "mode": mode,
+                            "fusion_weights": list(weights) if weights else None,
+                            "k": k,
+                            "chunks": len(chunks),
+                            "build_s": build_s,
+                            "index_memory_mb": memory_mb,
+                            **evaluate(pipeline, qrels, k, mode, args.docs),
+                        }
+                    )
+
+    table = to_markdown(rows)
+    print("\n" + table)
+
+    if args.markdown:
+        with open(args.markdown, "w", encoding="utf-8") as f:
+            f.write(table + "\n")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"queries": len(qrels), "embedding": f"hashing-{args.dim}", "rows": rows},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Search Mode Benchmark
+similarity / mmr / similarity_score_threshold 검색 모드의 지연 시간 비교
+
+1. 선택 단계: `fetch_k`개 후보에서 k개를 고르는 MMR을 세 가지 구현으로 측정
+   - numpy: `search_modes.maximal_marginal_relevance` (선택마다 행렬-벡터 곱 한 번)
+   - langchain: `langchain_community`의 참조 구현 (단계마다 코사인 유사도 재계산)
+   - loop: 후보 쌍마다 파이썬 루프로 내적 계산
+2. 파이프라인: 합성 코퍼스로 `RAGPipeline.search_similar_documents()`의 검색
+   모드별 쿼리당 지연 시간 (p50/p95, 쿼리 임베딩 포함)
+
+사용법:
+    python benchmarks/bench_search_modes.py
+    python benchmarks/bench_search_modes.py --dim 1536 --fetch-ks 20,50,100,200 --count 50000 --output modes.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import zlib
+
+import numpy as np
+from langchain_community.vectorstores.utils import maximal_marginal_relevance as langchain_mmr
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag_pipeline import RAGPipeline  # noqa: E402
+from search_modes import maximal_marginal_relevance, normalize_rows  # noqa: E402
+
+MODES = {
+    "similarity": {},
+    "mmr": {"fetch_k": 20, "lambda_mult": 0.5},
+    "similarity_score_threshold": {"fetch_k": 20, "score_threshold": 0.3},
+}
+
+
+class ClusteredEmbeddings(Embeddings):
+    """텍스트의 주제 번호 주변에 모인 결정적 벡터 (중첩 청크처럼 비슷한 벡터가 많음)"""
+
+    def __init__(self, dim: int, topics: int = 100):
+        self.dim = dim
+        self.centers = normalize_rows(np.random.default_rng(0).standard_normal((topics, dim)))
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        topic = int(text.split()[0]) % len(self.centers)
+        rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+        return (self.centers[topic] + 0.3 * rng.standard_normal(self.dim) / np.sqrt(self.dim)).tolist()
+
+
+def loop_mmr(query: np.ndarray, candidates: np.ndarray, k: int, lambda_mult: float):
+    """후보 쌍마다 파이썬 루프로 유사도를 계산하는 MMR (비교 기준)"""
+    unit = normalize_rows(candidates)
+    query = normalize_rows(query[None, :])[0]
+    relevance = [float(np.dot(row, query)) for row in unit]
+    selected = [int(np.argmax(relevance))]
+    while len(selected) < min(k, len(unit)):
+        best, best_score = -1, -np.inf
+        for i in range(len(unit)):
+            if i in selected:
+                continue
+            redundancy = max(float(np.dot(unit[i], unit[j])) for j in selected)
+            score = lambda_mult * relevance[i] - (1 - lambda_mult) * redundancy
+            if score > best_score:
+                best, best_score = i, score
+        selected.append(best)
+    return selected
+
+
+def numpy_mmr(query: np.ndarray, candidates: np.ndarray, k: int, lambda_mult: float):
+    unit = normalize_rows(candidates)
+    relevance = unit @ normalize_rows(query[None, :])[0]
+    return maximal_marginal_relevance(relevance, unit, k, lambda_mult)
+
+
+IMPLEMENTATIONS = {
+    "numpy": numpy_mmr,
+    "langchain": lambda query, candidates, k, lambda_mult: langchain_mmr(
+        query, candidates, lambda_mult=lambda_mult, k=k
+    ),
+    "loop": loop_mmr,
+}
+
+
+def time_calls(fn, repeat: int) -> np.ndarray:
+    """호출별 지연 시간 (ms)"""
+    latencies = np.empty(repeat)
+    for i in range(repeat):
+        started = time.perf_counter()
+        fn(i)
+        latencies[i] = (time.perf_counter() - started) * 1000
+    return latencies
+
+
+def bench_selection(dim: int, fetch_ks, k: int, repeat: int):
+    rng = np.random.default_rng(1)
+    rows = []
+    for fetch_k in fetch_ks:
+        queries = rng.standard_normal((repeat, dim)).astype(np.float32)
+        candidates = rng.standard_normal((repeat, fetch_k, dim)).astype(np.float32)
+        for name, fn in IMPLEMENTATIONS.items():
+            latencies = time_calls(lambda i: fn(queries[i], candidates[i], k, 0.5), repeat)
+            rows.append(
+                {
+                    "implementation": name,
+                    "fetch_k": fetch_k,
+                    "p50_ms": float(np.percentile(latencies, 50)),
+                    "p95_ms": float(np.percentile(latencies, 95)),
+                }
+            )
+    return rows
+
+
+def bench_pipeline(count: int, dim: int, k: int, queries: int):
+    embeddings = ClusteredEmbeddings(dim)
+    documents = [
+        Document(page_content=f"{i % 100} 청크 {i}", metadata={"source": f"/docs/{i % 100}.md"})
+        for i in range(count)
+    ]
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline = RAGPipeline(
+            documents,
+            ids=[f"chunk-{i}" for i in range(count)],
+            embeddings=embeddings,
+            llm=FakeListChatModel(responses=[""]),
+        )
+
+    questions = [f"{i % 100} 질문 {i}" for i in range(queries)]
+    rows = []
+    for mode, kwargs in MODES.items():
+        sources = []
+
+        def run(i):
+            results = pipeline.search_similar_documents(
+                questions[i], k=k, search_type=mode, search_kwargs=kwargs
+            )
+            sources.append(len({doc.id for doc, _ in results}))
+
+        latencies = time_calls(run, queries)
+        rows.append(
+            {
+                "mode": mode,
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "p95_ms": float(np.percentile(latencies, 95)),
+                "avg_results": float(np.mean(sources)),
+            }
+        )
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="검색 모드(similarity/MMR/임계값) 지연 시간 벤치마크")
+    parser.add_argument("--dim", type=int, default=1536, help="벡터 차원")
+    parser.add_argument("--fetch-ks", type=str, default="20,50,100,200", help="MMR 후보 수 (쉼표 구분)")
+    parser.add_argument("--k", type=int, default=4, help="선택할 문서 수")
+    parser.add_argument("--repeat", type=int, default=50, help="선택 단계 반복 횟수")
+    parser.add_argument("--count", type=int, default=20_000, help="파이프라인 측정용 청크 수 (0이면 생략)")
+    parser.add_argument("--pipeline-dim", type=int, default=256, help="파이프라인 측정용 벡터 차원")
+    parser.add_argument("--queries", type=int, default=200, help="파이프라인 측정 쿼리 수")
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    fetch_ks = [int(value) for value in args.fetch_ks.split(",")]
+    print(f"⏱️  MMR 선택 단계 측정 중: {args.dim}차원, k={args.k}, 후보 {fetch_ks}")
+    selection = bench_selection(args.dim, fetch_ks, args.k, args.repeat)
+
+    print(f"\n{'구현':<12}{'fetch_k':>8}{'p50(ms)':>10}{'p95(ms)':>10}")
+    for row in selection:
+        print(f"{row['implementation']:<12}{row['fetch_k']:>8}{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}")
+
+    pipeline = []
+    if args.count:
+        print(f"\n🔨 파이프라인 구축 중: {args.count:,}개 x {args.pipeline_dim}차원")
+        pipeline = bench_pipeline(args.count, args.pipeline_dim, args.k, args.queries)
+        print(f"\n{'검색 모드':<28}{'p50(ms)':>10}{'p95(ms)':>10}{'평균 결과 수':>12}")
+        for row in pipeline:
+            print(f"{row['mode']:<28}{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}{row['avg_results']:>12.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"dim": args.dim, "k": args.k, "selection": selection, "pipeline": pipeline},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
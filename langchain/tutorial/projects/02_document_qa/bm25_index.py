@@ -0,0 +1,398 @@
+"""
+BM25 Index Module
+역색인 기반 BM25 키워드 검색과 Reciprocal Rank Fusion
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from access_control import AccessControl
+
+_TOKEN_RE = re.compile(r"[가-힣]+|[a-z0-9]+(?:[._+#-][a-z0-9]+)*")
+
+# 긴 조사부터 제거 (예: "에서는" → "에서" → "는" 순서 방지)
+_JOSA = sorted(
+    [
+        "이", "가", "은", "는", "을", "를", "의", "에", "와", "과", "도", "로", "만",
+        "으로", "에서", "에게", "한테", "까지", "부터", "보다", "처럼", "이나", "이랑",
+        "에서는", "에서도", "으로는", "에는", "에도", "와는", "과는", "이란", "란",
+        "입니다", "이다", "이며", "이고", "하다", "합니다", "했다", "하는", "된", "되는",
+    ],
+    key=len,
+    reverse=True,
+)
+
+
+def _strip_josa(word: str) -> str:
+    """한글 단어 끝의 조사/어미 제거 (어간이 1글자 이상 남는 경우만)"""
+    for josa in _JOSA:
+        if len(word) > len(josa) and word.endswith(josa):
+            return word[: -len(josa)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    한국어 인지 토큰화
+
+    영문/숫자는 소문자 단어 단위로, 한글은 조사를 뗀 어간과 글자 bigram으로
+    분리합니다. bigram은 띄어쓰기가 다른 복합 명사("검색증강" / "검색 증강")도
+    매칭되도록 합니다.
+
+    Args:
+        text: 텍스트
+
+    Returns:
+        List[str]: 토큰 리스트
+    """
+    tokens = []
+    for word in _TOKEN_RE.findall(text.lower()):
+        if "가" <= word[0] <= "힣":
+            stem = _strip_josa(word)
+            tokens.append(stem)
+            if len(stem) > 2:
+                tokens.extend(stem[i : i + 2] for i in range(len(stem) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = 60,
+) -> List[Tuple[str, float]]:
+    """
+    가중 Reciprocal Rank Fusion
+
+    각 순위 리스트에서 문서의 점수는 `weight / (k + rank)`이며, 문서별로
+    합산하여 내림차순 정렬합니다. (`EnsembleRetriever`와 같은 방식)
+
+    Args:
+        rankings: 검색기별 문서 ID 순위 리스트
+        weights: 검색기별 가중치 (기본: 모두 1)
+        k: 순위 평활화 상수
+
+    Returns:
+        List[Tuple[str, float]]: (문서 ID, 융합 점수) - 점수 내림차순
+    """
+    weights = list(weights) if weights is not None else [1.0] * len(rankings)
+    if len(weights) != len(rankings):
+        raise ValueError("weights와 rankings의 개수가 다릅니다.")
+
+    ids = [doc_id for ranking in rankings for doc_id in ranking]
+    if not ids:
+        return []
+
+    contributions = np.concatenate(
+        [
+            weight / (k + np.arange(1, len(ranking) + 1, dtype=np.float64))
+            for ranking, weight in zip(rankings, weights)
+        ]
+    )
+    unique_ids, inverse = np.unique(np.array(ids, dtype=object), return_inverse=True)
+    scores = np.bincount(inverse, weights=contributions, minlength=len(unique_ids))
+    order = np.argsort(-scores, kind="stable")
+    return [(unique_ids[i], float(scores[i])) for i in order]
+
+
+class BM25Index:
+    """
+    증분 업데이트와 디스크 저장을 지원하는 BM25 역색인
+
+    포스팅은 CSR 배열(`indptr`, `postings`, `tfs`)로 저장됩니다. 추가된
+    문서는 대기 포스팅에 쌓였다가 검색/저장 시 한 번에 병합되고, 삭제된
+    문서는 먼저 표시만 한 뒤 일정 비율이 넘으면 압축합니다.
+    """
+
+    INDEX_FILE = "bm25.npz"
+    META_FILE = "bm25.json"
+    VERSION = 1
+
+    # 삭제 표시된 문서가 이 비율을 넘으면 압축
+    COMPACT_RATIO = 0.3
+
+    def __init__(
+        self,
+        k1: float = 1.5,
+        b: float = 0.75,
+        tokenizer: Callable[[str], List[str]] = tokenize,
+    ):
+        """
+        초기화
+
+        Args:
+            k1: 단어 빈도 포화 파라미터
+            b: 문서 길이 정규화 파라미터
+            tokenizer: 토큰화 함수
+        """
+        self.k1 = k1
+        self.b = b
+        self.tokenizer = tokenizer
+
+        self.vocab: Dict[str, int] = {}
+        self.doc_ids: List[str] = []
+        self.tags: Dict[str, int] = {}
+        self._positions: Dict[str, int] = {}
+
+        self.doc_len = np.zeros(0, dtype=np.int32)
+        self.doc_tag = np.zeros(0, dtype=np.int32)
+        self.alive = np.zeros(0, dtype=bool)
+
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.postings = np.zeros(0, dtype=np.int32)
+        self.tfs = np.zeros(0, dtype=np.uint16)
+
+        # 병합 대기 중인 (term, doc, tf) 배열
+        self._pending: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return int(self.alive.sum())
+
+    def add(self, ids: Sequence[str], documents: Sequence[Document]):
+        """
+        문서 추가 (이미 있는 ID는 교체)
+
+        Args:
+            ids: 문서 ID 리스트
+            documents: 문서 리스트
+        """
+        if len(ids) != len(documents):
+            raise ValueError("ids와 documents의 개수가 다릅니다.")
+
+        with self._lock:
+            self.delete([doc_id for doc_id in ids if doc_id in self._positions])
+
+            start = len(self.doc_ids)
+            terms, docs, tfs, lengths, tags = [], [], [], [], []
+            for offset, (doc_id, doc) in enumerate(zip(ids, documents)):
+                counts = Counter(self.tokenizer(doc.page_content))
+                for term, tf in counts.items():
+                    terms.append(self.vocab.setdefault(term, len(self.vocab)))
+                    docs.append(start + offset)
+                    tfs.append(min(tf, np.iinfo(np.uint16).max))
+                lengths.append(sum(counts.values()))
+                tag = AccessControl.acl_tag(doc.metadata)
+                tags.append(self.tags.setdefault(tag, len(self.tags)))
+                self._positions[doc_id] = start + offset
+                self.doc_ids.append(doc_id)
+
+            self.doc_len = np.concatenate([self.doc_len, np.array(lengths, dtype=np.int32)])
+            self.doc_tag = np.concatenate([self.doc_tag, np.array(tags, dtype=np.int32)])
+            self.alive = np.concatenate([self.alive, np.ones(len(ids), dtype=bool)])
+            if terms:
+                self._pending.append(
+                    (
+                        np.array(terms, dtype=np.int64),
+                        np.array(docs, dtype=np.int32),
+                        np.array(tfs, dtype=np.uint16),
+                    )
+                )
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """
+        문서 삭제 (없는 ID는 무시)
+
+        Args:
+            ids: 삭제할 문서 ID 리스트
+
+        Returns:
+            int: 삭제된 문서 개수
+        """
+        with self._lock:
+            deleted = 0
+            for doc_id in ids:
+                position = self._positions.pop(doc_id, None)
+                if position is not None:
+                    self.alive[position] = False
+                    deleted += 1
+            if deleted and (len(self.alive) - len(self)) > self.COMPACT_RATIO * len(self.alive):
+                self._compact()
+            return deleted
+
+    def _merge(self):
+        """대기 포스팅을 CSR 배열에 병합"""
+        if not self._pending:
+            return
+
+        # 기존 CSR을 (term, doc, tf) 형태로 펼친 뒤 term 기준 안정 정렬
+        old_terms = np.repeat(
+            np.arange(len(self.indptr) - 1, dtype=np.int64), np.diff(self.indptr)
+        )
+        terms = np.concatenate([old_terms] + [t for t, _, _ in self._pending])
+        docs = np.concatenate([self.postings] + [d for _, d, _ in self._pending])
+        tfs = np.concatenate([self.tfs] + [f for _, _, f in self._pending])
+        order = np.argsort(terms, kind="stable")
+
+        self.postings = docs[order]
+        self.tfs = tfs[order]
+        self.indptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(self.vocab)), out=self.indptr[1:])
+        self._pending = []
+
+    def _compact(self):
+        """삭제 표시된 문서를 제거하고 문서 위치를 다시 매김"""
+        self._merge()
+        if self.alive.all():
+            return
+
+        new_position = np.cumsum(self.alive, dtype=np.int64) - 1
+        keep = self.alive[self.postings]
+        terms = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int64), np.diff(self.indptr))[keep]
+
+        self.postings = new_position[self.postings[keep]].astype(np.int32)
+        self.tfs = self.tfs[keep]
+        np.cumsum(np.bincount(terms, minlength=len(self.vocab)), out=self.indptr[1:])
+
+        self.doc_ids = [doc_id for doc_id, alive in zip(self.doc_ids, self.alive) if alive]
+        self._positions = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+        self.doc_len = self.doc_len[self.alive]
+        self.doc_tag = self.doc_tag[self.alive]
+        self.alive = np.ones(len(self.doc_ids), dtype=bool)
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        allowed_tags: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        BM25 검색
+
+        Args:
+            query: 검색 쿼리
+            k: 반환할 문서 수
+            allowed_tags: 허용할 ACL 태그 (None이면 전체)
+
+        Returns:
+            List[Tuple[str, float]]: (문서 ID, BM25 점수) - 점수 내림차순
+        """
+        with self._lock:
+            self._merge()
+            total = len(self)
+            if k <= 0 or not total:
+                return []
+
+            term_ids = {self.vocab[t] for t in self.tokenizer(query) if t in self.vocab}
+            if not term_ids:
+                return []
+
+            avgdl = float(self.doc_len[self.alive].mean()) or 1.0
+            all_docs, all_scores = [], []
+            for term_id in term_ids:
+                start, stop = self.indptr[term_id], self.indptr[term_id + 1]
+                docs = self.postings[start:stop]
+                df = int(self.alive[docs].sum())
+                if not df:
+                    continue
+                idf = math.log((total - df + 0.5) / (df + 0.5) + 1.0)
+                tf = self.tfs[start:stop].astype(np.float32)
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[docs] / avgdl)
+                all_docs.append(docs)
+                all_scores.append(idf * tf * (self.k1 + 1) / (tf + norm))
+
+            if not all_docs:
+                return []
+            scores = np.bincount(
+                np.concatenate(all_docs),
+                weights=np.concatenate(all_scores),
+                minlength=len(self.doc_ids),
+            )
+
+            valid = self.alive & (scores > 0)
+            if allowed_tags is not None:
+                codes = [self.tags[tag] for tag in allowed_tags if tag in self.tags]
+                valid &= np.isin(self.doc_tag, codes)
+
+            candidates = np.flatnonzero(valid)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self.doc_ids[i], float(scores[i])) for i in candidates]
+
+    def save(self, path: str):
+        """
+        디렉토리에 인덱스 저장 (삭제 표시 문서는 압축 후 저장)
+
+        Args:
+            path: 저장 디렉토리
+        """
+        with self._lock:
+            self._compact()
+            os.makedirs(path, exist_ok=True)
+
+            index_path = os.path.join(path, self.INDEX_FILE)
+            with open(index_path + ".tmp", "wb") as f:
+                np.savez(
+                    f,
+                    indptr=self.indptr,
+                    postings=self.postings,
+                    tfs=self.tfs,
+                    doc_len=self.doc_len,
+                    doc_tag=self.doc_tag,
+                )
+            os.replace(index_path + ".tmp", index_path)
+
+            # 메타데이터를 마지막에 기록하여 저장 완료 표시
+            meta_path = os.path.join(path, self.META_FILE)
+            with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": self.VERSION,
+                        "k1": self.k1,
+                        "b": self.b,
+                        "vocab": sorted(self.vocab, key=self.vocab.get),
+                        "doc_ids": self.doc_ids,
+                        "tags": sorted(self.tags, key=self.tags.get),
+                    },
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(meta_path + ".tmp", meta_path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BM25Index"]:
+        """
+        디렉토리에서 인덱스 로드
+
+        Args:
+            path: 인덱스 디렉토리
+
+        Returns:
+            Optional[BM25Index]: 인덱스 (파일이 없거나 버전이 다르면 None)
+        """
+        meta_path = os.path.join(path, cls.META_FILE)
+        index_path = os.path.join(path, cls.INDEX_FILE)
+        if not (os.path.exists(meta_path) and os.path.exists(index_path)):
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != cls.VERSION:
+            return None
+
+        index = cls(k1=meta["k1"], b=meta["b"])
+        index.vocab = {term: i for i, term in enumerate(meta["vocab"])}
+        index.doc_ids = meta["doc_ids"]
+        index.tags = {tag: i for i, tag in enumerate(meta["tags"])}
+        index._positions = {doc_id: i for i, doc_id in enumerate(index.doc_ids)}
+        with np.load(index_path, allow_pickle=False) as arrays:
+            index.indptr = arrays["indptr"]
+            index.postings = arrays["postings"]
+            index.tfs = arrays["tfs"]
+            index.doc_len = arrays["doc_len"]
+            index.doc_tag = arrays["doc_tag"]
+        index.alive = np.ones(len(index.doc_ids), dtype=bool)
+
+        if len(index.indptr) != len(index.vocab) + 1 or len(index.doc_len) != len(index.doc_ids):
+            return None
+        return index
@@ -3,9 +3,12 @@ Document Loader Module
 문서 로딩 및 전처리 모듈
 """
 
+import hashlib
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from langchain_community.document_loaders import (
     DirectoryLoader,
     TextLoader,
@@ -14,6 +17,69 @@ from langchain_community.document_loaders import (
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 
+from index_manifest import IndexManifest
+
+# 프로세스 풀 워커에서 사용할 로더 (워커 초기화 시 설정)
+_worker_loader: Optional["DocumentLoader"] = None
+
+
+def _init_split_worker(loader: "DocumentLoader"):
+    """프로세스 풀 워커 초기화"""
+    global _worker_loader
+    _worker_loader = loader
+
+
+def _split_in_worker(documents: List[Document]) -> List[Document]:
+    """프로세스 풀 워커에서 문서 분할"""
+    return _worker_loader._split_file_documents(documents)
+
+
+class DocumentStats:
+    """
+    문서 통계 누적기
+
+    문서를 하나씩 받아 통계를 누적하므로 전체 문서를 메모리에 올리지
+    않고도 `get_document_stats()`와 같은 결과를 계산할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.total_docs = 0
+        self.total_length = 0
+        self.doc_types: Dict[str, int] = {}
+
+    def add(self, doc: Document):
+        """문서 하나를 통계에 추가"""
+        self.total_docs += 1
+        self.total_length += len(doc.page_content)
+        doc_type = doc.metadata.get("doc_type", "unknown")
+        self.doc_types[doc_type] = self.doc_types.get(doc_type, 0) + 1
+
+    def track(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        문서를 그대로 통과시키면서 통계를 누적하는 제너레이터
+
+        Args:
+            documents: 문서 이터러블
+
+        Yields:
+            Document: 입력 문서
+        """
+        for doc in documents:
+            self.add(doc)
+            yield doc
+
+    def to_dict(self) -> dict:
+        """통계 정보 반환"""
+        if not self.total_docs:
+            return {"total_docs": 0}
+
+        return {
+            "total_docs": self.total_docs,
+            "total_length": self.total_length,
+            "avg_length": round(self.total_length / self.total_docs, 2),
+            "doc_types": dict(self.doc_types),
+        }
+
 
 class DocumentLoader:
     """문서 로더 클래스"""
@@ -108,10 +174,11 @@ class DocumentLoader:
         """
         source_path = doc.metadata.get("source", "")
 
-        # 파일 이름 추가
+        # 파일 이름 추가 (파일 이름은 접근 제어 태그로도 사용)
         if source_path:
             doc.metadata["filename"] = Path(source_path).name
             doc.metadata["file_extension"] = Path(source_path).suffix
+            doc.metadata["acl_tag"] = Path(source_path).name
 
         # 문서 길이 추가
         doc.metadata["length"] = len(doc.page_content)
@@ -173,34 +240,221 @@ class DocumentLoader:
 
         return chunks
 
-    def get_document_stats(self, documents: List[Document]) -> dict:
+    def load_files(self, rel_paths: List[str]) -> Dict[str, List[Document]]:
         """
-        문서 통계 정보 반환
+        문서 디렉토리 기준 상대 경로의 파일들을 로드하여 파일별 청크로 반환
+        (증분 재인덱싱용)
+
+        `iter_chunks()`와 같은 읽기/분할/ID 부여 단계를 거치므로 증분
+        업데이트한 파일의 청크(내용, 메타데이터, `id`)는 전체 재인덱싱
+        결과와 같습니다.
 
         Args:
-            documents: 문서 리스트
+            rel_paths: 문서 디렉토리 기준 상대 경로 리스트
 
         Returns:
-            dict: 통계 정보
+            Dict[str, List[Document]]: {상대 경로: `id`가 부여된 청크 리스트}
         """
-        if not documents:
-            return {"total_docs": 0}
+        chunks_by_file = {}
+        for rel_path in rel_paths:
+            file_path = Path(self.docs_path) / rel_path
+            try:
+                content_hash, documents = self._read_file(file_path)
+                chunks = self._split_file_documents(documents)
+            except Exception as e:
+                print(f"⚠️  {file_path} 로드 실패: {e}")
+                continue
+            chunks_by_file[rel_path] = self._assign_chunk_ids(file_path, content_hash, chunks)
+        return chunks_by_file
 
-        total_length = sum(len(doc.page_content) for doc in documents)
-        avg_length = total_length / len(documents) if documents else 0
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        파일을 하나씩 읽어 분할 전 문서를 생성하는 제너레이터
+
+        파일 경로 정렬 순서대로 한 번에 한 파일만 메모리에 올립니다.
 
-        # 문서 타입별 개수
-        doc_types = {}
+        Yields:
+            Document: 파일 단위 문서 (`source` 메타데이터 포함)
+        """
+        if not os.path.exists(self.docs_path):
+            raise FileNotFoundError(f"문서 경로를 찾을 수 없습니다: {self.docs_path}")
+
+        for file_path in self._list_files():
+            try:
+                _, documents = self._read_file(file_path)
+            except Exception as e:
+                print(f"⚠️  {file_path} 로드 실패: {e}")
+                continue
+            yield from documents
+
+    def iter_chunks(self, parallel: bool = False, **kwargs) -> Iterator[Document]:
+        """
+        청크를 하나씩 생성하는 제너레이터
+
+        `load_documents()`와 달리 전체 청크를 리스트로 만들지 않으므로
+        큰 문서 디렉토리도 일정한 메모리로 처리할 수 있습니다. 청크 순서와
+        `id`는 `iter_chunks_parallel()`과 같습니다.
+
+        Args:
+            parallel: 병렬 모드 사용 여부 (`iter_chunks_parallel()`에 위임)
+            **kwargs: `iter_chunks_parallel()` 옵션
+
+        Yields:
+            Document: 청크
+        """
+        if parallel:
+            yield from self.iter_chunks_parallel(**kwargs)
+            return
+
+        if not os.path.exists(self.docs_path):
+            raise FileNotFoundError(f"문서 경로를 찾을 수 없습니다: {self.docs_path}")
+
+        for file_path in self._list_files():
+            try:
+                content_hash, documents = self._read_file(file_path)
+                chunks = self._split_file_documents(documents)
+            except Exception as e:
+                print(f"⚠️  {file_path} 로드 실패: {e}")
+                continue
+            yield from self._assign_chunk_ids(file_path, content_hash, chunks)
+
+    def iter_chunks_parallel(
+        self,
+        max_workers: Optional[int] = None,
+        use_processes: bool = True,
+    ) -> Iterator[Document]:
+        """
+        병렬로 파일을 읽고 분할하여 청크를 생성하는 제너레이터
+
+        파일 읽기는 스레드 풀, 분할은 프로세스 풀에서 실행합니다.
+        청크는 파일 경로 정렬 순서대로 반환되므로 결과가 항상 같고,
+        각 청크의 `id`는 `IndexManifest.make_chunk_ids()` 형식으로 부여됩니다.
+        앞쪽 파일의 청크는 뒤쪽 파일을 처리하는 동안 바로 사용할 수 있습니다.
+
+        Args:
+            max_workers: 워커 수 (기본: CPU 수)
+            use_processes: 분할에 프로세스 풀 사용 여부 (False면 스레드 풀)
+
+        Yields:
+            Document: 청크
+        """
+        if not os.path.exists(self.docs_path):
+            raise FileNotFoundError(f"문서 경로를 찾을 수 없습니다: {self.docs_path}")
+
+        files = self._list_files()
+        if not files:
+            return
+
+        max_workers = max_workers or os.cpu_count() or 1
+        io_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="doc-io")
+        if use_processes:
+            split_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_split_worker,
+                initargs=(self,),
+            )
+        else:
+            split_pool = io_pool
+
+        def read_and_submit(file_path: Path) -> Tuple[str, object]:
+            # 읽기가 끝나는 즉시 분할 작업을 프로세스 풀에 넘김
+            content_hash, documents = self._read_file(file_path)
+            if use_processes:
+                return content_hash, split_pool.submit(_split_in_worker, documents)
+            return content_hash, documents
+
+        try:
+            # 처리 중인 파일 수를 제한하여 메모리 사용량을 일정하게 유지
+            window = max_workers * 4
+            pending: deque = deque()
+            file_iter = iter(files)
+            for file_path in file_iter:
+                pending.append((file_path, io_pool.submit(read_and_submit, file_path)))
+                if len(pending) >= window:
+                    break
+
+            while pending:
+                file_path, read_future = pending.popleft()
+                next_file = next(file_iter, None)
+                if next_file is not None:
+                    pending.append((next_file, io_pool.submit(read_and_submit, next_file)))
+
+                try:
+                    content_hash, result = read_future.result()
+                    if use_processes:
+                        chunks = result.result()
+                    else:
+                        chunks = self._split_file_documents(result)
+                except Exception as e:
+                    print(f"⚠️  {file_path} 로드 실패: {e}")
+                    continue
+
+                yield from self._assign_chunk_ids(file_path, content_hash, chunks)
+        finally:
+            io_pool.shutdown(wait=True, cancel_futures=True)
+            if use_processes:
+                split_pool.shutdown(wait=True, cancel_futures=True)
+
+    def _assign_chunk_ids(
+        self, file_path: Path, content_hash: str, chunks: List[Document]
+    ) -> List[Document]:
+        """파일 경로와 콘텐츠 해시로 청크 `id` 부여"""
+        rel_path = file_path.relative_to(self.docs_path).as_posix()
+        chunk_ids = IndexManifest.make_chunk_ids(rel_path, content_hash, len(chunks))
+        for chunk, chunk_id in zip(chunks, chunk_ids):
+            chunk.id = chunk_id
+        return chunks
+
+    def _list_files(self) -> List[Path]:
+        """문서 디렉토리의 Markdown 파일 목록 (정렬됨)"""
+        return sorted(
+            path for path in Path(self.docs_path).glob("**/*.md") if path.is_file()
+        )
+
+    def _read_file(self, file_path: Path) -> Tuple[str, List[Document]]:
+        """
+        파일을 읽어 콘텐츠 해시와 문서 반환 (I/O 단계)
+
+        Args:
+            file_path: 파일 경로
+
+        Returns:
+            Tuple[str, List[Document]]: (sha256 해시, 문서 리스트)
+        """
+        raw = file_path.read_bytes()
+        # TextLoader와 같은 결과가 되도록 줄바꿈을 정규화
+        text = raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        document = Document(page_content=text, metadata={"source": str(file_path)})
+        return hashlib.sha256(raw).hexdigest(), [document]
+
+    def _split_file_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        한 파일의 문서에 메타데이터를 추가하고 청크로 분할 (CPU 단계)
+
+        Args:
+            documents: 한 파일에서 읽은 문서 리스트
+
+        Returns:
+            List[Document]: 청크 리스트
+        """
         for doc in documents:
-            doc_type = doc.metadata.get("doc_type", "unknown")
-            doc_types[doc_type] = doc_types.get(doc_type, 0) + 1
+            self._enhance_metadata(doc)
+        return self.text_splitter.split_documents(documents)
 
-        return {
-            "total_docs": len(documents),
-            "total_length": total_length,
-            "avg_length": round(avg_length, 2),
-            "doc_types": doc_types,
-        }
+    def get_document_stats(self, documents: Iterable[Document]) -> dict:
+        """
+        문서 통계 정보 반환
+
+        Args:
+            documents: 문서 리스트 또는 이터러블 (제너레이터도 가능)
+
+        Returns:
+            dict: 통계 정보
+        """
+        stats = DocumentStats()
+        for doc in documents:
+            stats.add(doc)
+        return stats.to_dict()
 
 
 class CustomMarkdownLoader(DocumentLoader):
@@ -224,36 +478,40 @@ class CustomMarkdownLoader(DocumentLoader):
 
     def load_documents(self) -> List[Document]:
         """헤더 기반으로 Markdown 문서 로드"""
-        documents = []
+        final_chunks = []
 
         for file_path in Path(self.docs_path).glob("**/*.md"):
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # 헤더 기반 분할
-                md_docs = self.md_splitter.split_text(content)
-
-                # 메타데이터 추가
-                for doc in md_docs:
-                    doc.metadata["source"] = str(file_path)
-                    doc.metadata["filename"] = file_path.name
-                    self._enhance_metadata(doc)
-
-                documents.extend(md_docs)
-                print(f"✅ {file_path.name}: {len(md_docs)}개 섹션")
+                _, documents = self._read_file(file_path)
+                chunks = self._split_file_documents(documents)
+                final_chunks.extend(chunks)
+                print(f"✅ {file_path.name}: {len(chunks)}개 섹션")
 
             except Exception as e:
                 print(f"⚠️  {file_path} 로드 실패: {e}")
 
-        # 추가 청킹 (섹션이 너무 큰 경우)
-        final_chunks = []
-        for doc in documents:
-            if len(doc.page_content) > self.chunk_size:
-                chunks = self.text_splitter.split_documents([doc])
-                final_chunks.extend(chunks)
-            else:
-                final_chunks.append(doc)
-
         print(f"✅ 총 {len(final_chunks)}개 청크 생성 완료")
         return final_chunks
+
+    def _split_file_documents(self, documents: List[Document]) -> List[Document]:
+        """헤더 기반 분할 후 큰 섹션만 추가 청킹"""
+        final_chunks = []
+        for source_doc in documents:
+            file_path = Path(source_doc.metadata["source"])
+
+            # 헤더 기반 분할
+            md_docs = self.md_splitter.split_text(source_doc.page_content)
+
+            # 메타데이터 추가
+            for doc in md_docs:
+                doc.metadata["source"] = str(file_path)
+                doc.metadata["filename"] = file_path.name
+                self._enhance_metadata(doc)
+
+            # 추가 청킹 (섹션이 너무 큰 경우)
+            for doc in md_docs:
+                if len(doc.page_content) > self.chunk_size:
+                    final_chunks.extend(self.text_splitter.split_documents([doc]))
+                else:
+                    final_chunks.append(doc)
+        return final_chunks
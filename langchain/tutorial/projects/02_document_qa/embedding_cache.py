@@ -0,0 +1,350 @@
+"""
+Embedding Cache Module
+청크 콘텐츠 해시 기반 영구 임베딩 캐시
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    디스크 기반 임베딩 캐시
+
+    임의의 `Embeddings` 구현을 감싸서, 같은 텍스트를 다시 임베딩하지 않도록
+    (모델 이름 + 콘텐츠 해시) → float32 벡터를 디스크에 저장합니다.
+
+    저장 구조 (`cache_dir/<모델 해시>/`):
+        - vectors.f32: 슬롯별 벡터를 담은 float32 배열 (np.memmap으로 접근)
+        - index.json: 모델 이름, 차원, LRU 순서의 {콘텐츠 해시: 슬롯} 스냅샷
+        - index.log: 스냅샷 이후 추가된 [콘텐츠 해시, 슬롯] 기록 (한 줄에 하나)
+
+    배치마다 새 항목만 로그에 덧붙이므로 저장 비용은 배치 크기에 비례합니다.
+    로그가 항목 수보다 길어지면 스냅샷으로 합치고, `flush()`도 스냅샷을
+    씁니다. 캐시 히트로 바뀐 LRU 순서는 `flush()` 때만 저장됩니다.
+
+    캐시가 `max_entries`를 넘으면 가장 오래 사용되지 않은 항목(LRU)을
+    제거하고 그 슬롯을 재사용합니다.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    INDEX_FILE = "index.json"
+    LOG_FILE = "index.log"
+    MIN_COMPACT_RECORDS = 1024
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache_dir: str,
+        model_name: Optional[str] = None,
+        max_entries: int = 100_000,
+        cache_queries: bool = False,
+    ):
+        """
+        초기화
+
+        Args:
+            embeddings: 실제 임베딩을 계산할 모델
+            cache_dir: 캐시 디렉토리 경로
+            model_name: 캐시 키에 포함할 모델 이름 (기본: embeddings.model 또는 클래스 이름)
+            max_entries: 최대 캐시 항목 수 (초과 시 LRU 제거)
+            cache_queries: `embed_query` 결과도 캐시할지 여부
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries는 1 이상이어야 합니다.")
+
+        self.embeddings = embeddings
+        self.model_name = model_name or self._default_model_name(embeddings)
+        self.max_entries = max_entries
+        self.cache_queries = cache_queries
+
+        model_key = hashlib.sha256(self.model_name.encode("utf-8")).hexdigest()[:16]
+        self.cache_path = os.path.join(cache_dir, model_key)
+        os.makedirs(self.cache_path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._free_slots: List[int] = []
+        self._dim: Optional[int] = None
+        self._vectors: Optional[np.memmap] = None
+        # 스냅샷 이후 로그 줄 수 (None이면 차원이 담긴 스냅샷이 아직 없음)
+        self._log_records: Optional[int] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load()
+
+    @staticmethod
+    def _default_model_name(embeddings: Embeddings) -> str:
+        model = getattr(embeddings, "model", None)
+        if isinstance(model, str) and model:
+            return model
+        return type(embeddings).__name__
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """텍스트 콘텐츠 해시 (캐시 키)"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        문서 임베딩 (캐시에 없는 텍스트만 실제 모델로 계산)
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Returns:
+            List[List[float]]: 임베딩 벡터 리스트
+        """
+        keys = [self.hash_text(text) for text in texts]
+
+        with self._lock:
+            found = {key: self._get(key) for key in dict.fromkeys(keys)}
+            # 배치 안의 중복 텍스트는 한 번만 임베딩 (나머지는 히트로 집계)
+            missing = {}
+            for key, text in zip(keys, texts):
+                if found[key] is None:
+                    missing.setdefault(key, text)
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            new_vectors = self.embeddings.embed_documents(list(missing.values()))
+
+            with self._lock:
+                for key, vector in zip(missing, new_vectors):
+                    found[key] = self._put(key, vector)
+                self._append_log(missing)
+
+        return [found[key].tolist() for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        쿼리 임베딩
+
+        Args:
+            text: 쿼리 텍스트
+
+        Returns:
+            List[float]: 임베딩 벡터
+        """
+        if not self.cache_queries:
+            return self.embeddings.embed_query(text)
+
+        key = self.hash_text(text)
+        with self._lock:
+            vector = self._get(key)
+            if vector is not None:
+                self.hits += 1
+                return vector.tolist()
+
+        vector = self.embeddings.embed_query(text)
+        with self._lock:
+            self.misses += 1
+            stored = self._put(key, vector)
+            self._append_log([key])
+        return stored.tolist()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        캐시 통계 반환
+
+        Returns:
+            dict: 히트/미스/제거 횟수, 히트율, 항목 수
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "model": self.model_name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+            self._free_slots.clear()
+            self._dim = None
+            self._vectors = None
+            vectors_path = os.path.join(self.cache_path, self.VECTORS_FILE)
+            if os.path.exists(vectors_path):
+                os.remove(vectors_path)
+            self._save_index()
+
+    def flush(self):
+        """LRU 순서를 포함한 캐시 상태를 스냅샷으로 저장하고 로그 비우기"""
+        with self._lock:
+            self._save_index()
+
+    # ---- 내부 구현 (호출 측에서 lock 보유) ----
+
+    def _get(self, key: str) -> Optional[np.ndarray]:
+        slot = self._entries.get(key)
+        if slot is None:
+            return None
+        self._entries.move_to_end(key)
+        # 같은 배치에서 슬롯이 재사용될 수 있으므로 복사본 반환
+        return np.array(self._vectors[slot])
+
+    def _put(self, key: str, vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        if self._dim is None:
+            self._dim = int(array.shape[0])
+        elif array.shape[0] != self._dim:
+            raise ValueError(
+                f"임베딩 차원이 캐시와 다릅니다: {array.shape[0]} != {self._dim}"
+            )
+
+        slot = self._entries.get(key)
+        if slot is None:
+            if len(self._entries) >= self.max_entries:
+                _, slot = self._entries.popitem(last=False)
+                self.evictions += 1
+            elif self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                slot = len(self._entries)
+            self._ensure_capacity(slot + 1)
+
+        self._vectors[slot] = array
+        self._entries[key] = slot
+        self._entries.move_to_end(key)
+        return array
+
+    def _ensure_capacity(self, rows: int):
+        """벡터 파일이 최소 `rows`개 슬롯을 담도록 확장 (2배씩 증가)"""
+        current = 0 if self._vectors is None else self._vectors.shape[0]
+        if rows <= current:
+            return
+
+        new_rows = max(rows, min(max(current * 2, 1024), self.max_entries))
+        vectors_path = os.path.join(self.cache_path, self.VECTORS_FILE)
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with open(vectors_path, "ab") as f:
+            f.truncate(new_rows * self._dim * 4)
+        self._vectors = np.memmap(
+            vectors_path, dtype=np.float32, mode="r+", shape=(new_rows, self._dim)
+        )
+
+    def _load(self):
+        """디스크에서 캐시 인덱스와 벡터 파일 로드"""
+        index_path = os.path.join(self.cache_path, self.INDEX_FILE)
+        vectors_path = os.path.join(self.cache_path, self.VECTORS_FILE)
+        if not os.path.exists(index_path) or not os.path.exists(vectors_path):
+            return
+
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            dim = data["dim"]
+            if data.get("model") != self.model_name or not dim:
+                return
+
+            rows = os.path.getsize(vectors_path) // (dim * 4)
+            vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(rows, dim))
+        except (OSError, ValueError, KeyError, json.JSONDecodeError) as e:
+            print(f"⚠️  임베딩 캐시 로드 실패, 새로 시작합니다: {e}")
+            return
+
+        self._dim = dim
+        self._vectors = vectors
+        for key, slot in data.get("entries", []):
+            if slot < rows:
+                self._entries[key] = slot
+        self._log_records = self._replay_log(rows)
+
+        # max_entries가 줄어든 경우 오래된 항목부터 제거
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        used = set(self._entries.values())
+        self._free_slots = [slot for slot in range(min(rows, self.max_entries)) if slot not in used]
+        self._free_slots.reverse()
+
+    def _replay_log(self, rows: int) -> int:
+        """스냅샷 이후의 로그를 순서대로 적용하고 적용한 줄 수 반환"""
+        log_path = os.path.join(self.cache_path, self.LOG_FILE)
+        if not os.path.exists(log_path):
+            return 0
+
+        slot_keys = {slot: key for key, slot in self._entries.items()}
+        records = 0
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    key, slot = json.loads(line)
+                except (ValueError, TypeError):
+                    # 쓰는 도중 중단되어 잘린 마지막 줄
+                    break
+                records += 1
+                if slot >= rows:
+                    continue
+                # 슬롯이 재사용되었으면 이전 주인은 제거된 항목
+                evicted = slot_keys.get(slot)
+                if evicted is not None and evicted != key:
+                    del self._entries[evicted]
+                previous = self._entries.get(key)
+                if previous is not None and previous != slot:
+                    del slot_keys[previous]
+                self._entries[key] = slot
+                self._entries.move_to_end(key)
+                slot_keys[slot] = key
+        return records
+
+    def _append_log(self, keys: Iterable[str]):
+        """새로 저장한 항목을 로그에 덧붙이기 (로그가 길어지면 스냅샷으로 합침)"""
+        if self._log_records is None or self._log_records >= max(
+            len(self._entries), self.MIN_COMPACT_RECORDS
+        ):
+            self._save_index()
+            return
+
+        # 로그가 가리키는 벡터가 먼저 디스크에 있어야 함
+        self._vectors.flush()
+        log_path = os.path.join(self.cache_path, self.LOG_FILE)
+        with open(log_path, "a", encoding="utf-8") as f:
+            for key in keys:
+                # 같은 배치 안에서 이미 제거된 항목은 건너뜀
+                slot = self._entries.get(key)
+                if slot is not None:
+                    f.write(json.dumps([key, slot]) + "\n")
+                    self._log_records += 1
+
+    def _save_index(self):
+        """인덱스 스냅샷을 임시 파일에 쓴 뒤 교체하여 원자적으로 저장하고 로그 비우기"""
+        if self._vectors is not None:
+            self._vectors.flush()
+
+        index_path = os.path.join(self.cache_path, self.INDEX_FILE)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "model": self.model_name,
+                    "dim": self._dim,
+                    "entries": list(self._entries.items()),
+                },
+                f,
+            )
+        os.replace(tmp_path, index_path)
+
+        log_path = os.path.join(self.cache_path, self.LOG_FILE)
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        self._log_records = 0 if self._dim is not None else None
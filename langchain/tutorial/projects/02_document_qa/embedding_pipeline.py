@@ -0,0 +1,361 @@
+"""
+Embedding Pipeline Module
+토큰 기준 배치 + 동시 실행 + 레이트 리밋 인지 임베딩 파이프라인
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트 토큰 수 추정
+
+    토크나이저 없이 UTF-8 바이트 수 / 3으로 추정합니다. 영문은 실제보다
+    약간 많게, 한글은 비슷하게 잡히므로 한도 계산에는 보수적인 값입니다.
+
+    Args:
+        text: 텍스트
+
+    Returns:
+        int: 추정 토큰 수
+    """
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def make_batches(
+    token_counts: List[int],
+    max_tokens_per_batch: int,
+    max_batch_size: int,
+) -> List[List[int]]:
+    """
+    입력 순서를 유지하면서 토큰 수 한도 안에서 배치 구성
+
+    한도보다 큰 단일 텍스트는 단독 배치가 됩니다.
+
+    Args:
+        token_counts: 텍스트별 토큰 수
+        max_tokens_per_batch: 배치당 최대 토큰 수
+        max_batch_size: 배치당 최대 텍스트 수
+
+    Returns:
+        List[List[int]]: 배치별 텍스트 인덱스 리스트
+    """
+    batches = []
+    current: List[int] = []
+    current_tokens = 0
+    for i, tokens in enumerate(token_counts):
+        if current and (
+            current_tokens + tokens > max_tokens_per_batch
+            or len(current) >= max_batch_size
+        ):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """429 (rate limit) 오류인지 확인"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or "RateLimit" in type(error).__name__
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """오류 응답의 Retry-After 헤더 값 (초)"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    분당 토큰(TPM) / 분당 요청(RPM) 예산을 지키는 토큰 버킷 레이트 리미터
+
+    각 버킷은 분당 한도만큼 채워진 상태로 시작하여 초당 `한도 / 60`씩
+    다시 채워집니다. 여러 스레드에서 동시에 호출할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        tokens_per_minute: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        초기화
+
+        Args:
+            tokens_per_minute: 분당 토큰 한도 (None이면 제한 없음)
+            requests_per_minute: 분당 요청 한도 (None이면 제한 없음)
+            clock: 시간 함수 (테스트용)
+            sleep: 대기 함수 (테스트용)
+        """
+        self.tokens_per_minute = tokens_per_minute
+        self.requests_per_minute = requests_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(tokens_per_minute or 0)
+        self._requests = float(requests_per_minute or 0)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float):
+        elapsed = max(0.0, now - self._updated)
+        self._updated = now
+        if self.tokens_per_minute:
+            self._tokens = min(
+                float(self.tokens_per_minute),
+                self._tokens + elapsed * self.tokens_per_minute / 60,
+            )
+        if self.requests_per_minute:
+            self._requests = min(
+                float(self.requests_per_minute),
+                self._requests + elapsed * self.requests_per_minute / 60,
+            )
+
+    def acquire(self, tokens: int) -> float:
+        """
+        요청 1건과 `tokens`개 토큰의 예산을 확보할 때까지 대기
+
+        Args:
+            tokens: 요청에 사용할 토큰 수
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                delay = max(0.0, self._paused_until - now)
+                if self.tokens_per_minute and self._tokens < tokens:
+                    delay = max(delay, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+                if self.requests_per_minute and self._requests < 1:
+                    delay = max(delay, (1 - self._requests) * 60 / self.requests_per_minute)
+
+                if delay <= 0:
+                    if self.tokens_per_minute:
+                        self._tokens -= tokens
+                    if self.requests_per_minute:
+                        self._requests -= 1
+                    return waited
+
+            self._sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float):
+        """429 응답 후 모든 요청을 `seconds`초 동안 멈춤"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+@dataclass
+class EmbeddingStats:
+    """임베딩 파이프라인 실행 통계"""
+
+    chunks: int = 0
+    tokens: int = 0
+    batches: int = 0
+    retries: int = 0
+    rate_limit_wait_s: float = 0.0
+    elapsed_s: float = 0.0
+
+    @property
+    def chunks_per_s(self) -> float:
+        return self.chunks / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def tokens_per_s(self) -> float:
+        return self.tokens / self.elapsed_s if self.elapsed_s else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "chunks_per_s": round(self.chunks_per_s, 2),
+            "tokens_per_s": round(self.tokens_per_s, 2),
+        }
+
+
+class EmbeddingPipeline:
+    """
+    배치 임베딩 파이프라인
+
+    청크를 토큰 수 기준 배치로 묶고, 최대 `max_concurrency`개 배치를
+    동시에 임베딩합니다. 각 요청은 `RateLimiter`로 TPM/RPM 예산을 지키며,
+    429 오류는 지수 백오프로 재시도합니다. 완료된 배치는 도착 순서대로
+    `iter_embeddings()`에서 반환되어 바로 인덱스에 추가할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_concurrency: int = 4,
+        max_tokens_per_batch: int = 8000,
+        max_batch_size: int = 256,
+        tokens_per_minute: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        token_counter: Callable[[str], int] = estimate_tokens,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        초기화
+
+        Args:
+            embeddings: 임베딩 모델
+            max_concurrency: 동시에 실행할 배치 수
+            max_tokens_per_batch: 배치당 최대 토큰 수
+            max_batch_size: 배치당 최대 텍스트 수
+            tokens_per_minute: 분당 토큰 한도 (None이면 제한 없음)
+            requests_per_minute: 분당 요청 한도 (None이면 제한 없음)
+            max_retries: 429 오류 최대 재시도 횟수
+            base_delay: 백오프 기본 대기 시간 (초)
+            max_delay: 백오프 최대 대기 시간 (초)
+            token_counter: 텍스트 토큰 수 계산 함수
+            rate_limiter: 직접 지정할 레이트 리미터 (여러 파이프라인이 예산 공유 시)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency는 1 이상이어야 합니다.")
+
+        self.embeddings = embeddings
+        self.max_concurrency = max_concurrency
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.token_counter = token_counter
+        self.rate_limiter = rate_limiter or RateLimiter(tokens_per_minute, requests_per_minute)
+        self.last_stats = EmbeddingStats()
+        self._stats_lock = threading.Lock()
+
+    def iter_embeddings(
+        self, texts: List[str]
+    ) -> Iterator[Tuple[List[int], List[List[float]]]]:
+        """
+        텍스트를 배치로 임베딩하며 완료된 배치부터 반환
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Yields:
+            Tuple[List[int], List[List[float]]]: (원본 인덱스 리스트, 벡터 리스트)
+        """
+        stats = EmbeddingStats()
+        self.last_stats = stats
+        if not texts:
+            return
+
+        token_counts = [self.token_counter(text) for text in texts]
+        batches = make_batches(token_counts, self.max_tokens_per_batch, self.max_batch_size)
+        started = time.perf_counter()
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="embedding"
+        )
+        try:
+            pending = {}
+            batch_iter = iter(batches)
+
+            def submit_next() -> bool:
+                indices = next(batch_iter, None)
+                if indices is None:
+                    return False
+                batch_tokens = sum(token_counts[i] for i in indices)
+                future = executor.submit(
+                    self._embed_batch, [texts[i] for i in indices], batch_tokens, stats
+                )
+                pending[future] = (indices, batch_tokens)
+                return True
+
+            # 동시 실행 수만큼만 제출하여 메모리 사용량 제한
+            while len(pending) < self.max_concurrency and submit_next():
+                pass
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    indices, batch_tokens = pending.pop(future)
+                    vectors = future.result()
+                    with self._stats_lock:
+                        stats.chunks += len(indices)
+                        stats.tokens += batch_tokens
+                        stats.batches += 1
+                        stats.elapsed_s = time.perf_counter() - started
+                    submit_next()
+                    yield indices, vectors
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            stats.elapsed_s = time.perf_counter() - started
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        텍스트 임베딩 (입력 순서대로 반환)
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Returns:
+            List[List[float]]: 임베딩 벡터 리스트
+        """
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        for indices, vectors in self.iter_embeddings(texts):
+            for i, vector in zip(indices, vectors):
+                results[i] = vector
+        return results
+
+    def _embed_batch(
+        self, texts: List[str], batch_tokens: int, stats: EmbeddingStats
+    ) -> List[List[float]]:
+        """단일 배치 임베딩 (레이트 리밋 대기 + 429 재시도)"""
+        attempt = 0
+        while True:
+            waited = self.rate_limiter.acquire(batch_tokens)
+            if waited:
+                with self._stats_lock:
+                    stats.rate_limit_wait_s += waited
+
+            try:
+                vectors = self.embeddings.embed_documents(texts)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                    raise
+
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = min(self.max_delay, self.base_delay * 2**attempt)
+                    delay *= 0.5 + random.random() / 2
+                self.rate_limiter.pause(delay)
+                attempt += 1
+                with self._stats_lock:
+                    stats.retries += 1
+                continue
+
+            if len(vectors) != len(texts):
+                raise ValueError(
+                    f"임베딩 개수가 입력과 다릅니다: {len(vectors)} != {len(texts)}"
+                )
+            return vectors
@@ -0,0 +1,220 @@
+"""
+Index Manifest Module
+증분 재인덱싱을 위한 인덱스 매니페스트 (파일 경로 → 콘텐츠 해시 → 청크 ID)
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+@dataclass
+class ManifestDiff:
+    """매니페스트와 현재 문서 디렉토리의 차이"""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.deleted)
+
+
+class IndexManifest:
+    """
+    인덱스 매니페스트
+
+    문서 디렉토리 기준 상대 경로마다 콘텐츠 해시(sha256)와 해당 파일에서
+    생성된 청크 ID 목록을 기록합니다. 인덱스 디렉토리 안에 `manifest.json`
+    으로 저장되어, 다음 초기화 때 추가/변경/삭제된 파일만 다시 임베딩할 수
+    있게 합니다.
+    """
+
+    FILENAME = "manifest.json"
+    VERSION = 1
+
+    def __init__(self, files: Optional[Dict[str, dict]] = None):
+        """
+        초기화
+
+        Args:
+            files: {상대 경로: {"hash", "size", "mtime_ns", "chunk_ids"}} 딕셔너리
+        """
+        self.files: Dict[str, dict] = files or {}
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """
+        파일 콘텐츠의 sha256 해시 계산
+
+        Args:
+            file_path: 파일 경로
+
+        Returns:
+            str: 16진수 해시 문자열
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_chunk_ids(rel_path: str, content_hash: str, count: int) -> List[str]:
+        """
+        파일의 청크 ID 생성
+
+        ID에 콘텐츠 해시가 포함되므로 파일이 바뀌면 ID도 바뀝니다.
+
+        Args:
+            rel_path: 문서 디렉토리 기준 상대 경로
+            content_hash: 파일 콘텐츠 해시
+            count: 청크 개수
+
+        Returns:
+            List[str]: `{경로}#{해시 앞 12자}#{순번}` 형식의 ID 리스트
+        """
+        return [f"{rel_path}#{content_hash[:12]}#{i}" for i in range(count)]
+
+    @classmethod
+    def path_for(cls, index_path: str) -> str:
+        """인덱스 경로에 대응하는 매니페스트 파일 경로"""
+        return os.path.join(index_path, cls.FILENAME)
+
+    @classmethod
+    def load(cls, index_path: str) -> Optional["IndexManifest"]:
+        """
+        매니페스트 로드
+
+        Args:
+            index_path: 인덱스 디렉토리 경로
+
+        Returns:
+            Optional[IndexManifest]: 매니페스트 (없거나 손상된 경우 None)
+        """
+        manifest_path = cls.path_for(index_path)
+        if not os.path.exists(manifest_path):
+            return None
+
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  매니페스트 로드 실패: {e}")
+            return None
+
+        if data.get("version") != cls.VERSION:
+            print(f"⚠️  지원하지 않는 매니페스트 버전: {data.get('version')}")
+            return None
+
+        return cls(data.get("files", {}))
+
+    def save(self, index_path: str):
+        """
+        매니페스트 저장 (임시 파일에 쓴 뒤 교체하여 원자적으로 저장)
+
+        Args:
+            index_path: 인덱스 디렉토리 경로
+        """
+        os.makedirs(index_path, exist_ok=True)
+        manifest_path = self.path_for(index_path)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": self.VERSION, "files": self.files},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(tmp_path, manifest_path)
+
+    def scan(self, docs_path: str, pattern: str = "**/*.md") -> Dict[str, dict]:
+        """
+        문서 디렉토리의 현재 파일 상태 수집
+
+        크기와 수정 시각이 매니페스트와 같으면 저장된 해시를 재사용하고,
+        다른 경우에만 파일을 읽어 해시를 계산합니다.
+
+        Args:
+            docs_path: 문서 디렉토리 경로
+            pattern: 파일 glob 패턴
+
+        Returns:
+            Dict[str, dict]: {상대 경로: {"hash", "size", "mtime_ns"}}
+        """
+        current = {}
+        root = Path(docs_path)
+        for file_path in sorted(root.glob(pattern)):
+            if not file_path.is_file():
+                continue
+
+            rel_path = file_path.relative_to(root).as_posix()
+            stat = file_path.stat()
+            entry = self.files.get(rel_path)
+
+            if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+                content_hash = entry["hash"]
+            else:
+                content_hash = self.hash_file(str(file_path))
+
+            current[rel_path] = {
+                "hash": content_hash,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+        return current
+
+    def diff(self, current: Dict[str, dict]) -> ManifestDiff:
+        """
+        현재 파일 상태와 매니페스트 비교
+
+        Args:
+            current: `scan()` 결과
+
+        Returns:
+            ManifestDiff: 추가/변경/삭제/유지 파일 목록
+        """
+        result = ManifestDiff()
+        for rel_path, info in current.items():
+            entry = self.files.get(rel_path)
+            if entry is None:
+                result.added.append(rel_path)
+            elif entry["hash"] != info["hash"]:
+                result.changed.append(rel_path)
+            else:
+                result.unchanged.append(rel_path)
+
+        result.deleted = sorted(set(self.files) - set(current))
+        return result
+
+    def chunk_ids_for(self, rel_paths: List[str]) -> List[str]:
+        """여러 파일의 청크 ID를 모아서 반환"""
+        ids = []
+        for rel_path in rel_paths:
+            ids.extend(self.files.get(rel_path, {}).get("chunk_ids", []))
+        return ids
+
+    def update(self, rel_path: str, info: dict, chunk_ids: List[str]):
+        """
+        파일 항목 추가/갱신
+
+        Args:
+            rel_path: 상대 경로
+            info: `scan()` 결과의 파일 정보
+            chunk_ids: 해당 파일의 청크 ID 리스트
+        """
+        self.files[rel_path] = {**info, "chunk_ids": list(chunk_ids)}
+
+    def remove(self, rel_path: str):
+        """파일 항목 삭제"""
+        self.files.pop(rel_path, None)
+
+    def refresh_stat(self, rel_path: str, info: dict):
+        """해시는 같지만 크기/수정 시각이 바뀐 파일의 상태 정보만 갱신"""
+        if rel_path in self.files:
+            self.files[rel_path].update(size=info["size"], mtime_ns=info["mtime_ns"])
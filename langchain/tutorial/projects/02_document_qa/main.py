@@ -5,13 +5,20 @@ Document Q&A System - Main Entry Point
 
 import os
 import sys
+import json
+import asyncio
 import argparse
 from pathlib import Path
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
 
 from rag_pipeline import RAGPipeline
-from document_loader import DocumentLoader
+from document_loader import DocumentLoader, DocumentStats
+from index_manifest import IndexManifest
 from access_control import AccessControl
 
 # 환경 변수 로드
@@ -21,16 +28,47 @@ load_dotenv()
 class DocumentQASystem:
     """문서 Q&A 시스템 메인 클래스"""
 
-    def __init__(self, docs_path: str, index_path: str = "faiss_index"):
+    def __init__(
+        self,
+        docs_path: str,
+        index_path: str = "faiss_index",
+        cache_dir: Optional[str] = None,
+        embedding_options: Optional[Dict[str, Any]] = None,
+        index_format: str = "faiss",
+        index_options: Optional[Dict[str, Any]] = None,
+        answer_cache_options: Optional[Dict[str, Any]] = None,
+        search_type: str = "similarity",
+        search_kwargs: Optional[Dict[str, Any]] = None,
+        embeddings: Optional[Embeddings] = None,
+        llm: Optional[BaseChatModel] = None,
+    ):
         """
         초기화
 
         Args:
             docs_path: 문서 디렉토리 경로
             index_path: FAISS 인덱스 저장 경로
+            cache_dir: 임베딩 캐시 디렉토리 (None이면 캐시 사용 안 함)
+            embedding_options: 임베딩 파이프라인 옵션 (동시 실행 수, TPM/RPM 한도 등)
+            index_format: 인덱스 저장 포맷 ("faiss" 또는 메모리 맵 기반 "native")
+            index_options: 벡터 인덱스 옵션 (index_type, train_threshold, nprobe, quantization 등)
+            answer_cache_options: 의미 기반 답변 캐시 옵션 (None이면 사용 안 함)
+            search_type: 검색 모드 ("similarity", "mmr", "similarity_score_threshold")
+            search_kwargs: 검색 모드 옵션 (fetch_k, lambda_mult, score_threshold)
+            embeddings: 임베딩 모델 (기본: OpenAI text-embedding-3-small)
+            llm: 답변 생성 LLM (기본: OpenAI gpt-4o-mini)
         """
         self.docs_path = docs_path
         self.index_path = index_path
+        self.cache_dir = cache_dir
+        self.embedding_options = embedding_options
+        self.index_format = index_format
+        self.index_options = index_options
+        self.answer_cache_options = answer_cache_options
+        self.search_type = search_type
+        self.search_kwargs = search_kwargs
+        self.embeddings = embeddings
+        self.llm = llm
         self.loader = DocumentLoader(docs_path)
         self.access_control = AccessControl()
         self.rag_pipeline: Optional[RAGPipeline] = None
@@ -39,6 +77,9 @@ class DocumentQASystem:
         """
         시스템 초기화 및 인덱스 로드/생성
 
+        기존 인덱스에 매니페스트가 있으면 문서 디렉토리와 비교하여
+        추가/변경/삭제된 파일만 다시 임베딩합니다.
+
         Args:
             force_reindex: 강제 재인덱싱 여부
         """
@@ -48,32 +89,138 @@ class DocumentQASystem:
         if os.path.exists(self.index_path) and not force_reindex:
             print(f"📂 기존 인덱스 로드 중: {self.index_path}")
             try:
-                self.rag_pipeline = RAGPipeline.load_index(self.index_path)
+                self.rag_pipeline = RAGPipeline.load_index(
+                    self.index_path,
+                    cache_dir=self.cache_dir,
+                    embedding_options=self.embedding_options,
+                    index_options=self.index_options,
+                    answer_cache_options=self.answer_cache_options,
+                    embeddings=self.embeddings,
+                    llm=self.llm,
+                )
+                self.rag_pipeline.set_access_control(self.access_control)
+                manifest = IndexManifest.load(self.index_path)
+                if manifest is None:
+                    print("⚠️  매니페스트가 없어 증분 업데이트를 건너뜁니다. (--reindex로 생성)")
+                else:
+                    self._sync_index(manifest)
                 print("✅ 인덱스 로드 완료!")
                 return
             except Exception as e:
                 print(f"⚠️  인덱스 로드 실패: {e}")
                 print("🔄 새로 인덱싱을 시작합니다...")
 
-        # 문서 로드 및 인덱싱
-        print(f"📚 문서 로드 중: {self.docs_path}")
-        documents = self.loader.load_documents()
+        # 문서 로드와 인덱싱을 스트리밍으로 진행 (전체 청크를 메모리에 올리지 않음)
+        print(f"📚 문서 로드 및 인덱싱 중: {self.docs_path}")
+        manifest = IndexManifest()
+        current = manifest.scan(self.docs_path)
+        chunk_ids_by_file: Dict[str, List[str]] = {}
+        doc_stats = DocumentStats()
 
-        if not documents:
+        def tracked_chunks():
+            for chunk in doc_stats.track(self.loader.iter_chunks(parallel=True)):
+                chunk_ids_by_file.setdefault(self._rel_path(chunk), []).append(chunk.id)
+                yield chunk
+
+        print("🔧 RAG 파이프라인 구축 중...")
+        self.rag_pipeline = RAGPipeline(
+            cache_dir=self.cache_dir,
+            embedding_options=self.embedding_options,
+            index_options=self.index_options,
+            answer_cache_options=self.answer_cache_options,
+            embeddings=self.embeddings,
+            llm=self.llm,
+        )
+        self.rag_pipeline.set_access_control(self.access_control)
+        self.rag_pipeline.add_documents_stream(tracked_chunks())
+
+        if not doc_stats.total_docs:
             print("❌ 로드된 문서가 없습니다. 경로를 확인해주세요.")
             sys.exit(1)
 
-        print(f"✅ {len(documents)}개의 청크가 로드되었습니다.")
+        print(f"✅ {doc_stats.total_docs}개의 청크가 인덱싱되었습니다.")
 
-        # RAG 파이프라인 생성
-        print("🔧 RAG 파이프라인 구축 중...")
-        self.rag_pipeline = RAGPipeline(documents)
+        # 매니페스트 생성 (청크 ID는 로더가 파일 경로와 콘텐츠 해시로 부여)
+        for rel_path, info in current.items():
+            manifest.update(rel_path, info, chunk_ids_by_file.get(rel_path, []))
 
         # 인덱스 저장
         print(f"💾 인덱스 저장 중: {self.index_path}")
-        self.rag_pipeline.save_index(self.index_path)
+        self.rag_pipeline.save_index(
+            self.index_path, native=self.index_format == "native"
+        )
+        manifest.save(self.index_path)
         print("✅ 초기화 완료!")
 
+    def _rel_path(self, doc: Document) -> str:
+        """청크의 문서 디렉토리 기준 상대 경로"""
+        source = Path(doc.metadata.get("source", ""))
+        try:
+            return source.relative_to(self.docs_path).as_posix()
+        except ValueError:
+            return source.as_posix()
+
+    def _sync_index(self, manifest: IndexManifest):
+        """
+        매니페스트 기반 증분 재인덱싱
+
+        변경/삭제된 파일의 기존 벡터를 삭제하고, 추가/변경된 파일만
+        다시 청킹하여 임베딩한 뒤 인덱스와 매니페스트를 저장합니다.
+
+        Args:
+            manifest: 기존 인덱스의 매니페스트
+        """
+        if not os.path.exists(self.docs_path):
+            print(f"⚠️  문서 경로가 없어 증분 업데이트를 건너뜁니다: {self.docs_path}")
+            return
+
+        current = manifest.scan(self.docs_path)
+        diff = manifest.diff(current)
+
+        if not diff.has_changes:
+            # 내용은 같지만 수정 시각만 바뀐 파일의 상태 정보 갱신
+            stale_stat = [
+                rel_path
+                for rel_path in diff.unchanged
+                if manifest.files[rel_path].get("mtime_ns") != current[rel_path]["mtime_ns"]
+            ]
+            if stale_stat:
+                for rel_path in stale_stat:
+                    manifest.refresh_stat(rel_path, current[rel_path])
+                manifest.save(self.index_path)
+            print("✅ 변경된 문서가 없습니다.")
+            return
+
+        print(
+            f"🔄 증분 업데이트: 추가 {len(diff.added)}개, "
+            f"변경 {len(diff.changed)}개, 삭제 {len(diff.deleted)}개 파일"
+        )
+
+        # 오래된 벡터 삭제
+        stale_ids = manifest.chunk_ids_for(diff.changed + diff.deleted)
+        self.rag_pipeline.delete_documents(stale_ids)
+        for rel_path in diff.changed + diff.deleted:
+            manifest.remove(rel_path)
+
+        # 추가/변경된 파일만 다시 청킹 및 임베딩
+        chunks_by_file = self.loader.load_files(diff.added + diff.changed)
+        documents = []
+        ids = []
+        for rel_path, chunks in chunks_by_file.items():
+            chunk_ids = [chunk.id for chunk in chunks]
+            manifest.update(rel_path, current[rel_path], chunk_ids)
+            documents.extend(chunks)
+            ids.extend(chunk_ids)
+
+        self.rag_pipeline.add_documents(documents, ids=ids)
+        for rel_path in diff.unchanged:
+            manifest.refresh_stat(rel_path, current[rel_path])
+
+        self.rag_pipeline.save_index(
+            self.index_path, native=self.index_format == "native"
+        )
+        manifest.save(self.index_path)
+
     def run_interactive(self):
         """대화형 Q&A 인터페이스 실행"""
         if not self.rag_pipeline:
@@ -93,8 +240,10 @@ class DocumentQASystem:
         print(f"\n안녕하세요, {username}님!")
         print("질문을 입력하세요. 종료하려면 'quit' 또는 'exit'를 입력하세요.\n")
 
-        # Q&A 체인 생성
-        qa_chain = self.rag_pipeline.create_qa_chain()
+        # Q&A 체인 생성 (사용자가 접근 가능한 문서만 검색)
+        qa_chain = self.rag_pipeline.create_qa_chain(
+            user=username, search_type=self.search_type, search_kwargs=self.search_kwargs
+        )
 
         # 대화 루프
         while True:
@@ -122,7 +271,7 @@ class DocumentQASystem:
                     continue
 
                 # 답변 출력
-                print("💡 답변:")
+                print("💡 답변:" + (" (⚡ 캐시)" if result.get("cached") else ""))
                 print("-" * 60)
                 print(result["result"])
                 print("-" * 60)
@@ -159,30 +308,104 @@ class DocumentQASystem:
             return {"error": "RAG 파이프라인이 초기화되지 않았습니다."}
 
         try:
-            qa_chain = self.rag_pipeline.create_qa_chain()
+            qa_chain = self.rag_pipeline.create_qa_chain(
+                user=username, search_type=self.search_type, search_kwargs=self.search_kwargs
+            )
             result = qa_chain.invoke({"query": question})
+            return self._format_result(result, username)
 
-            # 접근 제어 적용
-            filtered_sources = self.access_control.filter_documents(
-                username, result.get("source_documents", [])
-            )
+        except Exception as e:
+            return {"error": str(e)}
+
+    def answer_many(
+        self, questions: List[str], username: str = "admin", concurrency: int = 4
+    ) -> List[dict]:
+        """
+        여러 질문 일괄 처리 (야간 평가, FAQ 일괄 생성용)
 
-            if not filtered_sources:
-                return {"error": "접근 권한이 없는 문서입니다."}
+        질문 임베딩과 벡터 검색은 한 번에 수행하고 LLM 호출은 최대
+        `concurrency`개씩 동시에 실행합니다.
 
-            return {
-                "answer": result["result"],
-                "sources": [
-                    {
-                        "name": Path(doc.metadata.get("source", "")).name,
-                        "content": doc.page_content[:200] + "...",
-                    }
-                    for doc in filtered_sources
-                ],
-            }
+        Args:
+            questions: 질문 리스트
+            username: 사용자 이름
+            concurrency: 동시에 실행할 LLM 호출 수
+
+        Returns:
+            List[dict]: 입력 순서대로 `run_single_query()`와 같은 형식의 결과
+                (실패한 질문은 해당 항목에만 error)
+        """
+        if not self.rag_pipeline:
+            return [{"error": "RAG 파이프라인이 초기화되지 않았습니다."} for _ in questions]
 
+        try:
+            results = self.rag_pipeline.answer_many(
+                questions,
+                user=username,
+                concurrency=concurrency,
+                search_type=self.search_type,
+                search_kwargs=self.search_kwargs,
+            )
         except Exception as e:
-            return {"error": str(e)}
+            return [{"error": str(e)} for _ in questions]
+        return [self._format_result(result, username) for result in results]
+
+    async def aanswer_many(
+        self, questions: List[str], username: str = "admin", concurrency: int = 4
+    ) -> List[dict]:
+        """`answer_many()`의 비동기 버전"""
+        if not self.rag_pipeline:
+            return [{"error": "RAG 파이프라인이 초기화되지 않았습니다."} for _ in questions]
+
+        try:
+            results = await self.rag_pipeline.aanswer_many(
+                questions,
+                user=username,
+                concurrency=concurrency,
+                search_type=self.search_type,
+                search_kwargs=self.search_kwargs,
+            )
+        except Exception as e:
+            return [{"error": str(e)} for _ in questions]
+        return [self._format_result(result, username) for result in results]
+
+    async def aanswer(self, question: str, username: str = "admin") -> dict:
+        """
+        단일 질문 비동기 처리
+
+        Args:
+            question: 질문
+            username: 사용자 이름
+
+        Returns:
+            dict: 답변 및 소스 정보
+        """
+        return (await self.aanswer_many([question], username, concurrency=1))[0]
+
+    def _format_result(self, result: dict, username: str) -> dict:
+        """Q&A 결과에 접근 제어를 적용하여 API 응답 형식으로 변환"""
+        if "error" in result:
+            return {"error": result["error"]}
+
+        # 접근 제어 적용
+        filtered_sources = self.access_control.filter_documents(
+            username, result.get("source_documents", [])
+        )
+
+        if not filtered_sources:
+            return {"error": "접근 권한이 없는 문서입니다."}
+
+        return {
+            "answer": result["result"],
+            "cached": result.get("cached", False),
+            "sources": [
+                {
+                    "name": Path(doc.metadata.get("source", "")).name,
+                    "content": doc.page_content[:200] + "...",
+                }
+                for doc in filtered_sources
+            ],
+        }
 
 
 def main():
@@ -200,6 +423,96 @@ def main():
         default="faiss_index",
         help="FAISS 인덱스 저장 경로",
     )
+    parser.add_argument(
+        "--index-format",
+        choices=["faiss", "native"],
+        default="faiss",
+        help="인덱스 저장 포맷 (native: pickle 없이 메모리 맵으로 빠르게 로드)",
+    )
+    parser.add_argument(
+        "--index-type",
+        choices=["flat", "ivf", "hnsw", "pq"],
+        default=None,
+        help="벡터 인덱스 타입 (청크 수가 --train-threshold 이상일 때 적용, 기본: 저장된 인덱스 설정 또는 flat)",
+    )
+    parser.add_argument(
+        "--train-threshold",
+        type=int,
+        default=None,
+        help="ANN 인덱스로 전환할 최소 청크 수 (기본: 저장된 인덱스 설정 또는 20000)",
+    )
+    parser.add_argument(
+        "--nprobe",
+        type=int,
+        default=None,
+        help="IVF/PQ 검색 시 탐색할 클러스터 수 (기본: 저장된 인덱스 설정 또는 16)",
+    )
+    parser.add_argument(
+        "--ef-search",
+        type=int,
+        default=None,
+        help="HNSW 검색 후보 수 (기본: 저장된 인덱스 설정 또는 64)",
+    )
+    parser.add_argument(
+        "--quantization",
+        choices=["none", "fp16", "int8"],
+        default=None,
+        help="벡터 스칼라 양자화 (기본: 저장된 인덱스 설정 또는 none)",
+    )
+    parser.add_argument(
+        "--rerank-factor",
+        type=int,
+        default=None,
+        help="양자화/PQ 인덱스에서 원본 벡터로 다시 정렬할 후보 배수 (기본: 4)",
+    )
+    parser.add_argument(
+        "--search-type",
+        choices=["similarity", "mmr", "similarity_score_threshold"],
+        default="similarity",
+        help="검색 모드 (mmr: 중복 청크를 줄여 다양한 문서 선택, similarity_score_threshold: 유사도 임계값 이상만)",
+    )
+    parser.add_argument(
+        "--fetch-k", type=int, default=20, help="mmr/임계값 모드에서 다시 고를 후보 수"
+    )
+    parser.add_argument(
+        "--lambda-mult",
+        type=float,
+        default=0.5,
+        help="MMR 관련도 가중치 (1이면 관련도만, 0이면 다양성만)",
+    )
+    parser.add_argument(
+        "--score-threshold",
+        type=float,
+        default=None,
+        help="similarity_score_threshold 모드의 최소 코사인 유사도",
+    )
+    parser.add_argument(
+        "--answer-cache-threshold",
+        type=float,
+        default=0.9,
+        help="답변 캐시 히트로 볼 질문 간 최소 코사인 유사도",
+    )
+    parser.add_argument(
+        "--no-answer-cache", action="store_true", help="의미 기반 답변 캐시 사용 안 함"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="embedding_cache",
+        help="임베딩 캐시 디렉토리 (빈 문자열이면 캐시 사용 안 함)",
+    )
+    parser.add_argument(
+        "--embedding-concurrency",
+        type=int,
+        default=4,
+        help="동시에 실행할 임베딩 배치 수",
+    )
+    parser.add_argument(
+        "--tpm", type=int, default=None, help="임베딩 분당 토큰 한도"
+    )
+    parser.add_argument(
+        "--rpm", type=int, default=None, help="임베딩 분당 요청 한도"
+    )
     parser.add_argument(
         "--reindex", action="store_true", help="강제 재인덱싱"
     )
@@ -207,7 +520,15 @@ def main():
         "--query", type=str, help="단일 질문 (대화형 모드 대신)"
     )
     parser.add_argument(
-        "--user", type=str, default="admin", help="사용자 이름 (query 모드에서 사용)"
+        "--questions-file",
+        type=str,
+        help="일괄 처리할 질문 파일 (한 줄에 한 질문, 결과는 JSON Lines로 출력)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="일괄 처리 시 동시에 실행할 LLM 호출 수"
+    )
+    parser.add_argument(
+        "--user", type=str, default="admin", help="사용자 이름 (query/일괄 모드에서 사용)"
     )
 
     args = parser.parse_args()
@@ -219,11 +540,52 @@ def main():
         sys.exit(1)
 
     # 시스템 초기화
-    qa_system = DocumentQASystem(args.docs_path, args.index_path)
+    qa_system = DocumentQASystem(
+        args.docs_path,
+        args.index_path,
+        cache_dir=args.cache_dir or None,
+        embedding_options={
+            "max_concurrency": args.embedding_concurrency,
+            "tokens_per_minute": args.tpm,
+            "requests_per_minute": args.rpm,
+        },
+        index_format=args.index_format,
+        # 지정한 옵션만 전달 (나머지는 저장된 인덱스 설정 또는 IndexConfig 기본값)
+        index_options={
+            key: value
+            for key, value in (
+                ("index_type", args.index_type),
+                ("train_threshold", args.train_threshold),
+                ("nprobe", args.nprobe),
+                ("ef_search", args.ef_search),
+                ("quantization", args.quantization),
+                ("rerank_factor", args.rerank_factor),
+            )
+            if value is not None
+        },
+        answer_cache_options=None
+        if args.no_answer_cache
+        else {"threshold": args.answer_cache_threshold},
+        search_type=args.search_type,
+        search_kwargs={
+            "fetch_k": args.fetch_k,
+            "lambda_mult": args.lambda_mult,
+            "score_threshold": args.score_threshold,
+        },
+    )
     qa_system.initialize(force_reindex=args.reindex)
 
     # 실행 모드 선택
-    if args.query:
+    if args.questions_file:
+        # 일괄 처리 모드
+        with open(args.questions_file, "r", encoding="utf-8") as f:
+            questions = [line.strip() for line in f if line.strip()]
+        results = asyncio.run(
+            qa_system.aanswer_many(questions, args.user, concurrency=args.concurrency)
+        )
+        for question, result in zip(questions, results):
+            print(json.dumps({"question": question, **result}, ensure_ascii=False))
+    elif args.query:
         # 단일 질문 모드
         result = qa_system.run_single_query(args.query, args.user)
         print("\n💡 답변:")
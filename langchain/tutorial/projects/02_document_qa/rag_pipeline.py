@@ -3,55 +3,217 @@ RAG Pipeline Implementation
 RAG (Retrieval-Augmented Generation) 파이프라인 구현
 """
 
-from typing import List, Optional
+import hashlib
+import json
+import os
+import uuid
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import faiss
+import numpy as np
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain_community.vectorstores import FAISS
 from langchain.chains import RetrievalQA
+from langchain.chains.base import Chain
 from langchain.prompts import PromptTemplate
+from langchain_core.callbacks import CallbackManagerForChainRun, CallbackManagerForRetrieverRun
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.retrievers import BaseRetriever
+
+from access_control import AccessControl
+from bm25_index import BM25Index, reciprocal_rank_fusion
+from embedding_cache import CachedEmbeddings
+from embedding_pipeline import EmbeddingPipeline, EmbeddingStats
+from native_index import NativeVectorStore
+from search_modes import SearchConfig
+from semantic_cache import SemanticCache
+from vector_index import (
+    IndexConfig,
+    RerankVectors,
+    build_index,
+    compact_ids,
+    configure_search,
+    exact_rerank,
+    index_memory_bytes,
+    index_quantization,
+    index_type_name,
+    reconstruct_all,
+    reconstruct_positions,
+    search_parameters,
+    supports_remove,
+)
 
 
 class RAGPipeline:
     """RAG 파이프라인 클래스"""
 
-    def __init__(self, documents: Optional[List[Document]] = None):
+    INDEX_META_FILE = "vector_index.json"
+    RERANK_VECTORS_FILE = "rerank_vectors.npy"
+
+    def __init__(
+        self,
+        documents: Optional[List[Document]] = None,
+        ids: Optional[List[str]] = None,
+        cache_dir: Optional[str] = None,
+        embedding_options: Optional[Dict[str, Any]] = None,
+        index_options: Optional[Dict[str, Any]] = None,
+        answer_cache_options: Optional[Dict[str, Any]] = None,
+        embeddings: Optional[Embeddings] = None,
+        llm: Optional[BaseChatModel] = None,
+    ):
         """
         초기화
 
         Args:
             documents: 문서 리스트 (새로 인덱싱할 경우)
+            ids: 문서별 고유 ID 리스트 (증분 인덱싱용, 선택)
+            cache_dir: 임베딩 캐시 디렉토리 (지정 시 같은 청크를 다시 임베딩하지 않음)
+            embedding_options: `EmbeddingPipeline` 옵션 (max_concurrency,
+                tokens_per_minute, requests_per_minute 등)
+            index_options: `IndexConfig` 옵션 (index_type, train_threshold,
+                nprobe, ef_search, quantization, rerank_factor 등). 기본은 flat 인덱스
+            answer_cache_options: `SemanticCache` 옵션 (threshold, max_entries,
+                ttl_seconds). None이면 답변 캐시 사용 안 함
+            embeddings: 임베딩 모델 (기본: OpenAI text-embedding-3-small)
+            llm: 답변 생성 LLM (기본: OpenAI gpt-4o-mini)
         """
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-        self.vectorstore: Optional[FAISS] = None
+        self.embeddings = embeddings or OpenAIEmbeddings(model="text-embedding-3-small")
+        if cache_dir:
+            # 캐시는 embeddings.model(없으면 클래스 이름)별로 구분되어 다른 모델과 섞이지 않음
+            self.embeddings = CachedEmbeddings(self.embeddings, cache_dir)
+        self.embedding_pipeline = EmbeddingPipeline(
+            self.embeddings, **(embedding_options or {})
+        )
+        self.llm = llm or ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        self.answer_cache: Optional[SemanticCache] = None
+        if answer_cache_options is not None:
+            self.answer_cache = SemanticCache(self.embeddings, **answer_cache_options)
+        self.index_config = IndexConfig(**(index_options or {}))
+        self.vectorstore: Optional[FAISS | NativeVectorStore] = None
+
+        # 양자화/PQ 인덱스 재순위용 원본 float 벡터 (FAISS 위치 순서)
+        self._rerank_vectors: Optional[RerankVectors] = None
+
+        # 검색 단계 접근 제어 (FAISS 내부 ID 기준 사용자별 비트셋)
+        self.access_control: Optional[AccessControl] = None
+        self._index_version = 0
+        self._acl_cache_key: Optional[Tuple[int, int]] = None
+        self._acl_bitsets: Dict[str, Optional[Tuple[np.ndarray, int]]] = {}
 
         if documents:
-            self._build_vectorstore(documents)
+            self._build_vectorstore(documents, ids=ids)
 
-    def _build_vectorstore(self, documents: List[Document]):
+    def _build_vectorstore(
+        self, documents: List[Document], ids: Optional[List[str]] = None
+    ):
         """
         벡터 스토어 구축
 
         Args:
             documents: 인덱싱할 문서 리스트
+            ids: 문서별 고유 ID 리스트 (선택)
         """
         print(f"🔨 {len(documents)}개 문서로 벡터 스토어 구축 중...")
-        self.vectorstore = FAISS.from_documents(documents, self.embeddings)
+        self.vectorstore = None
+        self._set_rerank_vectors(None)
+        self._index_version += 1
+        self._index_documents(documents, ids)
+        self._maybe_train_index()
+        self._flush_embedding_cache()
         print("✅ 벡터 스토어 구축 완료!")
 
-    def create_qa_chain(self, k: int = 3) -> RetrievalQA:
+    def _index_documents(
+        self,
+        documents: List[Document],
+        ids: Optional[List[str]] = None,
+        report: bool = True,
+    ) -> EmbeddingStats:
+        """
+        임베딩 파이프라인으로 문서를 임베딩하며 완료된 배치부터 인덱스에 추가
+
+        Args:
+            documents: 인덱싱할 문서 리스트
+            ids: 문서별 고유 ID 리스트 (선택)
+            report: 처리량 출력 여부
+
+        Returns:
+            EmbeddingStats: 임베딩 통계
+        """
+        if ids is None and all(doc.id for doc in documents):
+            ids = [doc.id for doc in documents]
+
+        texts = [doc.page_content for doc in documents]
+        self._ensure_mutable()
+        self._index_version += 1
+        for indices, vectors in self.embedding_pipeline.iter_embeddings(texts):
+            text_embeddings = [(texts[i], vector) for i, vector in zip(indices, vectors)]
+            metadatas = [documents[i].metadata for i in indices]
+            batch_ids = [ids[i] for i in indices] if ids else None
+
+            if self.vectorstore is None:
+                self.vectorstore = FAISS.from_embeddings(
+                    text_embeddings, self.embeddings, metadatas=metadatas, ids=batch_ids
+                )
+            else:
+                self.vectorstore.add_embeddings(
+                    text_embeddings, metadatas=metadatas, ids=batch_ids
+                )
+                if self._rerank_vectors is not None:
+                    batch = np.array(vectors, dtype=np.float32)
+                    if self.vectorstore._normalize_L2:
+                        faiss.normalize_L2(batch)
+                    self._rerank_vectors.append(batch)
+
+        stats = self.embedding_pipeline.last_stats
+        if report:
+            self._report_throughput(stats)
+        return stats
+
+    def _flush_embedding_cache(self):
+        """인덱싱이 끝난 뒤 임베딩 캐시 로그를 스냅샷으로 합침"""
+        if isinstance(self.embeddings, CachedEmbeddings):
+            self.embeddings.flush()
+
+    @staticmethod
+    def _report_throughput(stats: EmbeddingStats):
+        """임베딩 처리량 출력"""
+        print(
+            f"⚡ 임베딩 처리량: {stats.chunks_per_s:.1f} chunks/s, "
+            f"{stats.tokens_per_s:.0f} tokens/s "
+            f"({stats.batches}개 배치, 재시도 {stats.retries}회)"
+        )
+
+    def create_qa_chain(
+        self,
+        k: int = 3,
+        user: Optional[str] = None,
+        search_type: str = "similarity",
+        search_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Chain:
         """
         Q&A 체인 생성
 
         Args:
             k: 검색할 상위 문서 개수
+            user: 사용자 이름 (접근 제어 설정 시 허용된 문서만 검색)
+            search_type: 검색 모드 ("similarity", "mmr", "similarity_score_threshold")
+            search_kwargs: `SearchConfig` 옵션 (fetch_k, lambda_mult, score_threshold)
 
         Returns:
-            RetrievalQA: 질의응답 체인
+            Chain: 질의응답 체인 (답변 캐시 설정 시 `CachedQAChain`)
         """
         if not self.vectorstore:
             raise ValueError("벡터 스토어가 초기화되지 않았습니다.")
+        search = SearchConfig(search_type, **(search_kwargs or {}))
+        return self._with_answer_cache(self._build_qa_chain(k, user, search), k, user, search)
 
+    def _build_qa_chain(
+        self, k: int, user: Optional[str], search: Optional[SearchConfig] = None
+    ) -> RetrievalQA:
+        """검색기와 프롬프트를 설정한 `RetrievalQA` 체인 생성"""
         # 한국어 최적화 프롬프트
         template = """당신은 문서 기반 질의응답 전문가입니다.
 주어진 문맥(context)을 바탕으로 질문에 정확하게 답변하세요.
@@ -74,78 +236,740 @@ class RAGPipeline:
             template=template, input_variables=["context", "question"]
         )
 
-        return RetrievalQA.from_chain_type(
+        qa_chain = RetrievalQA.from_chain_type(
             llm=self.llm,
             chain_type="stuff",
-            retriever=self.vectorstore.as_retriever(
-                search_type="similarity", search_kwargs={"k": k}
-            ),
+            retriever=self._retriever(k, user, search),
             chain_type_kwargs={"prompt": prompt},
             return_source_documents=True,
         )
+        return qa_chain
+
+    def _with_answer_cache(
+        self, qa_chain: Chain, k: int, user: Optional[str], search: Optional[SearchConfig] = None
+    ) -> Chain:
+        """답변 캐시가 설정되어 있으면 Q&A 체인을 캐시 체인으로 감쌈"""
+        if self.answer_cache is None:
+            return qa_chain
+        return CachedQAChain(qa_chain=qa_chain, pipeline=self, k=k, user=user, search=search)
+
+    def _answer_cache_scope(
+        self, k: int, user: Optional[str], search: Optional[SearchConfig] = None
+    ) -> str:
+        """
+        답변 캐시 범위 키 (인덱스 버전 + 사용자 허용 태그 + 검색 설정)
+
+        허용 태그가 같은 사용자끼리는 답변을 공유하고, 인덱스가 바뀌면
+        이전 답변을 재사용하지 않습니다.
+        """
+        tags: Any = "*"
+        if user is not None and self.access_control is not None:
+            allowed = self.access_control.allowed_tags(user)
+            tags = "*" if allowed is None else sorted(allowed)
+        search = search or SearchConfig()
+        payload = json.dumps([type(self).__name__, self._index_version, k, tags, search.to_dict()])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _retriever(
+        self, k: int, user: Optional[str] = None, search: Optional[SearchConfig] = None
+    ) -> BaseRetriever:
+        """사용자 접근 제어와 양자화 인덱스 재순위를 반영한 retriever 반환"""
+        return AccessControlledRetriever(pipeline=self, user=user, k=k, search=search)
 
     def search_similar_documents(
-        self, query: str, k: int = 3
+        self,
+        query: str,
+        k: int = 3,
+        user: Optional[str] = None,
+        search_type: str = "similarity",
+        search_kwargs: Optional[Dict[str, Any]] = None,
     ) -> List[tuple[Document, float]]:
         """
         유사 문서 검색
 
+        `user`가 주어지고 접근 제어가 설정되어 있으면 사용자가 접근 가능한
+        청크만 FAISS 검색 대상으로 삼으므로, 권한이 있는 문서가 충분하면
+        항상 k개가 반환됩니다. 양자화/PQ 인덱스는 `k * rerank_factor`개
+        후보를 원본 벡터의 정확한 거리로 다시 정렬합니다.
+
+        "mmr"/"similarity_score_threshold" 모드는 `fetch_k`개 후보의 벡터
+        행렬에서 다시 고르며, 점수는 쿼리와의 코사인 유사도입니다.
+
         Args:
             query: 검색 쿼리
             k: 반환할 문서 개수
+            user: 사용자 이름 (선택)
+            search_type: 검색 모드 ("similarity", "mmr", "similarity_score_threshold")
+            search_kwargs: `SearchConfig` 옵션 (fetch_k, lambda_mult, score_threshold)
+
+        Returns:
+            List[tuple[Document, float]]: (문서, 점수) 튜플 리스트 - similarity 모드는
+                제곱 L2 거리, 그 외 모드는 코사인 유사도
+        """
+        if not self.vectorstore:
+            raise ValueError("벡터 스토어가 초기화되지 않았습니다.")
+        search = SearchConfig(search_type, **(search_kwargs or {}))
+        return self._search_by_vectors([self.embeddings.embed_query(query)], k, user, search)[0]
+
+    def search_many(
+        self,
+        queries: List[str],
+        k: int = 3,
+        user: Optional[str] = None,
+        search_type: str = "similarity",
+        search_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        여러 쿼리 일괄 검색
+
+        모든 쿼리를 한 번의 임베딩 호출로 임베딩하고, 한 번의 행렬 검색으로
+        찾습니다.
+
+        Args:
+            queries: 검색 쿼리 리스트
+            k: 쿼리별 반환할 문서 개수
+            user: 사용자 이름 (선택)
+            search_type: 검색 모드 ("similarity", "mmr", "similarity_score_threshold")
+            search_kwargs: `SearchConfig` 옵션 (fetch_k, lambda_mult, score_threshold)
+
+        Returns:
+            List[List[Tuple[Document, float]]]: 입력 순서대로 쿼리별 (문서, 점수) 리스트
+        """
+        if not self.vectorstore:
+            raise ValueError("벡터 스토어가 초기화되지 않았습니다.")
+        if not queries:
+            return []
+        search = SearchConfig(search_type, **(search_kwargs or {}))
+        return self._search_by_vectors(self._embed_queries(queries), k, user, search)
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """쿼리 일괄 임베딩 (쿼리는 임베딩 캐시에 저장하지 않음)"""
+        return self._query_embeddings().embed_documents(queries)
+
+    async def _aembed_queries(self, queries: List[str]) -> List[List[float]]:
+        """쿼리 일괄 임베딩 (비동기)"""
+        return await self._query_embeddings().aembed_documents(queries)
+
+    def _query_embeddings(self) -> Embeddings:
+        embeddings = self.embeddings
+        if isinstance(embeddings, CachedEmbeddings) and not embeddings.cache_queries:
+            return embeddings.embeddings
+        return embeddings
+
+    def _search_by_vectors(
+        self,
+        vectors: List[List[float]],
+        k: int,
+        user: Optional[str] = None,
+        search: Optional[SearchConfig] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        쿼리 벡터들로 한 번에 검색 (접근 제어 사전 필터링 + 양자화 인덱스 재순위
+        + 검색 모드)
 
         Returns:
-            List[tuple[Document, float]]: (문서, 유사도 점수) 튜플 리스트
+            List[List[Tuple[Document, float]]]: 쿼리별 (문서, 점수) 리스트 - similarity
+                모드는 제곱 L2 거리, 그 외 모드는 코사인 유사도
         """
+        search = search or SearchConfig()
+        searched = self._search_positions(vectors, search.candidate_count(k), user)
+        if search.reranks:
+            queries = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+            selected = []
+            for query, (_, positions) in zip(queries, searched):
+                scores, order = search.select(query, self._candidate_vectors(positions), k)
+                selected.append((scores, positions[order]))
+            searched = selected
+        return self._documents_at(searched)
+
+    def _search_positions(
+        self, vectors: List[List[float]], k: int, user: Optional[str] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """쿼리별 상위 k개 (제곱 L2 거리, 인덱스 위치) - 가까운 순"""
+        # 모든 문서 접근 가능하면 None
+        allowed = None
+        if user is not None and self.access_control is not None:
+            allowed = self._allowed_bitset(user)
+            if allowed is not None and allowed[1] == 0:
+                empty = (np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64))
+                return [empty for _ in vectors]
+
+        if isinstance(self.vectorstore, NativeVectorStore):
+            mask = None
+            if allowed is not None:
+                mask = np.unpackbits(allowed[0], count=len(self.vectorstore), bitorder="little")
+                mask = mask.astype(bool)
+            return self.vectorstore.search_positions_batch(vectors, k, mask=mask)
+
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        if self.vectorstore._normalize_L2:
+            faiss.normalize_L2(matrix)
+
+        index = self.vectorstore.index
+        rerank = self._rerank_matrix()
+        fetch_k = k * self.index_config.rerank_factor if rerank is not None else k
+        params = None
+        if allowed is not None:
+            bitmap, allowed_count = allowed
+            fetch_k = min(fetch_k, allowed_count)
+            selector = faiss.IDSelectorBitmap(index.ntotal, faiss.swig_ptr(bitmap))
+            params = search_parameters(index, selector, self.index_config)
+        all_scores, all_positions = index.search(matrix, fetch_k, params=params)
+
+        results = []
+        for query, scores, positions in zip(matrix, all_scores, all_positions):
+            found = positions != -1
+            scores, positions = scores[found], positions[found]
+            if rerank is not None:
+                scores, positions = exact_rerank(rerank, query, positions, k)
+            results.append((scores, positions))
+        return results
+
+    def _candidate_vectors(self, positions: np.ndarray) -> np.ndarray:
+        """검색 후보 위치의 벡터 행렬 (압축 인덱스면 재순위용 원본 벡터)"""
+        if isinstance(self.vectorstore, NativeVectorStore):
+            return np.asarray(self.vectorstore.vectors[positions], dtype=np.float32)
+        rerank = self._rerank_matrix()
+        if rerank is not None:
+            return np.asarray(rerank[positions], dtype=np.float32)
+        return reconstruct_positions(self.vectorstore.index, positions)
+
+    def _documents_at(
+        self, searched: List[Tuple[np.ndarray, np.ndarray]]
+    ) -> List[List[Tuple[Document, float]]]:
+        """쿼리별 (점수, 위치)를 (문서, 점수) 리스트로 변환"""
+        if isinstance(self.vectorstore, NativeVectorStore):
+            # 쿼리 간에 겹치는 문서는 한 번만 조회
+            unique = list(dict.fromkeys(int(p) for _, positions in searched for p in positions))
+            by_position = dict(zip(unique, self.vectorstore.get_documents(unique)))
+        else:
+            mapping, docstore = self.vectorstore.index_to_docstore_id, self.vectorstore.docstore
+            by_position = {
+                int(p): docstore.search(mapping[int(p)]) for _, positions in searched for p in positions
+            }
+        return [
+            [(by_position[int(p)], float(score)) for score, p in zip(scores, positions)]
+            for scores, positions in searched
+        ]
+
+    def _retrieve_many(
+        self,
+        queries: List[str],
+        vectors: List[List[float]],
+        k: int,
+        user: Optional[str],
+        search: Optional[SearchConfig] = None,
+    ) -> List[List[Document]]:
+        """Q&A 체인의 검색기와 같은 방식으로 질문별 문서 검색"""
+        return [
+            [doc for doc, _ in matches]
+            for matches in self._search_by_vectors(vectors, k, user, search)
+        ]
+
+    def answer_many(
+        self,
+        questions: List[str],
+        k: int = 3,
+        user: Optional[str] = None,
+        concurrency: int = 4,
+        search_type: str = "similarity",
+        search_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 질문에 일괄 답변
+
+        답변 캐시에 없는 질문을 한 번의 임베딩 호출과 한 번의 행렬 검색으로
+        검색한 뒤, LLM 호출은 최대 `concurrency`개씩 동시에 실행합니다.
+        한 질문의 LLM 오류는 해당 항목의 `error`로만 기록됩니다.
+
+        Args:
+            questions: 질문 리스트
+            k: 질문별 검색할 문서 개수
+            user: 사용자 이름 (접근 제어 설정 시 허용된 문서만 검색)
+            concurrency: 동시에 실행할 LLM 호출 수
+            search_type: 검색 모드 ("similarity", "mmr", "similarity_score_threshold")
+            search_kwargs: `SearchConfig` 옵션 (fetch_k, lambda_mult, score_threshold)
+
+        Returns:
+            List[Dict[str, Any]]: 입력 순서대로 {result, source_documents, cached}
+                또는 {error}
+        """
+        search = SearchConfig(search_type, **(search_kwargs or {}))
+        results, pending, scope = self._lookup_answers(questions, k, user, search)
+        if not pending:
+            return results
+
+        queries = [questions[i] for i in pending]
+        try:
+            documents = self._retrieve_many(queries, self._embed_queries(queries), k, user, search)
+        except Exception as e:
+            return self._fail_answers(results, pending, e)
+
+        outputs = self._build_qa_chain(k, user, search).combine_documents_chain.batch(
+            self._answer_inputs(queries, documents),
+            config={"max_concurrency": concurrency},
+            return_exceptions=True,
+        )
+        return self._collect_answers(results, pending, questions, documents, outputs, scope)
+
+    async def aanswer_many(
+        self,
+        questions: List[str],
+        k: int = 3,
+        user: Optional[str] = None,
+        concurrency: int = 4,
+        search_type: str = "similarity",
+        search_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """`answer_many()`의 비동기 버전 (LLM 호출을 이벤트 루프에서 겹쳐 실행)"""
+        search = SearchConfig(search_type, **(search_kwargs or {}))
+        results, pending, scope = self._lookup_answers(questions, k, user, search)
+        if not pending:
+            return results
+
+        queries = [questions[i] for i in pending]
+        try:
+            vectors = await self._aembed_queries(queries)
+            documents = self._retrieve_many(queries, vectors, k, user, search)
+        except Exception as e:
+            return self._fail_answers(results, pending, e)
+
+        outputs = await self._build_qa_chain(k, user, search).combine_documents_chain.abatch(
+            self._answer_inputs(queries, documents),
+            config={"max_concurrency": concurrency},
+            return_exceptions=True,
+        )
+        return self._collect_answers(results, pending, questions, documents, outputs, scope)
+
+    def _lookup_answers(
+        self, questions: List[str], k: int, user: Optional[str], search: SearchConfig
+    ) -> Tuple[List[Optional[Dict[str, Any]]], List[int], Optional[str]]:
+        """답변 캐시 조회 결과, 답변을 생성해야 하는 질문 위치, 캐시 범위"""
         if not self.vectorstore:
             raise ValueError("벡터 스토어가 초기화되지 않았습니다.")
 
-        return self.vectorstore.similarity_search_with_score(query, k=k)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+        if self.answer_cache is None:
+            return results, list(range(len(questions))), None
+
+        # 답변 생성 전의 범위로 저장 (생성 중 인덱스가 바뀌면 다음 조회에서 무효)
+        scope = self._answer_cache_scope(k, user, search)
+        pending = []
+        for i, question in enumerate(questions):
+            cached = self.answer_cache.lookup(question, scope)
+            if cached is None:
+                pending.append(i)
+            else:
+                results[i] = {
+                    "result": cached["result"],
+                    "source_documents": cached["source_documents"],
+                    "cached": True,
+                }
+        return results, pending, scope
+
+    @staticmethod
+    def _answer_inputs(queries: List[str], documents: List[List[Document]]) -> List[dict]:
+        return [
+            {"input_documents": docs, "question": query}
+            for query, docs in zip(queries, documents)
+        ]
+
+    @staticmethod
+    def _fail_answers(
+        results: List[Optional[Dict[str, Any]]], pending: List[int], error: Exception
+    ) -> List[Dict[str, Any]]:
+        """검색 단계 오류를 답변을 생성하지 못한 모든 질문에 기록"""
+        for i in pending:
+            results[i] = {"error": str(error)}
+        return results
+
+    def _collect_answers(
+        self,
+        results: List[Optional[Dict[str, Any]]],
+        pending: List[int],
+        questions: List[str],
+        documents: List[List[Document]],
+        outputs: List[Any],
+        scope: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """LLM 출력을 입력 순서의 결과로 정리하고 답변 캐시에 저장"""
+        for i, docs, output in zip(pending, documents, outputs):
+            if isinstance(output, Exception):
+                results[i] = {"error": str(output)}
+                continue
+            answer = output["output_text"]
+            if scope is not None:
+                self.answer_cache.store(questions[i], scope, answer, docs)
+            results[i] = {"result": answer, "source_documents": docs, "cached": False}
+        return results
+
+    def set_access_control(self, access_control: Optional[AccessControl]):
+        """
+        검색 단계 접근 제어 설정
+
+        Args:
+            access_control: 접근 제어 객체 (None이면 해제)
+        """
+        self.access_control = access_control
+        self._acl_cache_key = None
+
+    def _allowed_bitset(self, user: str) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        사용자의 허용 비트셋 반환 (인덱스나 권한이 바뀌면 전체 사용자 비트셋 재계산)
 
-    def add_documents(self, documents: List[Document]):
+        Returns:
+            Optional[Tuple[np.ndarray, int]]: (FAISS 위치 기준 packbits 비트맵, 허용 개수),
+                None이면 모든 문서 접근 가능
+        """
+        cache_key = (self._index_version, self.access_control.version)
+        if cache_key != self._acl_cache_key:
+            self._rebuild_acl_bitsets()
+            self._acl_cache_key = cache_key
+
+        if user not in self._acl_bitsets:
+            return np.zeros(0, dtype=np.uint8), 0
+        return self._acl_bitsets[user]
+
+    def _rebuild_acl_bitsets(self):
+        """청크별 ACL 태그로부터 사용자별 허용 비트셋 사전 계산"""
+        size = self._vector_count()
+
+        # 벡터 위치 → 태그 코드
+        tag_codes: Dict[str, int] = {}
+        codes = np.full(size, -1, dtype=np.int32)
+        for position, metadata in enumerate(self._iter_metadatas()):
+            if metadata is not None:
+                tag = AccessControl.acl_tag(metadata)
+                codes[position] = tag_codes.setdefault(tag, len(tag_codes))
+
+        self._acl_bitsets = {}
+        for user in self.access_control.permissions:
+            tags = self.access_control.allowed_tags(user)
+            if tags is None:
+                self._acl_bitsets[user] = None
+                continue
+            allowed_codes = [tag_codes[tag] for tag in tags if tag in tag_codes]
+            mask = np.isin(codes, allowed_codes)
+            self._acl_bitsets[user] = (
+                np.packbits(mask, bitorder="little"),
+                int(mask.sum()),
+            )
+
+    def _vector_count(self) -> int:
+        """인덱스의 벡터 개수"""
+        if isinstance(self.vectorstore, NativeVectorStore):
+            return len(self.vectorstore)
+        return self.vectorstore.index.ntotal
+
+    def _iter_metadatas(self) -> Iterable[Optional[dict]]:
+        """벡터 위치 순서대로 메타데이터 반환 (문서가 없으면 None)"""
+        if isinstance(self.vectorstore, NativeVectorStore):
+            yield from self.vectorstore.iter_metadatas()
+            return
+
+        docstore = self.vectorstore.docstore
+        index_to_id = self.vectorstore.index_to_docstore_id
+        for position in range(self.vectorstore.index.ntotal):
+            doc = docstore.search(index_to_id.get(position))
+            yield doc.metadata if isinstance(doc, Document) else None
+
+    def _iter_documents(self) -> Iterable[Document]:
+        """벡터 위치 순서대로 저장된 문서 반환"""
+        if isinstance(self.vectorstore, NativeVectorStore):
+            yield from self.vectorstore.iter_documents()
+            return
+
+        docstore = self.vectorstore.docstore
+        for position in range(self.vectorstore.index.ntotal):
+            doc_id = self.vectorstore.index_to_docstore_id[position]
+            doc = docstore.search(doc_id)
+            if isinstance(doc, Document):
+                if doc.id is None:
+                    doc.id = doc_id
+                yield doc
+
+    def _ensure_mutable(self):
+        """네이티브 포맷(읽기 전용)으로 로드된 경우 수정 가능한 FAISS로 변환"""
+        if isinstance(self.vectorstore, NativeVectorStore):
+            print("🔄 네이티브 인덱스를 수정 가능한 FAISS 인덱스로 변환 중...")
+            self.vectorstore = self.vectorstore.to_faiss(self.embeddings)
+            self._set_rerank_vectors(None)
+            self._index_version += 1
+
+    def _set_rerank_vectors(self, vectors: Optional[np.ndarray | RerankVectors]):
+        """재순위용 원본 벡터 교체 (None이면 재순위 안 함)"""
+        if self._rerank_vectors is not None:
+            self._rerank_vectors.close()
+        if vectors is not None and not isinstance(vectors, RerankVectors):
+            vectors = RerankVectors(vectors)
+        self._rerank_vectors = vectors
+
+    def _rerank_matrix(self) -> Optional[np.ndarray]:
+        """재순위용 원본 벡터 (저장 후에는 메모리 맵)"""
+        if self._rerank_vectors is None:
+            return None
+        return self._rerank_vectors.matrix()
+
+    def _exact_vectors(self) -> np.ndarray:
+        """인덱스의 모든 벡터 (압축 인덱스면 재순위용 원본 벡터)"""
+        rerank = self._rerank_matrix()
+        if rerank is not None:
+            return np.ascontiguousarray(rerank, dtype=np.float32)
+        return reconstruct_all(self.vectorstore.index)
+
+    def _maybe_train_index(self):
+        """
+        벡터 수가 학습 임계값을 넘으면 flat 인덱스를 설정된 ANN/양자화 인덱스로 교체
+
+        벡터 순서가 유지되므로 docstore 매핑과 접근 제어 비트셋은 그대로
+        사용할 수 있습니다. 압축 인덱스는 원본 벡터를 재순위용으로 보관합니다.
+        """
+        config = self.index_config
+        if (
+            not isinstance(self.vectorstore, FAISS)
+            or (config.index_type == "flat" and config.quantization == "none")
+            or self.vectorstore.index.ntotal < config.train_threshold
+            or not isinstance(self.vectorstore.index, faiss.IndexFlat)
+        ):
+            return
+
+        count = self.vectorstore.index.ntotal
+        label = config.index_type
+        if config.quantization != "none" and config.index_type != "pq":
+            label = f"{label}+{config.quantization}"
+        print(f"🔨 {count}개 벡터로 {label} 인덱스 학습 중...")
+        vectors = reconstruct_all(self.vectorstore.index)
+        self.vectorstore.index = build_index(vectors, config)
+        self._set_rerank_vectors(vectors if config.compressed else None)
+        print(f"✅ {label} 인덱스 학습 완료!")
+
+    def add_documents(
+        self, documents: List[Document], ids: Optional[List[str]] = None
+    ):
         """
         기존 벡터 스토어에 문서 추가
 
         Args:
             documents: 추가할 문서 리스트
+            ids: 문서별 고유 ID 리스트 (선택)
         """
+        if not documents:
+            return
+
         if not self.vectorstore:
-            self._build_vectorstore(documents)
+            self._build_vectorstore(documents, ids=ids)
         else:
-            self.vectorstore.add_documents(documents)
+            self._index_documents(documents, ids)
+            self._maybe_train_index()
+            self._flush_embedding_cache()
             print(f"✅ {len(documents)}개 문서가 추가되었습니다.")
 
-    def save_index(self, path: str):
+    def add_documents_stream(
+        self, documents: Iterable[Document], batch_size: int = 1024
+    ) -> int:
+        """
+        문서 이터러블을 고정 크기 배치로 나누어 인덱싱
+
+        한 번에 `batch_size`개 문서만 메모리에 두므로 `DocumentLoader.iter_chunks()`
+        같은 제너레이터와 함께 사용하면 큰 문서 디렉토리도 일정한 메모리로
+        인덱싱할 수 있습니다. 문서에 `id`가 있으면 그대로 사용합니다.
+
+        Args:
+            documents: 추가할 문서 이터러블
+            batch_size: 배치당 문서 수
+
+        Returns:
+            int: 추가된 문서 개수
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size는 1 이상이어야 합니다.")
+
+        total = EmbeddingStats()
+        iterator = iter(documents)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+
+            stats = self._index_documents(batch, report=False)
+            total.chunks += stats.chunks
+            total.tokens += stats.tokens
+            total.batches += stats.batches
+            total.retries += stats.retries
+            total.rate_limit_wait_s += stats.rate_limit_wait_s
+            total.elapsed_s += stats.elapsed_s
+            print(f"📥 {total.chunks}개 문서 인덱싱 완료")
+
+        if total.chunks:
+            self._report_throughput(total)
+            self._maybe_train_index()
+            self._flush_embedding_cache()
+        return total.chunks
+
+    def delete_documents(self, ids: List[str]) -> int:
+        """
+        ID로 벡터 스토어에서 문서 삭제
+
+        스토어에 없는 ID는 무시합니다.
+
+        Args:
+            ids: 삭제할 문서 ID 리스트
+
+        Returns:
+            int: 실제로 삭제된 문서 개수
+        """
+        if not self.vectorstore or not ids:
+            return 0
+
+        self._ensure_mutable()
+        known_ids = set(self.vectorstore.index_to_docstore_id.values())
+        existing = [doc_id for doc_id in dict.fromkeys(ids) if doc_id in known_ids]
+        if existing:
+            if not supports_remove(self.vectorstore.index):
+                # HNSW는 삭제를 지원하지 않으므로 flat으로 되돌린 뒤 삭제 후 재구축
+                flat = faiss.IndexFlatL2(self.vectorstore.index.d)
+                flat.add(self._exact_vectors())
+                self.vectorstore.index = flat
+                self._set_rerank_vectors(None)
+            reverse = {doc_id: i for i, doc_id in self.vectorstore.index_to_docstore_id.items()}
+            removed_positions = [reverse[doc_id] for doc_id in existing]
+            self.vectorstore.delete(existing)
+            compact_ids(self.vectorstore.index, removed_positions)
+            if self._rerank_vectors is not None:
+                self._rerank_vectors.delete(removed_positions)
+            self._maybe_train_index()
+            self._index_version += 1
+            print(f"🗑️  {len(existing)}개 문서가 삭제되었습니다.")
+        return len(existing)
+
+    def save_index(self, path: str, native: bool = False):
         """
         벡터 스토어 인덱스 저장
 
         Args:
             path: 저장 경로
+            native: 네이티브 포맷 저장 여부 (pickle 없이 메모리 맵으로 로드 가능)
         """
         if not self.vectorstore:
             raise ValueError("저장할 벡터 스토어가 없습니다.")
 
-        self.vectorstore.save_local(path)
+        if isinstance(self.vectorstore, NativeVectorStore) and native:
+            if os.path.abspath(self.vectorstore.path) == os.path.abspath(path):
+                print(f"✅ 인덱스가 {path}에 이미 저장되어 있습니다.")
+                return
+        self._ensure_mutable()
+
+        rerank = self._rerank_matrix()
+        rerank_path = os.path.join(path, self.RERANK_VECTORS_FILE)
+        if native:
+            # 네이티브 포맷은 원본 벡터를 vectors.npy로 저장하고 자체 압축 코드로 검색
+            NativeVectorStore.save_faiss(
+                path,
+                self.vectorstore,
+                vectors=self._exact_vectors() if rerank is not None else None,
+                quantization=self.index_config.quantization,
+                rerank_factor=self.index_config.rerank_factor,
+            )
+            # 이전 FAISS 포맷 파일 정리
+            for filename in ("index.faiss", "index.pkl", self.RERANK_VECTORS_FILE):
+                legacy = os.path.join(path, filename)
+                if os.path.exists(legacy):
+                    os.remove(legacy)
+        else:
+            self.vectorstore.save_local(path)
+            # 네이티브 포맷 표시가 남아 있으면 로드 시 그쪽이 우선하므로 제거
+            marker = os.path.join(path, NativeVectorStore.META_FILE)
+            if os.path.exists(marker):
+                os.remove(marker)
+            if rerank is not None:
+                self._rerank_vectors.save(rerank_path)
+            elif os.path.exists(rerank_path):
+                os.remove(rerank_path)
+        self._write_index_meta(path, native)
         print(f"✅ 인덱스가 {path}에 저장되었습니다.")
 
+    def _write_index_meta(self, path: str, native: bool):
+        """인덱스 설정과 압축 방식을 vector_index.json으로 기록"""
+        if native:
+            index_type, quantization = "flat", self.index_config.quantization
+        else:
+            index_type = index_type_name(self.vectorstore.index)
+            quantization = index_quantization(self.vectorstore.index)
+        meta = {
+            "format": "native" if native else "faiss",
+            "index_type": index_type,
+            "quantization": quantization,
+            "rerank": quantization != "none",
+            "count": self._vector_count(),
+            "dim": int(self.vectorstore.index.d),
+            "config": self.index_config.to_dict(),
+        }
+        with open(os.path.join(path, self.INDEX_META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
     @classmethod
-    def load_index(cls, path: str) -> "RAGPipeline":
+    def load_index(
+        cls,
+        path: str,
+        cache_dir: Optional[str] = None,
+        embedding_options: Optional[Dict[str, Any]] = None,
+        index_options: Optional[Dict[str, Any]] = None,
+        answer_cache_options: Optional[Dict[str, Any]] = None,
+        embeddings: Optional[Embeddings] = None,
+        llm: Optional[BaseChatModel] = None,
+    ) -> "RAGPipeline":
         """
         저장된 인덱스 로드
 
+        네이티브 포맷이면 메모리 맵으로, 아니면 FAISS(pickle) 포맷으로 로드합니다.
+        저장 시 기록된 인덱스 설정(양자화 방식 등)을 복원하며, `index_options`로
+        지정한 값이 우선합니다.
+
         Args:
             path: 인덱스 경로
+            cache_dir: 임베딩 캐시 디렉토리 (선택)
+            embedding_options: 임베딩 파이프라인 옵션 (선택)
+            index_options: 인덱스 옵션 (선택, 검색 파라미터는 로드 후 다시 적용)
+            answer_cache_options: 답변 캐시 옵션 (선택)
+            embeddings: 임베딩 모델 (선택, 인덱스를 만든 모델과 같아야 함)
+            llm: 답변 생성 LLM (선택)
 
         Returns:
             RAGPipeline: 로드된 파이프라인 인스턴스
         """
-        pipeline = cls()
-        pipeline.vectorstore = FAISS.load_local(
-            path, pipeline.embeddings, allow_dangerous_deserialization=True
+        pipeline = cls(
+            cache_dir=cache_dir,
+            embedding_options=embedding_options,
+            index_options=index_options,
+            answer_cache_options=answer_cache_options,
+            embeddings=embeddings,
+            llm=llm,
         )
+        pipeline._load_vectorstore(path, index_options)
         print(f"✅ 인덱스가 {path}에서 로드되었습니다.")
         return pipeline
 
+    def _load_vectorstore(self, path: str, index_options: Optional[Dict[str, Any]] = None):
+        """저장된 벡터 스토어, 인덱스 설정, 재순위용 원본 벡터 로드"""
+        meta_path = os.path.join(path, self.INDEX_META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                saved = json.load(f).get("config", {})
+            self.index_config = IndexConfig(**{**saved, **(index_options or {})})
+
+        if NativeVectorStore.is_native(path):
+            self.vectorstore = NativeVectorStore.load(path, self.embeddings)
+        else:
+            self.vectorstore = FAISS.load_local(
+                path, self.embeddings, allow_dangerous_deserialization=True
+            )
+            # nprobe/efSearch는 인덱스 파일에 저장되지 않음
+            configure_search(self.vectorstore.index, self.index_config)
+            rerank_path = os.path.join(path, self.RERANK_VECTORS_FILE)
+            if os.path.exists(rerank_path):
+                self._set_rerank_vectors(RerankVectors.open(rerank_path))
+        self._index_version += 1
+
     def get_stats(self) -> dict:
         """
         벡터 스토어 통계 정보 반환
@@ -156,59 +980,241 @@ class RAGPipeline:
         if not self.vectorstore:
             return {"status": "empty", "count": 0}
 
-        # FAISS 인덱스 크기 확인
-        index_size = self.vectorstore.index.ntotal
+        # 인덱스 크기 확인
+        index_size = self._vector_count()
 
-        return {
+        if isinstance(self.vectorstore, NativeVectorStore):
+            index_format, index_type = "native", "flat"
+            quantization = self.vectorstore.quantization
+            # 압축 코드가 있으면 원본 벡터는 재순위 후보 행만 읽음
+            scanned = self.vectorstore.codes if self.vectorstore.codes is not None else self.vectorstore.vectors
+            index_bytes = scanned.nbytes + self.vectorstore.norms.nbytes + self.vectorstore.ids.nbytes
+        else:
+            index_format = "faiss"
+            index_type = index_type_name(self.vectorstore.index)
+            quantization = index_quantization(self.vectorstore.index)
+            index_bytes = index_memory_bytes(self.vectorstore.index)
+
+        stats = {
             "status": "active",
             "count": index_size,
+            "index_format": index_format,
+            "index_type": index_type,
+            "quantization": quantization,
+            "index_memory_mb": round(index_bytes / 2**20, 2),
             "embedding_model": "text-embedding-3-small",
             "llm_model": "gpt-4o-mini",
         }
+        if isinstance(self.embeddings, CachedEmbeddings):
+            stats["embedding_cache"] = self.embeddings.get_stats()
+        if self.answer_cache is not None:
+            stats["answer_cache"] = self.answer_cache.get_stats()
+        return stats
 
 
 class HybridRAGPipeline(RAGPipeline):
     """
     하이브리드 검색을 사용하는 고급 RAG 파이프라인
     (도전 과제용)
+
+    벡터 검색과 BM25 역색인 검색 결과를 가중 Reciprocal Rank Fusion으로
+    합칩니다. BM25 인덱스는 문서 추가/삭제 시 증분 갱신되고
+    `save_index()`/`load_index()`로 함께 저장/로드됩니다.
     """
 
-    def __init__(self, documents: Optional[List[Document]] = None):
-        super().__init__(documents)
-        self.bm25_retriever = None
+    def __init__(
+        self,
+        documents: Optional[List[Document]] = None,
+        ids: Optional[List[str]] = None,
+        cache_dir: Optional[str] = None,
+        embedding_options: Optional[Dict[str, Any]] = None,
+        index_options: Optional[Dict[str, Any]] = None,
+        answer_cache_options: Optional[Dict[str, Any]] = None,
+        fusion_weights: Tuple[float, float] = (0.3, 0.7),
+        rrf_k: int = 60,
+        embeddings: Optional[Embeddings] = None,
+        llm: Optional[BaseChatModel] = None,
+    ):
+        """
+        초기화
 
-    def _build_vectorstore(self, documents: List[Document]):
+        Args:
+            documents: 문서 리스트 (새로 인덱싱할 경우)
+            ids: 문서별 고유 ID 리스트 (선택)
+            cache_dir: 임베딩 캐시 디렉토리 (선택)
+            embedding_options: 임베딩 파이프라인 옵션 (선택)
+            index_options: 벡터 인덱스 옵션 (선택)
+            answer_cache_options: 답변 캐시 옵션 (선택)
+            fusion_weights: (BM25, 벡터) 검색 가중치
+            rrf_k: RRF 순위 평활화 상수
+            embeddings: 임베딩 모델 (선택)
+            llm: 답변 생성 LLM (선택)
+        """
+        self.bm25_index = BM25Index()
+        self.fusion_weights = fusion_weights
+        self.rrf_k = rrf_k
+        super().__init__(
+            documents,
+            ids=ids,
+            cache_dir=cache_dir,
+            embedding_options=embedding_options,
+            index_options=index_options,
+            answer_cache_options=answer_cache_options,
+            embeddings=embeddings,
+            llm=llm,
+        )
+
+    def _build_vectorstore(
+        self, documents: List[Document], ids: Optional[List[str]] = None
+    ):
         """벡터 스토어 및 BM25 인덱스 구축"""
-        super()._build_vectorstore(documents)
+        self.bm25_index = BM25Index()
+        super()._build_vectorstore(documents, ids=ids)
 
-        # BM25 retriever 구축
-        try:
-            from langchain.retrievers import BM25Retriever
+    def _index_documents(
+        self,
+        documents: List[Document],
+        ids: Optional[List[str]] = None,
+        report: bool = True,
+    ) -> EmbeddingStats:
+        """벡터 인덱싱 후 같은 ID로 BM25 인덱스에 추가"""
+        if ids is None:
+            # BM25와 벡터 스토어가 같은 ID를 쓰도록 미리 부여
+            ids = [doc.id or str(uuid.uuid4()) for doc in documents]
+        stats = super()._index_documents(documents, ids=ids, report=report)
+        self.bm25_index.add(ids, documents)
+        return stats
 
-            self.bm25_retriever = BM25Retriever.from_documents(documents)
-            self.bm25_retriever.k = 3
-            print("✅ BM25 retriever 구축 완료!")
-        except ImportError:
-            print("⚠️  BM25Retriever를 사용할 수 없습니다. rank_bm25 설치 필요")
+    def delete_documents(self, ids: List[str]) -> int:
+        """문서 삭제 (BM25 인덱스에서도 삭제)"""
+        deleted = super().delete_documents(ids)
+        if deleted:
+            self.bm25_index.delete(ids)
+        return deleted
 
-    def create_qa_chain(self, k: int = 3) -> RetrievalQA:
-        """하이브리드 검색을 사용하는 Q&A 체인 생성"""
+    def save_index(self, path: str, native: bool = False):
+        """벡터 인덱스와 BM25 인덱스 저장"""
+        super().save_index(path, native=native)
+        self.bm25_index.save(path)
+
+    @classmethod
+    def load_index(
+        cls,
+        path: str,
+        cache_dir: Optional[str] = None,
+        embedding_options: Optional[Dict[str, Any]] = None,
+        index_options: Optional[Dict[str, Any]] = None,
+        answer_cache_options: Optional[Dict[str, Any]] = None,
+        embeddings: Optional[Embeddings] = None,
+        llm: Optional[BaseChatModel] = None,
+    ) -> "HybridRAGPipeline":
+        """
+        저장된 벡터 인덱스와 BM25 인덱스 로드
+
+        BM25 인덱스 파일이 없으면 (이전 버전 인덱스) 저장된 문서로 재구축합니다.
+        """
+        pipeline = super().load_index(
+            path,
+            cache_dir=cache_dir,
+            embedding_options=embedding_options,
+            index_options=index_options,
+            answer_cache_options=answer_cache_options,
+            embeddings=embeddings,
+            llm=llm,
+        )
+        bm25_index = BM25Index.load(path)
+        if bm25_index is None:
+            print("⚠️  BM25 인덱스가 없어 저장된 문서로 재구축합니다.")
+            bm25_index = BM25Index()
+            documents = list(pipeline._iter_documents())
+            bm25_index.add([doc.id for doc in documents], documents)
+        pipeline.bm25_index = bm25_index
+        print(f"✅ BM25 인덱스 로드 완료 ({len(bm25_index)}개 문서)")
+        return pipeline
+
+    def hybrid_search(
+        self, query: str, k: int = 3, user: Optional[str] = None, fetch_k: int = 20
+    ) -> List[Tuple[Document, float]]:
+        """
+        벡터 + BM25 하이브리드 검색
+
+        Args:
+            query: 검색 쿼리
+            k: 반환할 문서 개수
+            user: 사용자 이름 (접근 제어 설정 시 허용된 문서만 검색)
+            fetch_k: 검색기별로 가져올 후보 수
+
+        Returns:
+            List[Tuple[Document, float]]: (문서, RRF 점수) - 점수 내림차순
+        """
         if not self.vectorstore:
             raise ValueError("벡터 스토어가 초기화되지 않았습니다.")
+        return self._hybrid_search_by_vectors(
+            [query], [self.embeddings.embed_query(query)], k, user, fetch_k
+        )[0]
 
-        # BM25가 없으면 일반 RAG 체인 반환
-        if not self.bm25_retriever:
-            return super().create_qa_chain(k)
+    def _hybrid_search_by_vectors(
+        self,
+        queries: List[str],
+        vectors: List[List[float]],
+        k: int,
+        user: Optional[str],
+        fetch_k: int = 20,
+    ) -> List[List[Tuple[Document, float]]]:
+        """미리 계산한 쿼리 벡터로 여러 쿼리를 하이브리드 검색 (벡터 검색은 한 번에)"""
+        fetch_k = max(fetch_k, k)
+        dense_results = self._search_by_vectors(vectors, fetch_k, user)
 
-        # 앙상블 retriever 생성
-        from langchain.retrievers import EnsembleRetriever
+        allowed_tags = None
+        if user is not None and self.access_control is not None:
+            allowed_tags = self.access_control.allowed_tags(user)
 
-        faiss_retriever = self.vectorstore.as_retriever(search_kwargs={"k": k})
+        fused_results = []
+        for query, dense in zip(queries, dense_results):
+            sparse = self.bm25_index.search(query, k=fetch_k, allowed_tags=allowed_tags)
+            fused = reciprocal_rank_fusion(
+                [[doc_id for doc_id, _ in sparse], [doc.id for doc, _ in dense]],
+                weights=self.fusion_weights,
+                k=self.rrf_k,
+            )[:k]
+            fused_results.append((fused, dense))
 
-        ensemble_retriever = EnsembleRetriever(
-            retrievers=[self.bm25_retriever, faiss_retriever],
-            weights=[0.3, 0.7],  # FAISS에 더 높은 가중치
-        )
+        # BM25로만 찾은 문서는 쿼리 전체를 모아 한 번에 조회
+        documents = {doc.id: doc for _, dense in fused_results for doc, _ in dense}
+        missing = [
+            doc_id for fused, _ in fused_results for doc_id, _ in fused if doc_id not in documents
+        ]
+        if missing:
+            missing = list(dict.fromkeys(missing))
+            documents.update((doc.id, doc) for doc in self.vectorstore.get_by_ids(missing))
+        return [
+            [(documents[doc_id], score) for doc_id, score in fused if doc_id in documents]
+            for fused, _ in fused_results
+        ]
+
+    def _retrieve_many(
+        self,
+        queries: List[str],
+        vectors: List[List[float]],
+        k: int,
+        user: Optional[str],
+        search: Optional[SearchConfig] = None,
+    ) -> List[List[Document]]:
+        """하이브리드 Q&A 체인과 같은 방식으로 질문별 문서 검색"""
+        if not len(self.bm25_index) or (search is not None and search.reranks):
+            return super()._retrieve_many(queries, vectors, k, user, search)
+        return [
+            [doc for doc, _ in matches]
+            for matches in self._hybrid_search_by_vectors(queries, vectors, k, user)
+        ]
+
+    def _build_qa_chain(
+        self, k: int, user: Optional[str], search: Optional[SearchConfig] = None
+    ) -> RetrievalQA:
+        """하이브리드 검색을 사용하는 Q&A 체인 생성"""
+        # BM25 인덱스가 비어 있거나 MMR/임계값 모드면 벡터 검색 기반 RAG 체인 반환
+        if not len(self.bm25_index) or (search is not None and search.reranks):
+            return super()._build_qa_chain(k, user, search)
 
         template = """당신은 문서 기반 질의응답 전문가입니다.
 주어진 문맥을 바탕으로 질문에 정확하게 답변하세요.
@@ -224,10 +1230,95 @@ class HybridRAGPipeline(RAGPipeline):
             template=template, input_variables=["context", "question"]
         )
 
-        return RetrievalQA.from_chain_type(
+        qa_chain = RetrievalQA.from_chain_type(
             llm=self.llm,
             chain_type="stuff",
-            retriever=ensemble_retriever,
+            retriever=HybridRetriever(pipeline=self, user=user, k=k),
             chain_type_kwargs={"prompt": prompt},
             return_source_documents=True,
         )
+        return qa_chain
+
+
+class AccessControlledRetriever(BaseRetriever):
+    """`RAGPipeline.search_similar_documents()`와 같은 방식(검색 모드 포함)으로 사용자가 접근 가능한 청크만 검색하는 retriever"""
+
+    pipeline: Any
+    user: Optional[str] = None
+    k: int = 3
+    search: Optional[SearchConfig] = None
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        vector = self.pipeline.embeddings.embed_query(query)
+        return [
+            doc
+            for doc, _ in self.pipeline._search_by_vectors([vector], self.k, self.user, self.search)[0]
+        ]
+
+
+class HybridRetriever(BaseRetriever):
+    """`HybridRAGPipeline.hybrid_search()`를 사용하는 retriever"""
+
+    pipeline: Any
+    user: Optional[str] = None
+    k: int = 3
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return [
+            doc
+            for doc, _ in self.pipeline.hybrid_search(query, k=self.k, user=self.user)
+        ]
+
+
+class CachedQAChain(Chain):
+    """
+    의미 기반 답변 캐시를 거치는 Q&A 체인
+
+    캐시 히트 시 LLM과 검색을 건너뛰고 캐시된 답변과 출처 문서를 반환합니다.
+    출력 형식은 `RetrievalQA`와 같고 `cached` 키가 추가됩니다.
+    """
+
+    qa_chain: Chain
+    pipeline: Any
+    k: int = 3
+    user: Optional[str] = None
+    search: Optional[SearchConfig] = None
+
+    @property
+    def input_keys(self) -> List[str]:
+        return ["query"]
+
+    @property
+    def output_keys(self) -> List[str]:
+        return ["result", "source_documents", "cached"]
+
+    def _call(
+        self,
+        inputs: Dict[str, Any],
+        run_manager: Optional[CallbackManagerForChainRun] = None,
+    ) -> Dict[str, Any]:
+        question = inputs["query"]
+        cache = self.pipeline.answer_cache
+        # 답변 생성 전의 범위로 저장 (생성 중 인덱스가 바뀌면 다음 조회에서 무효)
+        scope = self.pipeline._answer_cache_scope(self.k, self.user, self.search)
+
+        cached = cache.lookup(question, scope)
+        if cached is not None:
+            return {
+                "result": cached["result"],
+                "source_documents": cached["source_documents"],
+                "cached": True,
+            }
+
+        callbacks = run_manager.get_child() if run_manager else None
+        result = self.qa_chain.invoke({"query": question}, config={"callbacks": callbacks})
+        cache.store(question, scope, result["result"], result.get("source_documents", []))
+        return {
+            "result": result["result"],
+            "source_documents": result.get("source_documents", []),
+            "cached": False,
+        }
@@ -0,0 +1,123 @@
+"""
+Search Modes Module
+유사도 / MMR / 점수 임계값 검색 모드 (후보 벡터 행렬 기반 NumPy 구현)
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+SEARCH_TYPES = ("similarity", "mmr", "similarity_score_threshold")
+
+
+@dataclass
+class SearchConfig:
+    """
+    검색 모드 설정 (LangChain `as_retriever()`의 search_type/search_kwargs와 같은 이름)
+
+    - similarity: 거리순 상위 k개
+    - mmr: `fetch_k`개 후보 중 쿼리 관련도와 이미 고른 문서와의 중복을
+      `lambda_mult`로 절충하여 k개 선택 (1이면 관련도만, 0이면 다양성만)
+    - similarity_score_threshold: `fetch_k`개 후보 중 쿼리와의 코사인
+      유사도가 `score_threshold` 이상인 문서만 최대 k개
+
+    mmr/similarity_score_threshold 모드의 점수는 거리 대신 코사인 유사도입니다.
+    """
+
+    search_type: str = "similarity"
+    fetch_k: int = 20
+    lambda_mult: float = 0.5
+    score_threshold: Optional[float] = None
+
+    def __post_init__(self):
+        if self.search_type not in SEARCH_TYPES:
+            raise ValueError(
+                f"지원하지 않는 검색 모드입니다: {self.search_type} (가능: {', '.join(SEARCH_TYPES)})"
+            )
+        if self.fetch_k < 1:
+            raise ValueError("fetch_k는 1 이상이어야 합니다.")
+        if not 0.0 <= self.lambda_mult <= 1.0:
+            raise ValueError("lambda_mult는 0과 1 사이여야 합니다.")
+        if self.search_type == "similarity_score_threshold" and self.score_threshold is None:
+            raise ValueError("similarity_score_threshold 모드에는 score_threshold가 필요합니다.")
+
+    @property
+    def reranks(self) -> bool:
+        """후보 벡터로 다시 고르는 모드인지 여부"""
+        return self.search_type != "similarity"
+
+    def candidate_count(self, k: int) -> int:
+        """인덱스에서 가져올 후보 수"""
+        return max(k, self.fetch_k) if self.reranks else k
+
+    def select(
+        self, query: np.ndarray, candidates: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        후보 벡터 행렬에서 검색 모드에 맞게 k개 이하 선택
+
+        Args:
+            query: 쿼리 벡터 (d)
+            candidates: 거리순 후보 벡터 (n x d)
+            k: 반환할 개수
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (코사인 유사도, 후보 행 번호) - 선택 순
+        """
+        unit = normalize_rows(candidates)
+        relevance = unit @ normalize_rows(query[None, :])[0]
+        if self.search_type == "mmr":
+            order = maximal_marginal_relevance(relevance, unit, k, self.lambda_mult)
+        else:
+            order = np.argsort(-relevance, kind="stable")
+            order = order[relevance[order] >= self.score_threshold][:k]
+        return relevance[order], order
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행별 L2 정규화 (영벡터는 그대로)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
+    return matrix / np.maximum(norms, 1e-12)[:, None]
+
+
+def maximal_marginal_relevance(
+    relevance: np.ndarray, unit_candidates: np.ndarray, k: int, lambda_mult: float = 0.5
+) -> np.ndarray:
+    """
+    MMR 탐욕 선택
+
+    후보 간 쌍별 루프 대신, 선택할 때마다 방금 고른 문서와 전체 후보의
+    코사인 유사도를 한 번의 행렬-벡터 곱으로 구해 "이미 고른 문서와의
+    최대 유사도" 벡터를 갱신합니다. 전체 (n x n) 유사도 행렬을 만들지
+    않으므로 k가 작을 때 O(k·n·d)만 계산합니다.
+
+    Args:
+        relevance: 후보별 쿼리 코사인 유사도 (n)
+        unit_candidates: L2 정규화된 후보 벡터 (n x d)
+        k: 선택할 개수
+        lambda_mult: 관련도 가중치 (0~1)
+
+    Returns:
+        np.ndarray: 선택된 후보 행 번호 - 선택 순
+    """
+    count = min(k, len(relevance))
+    if count <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    selected = np.empty(count, dtype=np.int64)
+    available = np.ones(len(relevance), dtype=bool)
+    redundancy = np.full(len(relevance), -np.inf, dtype=np.float32)
+
+    selected[0] = int(np.argmax(relevance))
+    for step in range(1, count):
+        last = selected[step - 1]
+        available[last] = False
+        np.maximum(redundancy, unit_candidates @ unit_candidates[last], out=redundancy)
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        selected[step] = int(np.argmax(np.where(available, scores, -np.inf)))
+    return selected
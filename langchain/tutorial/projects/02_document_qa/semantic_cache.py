@@ -0,0 +1,263 @@
+"""
+Semantic Cache Module
+질문 임베딩 유사도 기반 답변 캐시
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+_PUNCT_RE = re.compile(r"[\s?!.,~。？！]+")
+
+
+def normalize_question(question: str) -> str:
+    """
+    질문 정규화 (유니코드 NFKC, 소문자, 문장부호/공백 정리)
+
+    Args:
+        question: 질문
+
+    Returns:
+        str: 정규화된 질문
+    """
+    text = unicodedata.normalize("NFKC", question).lower()
+    return _PUNCT_RE.sub(" ", text).strip()
+
+
+@dataclass
+class CacheEntry:
+    """캐시된 답변"""
+
+    question: str
+    scope: str
+    result: str
+    source_documents: List[Document]
+    created_at: float
+    slot: int
+    hits: int = 0
+
+
+class SemanticCache:
+    """
+    의미 기반 답변 캐시
+
+    정규화한 질문을 임베딩하여, 같은 범위(scope) 안의 이전 질문 중 코사인
+    유사도가 `threshold` 이상인 것이 있으면 그 답변을 반환합니다. 범위에는
+    사용자의 접근 권한과 인덱스 버전이 들어가므로 권한이 다른 사용자나
+    문서가 바뀐 인덱스의 답변은 재사용되지 않습니다.
+
+    질문 벡터는 고정 크기 행렬의 슬롯에 저장되어 한 번의 행렬 곱으로
+    검색되며, 항목 수는 `max_entries`를 넘으면 LRU로, 오래된 항목은
+    `ttl_seconds`가 지나면 제거됩니다.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        threshold: float = 0.9,
+        max_entries: int = 1000,
+        ttl_seconds: Optional[float] = 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        초기화
+
+        Args:
+            embeddings: 질문 임베딩 모델
+            threshold: 캐시 히트로 볼 최소 코사인 유사도
+            max_entries: 최대 항목 수
+            ttl_seconds: 항목 유효 시간 (None이면 만료 없음)
+            clock: 시간 함수 (테스트용)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries는 1 이상이어야 합니다.")
+
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._scope_codes: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._slot_scopes = np.full(max_entries, -1, dtype=np.int64)
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        self._slot_keys: List[Optional[str]] = [None] * max_entries
+
+        # 직전 조회에서 계산한 벡터 (miss 후 store 시 재사용)
+        self._recent_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self.hits = 0
+        self.exact_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _key(scope: str, normalized: str) -> str:
+        return f"{scope}\x00{normalized}"
+
+    def _embed(self, normalized: str) -> np.ndarray:
+        with self._lock:
+            vector = self._recent_vectors.get(normalized)
+        if vector is not None:
+            return vector
+
+        vector = np.asarray(self.embeddings.embed_query(normalized), dtype=np.float32)
+        vector = vector / max(float(np.linalg.norm(vector)), 1e-12)
+        with self._lock:
+            self._recent_vectors[normalized] = vector
+            while len(self._recent_vectors) > 128:
+                self._recent_vectors.popitem(last=False)
+        return vector
+
+    def _expired(self, entry: CacheEntry, now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry.created_at > self.ttl_seconds
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._slot_scopes[entry.slot] = -1
+        self._slot_keys[entry.slot] = None
+        self._free_slots.append(entry.slot)
+
+    def lookup(self, question: str, scope: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 답변 조회
+
+        Args:
+            question: 질문
+            scope: 캐시 범위 (사용자 권한 + 인덱스 버전 등)
+
+        Returns:
+            Optional[Dict[str, Any]]: result, source_documents, similarity,
+                cached_question (없으면 None)
+        """
+        normalized = normalize_question(question)
+        now = self._clock()
+
+        with self._lock:
+            # 정규화 결과가 같으면 임베딩 없이 바로 반환
+            entry = self._entries.get(self._key(scope, normalized))
+            if entry is not None and self._expired(entry, now):
+                self._remove(self._key(scope, normalized))
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self.exact_hits += 1
+                return self._hit(entry, 1.0)
+
+            code = self._scope_codes.get(scope)
+            if code is None or self._vectors is None:
+                self.misses += 1
+                return None
+
+        vector = self._embed(normalized)
+
+        with self._lock:
+            in_scope = np.flatnonzero(self._slot_scopes == code)
+            if len(in_scope):
+                similarities = self._vectors[in_scope] @ vector
+                for i in np.argsort(-similarities):
+                    if similarities[i] < self.threshold:
+                        break
+                    key = self._slot_keys[in_scope[i]]
+                    entry = self._entries[key]
+                    if self._expired(entry, now):
+                        self._remove(key)
+                        self.expirations += 1
+                        continue
+                    return self._hit(entry, float(similarities[i]))
+
+            self.misses += 1
+            return None
+
+    def _hit(self, entry: CacheEntry, similarity: float) -> Dict[str, Any]:
+        self.hits += 1
+        entry.hits += 1
+        self._entries.move_to_end(self._key(entry.scope, entry.question))
+        return {
+            "result": entry.result,
+            "source_documents": list(entry.source_documents),
+            "similarity": similarity,
+            "cached_question": entry.question,
+        }
+
+    def store(
+        self,
+        question: str,
+        scope: str,
+        result: str,
+        source_documents: Optional[List[Document]] = None,
+    ):
+        """
+        답변 저장
+
+        Args:
+            question: 질문
+            scope: 캐시 범위
+            result: 답변
+            source_documents: 출처 문서
+        """
+        normalized = normalize_question(question)
+        vector = self._embed(normalized)
+        key = self._key(scope, normalized)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while not self._free_slots:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+            slot = self._free_slots.pop()
+            self._vectors[slot] = vector
+            self._slot_scopes[slot] = self._scope_codes.setdefault(scope, len(self._scope_codes))
+            self._slot_keys[slot] = key
+            self._entries[key] = CacheEntry(
+                question=normalized,
+                scope=scope,
+                result=result,
+                source_documents=list(source_documents or []),
+                created_at=self._clock(),
+                slot=slot,
+            )
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+            self._scope_codes.clear()
+
+    def get_stats(self) -> dict:
+        """
+        캐시 통계 반환
+
+        Returns:
+            dict: 항목 수, 히트/미스, 제거 횟수, 히트율
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "exact_hits": self.exact_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
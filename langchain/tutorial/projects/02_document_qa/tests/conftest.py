@@ -0,0 +1,63 @@
+"""
+pytest 공통 fixture
+
+OpenAI 없이 파이프라인을 만들 수 있도록 Fake 임베딩/LLM과
+`RAGPipeline` 팩토리를 제공합니다.
+"""
+
+import zlib
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from rag_pipeline import RAGPipeline
+
+
+class RandomEmbeddings(Embeddings):
+    """텍스트별로 고정된 난수 벡터를 반환하는 Fake Embeddings"""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+        return rng.standard_normal(16).tolist()
+
+
+@pytest.fixture
+def random_embeddings():
+    """텍스트별 고정 난수 벡터 Fake Embeddings"""
+    return RandomEmbeddings()
+
+
+@pytest.fixture
+def chunks():
+    """"청크 i" 400개 (홀수는 python_basics.md, 짝수는 ai_ethics.md), ID는 chunk-i"""
+    return [
+        Document(
+            id=f"chunk-{i}",
+            page_content=f"청크 {i}",
+            metadata={"source": "/docs/python_basics.md" if i % 2 else "/docs/ai_ethics.md"},
+        )
+        for i in range(400)
+    ]
+
+
+@pytest.fixture
+def make_pipeline():
+    """
+    Fake 임베딩/LLM을 주입한 파이프라인 팩토리
+
+    `make_pipeline(documents, embeddings=None, cls=RAGPipeline, **kwargs)`:
+    embeddings 기본값은 `RandomEmbeddings`, llm 기본값은 고정 답변 Fake LLM이며
+    나머지 인자는 파이프라인 생성자로 전달됩니다.
+    """
+
+    def factory(documents, embeddings=None, cls=RAGPipeline, **kwargs):
+        kwargs.setdefault("llm", FakeListChatModel(responses=["답변"]))
+        return cls(documents, embeddings=embeddings or RandomEmbeddings(), **kwargs)
+
+    return factory
@@ -170,3 +170,77 @@ def test_rbac_get_user_permissions(rbac):
     assert "read" in perms["actions"]
     assert "write" in perms["actions"]
     assert "delete" in perms["actions"]
+
+
+@pytest.fixture
+def acl_pipeline(make_pipeline):
+    """접근 제어가 설정된 RAG 파이프라인 (결정적 Fake Embeddings 사용)"""
+    from langchain_core.embeddings import Embeddings
+
+    class KeywordEmbeddings(Embeddings):
+        """키워드 포함 여부로 벡터를 만드는 Fake Embeddings"""
+
+        keywords = ["langchain", "python", "ethics"]
+
+        def embed_documents(self, texts):
+            return [self.embed_query(text) for text in texts]
+
+        def embed_query(self, text):
+            text = text.lower()
+            return [float(keyword in text) for keyword in self.keywords] + [0.01 * len(text)]
+
+    documents = []
+    for name, keyword in [
+        ("langchain_overview.md", "LangChain"),
+        ("python_basics.md", "Python"),
+        ("ai_ethics.md", "Ethics"),
+    ]:
+        for i in range(3):
+            documents.append(
+                Document(
+                    page_content=f"{keyword} section {i}",
+                    metadata={"source": f"/docs/{name}", "acl_tag": name},
+                )
+            )
+
+    pipeline = make_pipeline(documents, embeddings=KeywordEmbeddings())
+
+    access_control = AccessControl()
+    pipeline.set_access_control(access_control)
+    return pipeline, access_control
+
+
+def test_prefiltered_search_fills_top_k(acl_pipeline):
+    """허용된 문서만 검색하여 top-k를 채우는지 테스트"""
+    pipeline, _ = acl_pipeline
+
+    results = pipeline.search_similar_documents("LangChain question", k=3, user="guest")
+
+    assert len(results) == 3
+    assert {doc.metadata["acl_tag"] for doc, _ in results} == {"python_basics.md"}
+
+    # 관리자는 가장 가까운 문서를 그대로 받음
+    admin_results = pipeline.search_similar_documents("LangChain question", k=3, user="admin")
+    assert {doc.metadata["acl_tag"] for doc, _ in admin_results} == {"langchain_overview.md"}
+
+    # 알 수 없는 사용자는 결과 없음
+    assert pipeline.search_similar_documents("LangChain", k=3, user="nobody") == []
+
+
+def test_prefilter_refreshes_on_permission_change(acl_pipeline):
+    """권한 변경 시 비트셋이 갱신되는지 테스트"""
+    pipeline, access_control = acl_pipeline
+    version = access_control.version
+
+    access_control.add_permission("guest", "langchain_overview.md")
+
+    assert access_control.version == version + 1
+    results = pipeline.search_similar_documents("LangChain question", k=3, user="guest")
+    assert {doc.metadata["acl_tag"] for doc, _ in results} == {"langchain_overview.md"}
+
+
+def test_acl_tag_falls_back_to_source(access_control):
+    """acl_tag 메타데이터가 없으면 source 파일 이름을 사용하는지 테스트"""
+    assert access_control.acl_tag({"source": "/a/b/python_basics.md"}) == "python_basics.md"
+    assert access_control.acl_tag({"source": "a\\python_basics.md"}) == "python_basics.md"
+    assert access_control.acl_tag({"acl_tag": "x.md", "source": "/y.md"}) == "x.md"
@@ -0,0 +1,177 @@
+"""
+Tests for Batch and Async Question Answering
+"""
+
+import asyncio
+import tempfile
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from access_control import AccessControl
+from main import DocumentQASystem
+from rag_pipeline import HybridRAGPipeline, RAGPipeline
+
+
+class TopicEmbeddings(Embeddings):
+    """주제 키워드로 벡터를 정하고 호출 횟수를 기록하는 Fake Embeddings"""
+
+    TOPICS = ["langchain", "python", "윤리"]
+
+    def __init__(self):
+        self.document_calls = []
+        self.query_calls = 0
+
+    def embed_documents(self, texts):
+        self.document_calls.append(list(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        return self._vector(text)
+
+    def _vector(self, text):
+        text = text.lower()
+        return [1.0 if topic in text else 0.0 for topic in self.TOPICS] + [0.1]
+
+
+class EchoChatModel(BaseChatModel):
+    """질문을 그대로 답변에 담아 돌려주는 Fake LLM ("실패"가 포함되면 오류)"""
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any
+    ) -> ChatResult:
+        prompt = messages[-1].content
+        question = prompt.split("질문:")[-1].split("\n")[0].strip()
+        if "실패" in question:
+            raise RuntimeError(f"LLM 오류: {question}")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"답변: {question}"))])
+
+    @property
+    def _llm_type(self) -> str:
+        return "echo"
+
+
+@pytest.fixture
+def documents():
+    """테스트용 샘플 문서"""
+    return [
+        Document(page_content="LangChain은 LLM 프레임워크입니다.", metadata={"source": "/docs/langchain_overview.md"}),
+        Document(page_content="Python은 프로그래밍 언어입니다.", metadata={"source": "/docs/python_basics.md"}),
+        Document(page_content="AI 윤리는 공정성을 다룹니다.", metadata={"source": "/docs/ai_ethics.md"}),
+    ]
+
+
+@pytest.fixture
+def qa_pipeline(make_pipeline, documents):
+    """주제 임베딩과 Echo LLM을 쓰는 파이프라인 팩토리 ((파이프라인, 임베딩) 반환)"""
+
+    def build(cls=RAGPipeline, **kwargs):
+        embeddings = TopicEmbeddings()
+        pipeline = make_pipeline(
+            documents,
+            embeddings=embeddings,
+            cls=cls,
+            ids=[f"chunk-{i}" for i in range(len(documents))],
+            llm=EchoChatModel(),
+            **kwargs,
+        )
+        embeddings.document_calls.clear()
+        return pipeline, embeddings
+
+    return build
+
+
+QUESTIONS = ["LangChain이 뭐야?", "Python 배우기", "실패하는 질문", "윤리 원칙"]
+
+
+def test_answer_many_order_and_errors(qa_pipeline):
+    """입력 순서 유지, 한 번의 임베딩 호출, 항목별 오류 테스트"""
+    pipeline, embeddings = qa_pipeline()
+
+    results = pipeline.answer_many(QUESTIONS, k=1, concurrency=3)
+
+    assert embeddings.document_calls == [QUESTIONS]
+    assert embeddings.query_calls == 0
+    assert [r.get("result") for r in results] == [
+        "답변: LangChain이 뭐야?",
+        "답변: Python 배우기",
+        None,
+        "답변: 윤리 원칙",
+    ]
+    assert "LLM 오류" in results[2]["error"]
+    assert results[1]["source_documents"][0].metadata["source"] == "/docs/python_basics.md"
+    assert not any(r.get("cached") for r in results)
+
+
+def test_search_many_matches_single_search(qa_pipeline):
+    """일괄 검색 결과가 단건 검색과 같은지 테스트 (FAISS / 네이티브 포맷)"""
+    pipeline, _ = qa_pipeline()
+    pipeline.set_access_control(AccessControl())
+    queries = ["LangChain", "Python 윤리", "기타"]
+
+    def ids(results):
+        return [[doc.metadata["source"] for doc, _ in matches] for matches in results]
+
+    for user in (None, "guest"):
+        expected = [pipeline.search_similar_documents(q, k=2, user=user) for q in queries]
+        assert ids(pipeline.search_many(queries, k=2, user=user)) == ids(expected)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline.save_index(tmpdir, native=True)
+        native = RAGPipeline.load_index(tmpdir, embeddings=pipeline.embeddings, llm=pipeline.llm)
+        native.set_access_control(AccessControl())
+        for user in (None, "guest"):
+            expected = [pipeline.search_similar_documents(q, k=2, user=user) for q in queries]
+            assert ids(native.search_many(queries, k=2, user=user)) == ids(expected)
+
+
+def test_answer_many_uses_answer_cache_and_acl(qa_pipeline):
+    """일괄 답변의 답변 캐시 재사용 및 접근 제어 테스트"""
+    pipeline, _ = qa_pipeline(answer_cache_options={"threshold": 0.99})
+    pipeline.set_access_control(AccessControl())
+
+    first = pipeline.answer_many(["Python 배우기"], user="admin")
+    second = pipeline.answer_many(["Python 배우기", "LangChain이 뭐야?"], user="admin")
+    assert first[0]["cached"] is False
+    assert [r["cached"] for r in second] == [True, False]
+    assert second[0]["result"] == first[0]["result"]
+
+    guest = pipeline.answer_many(["LangChain이 뭐야?"], k=3, user="guest")
+    assert {doc.metadata["source"] for doc in guest[0]["source_documents"]} == {"/docs/python_basics.md"}
+
+
+def test_aanswer_many_and_hybrid(qa_pipeline):
+    """비동기 일괄 답변 및 하이브리드 파이프라인 검색 테스트"""
+    pipeline, embeddings = qa_pipeline(cls=HybridRAGPipeline)
+
+    results = asyncio.run(pipeline.aanswer_many(QUESTIONS, k=2, concurrency=2))
+
+    assert embeddings.document_calls == [QUESTIONS]
+    assert [r.get("result") for r in results][:2] == ["답변: LangChain이 뭐야?", "답변: Python 배우기"]
+    assert "error" in results[2]
+    expected = [doc.id for doc, _ in pipeline.hybrid_search("윤리 원칙", k=2)]
+    assert [doc.id for doc in results[3]["source_documents"]] == expected
+
+
+def test_document_qa_system_batch_api(qa_pipeline):
+    """DocumentQASystem 일괄/비동기 API 테스트"""
+    system = DocumentQASystem("/nonexistent")
+    assert system.answer_many(["질문"]) == [{"error": "RAG 파이프라인이 초기화되지 않았습니다."}]
+
+    system.rag_pipeline, _ = qa_pipeline()
+    system.rag_pipeline.set_access_control(system.access_control)
+
+    results = system.answer_many(["Python 배우기", "실패하는 질문"], username="developer", concurrency=2)
+    assert results[0]["answer"] == "답변: Python 배우기"
+    assert results[0]["sources"][0]["name"] == "python_basics.md"
+    assert "LLM 오류" in results[1]["error"]
+
+    single = asyncio.run(system.aanswer("LangChain이 뭐야?", username="admin"))
+    assert single["answer"] == "답변: LangChain이 뭐야?"
+    assert single["cached"] is False
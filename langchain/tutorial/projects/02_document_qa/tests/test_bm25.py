@@ -0,0 +1,132 @@
+"""
+Tests for BM25 Index and Hybrid Search
+"""
+
+import os
+import tempfile
+
+import pytest
+from langchain_core.documents import Document
+
+from access_control import AccessControl
+from bm25_index import BM25Index, reciprocal_rank_fusion, tokenize
+from rag_pipeline import HybridRAGPipeline
+
+
+@pytest.fixture
+def documents():
+    """테스트용 샘플 문서"""
+    return [
+        Document(page_content="LangChain은 LLM 애플리케이션 프레임워크입니다.", metadata={"source": "/docs/langchain_overview.md"}),
+        Document(page_content="Python은 배우기 쉬운 프로그래밍 언어입니다.", metadata={"source": "/docs/python_basics.md"}),
+        Document(page_content="AI 윤리는 공정성과 투명성을 다룹니다.", metadata={"source": "/docs/ai_ethics.md"}),
+        Document(page_content="검색증강생성(RAG)은 검색 결과로 답변을 보강합니다.", metadata={"source": "/docs/langchain_overview.md"}),
+    ]
+
+
+@pytest.fixture
+def make_hybrid(make_pipeline):
+    """키워드와 무관한 난수 임베딩을 쓰는 HybridRAGPipeline 팩토리"""
+
+    def factory(documents, **kwargs):
+        ids = [f"chunk-{i}" for i in range(len(documents))]
+        return make_pipeline(documents, cls=HybridRAGPipeline, ids=ids, **kwargs)
+
+    return factory
+
+
+def test_tokenize_korean():
+    """한국어 조사 제거 및 bigram 토큰화 테스트"""
+    tokens = tokenize("LangChain은 프레임워크입니다. 검색증강을 사용합니다")
+
+    assert "langchain" in tokens
+    assert "프레임워크" in tokens
+    assert "검색증강" in tokens and "검색" in tokens and "증강" in tokens
+    assert tokenize("검색 증강")[:2] == ["검색", "증강"]
+
+
+def test_bm25_search_and_incremental_add(documents):
+    """검색 순위와 증분 추가 결과가 일괄 구축과 같은지 테스트"""
+    ids = [f"chunk-{i}" for i in range(len(documents))]
+    full = BM25Index()
+    full.add(ids, documents)
+
+    incremental = BM25Index()
+    incremental.add(ids[:2], documents[:2])
+    incremental.search("Python")  # 중간 병합
+    incremental.add(ids[2:], documents[2:])
+
+    assert full.search("Python 언어")[0][0] == "chunk-1"
+    assert full.search("검색 증강")[0][0] == "chunk-3"
+    assert full.search("존재하지않는단어") == []
+    for query in ["LangChain 프레임워크", "윤리 공정성", "검색 증강 RAG"]:
+        assert incremental.search(query) == pytest.approx(full.search(query))
+
+
+def test_bm25_delete_and_persist(documents):
+    """삭제/압축/재추가 및 저장 후 로드 결과가 같은지 테스트"""
+    ids = [f"chunk-{i}" for i in range(len(documents))]
+    index = BM25Index()
+    index.add(ids, documents)
+
+    assert index.delete(["chunk-1", "chunk-2", "unknown"]) == 2
+    assert len(index) == 2
+    assert all(doc_id not in ("chunk-1", "chunk-2") for doc_id, _ in index.search("Python 윤리 LangChain"))
+
+    expected = BM25Index()
+    expected.add([ids[0], ids[3]], [documents[0], documents[3]])
+    assert index.search("LangChain 검색") == pytest.approx(expected.search("LangChain 검색"))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index.save(tmpdir)
+        loaded = BM25Index.load(tmpdir)
+
+    assert loaded.search("LangChain 검색") == pytest.approx(index.search("LangChain 검색"))
+    assert loaded.search("AI", allowed_tags={"python_basics.md"}) == []
+
+
+def test_reciprocal_rank_fusion():
+    """가중 RRF 점수 및 순위 테스트"""
+    fused = reciprocal_rank_fusion([["a", "b"], ["b", "c"]], weights=[1.0, 1.0], k=60)
+
+    assert [doc_id for doc_id, _ in fused] == ["b", "a", "c"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+    assert reciprocal_rank_fusion([[], []]) == []
+
+
+def test_hybrid_search_finds_keyword_matches(documents, make_hybrid):
+    """벡터 검색이 놓친 키워드 문서를 하이브리드 검색이 찾는지 테스트"""
+    pipeline = make_hybrid(documents, fusion_weights=(1.0, 0.2))
+
+    results = pipeline.hybrid_search("Python 프로그래밍", k=2)
+    assert results[0][0].metadata["source"] == "/docs/python_basics.md"
+
+    pipeline.set_access_control(AccessControl())
+    guest = pipeline.hybrid_search("LangChain 프레임워크", k=4, user="guest")
+    assert {doc.metadata["source"] for doc, _ in guest} == {"/docs/python_basics.md"}
+
+    # 증분 추가된 문서도 BM25로 검색
+    pipeline.add_documents(
+        [Document(page_content="FAISS는 벡터 검색 라이브러리입니다.", metadata={"source": "/docs/faiss.md"})],
+        ids=["chunk-new"],
+    )
+    assert pipeline.hybrid_search("FAISS 라이브러리", k=1)[0][0].id == "chunk-new"
+
+
+def test_hybrid_persists_bm25(documents, make_hybrid):
+    """저장/로드 후 BM25 인덱스가 유지되고, 없으면 재구축되는지 테스트"""
+    pipeline = make_hybrid(documents)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline.save_index(tmpdir)
+        assert os.path.exists(os.path.join(tmpdir, BM25Index.INDEX_FILE))
+
+        injected = {"embeddings": pipeline.embeddings, "llm": pipeline.llm}
+        loaded = HybridRAGPipeline.load_index(tmpdir, **injected)
+        assert len(loaded.bm25_index) == 4
+        assert loaded.bm25_index.search("윤리") == pipeline.bm25_index.search("윤리")
+
+        os.remove(os.path.join(tmpdir, BM25Index.META_FILE))
+        rebuilt = HybridRAGPipeline.load_index(tmpdir, **injected)
+
+    assert rebuilt.bm25_index.search("윤리") == pytest.approx(pipeline.bm25_index.search("윤리"))
@@ -0,0 +1,171 @@
+"""
+Tests for Embedding Cache
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from embedding_cache import CachedEmbeddings
+from rag_pipeline import RAGPipeline
+
+
+class CountingEmbeddings(Embeddings):
+    """결정적인 벡터를 반환하고 호출된 텍스트를 기록하는 Fake Embeddings"""
+
+    model = "fake-embedding"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 0.5]
+
+
+@pytest.fixture
+def cache_dir():
+    """테스트용 임시 캐시 디렉토리"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+def test_cache_hit_and_miss(cache_dir):
+    """캐시 히트/미스 및 배치 내 중복 제거 테스트"""
+    base = CountingEmbeddings()
+    cached = CachedEmbeddings(base, cache_dir)
+
+    first = cached.embed_documents(["가", "나", "가"])
+    second = cached.embed_documents(["나", "다"])
+
+    assert base.calls == [["가", "나"], ["다"]]
+    assert first == [base.embed_query(t) for t in ["가", "나", "가"]]
+    assert second == [base.embed_query(t) for t in ["나", "다"]]
+
+    stats = cached.get_stats()
+    assert stats["model"] == "fake-embedding"
+    assert stats["entries"] == 3
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+
+
+def test_cache_persists_across_instances(cache_dir):
+    """디스크에 저장된 캐시를 다른 인스턴스가 재사용하는지 테스트"""
+    CachedEmbeddings(CountingEmbeddings(), cache_dir).embed_documents(["문서 A", "문서 B"])
+
+    base = CountingEmbeddings()
+    cached = CachedEmbeddings(base, cache_dir)
+    vectors = cached.embed_documents(["문서 A", "문서 B"])
+
+    assert base.calls == []
+    assert vectors == [base.embed_query("문서 A"), base.embed_query("문서 B")]
+
+    # 모델 이름이 다르면 캐시를 공유하지 않음
+    other = CountingEmbeddings()
+    CachedEmbeddings(other, cache_dir, model_name="other-model").embed_documents(["문서 A"])
+    assert other.calls == [["문서 A"]]
+
+
+def test_cache_lru_eviction(cache_dir):
+    """최대 항목 수 초과 시 LRU 제거 테스트"""
+    base = CountingEmbeddings()
+    cached = CachedEmbeddings(base, cache_dir, max_entries=2)
+
+    cached.embed_documents(["a", "b"])
+    cached.embed_documents(["a"])  # a를 최근 사용으로 갱신
+    cached.embed_documents(["c"])  # b 제거
+
+    assert cached.get_stats()["evictions"] == 1
+
+    base.calls.clear()
+    reopened = CachedEmbeddings(base, cache_dir, max_entries=2)
+    assert reopened.embed_documents(["a", "c"]) == [base.embed_query("a"), base.embed_query("c")]
+    assert base.calls == []
+    reopened.embed_documents(["b"])
+    assert base.calls == [["b"]]
+
+
+def test_batches_append_to_log_instead_of_rewriting_index(cache_dir):
+    """배치마다 인덱스 전체가 아니라 새 항목만 로그에 덧붙이는지 테스트"""
+    base = CountingEmbeddings()
+    cached = CachedEmbeddings(base, cache_dir)
+    cached.embed_documents(["첫 배치"])
+
+    index_path = os.path.join(cached.cache_path, CachedEmbeddings.INDEX_FILE)
+    log_path = os.path.join(cached.cache_path, CachedEmbeddings.LOG_FILE)
+    snapshot = os.path.getmtime(index_path)
+    for i in range(20):
+        cached.embed_documents([f"문서 {i}", f"문서 {i}-2"])
+
+    assert os.path.getmtime(index_path) == snapshot
+    with open(log_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 40
+
+    # 로그만으로 복원 (flush 없이 재시작)
+    base.calls.clear()
+    reopened = CachedEmbeddings(base, cache_dir)
+    assert reopened.get_stats()["entries"] == 41
+    reopened.embed_documents(["첫 배치", "문서 19-2"])
+    assert base.calls == []
+
+    reopened.flush()
+    assert not os.path.exists(log_path)
+    assert CachedEmbeddings(base, cache_dir).get_stats()["entries"] == 41
+
+
+def test_log_replay_handles_eviction_and_truncated_line(cache_dir):
+    """슬롯 재사용과 잘린 마지막 로그 줄을 복원 시 처리하는지 테스트"""
+    base = CountingEmbeddings()
+    cached = CachedEmbeddings(base, cache_dir, max_entries=2)
+    cached.embed_documents(["a"])
+    cached.embed_documents(["b"])
+    cached.embed_documents(["c"])  # a 제거, 슬롯 재사용
+
+    with open(os.path.join(cached.cache_path, CachedEmbeddings.LOG_FILE), "a") as f:
+        f.write('["deadbeef", ')
+
+    base.calls.clear()
+    reopened = CachedEmbeddings(base, cache_dir, max_entries=2)
+    assert reopened.embed_documents(["b", "c"]) == [base.embed_query("b"), base.embed_query("c")]
+    assert base.calls == []
+    reopened.embed_documents(["a"])
+    assert base.calls == [["a"]]
+
+
+def test_rag_pipeline_uses_cache(cache_dir):
+    """RAGPipeline 재구축 시 캐시된 임베딩을 재사용하는지 테스트"""
+    base = CountingEmbeddings()
+    documents = [
+        Document(page_content="LangChain 소개", metadata={"source": "a.md"}),
+        Document(page_content="Python 기초", metadata={"source": "b.md"}),
+    ]
+
+    with patch("rag_pipeline.OpenAIEmbeddings", return_value=base), patch(
+        "rag_pipeline.ChatOpenAI"
+    ):
+        RAGPipeline(documents, cache_dir=cache_dir)
+        pipeline = RAGPipeline(documents, cache_dir=cache_dir)
+
+    assert base.calls == [["LangChain 소개", "Python 기초"]]
+    assert pipeline.get_stats()["embedding_cache"]["hits"] == 2
+
+
+def test_rag_pipeline_cache_keyed_by_injected_model(cache_dir, make_pipeline):
+    """주입한 임베딩의 모델 이름별로 캐시를 구분하는지 테스트"""
+    documents = [Document(page_content="LangChain 소개", metadata={"source": "a.md"})]
+    ada, small = CountingEmbeddings(), CountingEmbeddings()
+    ada.model = "text-embedding-ada-002"
+    small.model = "text-embedding-3-small"
+
+    first = make_pipeline(documents, embeddings=ada, cache_dir=cache_dir)
+    second = make_pipeline(documents, embeddings=small, cache_dir=cache_dir)
+
+    assert first.embeddings.cache_path != second.embeddings.cache_path
+    assert small.calls == [["LangChain 소개"]]
@@ -0,0 +1,144 @@
+"""
+Tests for Embedding Pipeline
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from embedding_pipeline import EmbeddingPipeline, RateLimiter, make_batches
+from rag_pipeline import RAGPipeline
+
+
+class FakeRateLimitError(Exception):
+    """429 응답을 흉내내는 오류"""
+
+    status_code = 429
+
+
+class SlowEmbeddings(Embeddings):
+    """지연 시간과 레이트 리밋을 흉내내는 Fake Embeddings"""
+
+    def __init__(self, latency: float = 0.02, fail_first: int = 0):
+        self.latency = latency
+        self.fail_first = fail_first
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.calls += 1
+            if self.calls <= self.fail_first:
+                raise FakeRateLimitError("rate limited")
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.latency)
+            return [self.embed_query(text) for text in texts]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def embed_query(self, text):
+        return [float(len(text)), float(sum(map(ord, text)) % 13), 1.0]
+
+
+class FakeClock:
+    """테스트용 가상 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_make_batches_respects_limits():
+    """토큰/개수 한도 배치 구성 테스트"""
+    assert make_batches([3, 3, 3, 3], max_tokens_per_batch=6, max_batch_size=10) == [[0, 1], [2, 3]]
+    assert make_batches([1, 1, 1], max_tokens_per_batch=100, max_batch_size=2) == [[0, 1], [2]]
+    # 한도보다 큰 텍스트는 단독 배치
+    assert make_batches([1, 50, 1], max_tokens_per_batch=10, max_batch_size=10) == [[0], [1], [2]]
+
+
+def test_pipeline_preserves_order_and_runs_concurrently():
+    """동시 실행 및 입력 순서 보존 테스트"""
+    embeddings = SlowEmbeddings()
+    pipeline = EmbeddingPipeline(embeddings, max_concurrency=4, max_batch_size=2)
+    texts = [f"청크 {i}" * (i + 1) for i in range(16)]
+
+    vectors = pipeline.embed_documents(texts)
+
+    assert vectors == [embeddings.embed_query(text) for text in texts]
+    assert 1 < embeddings.max_active <= 4
+
+    stats = pipeline.last_stats
+    assert stats.chunks == 16
+    assert stats.batches == 8
+    assert stats.tokens > 0
+    assert stats.chunks_per_s > 0
+
+
+def test_pipeline_retries_rate_limit_errors():
+    """429 오류 재시도 테스트"""
+    embeddings = SlowEmbeddings(latency=0, fail_first=2)
+    pipeline = EmbeddingPipeline(embeddings, max_concurrency=1, base_delay=0.001)
+
+    vectors = pipeline.embed_documents(["a", "b"])
+
+    assert vectors == [embeddings.embed_query("a"), embeddings.embed_query("b")]
+    assert pipeline.last_stats.retries == 2
+
+
+def test_pipeline_gives_up_after_max_retries():
+    """최대 재시도 초과 시 오류 전파 테스트"""
+    pipeline = EmbeddingPipeline(
+        SlowEmbeddings(latency=0, fail_first=10), max_retries=1, base_delay=0.001
+    )
+
+    with pytest.raises(FakeRateLimitError):
+        pipeline.embed_documents(["a"])
+
+
+def test_rate_limiter_budgets():
+    """TPM/RPM 예산에 따른 대기 시간 테스트"""
+    clock = FakeClock()
+    limiter = RateLimiter(tokens_per_minute=600, requests_per_minute=2, clock=clock.time, sleep=clock.sleep)
+
+    assert limiter.acquire(300) == 0
+    assert limiter.acquire(300) == 0
+    # RPM 소진: 요청 1건이 채워질 때까지 30초 대기
+    assert limiter.acquire(10) == pytest.approx(30.0)
+
+    limiter.pause(5)
+    assert limiter.acquire(1) == pytest.approx(30.0)
+
+
+def test_rag_pipeline_streams_into_index():
+    """RAGPipeline이 배치별로 인덱스에 추가하는지 테스트"""
+    embeddings = SlowEmbeddings(latency=0)
+    documents = [
+        Document(page_content=f"문서 {i}", metadata={"source": f"{i}.md"}) for i in range(5)
+    ]
+    ids = [f"doc-{i}" for i in range(5)]
+
+    with patch("rag_pipeline.OpenAIEmbeddings", return_value=embeddings), patch(
+        "rag_pipeline.ChatOpenAI"
+    ):
+        pipeline = RAGPipeline(documents, ids=ids, embedding_options={"max_batch_size": 2})
+
+    assert embeddings.calls == 3
+    assert pipeline.vectorstore.index.ntotal == 5
+    stored = pipeline.vectorstore.docstore._dict
+    assert {doc_id: stored[doc_id].page_content for doc_id in ids} == {
+        f"doc-{i}": f"문서 {i}" for i in range(5)
+    }
@@ -109,3 +109,93 @@ def test_load_nonexistent_file():
 
     with pytest.raises(FileNotFoundError):
         loader.load_single_file("/nonexistent/file.md")
+
+
+def test_iter_chunks_parallel_matches_sequential(temp_docs_dir):
+    """병렬 로드 결과가 순차 로드와 같고 순서/ID가 결정적인지 테스트"""
+    (Path(temp_docs_dir) / "sub").mkdir()
+    (Path(temp_docs_dir) / "sub" / "test3.md").write_text(
+        "# 긴 문서\n\n" + "LangChain 문단입니다. " * 200, encoding="utf-8"
+    )
+    loader = DocumentLoader(temp_docs_dir, chunk_size=300, chunk_overlap=50)
+
+    sequential = sorted(
+        loader.load_documents(), key=lambda doc: Path(doc.metadata["source"]).as_posix()
+    )
+    parallel = list(loader.iter_chunks_parallel(max_workers=2))
+    threaded = list(loader.iter_chunks_parallel(max_workers=2, use_processes=False))
+
+    def as_tuples(documents):
+        return [(doc.page_content, doc.metadata) for doc in documents]
+
+    assert as_tuples(parallel) == as_tuples(sequential)
+    assert as_tuples(threaded) == as_tuples(sequential)
+    assert [doc.id for doc in parallel] == [doc.id for doc in threaded]
+    assert len(set(doc.id for doc in parallel)) == len(parallel)
+    assert parallel[0].id.startswith("sub/test3.md#")
+
+
+def test_custom_loader_parallel(temp_docs_dir):
+    """헤더 기반 로더의 병렬 로드 테스트"""
+    from document_loader import CustomMarkdownLoader
+
+    loader = CustomMarkdownLoader(temp_docs_dir)
+
+    sequential = sorted(loader.load_documents(), key=lambda doc: doc.metadata["source"])
+    parallel = list(loader.iter_chunks_parallel(max_workers=2))
+
+    assert [doc.page_content for doc in parallel] == [doc.page_content for doc in sequential]
+    assert all(doc.metadata.get("Header 1") for doc in parallel)
+
+
+def test_iter_chunks_streams_same_chunks(temp_docs_dir):
+    """순차 스트리밍 청크가 병렬 모드와 같은지 테스트"""
+    loader = DocumentLoader(temp_docs_dir)
+
+    documents = list(loader.iter_documents())
+    chunks = loader.iter_chunks()
+
+    assert [Path(doc.metadata["source"]).name for doc in documents] == ["test1.md", "test2.md"]
+    assert not isinstance(chunks, list)
+    streamed = list(chunks)
+    parallel = list(loader.iter_chunks(parallel=True, max_workers=2, use_processes=False))
+    assert [(doc.id, doc.page_content) for doc in streamed] == [
+        (doc.id, doc.page_content) for doc in parallel
+    ]
+
+
+def test_document_stats_accumulator(temp_docs_dir):
+    """통계 누적기가 리스트 기반 통계와 같은지 테스트"""
+    from document_loader import DocumentStats
+
+    loader = DocumentLoader(temp_docs_dir)
+    documents = loader.load_documents()
+
+    stats = DocumentStats()
+    consumed = list(stats.track(loader.iter_chunks()))
+
+    assert len(consumed) == len(documents)
+    assert stats.to_dict() == loader.get_document_stats(documents)
+    assert loader.get_document_stats(iter(documents)) == loader.get_document_stats(documents)
+
+
+def test_load_files_matches_full_reindex(temp_docs_dir):
+    """증분 로드 청크가 전체 재인덱싱 청크와 같은지 테스트 (CRLF, 헤더 분할, ID 포함)"""
+    from document_loader import CustomMarkdownLoader
+
+    (Path(temp_docs_dir) / "sub").mkdir()
+    (Path(temp_docs_dir) / "sub" / "crlf.md").write_bytes(
+        "# 제목\r\n\r\n## 절 1\r\n본문입니다.\r\n\r\n## 절 2\r\n다른 본문입니다.\r\n".encode("utf-8")
+    )
+
+    for loader in (DocumentLoader(temp_docs_dir), CustomMarkdownLoader(temp_docs_dir)):
+        full = list(loader.iter_chunks())
+        incremental = loader.load_files(["sub/crlf.md", "test1.md", "test2.md"])
+
+        def as_tuples(documents):
+            return [(doc.id, doc.page_content, doc.metadata) for doc in documents]
+
+        assert as_tuples(
+            chunk for rel_path in sorted(incremental) for chunk in incremental[rel_path]
+        ) == as_tuples(full)
+        assert all("\r" not in chunk.page_content for chunk in incremental["sub/crlf.md"])
@@ -0,0 +1,130 @@
+"""
+Tests for Index Manifest and Incremental Re-indexing
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from index_manifest import IndexManifest
+
+
+class RecordingEmbeddings(Embeddings):
+    """임베딩한 텍스트를 기록하며 감싼 Embeddings에 위임"""
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self.embedded_texts = []
+
+    def embed_documents(self, texts):
+        self.embedded_texts.extend(texts)
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+
+@pytest.fixture
+def temp_docs_dir():
+    """테스트용 임시 문서 디렉토리"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        docs = Path(tmpdir) / "docs"
+        (docs / "sub").mkdir(parents=True)
+        (docs / "a.md").write_text("# A\n\nLangChain 문서 A", encoding="utf-8")
+        (docs / "b.md").write_text("# B\n\nPython 문서 B", encoding="utf-8")
+        (docs / "sub" / "c.md").write_text("# C\n\nAI 윤리 문서 C", encoding="utf-8")
+        yield tmpdir
+
+
+def test_manifest_scan_and_diff(temp_docs_dir):
+    """매니페스트 스캔 및 변경 감지 테스트"""
+    docs_path = os.path.join(temp_docs_dir, "docs")
+    manifest = IndexManifest()
+    current = manifest.scan(docs_path)
+
+    assert sorted(current) == ["a.md", "b.md", "sub/c.md"]
+    for rel_path, info in current.items():
+        manifest.update(rel_path, info, IndexManifest.make_chunk_ids(rel_path, info["hash"], 1))
+
+    (Path(docs_path) / "a.md").write_text("# A\n\n변경된 내용", encoding="utf-8")
+    (Path(docs_path) / "b.md").unlink()
+    (Path(docs_path) / "d.md").write_text("# D", encoding="utf-8")
+
+    diff = manifest.diff(manifest.scan(docs_path))
+
+    assert diff.added == ["d.md"]
+    assert diff.changed == ["a.md"]
+    assert diff.deleted == ["b.md"]
+    assert diff.unchanged == ["sub/c.md"]
+    assert diff.has_changes
+
+
+def test_manifest_save_and_load(temp_docs_dir):
+    """매니페스트 저장/로드 테스트"""
+    index_path = os.path.join(temp_docs_dir, "index")
+    manifest = IndexManifest()
+    manifest.update("a.md", {"hash": "ab" * 32, "size": 1, "mtime_ns": 2}, ["a.md#abababababab#0"])
+    manifest.save(index_path)
+
+    loaded = IndexManifest.load(index_path)
+
+    assert loaded is not None
+    assert loaded.files == manifest.files
+    assert IndexManifest.load(os.path.join(temp_docs_dir, "missing")) is None
+
+
+def test_make_chunk_ids_change_with_content():
+    """콘텐츠 해시가 바뀌면 청크 ID도 바뀌는지 테스트"""
+    ids_v1 = IndexManifest.make_chunk_ids("a.md", "1" * 64, 2)
+    ids_v2 = IndexManifest.make_chunk_ids("a.md", "2" * 64, 2)
+
+    assert ids_v1 == ["a.md#111111111111#0", "a.md#111111111111#1"]
+    assert set(ids_v1).isdisjoint(ids_v2)
+
+
+def test_incremental_reindex(temp_docs_dir, random_embeddings):
+    """변경된 파일만 다시 임베딩하는지 테스트"""
+    from main import DocumentQASystem
+
+    docs_path = os.path.join(temp_docs_dir, "docs")
+    index_path = os.path.join(temp_docs_dir, "index")
+    fake_embeddings = RecordingEmbeddings(random_embeddings)
+    llm = FakeListChatModel(responses=["답변"])
+
+    def make_system():
+        return DocumentQASystem(docs_path, index_path, embeddings=fake_embeddings, llm=llm)
+
+    system = make_system()
+    system.initialize()
+    assert system.rag_pipeline.get_stats()["count"] == 3
+    assert os.path.exists(IndexManifest.path_for(index_path))
+
+    # 변경 없음: 임베딩 호출 없음
+    fake_embeddings.embedded_texts.clear()
+    make_system().initialize()
+    assert fake_embeddings.embedded_texts == []
+
+    # 하나 변경, 하나 삭제, 하나 추가
+    (Path(docs_path) / "a.md").write_text("# A\n\n새로운 LangChain 내용", encoding="utf-8")
+    (Path(docs_path) / "b.md").unlink()
+    (Path(docs_path) / "d.md").write_text("# D\n\n추가 문서", encoding="utf-8")
+
+    system = make_system()
+    system.initialize()
+
+    assert sorted(fake_embeddings.embedded_texts) == ["# A\n\n새로운 LangChain 내용", "# D\n\n추가 문서"]
+
+    vectorstore = system.rag_pipeline.vectorstore
+    contents = sorted(doc.page_content for doc in vectorstore.docstore._dict.values())
+    assert contents == ["# A\n\n새로운 LangChain 내용", "# C\n\nAI 윤리 문서 C", "# D\n\n추가 문서"]
+    assert vectorstore.index.ntotal == 3
+
+    manifest = IndexManifest.load(index_path)
+    assert sorted(manifest.files) == ["a.md", "d.md", "sub/c.md"]
+    assert set(manifest.chunk_ids_for(list(manifest.files))) == set(
+        vectorstore.index_to_docstore_id.values()
+    )
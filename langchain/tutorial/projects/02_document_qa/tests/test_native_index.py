@@ -0,0 +1,121 @@
+"""
+Tests for Native (memory-mapped) Index
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from access_control import AccessControl
+from native_index import NativeVectorStore
+from rag_pipeline import RAGPipeline
+
+
+@pytest.fixture
+def index_dir():
+    """테스트용 임시 인덱스 디렉토리"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+@pytest.fixture
+def pipeline(make_pipeline):
+    """FAISS 기반 RAGPipeline 생성"""
+    documents = [
+        Document(page_content="LangChain은 LLM 애플리케이션 프레임워크입니다.", metadata={"source": "/docs/langchain_overview.md"}),
+        Document(page_content="Python은 프로그래밍 언어입니다.", metadata={"source": "/docs/python_basics.md"}),
+        Document(page_content="AI 윤리는 중요한 주제입니다.", metadata={"source": "/docs/ai_ethics.md"}),
+        Document(page_content="RAG는 검색 증강 생성입니다.", metadata={"source": "/docs/langchain_overview.md"}),
+    ]
+    ids = [f"chunk-{i}" for i in range(len(documents))]
+    return make_pipeline(documents, ids=ids)
+
+
+def load(path, pipeline):
+    return RAGPipeline.load_index(path, embeddings=pipeline.embeddings, llm=pipeline.llm)
+
+
+def test_native_round_trip_matches_faiss(pipeline, index_dir):
+    """네이티브 포맷 저장/로드 후 검색 결과가 FAISS와 같은지 테스트"""
+    pipeline.save_index(index_dir, native=True)
+
+    assert NativeVectorStore.is_native(index_dir)
+    assert not os.path.exists(os.path.join(index_dir, "index.pkl"))
+    vectors = np.load(os.path.join(index_dir, "vectors.npy"), mmap_mode="r")
+    assert vectors.shape == (4, 16)
+
+    loaded = load(index_dir, pipeline)
+    assert isinstance(loaded.vectorstore, NativeVectorStore)
+    assert loaded.get_stats()["count"] == 4
+    assert loaded.get_stats()["index_format"] == "native"
+
+    for query in ["LangChain 프레임워크", "Python", "윤리"]:
+        expected = pipeline.vectorstore.similarity_search_with_score(query, k=3)
+        actual = loaded.vectorstore.similarity_search_with_score(query, k=3)
+        assert [(doc.id, doc.page_content, doc.metadata) for doc, _ in actual] == [
+            (doc.id, doc.page_content, doc.metadata) for doc, _ in expected
+        ]
+        assert [score for _, score in actual] == pytest.approx(
+            [score for _, score in expected], rel=1e-5
+        )
+
+
+def test_native_access_control_search(pipeline, index_dir):
+    """네이티브 인덱스에서 권한 사전 필터링 검색 테스트"""
+    pipeline.save_index(index_dir, native=True)
+    loaded = load(index_dir, pipeline)
+    loaded.set_access_control(AccessControl())
+
+    results = loaded.search_similar_documents("AI 윤리", k=4, user="guest")
+
+    assert [doc.metadata["source"] for doc, _ in results] == ["/docs/python_basics.md"]
+    assert len(loaded.search_similar_documents("AI 윤리", k=4, user="admin")) == 4
+
+
+def test_native_index_converts_on_write(pipeline, index_dir):
+    """네이티브 인덱스 수정 시 FAISS로 변환 후 다시 저장되는지 테스트"""
+    pipeline.save_index(index_dir, native=True)
+    loaded = load(index_dir, pipeline)
+
+    loaded.add_documents(
+        [Document(page_content="새 문서입니다.", metadata={"source": "/docs/new.md"})],
+        ids=["chunk-new"],
+    )
+    assert loaded.delete_documents(["chunk-0"]) == 1
+    assert loaded.get_stats()["count"] == 4
+
+    loaded.save_index(index_dir, native=True)
+    reloaded = load(index_dir, pipeline)
+    stored_ids = [doc.id for doc in reloaded.vectorstore.iter_documents()]
+    assert sorted(stored_ids) == ["chunk-1", "chunk-2", "chunk-3", "chunk-new"]
+
+    # FAISS 포맷으로 다시 저장하면 네이티브 표시가 제거됨
+    reloaded.save_index(index_dir)
+    assert not NativeVectorStore.is_native(index_dir)
+    assert load(index_dir, pipeline).vectorstore.index.ntotal == 4
+
+
+def test_metadata_filter_mask_is_cached(index_dir, random_embeddings):
+    """필터별 마스크를 캐시해 반복 검색 시 메타데이터를 다시 읽지 않는지 테스트"""
+    vectors = np.random.default_rng(0).standard_normal((50, 3)).astype(np.float32)
+    metadatas = [{"category": ["support", "billing"][i % 2], "tier": i % 3} for i in range(50)]
+    NativeVectorStore.write(
+        index_dir, vectors, [f"t{i}" for i in range(50)], metadatas, [f"id-{i}" for i in range(50)]
+    )
+    store = NativeVectorStore.load(index_dir, random_embeddings)
+
+    with patch.object(store, "iter_metadatas", wraps=store.iter_metadatas) as reads:
+        for _ in range(3):
+            results = store.similarity_search_with_score_by_vector(vectors[0], k=5, filter={"category": "billing"})
+            assert all(doc.metadata["category"] == "billing" for doc, _ in results)
+        assert reads.call_count == 1
+
+        mask = store.metadata_mask({"category": ["support"], "tier": [0, 2]})
+        expected = [m["category"] == "support" and m["tier"] in (0, 2) for m in metadatas]
+        assert mask.tolist() == expected
+        assert reads.call_count == 2  # tier 열만 새로 읽음
+        assert store.metadata_mask({"tier": [0, 2], "category": ["support"]}) is mask
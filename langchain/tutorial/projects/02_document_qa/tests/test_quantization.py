@@ -0,0 +1,180 @@
+"""
+Tests for Quantized Vector Storage
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from access_control import AccessControl
+from native_index import NativeVectorStore
+from rag_pipeline import RAGPipeline
+from vector_index import IndexConfig, build_index, exact_rerank, index_memory_bytes, index_quantization
+
+
+def search(pipeline, query, k=5, user=None):
+    return [(doc.id, score) for doc, score in pipeline.search_similar_documents(query, k=k, user=user)]
+
+
+def assert_same_results(actual, expected):
+    assert [doc_id for doc_id, _ in actual] == [doc_id for doc_id, _ in expected]
+    assert [score for _, score in actual] == pytest.approx([score for _, score in expected], abs=1e-4)
+
+
+@pytest.mark.parametrize(
+    "index_type,quantization,expected",
+    [("flat", "fp16", "fp16"), ("flat", "int8", "int8"), ("ivf", "int8", "int8"), ("pq", "none", "pq")],
+)
+def test_quantized_index_with_rerank(index_type, quantization, expected):
+    """양자화 인덱스의 메모리 절감 및 재순위 후 정확한 top-k 테스트"""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((3000, 32)).astype(np.float32)
+    queries = vectors[:20] + 0.05
+
+    config = IndexConfig(
+        index_type=index_type, quantization=quantization, train_threshold=1000, nprobe=64, pq_m=8
+    )
+    index = build_index(vectors, config)
+    exact = build_index(vectors, IndexConfig())
+
+    assert index_quantization(index) == expected
+    assert config.compressed
+    assert index_memory_bytes(index) < index_memory_bytes(exact)
+
+    expected_scores, expected_positions = exact.search(queries, 5)
+    _, candidates = index.search(queries, 5 * 8)
+    for query, candidate, scores, positions in zip(queries, candidates, expected_scores, expected_positions):
+        reranked_scores, reranked = exact_rerank(vectors, query, candidate[candidate >= 0], 5)
+        assert set(reranked) == set(positions)
+        assert reranked_scores == pytest.approx(scores, abs=1e-3)
+
+
+def test_invalid_quantization():
+    """지원하지 않는 양자화 옵션 테스트"""
+    with pytest.raises(ValueError):
+        IndexConfig(quantization="int4")
+    with pytest.raises(ValueError):
+        IndexConfig(quantization="int8", rerank_factor=0)
+
+
+def test_pipeline_quantized_matches_exact_search(make_pipeline, chunks):
+    """양자화 파이프라인의 검색/접근 제어/삭제 결과가 float 인덱스와 같은지 테스트"""
+    exact = make_pipeline(chunks)
+    quantized = make_pipeline(
+        chunks, index_options={"quantization": "int8", "train_threshold": 100, "rerank_factor": 8}
+    )
+
+    stats = quantized.get_stats()
+    assert (stats["index_type"], stats["quantization"]) == ("flat", "int8")
+    assert stats["index_memory_mb"] < exact.get_stats()["index_memory_mb"]
+
+    for query in ["청크 1", "청크 77", "질문"]:
+        assert_same_results(search(quantized, query), search(exact, query))
+
+    for pipeline in (exact, quantized):
+        pipeline.set_access_control(AccessControl())
+    guest = search(quantized, "청크 10", user="guest")
+    assert_same_results(guest, search(exact, "청크 10", user="guest"))
+    assert all(int(doc_id.split("-")[1]) % 2 for doc_id, _ in guest)
+
+    # 삭제 후 재순위 벡터도 같은 위치가 제거됨
+    deleted = [f"chunk-{i}" for i in range(0, 400, 3)]
+    exact.delete_documents(deleted)
+    quantized.delete_documents(deleted)
+    assert len(quantized._rerank_matrix()) == quantized.vectorstore.index.ntotal
+    assert_same_results(search(quantized, "청크 5"), search(exact, "청크 5"))
+
+    # 추가된 문서도 재순위 대상
+    for pipeline in (exact, quantized):
+        pipeline.add_documents([Document(page_content="새 청크", metadata={"source": "/docs/new.md"})], ids=["new"])
+    assert search(quantized, "새 청크", k=1)[0][0] == "new"
+
+
+@pytest.mark.parametrize("native", [False, True])
+def test_quantized_index_persistence(native, make_pipeline, chunks):
+    """저장 시 양자화 설정이 메타데이터에 기록되고 로드 후 그대로 검색되는지 테스트"""
+    pipeline = make_pipeline(chunks, index_options={"quantization": "fp16", "train_threshold": 100})
+    expected = search(pipeline, "청크 3")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline.save_index(tmpdir, native=native)
+        with open(os.path.join(tmpdir, RAGPipeline.INDEX_META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        assert (meta["quantization"], meta["rerank"], meta["count"]) == ("fp16", True, 400)
+
+        loaded = RAGPipeline.load_index(tmpdir, embeddings=pipeline.embeddings, llm=pipeline.llm)
+        assert loaded.index_config.quantization == "fp16"
+        assert loaded.get_stats()["quantization"] == "fp16"
+        assert_same_results(search(loaded, "청크 3"), expected)
+
+        # 저장한 경로에 다시 저장해도 메모리 맵이 깨지지 않음
+        if not native:
+            loaded.save_index(tmpdir)
+            assert_same_results(search(loaded, "청크 3"), expected)
+        del loaded
+
+
+def test_rerank_vectors_stay_on_disk_after_save(make_pipeline, chunks):
+    """저장 후 추가/삭제해도 재순위 벡터를 메모리로 읽지 않고 저장 파일도 바뀌지 않는지 테스트"""
+    options = {"quantization": "int8", "train_threshold": 100, "rerank_factor": 8}
+    exact = make_pipeline(chunks)
+    quantized = make_pipeline(chunks, index_options=options)
+    assert not quantized._rerank_vectors.on_disk
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        quantized.save_index(tmpdir)
+        rerank_path = os.path.join(tmpdir, RAGPipeline.RERANK_VECTORS_FILE)
+        saved = np.load(rerank_path)
+
+        loaded = RAGPipeline.load_index(tmpdir, embeddings=quantized.embeddings, llm=quantized.llm)
+        deleted = [f"chunk-{i}" for i in range(0, 400, 3)]
+        new_doc = Document(page_content="새 청크", metadata={"source": "/docs/new.md"})
+        for pipeline in (exact, loaded):
+            pipeline.delete_documents(deleted)
+            pipeline.add_documents([new_doc], ids=["new"])
+
+        rerank = loaded._rerank_matrix()
+        assert isinstance(rerank, np.memmap)
+        assert len(rerank) == loaded.vectorstore.index.ntotal
+        np.testing.assert_array_equal(np.load(rerank_path), saved)
+        for query in ["청크 5", "청크 77", "새 청크"]:
+            assert_same_results(search(loaded, query), search(exact, query))
+
+        # 다시 저장하면 임시 파일 대신 저장된 파일을 메모리 맵으로 사용
+        spill_path = loaded._rerank_vectors._spill_path
+        loaded.save_index(tmpdir)
+        assert not os.path.exists(spill_path)
+        assert len(np.load(rerank_path, mmap_mode="r")) == loaded.vectorstore.index.ntotal
+        assert_same_results(search(loaded, "청크 5"), search(exact, "청크 5"))
+        del loaded, rerank
+
+
+@pytest.mark.parametrize("quantization", ["fp16", "int8"])
+def test_native_quantized_search(quantization, random_embeddings):
+    """네이티브 포맷 압축 코드 검색이 float 검색과 같은 결과를 내는지 테스트"""
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((500, 16)).astype(np.float32)
+    texts = [f"t{i}" for i in range(500)]
+    ids = [f"id-{i}" for i in range(500)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        exact_dir, quantized_dir = os.path.join(tmpdir, "exact"), os.path.join(tmpdir, "quantized")
+        NativeVectorStore.write(exact_dir, vectors, texts, [{}] * 500, ids)
+        NativeVectorStore.write(quantized_dir, vectors, texts, [{}] * 500, ids, quantization=quantization)
+
+        exact = NativeVectorStore.load(exact_dir, random_embeddings)
+        quantized = NativeVectorStore.load(quantized_dir, random_embeddings)
+        assert quantized.quantization == quantization
+        assert quantized.codes.nbytes < exact.vectors.nbytes
+
+        mask = np.arange(500) % 2 == 0
+        for query in vectors[:10] + 0.1:
+            assert quantized.search_positions(query, 5)[1].tolist() == exact.search_positions(query, 5)[1].tolist()
+            scores, positions = quantized.search_positions(query, 5, mask=mask)
+            assert not (positions % 2).any()
+            assert scores == pytest.approx(exact.search_positions(query, 5, mask=mask)[0], abs=1e-4)
+        del exact, quantized
@@ -106,3 +106,64 @@ def test_qa_chain_creation_integration(sample_documents):
     result = qa_chain.invoke({"query": "LangChain이란?"})
     assert "result" in result
     assert "source_documents" in result
+
+
+def test_add_documents_stream(mock_llm):
+    """고정 크기 배치 스트리밍 인덱싱 테스트"""
+    from langchain_core.embeddings import Embeddings
+
+    class FakeEmbeddings(Embeddings):
+        def __init__(self):
+            self.batch_sizes = []
+
+        def embed_documents(self, texts):
+            self.batch_sizes.append(len(texts))
+            return [self.embed_query(text) for text in texts]
+
+        def embed_query(self, text):
+            return [float(len(text)), 1.0]
+
+    embeddings = FakeEmbeddings()
+    documents = (
+        Document(page_content=f"문서 {i}", metadata={"source": f"{i}.md"}, id=f"doc-{i}")
+        for i in range(7)
+    )
+
+    with patch("rag_pipeline.OpenAIEmbeddings", return_value=embeddings):
+        pipeline = RAGPipeline()
+        count = pipeline.add_documents_stream(documents, batch_size=3)
+
+    assert count == 7
+    assert embeddings.batch_sizes == [3, 3, 1]
+    assert pipeline.vectorstore.index.ntotal == 7
+    assert set(pipeline.vectorstore.index_to_docstore_id.values()) == {
+        f"doc-{i}" for i in range(7)
+    }
+
+
+def test_injected_models(sample_documents):
+    """OpenAI 없이 임베딩 모델과 LLM을 직접 지정하는 테스트"""
+    from langchain_core.embeddings import Embeddings
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    class KeywordEmbeddings(Embeddings):
+        def embed_documents(self, texts):
+            return [self.embed_query(text) for text in texts]
+
+        def embed_query(self, text):
+            return [float("Python" in text), float("LangChain" in text), 0.1]
+
+    with patch("rag_pipeline.OpenAIEmbeddings") as openai_embeddings, patch(
+        "rag_pipeline.ChatOpenAI"
+    ) as chat_openai:
+        pipeline = RAGPipeline(
+            sample_documents,
+            embeddings=KeywordEmbeddings(),
+            llm=FakeListChatModel(responses=["답변"]),
+        )
+
+    openai_embeddings.assert_not_called()
+    chat_openai.assert_not_called()
+    results = pipeline.search_similar_documents("Python 문법", k=1)
+    assert results[0][0].metadata["source"] == "python_basics.md"
+    assert pipeline.create_qa_chain(k=1).invoke({"query": "Python?"})["result"] == "답변"
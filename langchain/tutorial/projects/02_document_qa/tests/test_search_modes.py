@@ -0,0 +1,186 @@
+"""
+Tests for MMR and Score-Threshold Search Modes
+"""
+
+import tempfile
+import zlib
+
+import numpy as np
+import pytest
+from langchain_community.vectorstores.utils import maximal_marginal_relevance as reference_mmr
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from access_control import AccessControl
+from rag_pipeline import AccessControlledRetriever, HybridRAGPipeline, HybridRetriever, RAGPipeline
+from search_modes import SearchConfig, maximal_marginal_relevance, normalize_rows
+
+VECTORS = {
+    # 같은 내용이 중첩 청크로 세 번 들어간 경우
+    "LangChain 체인 소개 1": [1.0, 0.0, 0.02],
+    "LangChain 체인 소개 2": [1.0, 0.01, 0.0],
+    "LangChain 체인 소개 3": [1.0, 0.0, 0.0],
+    "LangChain 에이전트": [0.8, 0.6, 0.0],
+    "Python 기초": [0.0, 0.0, 1.0],
+    "질문": [1.0, 0.3, 0.0],
+}
+
+
+class TableEmbeddings(Embeddings):
+    """정해진 텍스트는 표의 벡터, 그 외는 고정 난수 벡터를 반환하는 Fake Embeddings"""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        if text in VECTORS:
+            return VECTORS[text]
+        rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+        return rng.standard_normal(3).tolist()
+
+
+@pytest.fixture
+def table_pipeline(make_pipeline):
+    """표 벡터 문서에 `기타 i` 문서 `extra`개를 더한 파이프라인 팩토리 (ID는 텍스트)"""
+
+    def build(extra=0, cls=RAGPipeline, **kwargs):
+        texts = [text for text in VECTORS if text != "질문"] + [f"기타 {i}" for i in range(extra)]
+        documents = [
+            Document(
+                id=text,
+                page_content=text,
+                metadata={"source": "/docs/python_basics.md" if "Python" in text else "/docs/langchain_overview.md"},
+            )
+            for text in texts
+        ]
+        return make_pipeline(documents, embeddings=TableEmbeddings(), cls=cls, **kwargs)
+
+    return build
+
+
+def ids(results):
+    return [doc.id for doc, _ in results]
+
+
+def test_mmr_matches_reference_implementation():
+    """벡터화한 MMR이 LangChain 참조 구현과 같은 순서로 고르는지 테스트"""
+    rng = np.random.default_rng(0)
+    for lambda_mult in (0.0, 0.3, 0.5, 1.0):
+        query = rng.standard_normal(32).astype(np.float32)
+        candidates = rng.standard_normal((60, 32)).astype(np.float32)
+        candidates[10:20] = candidates[0] + 0.01 * rng.standard_normal((10, 32))
+
+        unit = normalize_rows(candidates)
+        relevance = unit @ normalize_rows(query[None, :])[0]
+        selected = maximal_marginal_relevance(relevance, unit, 8, lambda_mult)
+
+        expected = reference_mmr(query, candidates, lambda_mult=lambda_mult, k=8)
+        assert selected.tolist() == expected
+
+    assert len(maximal_marginal_relevance(relevance[:3], unit[:3], 10)) == 3
+    assert len(maximal_marginal_relevance(relevance[:0], unit[:0], 4)) == 0
+
+
+def test_search_config_validation():
+    """검색 모드 설정 검증 테스트"""
+    assert SearchConfig().candidate_count(3) == 3
+    assert SearchConfig("mmr", fetch_k=10).candidate_count(3) == 10
+    assert SearchConfig("mmr", fetch_k=2).candidate_count(3) == 3
+    with pytest.raises(ValueError):
+        SearchConfig("bm25")
+    with pytest.raises(ValueError):
+        SearchConfig("mmr", lambda_mult=1.5)
+    with pytest.raises(ValueError):
+        SearchConfig("mmr", fetch_k=0)
+    with pytest.raises(ValueError):
+        SearchConfig("similarity_score_threshold")
+
+
+def test_mmr_skips_near_duplicates(table_pipeline):
+    """중첩 청크가 top-k를 채우지 않고 다른 문서가 선택되는지 테스트"""
+    pipeline = table_pipeline()
+
+    similar = ids(pipeline.search_similar_documents("질문", k=3))
+    assert similar[:3] == ["LangChain 체인 소개 2", "LangChain 체인 소개 3", "LangChain 체인 소개 1"]
+
+    mmr = pipeline.search_similar_documents("질문", k=3, search_type="mmr", search_kwargs={"fetch_k": 5})
+    assert ids(mmr)[0] == "LangChain 체인 소개 2"
+    assert "LangChain 에이전트" in ids(mmr)
+    assert sum(doc_id.startswith("LangChain 체인 소개") for doc_id in ids(mmr)) == 1
+    # 점수는 쿼리와의 코사인 유사도
+    query, top = normalize_rows(np.array([VECTORS["질문"], VECTORS["LangChain 체인 소개 2"]]))
+    assert mmr[0][1] == pytest.approx(float(query @ top))
+
+    # lambda_mult=1이면 관련도만 보므로 similarity와 같은 순서
+    relevance_only = pipeline.search_similar_documents(
+        "질문", k=3, search_type="mmr", search_kwargs={"lambda_mult": 1.0}
+    )
+    assert ids(relevance_only) == similar
+
+
+def test_score_threshold(table_pipeline):
+    """코사인 유사도 임계값 이상인 문서만 반환하는지 테스트"""
+    pipeline = table_pipeline()
+
+    results = pipeline.search_similar_documents(
+        "질문", k=10, search_type="similarity_score_threshold", search_kwargs={"score_threshold": 0.9}
+    )
+    assert sorted(ids(results)) == sorted(text for text in VECTORS if "LangChain" in text)
+    assert all(score >= 0.9 for _, score in results)
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+    none = pipeline.search_many(
+        ["질문"], k=3, search_type="similarity_score_threshold", search_kwargs={"score_threshold": 0.999}
+    )
+    assert none == [[]]
+
+
+@pytest.mark.parametrize(
+    "index_options", [{}, {"index_type": "ivf", "train_threshold": 50}, {"quantization": "int8", "train_threshold": 50}]
+)
+def test_search_modes_across_indexes(index_options, table_pipeline):
+    """FAISS 인덱스 타입/네이티브 포맷/접근 제어/삭제 후에도 같은 결과인지 테스트"""
+    exact = table_pipeline(extra=200)
+    pipeline = table_pipeline(extra=200, index_options={**index_options, "nprobe": 64})
+    options = {"search_type": "mmr", "search_kwargs": {"fetch_k": 8}}
+
+    assert ids(pipeline.search_similar_documents("질문", k=4, **options)) == ids(
+        exact.search_similar_documents("질문", k=4, **options)
+    )
+
+    for p in (exact, pipeline):
+        p.set_access_control(AccessControl())
+        p.delete_documents(["LangChain 체인 소개 2", "기타 3"])
+    guest = pipeline.search_similar_documents("질문", k=4, user="guest", **options)
+    assert ids(guest) == ids(exact.search_similar_documents("질문", k=4, user="guest", **options))
+    assert {doc.metadata["source"] for doc, _ in guest} == {"/docs/python_basics.md"}
+    assert ids(pipeline.search_similar_documents("질문", k=4, **options)) == ids(
+        exact.search_similar_documents("질문", k=4, **options)
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline.save_index(tmpdir, native=True)
+        native = RAGPipeline.load_index(tmpdir, embeddings=pipeline.embeddings, llm=pipeline.llm)
+        assert ids(native.search_similar_documents("질문", k=4, **options)) == ids(
+            exact.search_similar_documents("질문", k=4, **options)
+        )
+        del native
+
+
+def test_qa_chain_search_mode_and_cache_scope(table_pipeline):
+    """Q&A 체인 검색 모드 적용 및 모드별 답변 캐시 범위 분리 테스트"""
+    pipeline = table_pipeline(answer_cache_options={"threshold": 0.99})
+    mmr = SearchConfig("mmr", fetch_k=5)
+
+    chain = pipeline.create_qa_chain(k=3, search_type="mmr", search_kwargs={"fetch_k": 5})
+    retriever = chain.qa_chain.retriever
+    assert retriever.search == mmr
+    assert ids((doc, 0) for doc in retriever.invoke("질문")) == ids(
+        pipeline.search_similar_documents("질문", k=3, search_type="mmr", search_kwargs={"fetch_k": 5})
+    )
+    assert pipeline._answer_cache_scope(3, None, mmr) != pipeline._answer_cache_scope(3, None)
+
+    # 하이브리드 파이프라인은 MMR/임계값 모드에서 벡터 검색 기반 체인 사용
+    hybrid = table_pipeline(cls=HybridRAGPipeline)
+    assert isinstance(hybrid.create_qa_chain(k=3, search_type="mmr").retriever, AccessControlledRetriever)
+    assert isinstance(hybrid.create_qa_chain(k=3).retriever, HybridRetriever)
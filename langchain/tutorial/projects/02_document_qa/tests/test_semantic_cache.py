@@ -0,0 +1,133 @@
+"""
+Tests for Semantic Answer Cache
+"""
+
+from unittest.mock import patch
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from access_control import AccessControl
+from rag_pipeline import RAGPipeline
+from semantic_cache import SemanticCache, normalize_question
+
+
+class TopicEmbeddings(Embeddings):
+    """주제 키워드로 벡터를 정하는 Fake Embeddings (같은 주제의 질문은 유사)"""
+
+    TOPICS = ["langchain", "python", "윤리"]
+
+    def __init__(self):
+        self.queries = []
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return self._vector(text)
+
+    def _vector(self, text):
+        text = text.lower()
+        vector = [1.0 if topic in text else 0.0 for topic in self.TOPICS]
+        # 표현 차이는 작은 성분으로 반영
+        vector.append(0.05 * (len(text) % 5))
+        return vector
+
+
+class FakeClock:
+    """테스트용 가상 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+
+def test_normalize_question():
+    """질문 정규화 테스트"""
+    assert normalize_question("  LangChain이   뭐야?? ") == "langchain이 뭐야"
+    assert normalize_question("ＬａｎｇＣｈａｉｎ이 뭐야!") == "langchain이 뭐야"
+
+
+def test_semantic_hit_and_scope():
+    """의미 유사 질문 히트 및 범위 분리 테스트"""
+    embeddings = TopicEmbeddings()
+    cache = SemanticCache(embeddings, threshold=0.9)
+
+    assert cache.lookup("LangChain이 뭐야?", "scope-a") is None
+    cache.store("LangChain이 뭐야?", "scope-a", "LLM 프레임워크입니다.", [Document(page_content="doc")])
+
+    embeddings.queries.clear()
+    exact = cache.lookup("langchain이   뭐야", "scope-a")
+    assert exact["result"] == "LLM 프레임워크입니다."
+    assert embeddings.queries == []  # 정규화 결과가 같으면 임베딩 생략
+
+    similar = cache.lookup("LangChain에 대해 설명해줘", "scope-a")
+    assert similar["result"] == "LLM 프레임워크입니다."
+    assert similar["similarity"] >= 0.9
+    assert similar["source_documents"][0].page_content == "doc"
+
+    assert cache.lookup("Python 문법 알려줘", "scope-a") is None
+    assert cache.lookup("LangChain이 뭐야?", "scope-b") is None
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 2
+    assert stats["exact_hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["hit_rate"] == pytest.approx(0.4)
+
+
+def test_lru_and_ttl_eviction():
+    """LRU 및 TTL 제거 테스트"""
+    clock = FakeClock()
+    cache = SemanticCache(TopicEmbeddings(), max_entries=2, ttl_seconds=10, clock=clock.time)
+
+    cache.store("LangChain", "s", "a1")
+    cache.store("Python", "s", "a2")
+    assert cache.lookup("LangChain", "s") is not None  # LangChain을 최근 사용으로 갱신
+    cache.store("윤리", "s", "a3")  # Python 제거
+
+    assert cache.lookup("Python", "s") is None
+    assert cache.get_stats()["evictions"] == 1
+
+    clock.now = 11
+    assert cache.lookup("LangChain", "s") is None
+    assert cache.get_stats()["expirations"] == 1
+
+
+def test_cached_qa_chain():
+    """Q&A 체인 캐시 히트, 사용자 권한 및 인덱스 버전별 분리 테스트"""
+    documents = [
+        Document(page_content="LangChain은 LLM 프레임워크입니다.", metadata={"source": "/docs/langchain_overview.md"}),
+        Document(page_content="Python은 프로그래밍 언어입니다.", metadata={"source": "/docs/python_basics.md"}),
+    ]
+    llm = FakeListChatModel(responses=["답변 1", "답변 2", "답변 3", "답변 4"])
+
+    with patch("rag_pipeline.OpenAIEmbeddings", return_value=TopicEmbeddings()), patch(
+        "rag_pipeline.ChatOpenAI", return_value=llm
+    ):
+        pipeline = RAGPipeline(documents, answer_cache_options={"threshold": 0.9})
+    pipeline.set_access_control(AccessControl())
+
+    admin_chain = pipeline.create_qa_chain(k=1, user="admin")
+    first = admin_chain.invoke({"query": "LangChain이 뭐야?"})
+    second = admin_chain.invoke({"query": "LangChain에 대해 알려줘"})
+
+    assert (first["result"], first["cached"]) == ("답변 1", False)
+    assert (second["result"], second["cached"]) == ("답변 1", True)
+    assert second["source_documents"] == first["source_documents"]
+
+    # 권한이 다른 사용자는 캐시를 공유하지 않음
+    guest = pipeline.create_qa_chain(k=1, user="guest").invoke({"query": "LangChain이 뭐야?"})
+    assert (guest["result"], guest["cached"]) == ("답변 2", False)
+
+    # 인덱스가 바뀌면 이전 답변을 재사용하지 않음
+    pipeline.add_documents([Document(page_content="LangChain 0.3 릴리스", metadata={"source": "/docs/langchain_overview.md"})])
+    third = admin_chain.invoke({"query": "LangChain이 뭐야?"})
+    assert (third["result"], third["cached"]) == ("답변 3", False)
+
+    assert pipeline.get_stats()["answer_cache"]["hits"] == 1
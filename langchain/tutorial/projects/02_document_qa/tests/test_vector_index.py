@@ -0,0 +1,80 @@
+"""
+Tests for Vector Index Factory
+"""
+
+import tempfile
+
+import numpy as np
+import pytest
+
+from access_control import AccessControl
+from rag_pipeline import RAGPipeline
+from vector_index import INDEX_TYPES, IndexConfig, build_index, index_type_name
+
+
+@pytest.mark.parametrize("index_type", INDEX_TYPES)
+def test_build_index_recall(index_type):
+    """인덱스 타입별 학습 및 flat 대비 recall 테스트"""
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((20, 32)).astype(np.float32) * 4
+    vectors = centers[rng.integers(0, 20, 5000)] + rng.standard_normal((5000, 32)).astype(np.float32)
+    queries = vectors[:50] + 0.1
+
+    config = IndexConfig(index_type=index_type, train_threshold=1000, nprobe=8)
+    index = build_index(vectors, config)
+    exact = build_index(vectors, IndexConfig())
+
+    assert index_type_name(index) == index_type
+    assert index.ntotal == 5000
+    _, expected = exact.search(queries, 10)
+    _, actual = index.search(queries, 10)
+    recall = np.mean([len(set(a) & set(e)) / 10 for a, e in zip(actual, expected)])
+    assert recall >= (0.99 if index_type == "flat" else 0.5)
+
+
+def test_build_index_below_threshold_stays_flat():
+    """임계값 미만이면 flat 인덱스를 사용하는지 테스트"""
+    vectors = np.random.default_rng(0).standard_normal((100, 8)).astype(np.float32)
+    index = build_index(vectors, IndexConfig(index_type="ivf", train_threshold=1000))
+
+    assert index_type_name(index) == "flat"
+    with pytest.raises(ValueError):
+        IndexConfig(index_type="lsh")
+
+
+@pytest.mark.parametrize("index_type", ["ivf", "hnsw"])
+def test_pipeline_trains_and_deletes(index_type, make_pipeline, chunks):
+    """파이프라인 자동 학습 및 삭제 후 위치 매핑 유지 테스트"""
+    pipeline = make_pipeline(chunks, index_options={"index_type": index_type, "train_threshold": 300, "nprobe": 64})
+
+    stats = pipeline.get_stats()
+    assert stats["index_type"] == index_type
+    assert stats["index_memory_mb"] > 0
+
+    assert pipeline.delete_documents(["chunk-0", "chunk-7", "chunk-200"]) == 3
+    assert pipeline.get_stats()["index_type"] == index_type
+    assert pipeline.get_stats()["count"] == 397
+
+    # 자기 자신의 벡터로 검색하면 같은 문서가 나와야 함
+    for i in [1, 8, 199, 201, 399]:
+        doc, _ = pipeline.search_similar_documents(f"청크 {i}", k=1)[0]
+        assert doc.page_content == f"청크 {i}"
+
+
+def test_pipeline_ann_access_control_and_reload(make_pipeline, chunks):
+    """ANN 인덱스의 권한 필터링 검색과 로드 후 검색 파라미터 유지 테스트"""
+    pipeline = make_pipeline(chunks, index_options={"index_type": "ivf", "train_threshold": 300, "nprobe": 64})
+    pipeline.set_access_control(AccessControl())
+
+    results = pipeline.search_similar_documents("청크 2", k=5, user="guest")
+    assert len(results) == 5
+    assert all(doc.metadata["source"] == "/docs/python_basics.md" for doc, _ in results)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline.save_index(tmpdir)
+        loaded = RAGPipeline.load_index(
+            tmpdir, index_options={"nprobe": 64}, embeddings=pipeline.embeddings, llm=pipeline.llm
+        )
+
+    assert loaded.get_stats()["index_type"] == "ivf"
+    assert loaded.vectorstore.index.nprobe == min(64, loaded.vectorstore.index.nlist)
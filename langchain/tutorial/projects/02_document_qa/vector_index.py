@@ -0,0 +1,459 @@
+"""
+Vector Index Module
+대규모 코퍼스용 FAISS 근사 최근접 이웃(ANN) 인덱스 팩토리
+"""
+
+import math
+import os
+import tempfile
+import weakref
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf", "hnsw", "pq")
+QUANTIZATIONS = ("none", "fp16", "int8")
+
+_SQ_TYPES = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+
+@dataclass
+class IndexConfig:
+    """
+    벡터 인덱스 설정
+
+    - flat: 전수 검색 (정확, 쿼리당 O(N·d))
+    - ivf: IVF-Flat, `nlist`개 클러스터 중 `nprobe`개만 검색
+    - hnsw: HNSW 그래프 (학습 불필요, 삭제 시 재구축)
+    - pq: IVF-PQ, 벡터를 `pq_m`바이트 코드로 압축 (메모리 최소, 근사 거리)
+
+    `quantization`("fp16", "int8")을 지정하면 flat/ivf/hnsw 인덱스의 벡터를
+    스칼라 양자화하여 저장합니다 (메모리 1/2, 1/4). 양자화/PQ 인덱스는
+    상위 `k * rerank_factor`개 후보를 원본 float 벡터로 다시 정렬합니다.
+
+    벡터 수가 `train_threshold` 미만이면 어떤 타입이든 양자화하지 않은
+    flat 인덱스를 사용하고, 임계값을 넘는 시점에 지정한 타입으로
+    학습/변환합니다.
+    """
+
+    index_type: str = "flat"
+    train_threshold: int = 20_000
+    nlist: Optional[int] = None
+    nprobe: int = 16
+    hnsw_m: int = 32
+    ef_construction: int = 80
+    ef_search: int = 64
+    pq_m: Optional[int] = None
+    pq_bits: int = 8
+    quantization: str = "none"
+    rerank_factor: int = 4
+    seed: int = 1234
+
+    def __post_init__(self):
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(
+                f"지원하지 않는 인덱스 타입입니다: {self.index_type} (가능: {', '.join(INDEX_TYPES)})"
+            )
+        if self.quantization not in QUANTIZATIONS:
+            raise ValueError(
+                f"지원하지 않는 양자화 방식입니다: {self.quantization} (가능: {', '.join(QUANTIZATIONS)})"
+            )
+        if self.rerank_factor < 1:
+            raise ValueError("rerank_factor는 1 이상이어야 합니다.")
+
+    @property
+    def compressed(self) -> bool:
+        """근사 거리를 쓰는 (재순위가 필요한) 설정인지 여부"""
+        return self.quantization != "none" or self.index_type == "pq"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def auto_nlist(count: int) -> int:
+    """
+    벡터 수에 맞는 IVF 클러스터 수
+
+    FAISS 권장값(4·√N)을 쓰되, 클러스터당 학습 벡터가 39개 이상이 되도록
+    제한합니다.
+    """
+    return max(1, min(int(4 * math.sqrt(count)), count // 39))
+
+
+def auto_pq_m(dim: int) -> int:
+    """차원을 나누어 떨어지게 하는 PQ 서브 벡터 수 (약 8차원당 1바이트)"""
+    target = max(1, dim // 8)
+    for m in range(target, 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def build_index(vectors: np.ndarray, config: IndexConfig) -> faiss.Index:
+    """
+    설정에 맞는 FAISS 인덱스를 만들고 (필요 시 학습 후) 벡터 추가
+
+    벡터 순서는 그대로 유지되므로 위치 기반 매핑(`index_to_docstore_id`)을
+    바꾸지 않아도 됩니다.
+
+    Args:
+        vectors: float32 벡터 (N x d)
+        config: 인덱스 설정
+
+    Returns:
+        faiss.Index: 벡터가 추가된 인덱스
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    count, dim = vectors.shape
+    below_threshold = count < config.train_threshold
+    index_type = "flat" if below_threshold else config.index_type
+    sq_type = None if below_threshold else _SQ_TYPES.get(config.quantization)
+
+    if index_type == "flat" and sq_type is None:
+        index = faiss.IndexFlatL2(dim)
+    elif index_type == "flat":
+        index = faiss.IndexScalarQuantizer(dim, sq_type, faiss.METRIC_L2)
+        index.train(vectors)
+    elif index_type == "hnsw":
+        if sq_type is None:
+            index = faiss.IndexHNSWFlat(dim, config.hnsw_m)
+        else:
+            index = faiss.IndexHNSWSQ(dim, sq_type, config.hnsw_m)
+            index.train(vectors)
+        index.hnsw.efConstruction = config.ef_construction
+    else:
+        nlist = min(config.nlist or auto_nlist(count), count)
+        quantizer = faiss.IndexFlatL2(dim)
+        centroids = nlist
+        if index_type == "ivf" and sq_type is None:
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist)
+        elif index_type == "ivf":
+            index = faiss.IndexIVFScalarQuantizer(quantizer, dim, nlist, sq_type, faiss.METRIC_L2)
+        else:
+            pq_m = config.pq_m or auto_pq_m(dim)
+            if dim % pq_m:
+                raise ValueError(f"pq_m({pq_m})이 벡터 차원({dim})을 나누어 떨어뜨려야 합니다.")
+            # 코드북 중심 수(2^bits)가 학습 벡터 수를 넘지 않도록 제한
+            pq_bits = max(1, min(config.pq_bits, int(math.log2(count))))
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_m, pq_bits)
+            centroids = max(nlist, 2**pq_bits)
+
+        # 중심당 최대 256개 샘플로 학습
+        sample_size = min(count, centroids * 256)
+        if sample_size < count:
+            rng = np.random.default_rng(config.seed)
+            sample = vectors[np.sort(rng.choice(count, sample_size, replace=False))]
+        else:
+            sample = vectors
+        index.train(sample)
+
+    if count:
+        index.add(vectors)
+    configure_search(index, config)
+    return index
+
+
+def configure_search(index: faiss.Index, config: IndexConfig):
+    """인덱스의 검색 파라미터(nprobe, efSearch) 설정 - 로드 후에도 호출 필요"""
+    if isinstance(index, faiss.IndexIVF):
+        index.nprobe = min(config.nprobe, index.nlist)
+    elif isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = config.ef_search
+
+
+def search_parameters(
+    index: faiss.Index, selector: faiss.IDSelector, config: IndexConfig
+) -> faiss.SearchParameters:
+    """
+    ID 셀렉터를 포함한 인덱스 타입별 검색 파라미터
+
+    SearchParameters를 넘기면 인덱스에 설정된 nprobe/efSearch 대신
+    파라미터 값이 쓰이므로 타입별로 명시합니다.
+    """
+    if isinstance(index, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(sel=selector, nprobe=min(config.nprobe, index.nlist))
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=config.ef_search)
+    return faiss.SearchParameters(sel=selector)
+
+
+def index_type_name(index: faiss.Index) -> str:
+    """FAISS 인덱스의 타입 이름 ("flat", "ivf", "hnsw", "pq")"""
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "pq"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf"
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, (faiss.IndexFlat, faiss.IndexScalarQuantizer)):
+        return "flat"
+    return type(index).__name__
+
+
+def index_quantization(index: faiss.Index) -> str:
+    """인덱스의 벡터 압축 방식 ("none", "fp16", "int8", "pq")"""
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "pq"
+    if isinstance(index, faiss.IndexHNSW):
+        index = faiss.downcast_index(index.storage)
+    if isinstance(index, (faiss.IndexScalarQuantizer, faiss.IndexIVFScalarQuantizer)):
+        for name, qtype in _SQ_TYPES.items():
+            if index.sq.qtype == qtype:
+                return name
+        return "sq"
+    return "none"
+
+
+def exact_rerank(
+    vectors: np.ndarray, query: np.ndarray, positions: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    후보 위치를 원본 float 벡터의 정확한 제곱 L2 거리로 다시 정렬
+
+    Args:
+        vectors: 원본 벡터 (N x d, 메모리 맵 가능 - 후보 행만 읽음)
+        query: 쿼리 벡터 (d)
+        positions: 후보 위치
+        k: 반환할 개수
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (제곱 L2 거리, 위치) - 가까운 순
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    if not len(positions):
+        return np.empty(0, dtype=np.float32), positions
+
+    # 메모리 맵에서 순서대로 읽도록 정렬된 위치로 조회
+    unique = np.unique(positions)
+    diffs = np.asarray(vectors[unique], dtype=np.float32) - np.asarray(query, dtype=np.float32)
+    distances = np.einsum("ij,ij->i", diffs, diffs)
+    order = np.argsort(distances, kind="stable")[:k]
+    return distances[order], unique[order]
+
+
+def supports_remove(index: faiss.Index) -> bool:
+    """`remove_ids` 지원 여부 (HNSW는 미지원)"""
+    return not isinstance(index, faiss.IndexHNSW)
+
+
+def compact_ids(index: faiss.Index, removed_positions) -> None:
+    """
+    `remove_ids` 후 남은 벡터의 ID를 0..N-1로 당겨 맞춤
+
+    Flat/PQ 코드 인덱스는 삭제 시 뒤의 벡터가 자동으로 당겨지지만,
+    IVF는 원래 ID를 유지하므로 위치 기반 매핑이 어긋나지 않게
+    역 리스트의 ID를 직접 갱신합니다.
+
+    Args:
+        index: 벡터를 삭제한 인덱스
+        removed_positions: 삭제한 위치 리스트
+    """
+    if not isinstance(index, faiss.IndexIVF):
+        return
+
+    removed = np.sort(np.asarray(list(removed_positions), dtype=np.int64))
+    invlists = index.invlists
+    for list_no in range(index.nlist):
+        size = invlists.list_size(list_no)
+        if size:
+            ids = faiss.rev_swig_ptr(invlists.get_ids(list_no), size)
+            ids -= np.searchsorted(removed, ids)
+
+    # ID가 바뀌었으므로 ID → (리스트, 오프셋) 맵을 다시 만듦
+    map_type = index.direct_map.type
+    if map_type != faiss.DirectMap.NoMap:
+        index.set_direct_map_type(faiss.DirectMap.NoMap)
+        index.set_direct_map_type(map_type)
+
+
+def reconstruct_all(index: faiss.Index) -> np.ndarray:
+    """
+    인덱스의 모든 벡터를 위치 순서대로 복원
+
+    PQ 인덱스는 압축된 코드로부터 복원하므로 근사 벡터입니다.
+    """
+    if not index.ntotal:
+        return np.zeros((0, index.d), dtype=np.float32)
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def reconstruct_positions(index: faiss.Index, positions) -> np.ndarray:
+    """
+    지정한 위치의 벡터만 복원 (위치 순서대로)
+
+    IVF 인덱스는 처음 호출할 때 ID → (리스트, 오프셋) 해시 맵을 만들어
+    두고, 이후 추가/삭제 시 FAISS가 함께 갱신합니다. PQ/양자화 인덱스는
+    근사 벡터입니다.
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    if not len(positions):
+        return np.zeros((0, index.d), dtype=np.float32)
+    if isinstance(index, faiss.IndexIVF) and index.direct_map.type == faiss.DirectMap.NoMap:
+        index.set_direct_map_type(faiss.DirectMap.Hashtable)
+    return index.reconstruct_batch(positions)
+
+
+def index_memory_bytes(index: faiss.Index) -> int:
+    """
+    인덱스의 메모리 사용량 추정 (바이트)
+
+    벡터/코드, ID, 클러스터 중심, 그래프 링크 등 주요 자료구조만 계산합니다.
+    """
+    if isinstance(index, faiss.IndexIVF):
+        invlists = index.invlists
+        list_sizes = sum(invlists.list_size(i) for i in range(index.nlist))
+        total = list_sizes * (invlists.code_size + 8)
+        total += index_memory_bytes(index.quantizer)
+        if isinstance(index, faiss.IndexIVFPQ):
+            total += index.pq.M * index.pq.ksub * index.pq.dsub * 4
+        return int(total)
+    if isinstance(index, faiss.IndexHNSW):
+        hnsw = index.hnsw
+        links = hnsw.neighbors.size() * 4 + hnsw.offsets.size() * 8 + hnsw.levels.size() * 4
+        return int(links + index_memory_bytes(index.storage))
+    if isinstance(index, faiss.IndexFlatCodes):
+        return int(index.ntotal * index.code_size)
+    return int(index.ntotal * index.d * 4)
+
+
+class RerankVectors:
+    """
+    재순위용 원본 float32 벡터 (N x d, FAISS 위치 순서)
+
+    처음 저장하기 전에는 메모리에 두고, 저장한 뒤에는 `.npy`를 읽기 전용
+    메모리 맵으로 엽니다. 메모리 맵 상태에서 벡터가 추가/삭제되면 전체 행렬을
+    메모리로 읽는 대신 임시 파일로 블록 단위 복사해 그 파일에 덧붙이거나
+    압축하므로, 저장된 인덱스 파일은 다음 저장 전까지 바뀌지 않고 상주
+    메모리도 블록 크기로 제한됩니다.
+    """
+
+    BLOCK_ROWS = 65536
+
+    def __init__(self, vectors: np.ndarray):
+        """
+        초기화 (메모리 상태)
+
+        Args:
+            vectors: 원본 벡터 (N x d)
+        """
+        self._blocks: List[np.ndarray] = [np.asarray(vectors, dtype=np.float32)]
+        self.dim = int(self._blocks[0].shape[1])
+        self._view: Optional[np.ndarray] = None
+        self._spill_path: Optional[str] = None
+        self._cleanup: Optional[weakref.finalize] = None
+
+    @classmethod
+    def open(cls, path: str) -> "RerankVectors":
+        """저장된 `.npy`를 읽기 전용 메모리 맵으로 열기"""
+        view = np.load(path, mmap_mode="r")
+        vectors = cls(np.zeros((0, view.shape[1]), dtype=np.float32))
+        vectors._blocks = []
+        vectors._view = view
+        return vectors
+
+    @property
+    def on_disk(self) -> bool:
+        """벡터가 디스크(메모리 맵)에 있는지 여부"""
+        return self._view is not None
+
+    def __len__(self) -> int:
+        if self._view is not None:
+            return len(self._view)
+        return sum(len(block) for block in self._blocks)
+
+    def __getitem__(self, key) -> np.ndarray:
+        return self.matrix()[key]
+
+    def matrix(self) -> np.ndarray:
+        """전체 행렬 (디스크 상태면 메모리 맵, 메모리 상태면 추가된 배치를 합친 배열)"""
+        if self._view is not None:
+            return self._view
+        if len(self._blocks) > 1:
+            self._blocks = [np.concatenate(self._blocks)]
+        return self._blocks[0]
+
+    def append(self, vectors: np.ndarray):
+        """벡터 추가 (디스크 상태면 임시 파일 끝에 덧붙임)"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if self._view is None:
+            self._blocks.append(vectors)
+            return
+        if self._spill_path is None:
+            self._spill(self._view)
+        with open(self._spill_path, "ab") as f:
+            f.write(vectors.tobytes())
+        self._open_spill(len(self._view) + len(vectors))
+
+    def delete(self, positions):
+        """지정한 위치의 벡터 삭제 (디스크 상태면 남은 행만 새 임시 파일로 복사)"""
+        if self._view is None:
+            self._blocks = [np.delete(self.matrix(), list(positions), axis=0)]
+            return
+        keep = np.ones(len(self._view), dtype=bool)
+        keep[np.asarray(list(positions), dtype=np.int64)] = False
+        self._spill(self._view, keep)
+
+    def save(self, path: str):
+        """
+        `.npy`로 저장한 뒤 그 파일을 메모리 맵으로 다시 열기
+
+        같은 파일을 메모리 맵으로 열고 있을 수 있으므로 임시 파일에 블록 단위로
+        쓴 뒤 교체합니다.
+        """
+        source = self.matrix()
+        tmp = path + ".tmp.npy"
+        out = np.lib.format.open_memmap(
+            tmp, mode="w+", dtype=np.float32, shape=(len(source), self.dim)
+        )
+        for start in range(0, len(source), self.BLOCK_ROWS):
+            out[start : start + self.BLOCK_ROWS] = source[start : start + self.BLOCK_ROWS]
+        out.flush()
+        del out
+        os.replace(tmp, path)
+
+        self.close()
+        self._blocks = []
+        self._view = np.load(path, mmap_mode="r")
+
+    def close(self):
+        """임시 파일 삭제"""
+        if self._cleanup is not None:
+            self._view = None
+            self._cleanup()
+            self._cleanup = None
+            self._spill_path = None
+
+    def _spill(self, source: np.ndarray, keep: Optional[np.ndarray] = None):
+        """`source`의 행(keep이 있으면 남길 행만)을 새 임시 파일로 블록 단위 복사"""
+        fd, spill_path = tempfile.mkstemp(prefix="rerank-", suffix=".f32")
+        rows = 0
+        with os.fdopen(fd, "wb") as f:
+            for start in range(0, len(source), self.BLOCK_ROWS):
+                block = np.asarray(source[start : start + self.BLOCK_ROWS], dtype=np.float32)
+                if keep is not None:
+                    block = block[keep[start : start + self.BLOCK_ROWS]]
+                f.write(block.tobytes())
+                rows += len(block)
+
+        self.close()
+        self._spill_path = spill_path
+        self._cleanup = weakref.finalize(self, _remove_file, spill_path)
+        self._open_spill(rows)
+
+    def _open_spill(self, rows: int):
+        if rows:
+            self._view = np.memmap(
+                self._spill_path, dtype=np.float32, mode="r", shape=(rows, self.dim)
+            )
+        else:
+            self._view = np.zeros((0, self.dim), dtype=np.float32)
+
+
+def _remove_file(path: str):
+    if os.path.exists(path):
+        os.remove(path)
@@ -2,6 +2,7 @@
 Base Agent Class
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 
@@ -35,6 +36,21 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def arun(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Agent 비동기 실행
+
+        기본 구현은 `run()`을 스레드에서 실행합니다. LLM을 `ainvoke`로
+        호출하는 Agent는 오버라이드합니다.
+
+        Args:
+            input_data: 입력 데이터
+
+        Returns:
+            Dict[str, Any]: 출력 데이터
+        """
+        return await asyncio.to_thread(self.run, input_data)
+
     def log(self, message: str, force: bool = False):
         """로그 출력"""
         if self.verbose or force:
@@ -44,3 +60,8 @@ class BaseAgent(ABC):
         """LLM 호출"""
         response = self.llm.invoke(prompt)
         return response.content if hasattr(response, 'content') else str(response)
+
+    async def ainvoke_llm(self, prompt: str) -> str:
+        """LLM 비동기 호출"""
+        response = await self.llm.ainvoke(prompt)
+        return response.content if hasattr(response, 'content') else str(response)
@@ -3,12 +3,16 @@ Billing Agent - 결제 관련
 """
 
 from typing import Dict, Any
+from keyword_matcher import KeywordMatcher
 from .base import BaseAgent
 
 
 class BillingAgent(BaseAgent):
     """결제 관련 Agent"""
 
+    # 에스컬레이션이 필요한 중요 작업 키워드
+    CRITICAL_MATCHER = KeywordMatcher({"critical": ["환불", "취소", "삭제", "해지"]})
+
     def __init__(self, name: str, llm, rag, verbose: bool = False):
         super().__init__(name, llm, verbose)
         self.rag = rag
@@ -18,7 +22,8 @@ class BillingAgent(BaseAgent):
         결제 관련 문의 처리
 
         Args:
-            input_data: {"message": str, "context": list, "session_id": str}
+            input_data: {"message": str, "context": list, "summary": str, "session_id": str,
+                "query_embedding": list (선택, 미리 계산한 쿼리 임베딩)}
 
         Returns:
             Dict: 응답 정보
@@ -28,22 +33,44 @@ class BillingAgent(BaseAgent):
         self.log("결제 관련 문의 처리 중...")
 
         # RAG로 관련 정책 검색
-        relevant_docs = self.rag.search(message, category="billing")
+        relevant_docs = self.rag.search(
+            message, category="billing", embedding=input_data.get("query_embedding")
+        )
 
         # 답변 생성
         answer = self._generate_answer(message, relevant_docs)
 
+        return self._build_response(message, answer, relevant_docs)
+
+    async def arun(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """결제 관련 문의 처리 (비동기)"""
+        message = input_data["message"]
+
+        self.log("결제 관련 문의 처리 중...")
+
+        relevant_docs = await self.rag.asearch(
+            message, category="billing", embedding=input_data.get("query_embedding")
+        )
+        answer = await self.ainvoke_llm(self._build_prompt(message, relevant_docs))
+
+        return self._build_response(message, answer, relevant_docs)
+
+    def _build_response(self, message: str, answer: str, docs: list) -> Dict[str, Any]:
         return {
             "answer": answer,
-            "sources": relevant_docs,
+            "sources": docs,
             "needs_escalation": self._check_critical_action(message),
         }
 
     def _generate_answer(self, message: str, docs: list) -> str:
         """답변 생성"""
+        return self.invoke_llm(self._build_prompt(message, docs))
+
+    def _build_prompt(self, message: str, docs: list) -> str:
+        """답변 프롬프트"""
         doc_content = "\n\n".join([doc.page_content for doc in docs[:2]])
 
-        prompt = f"""당신은 친절한 결제 담당자입니다.
+        return f"""당신은 친절한 결제 담당자입니다.
 
 결제 정책:
 {doc_content}
@@ -55,9 +82,6 @@ class BillingAgent(BaseAgent):
 
 답변:"""
 
-        return self.invoke_llm(prompt)
-
     def _check_critical_action(self, message: str) -> bool:
         """중요 작업 여부 확인"""
-        critical_keywords = ["환불", "취소", "삭제", "해지"]
-        return any(keyword in message for keyword in critical_keywords)
+        return self.CRITICAL_MATCHER.contains_any(message)
@@ -18,7 +18,8 @@ class GeneralAgent(BaseAgent):
         일반 문의 처리
 
         Args:
-            input_data: {"message": str, "context": list, "session_id": str}
+            input_data: {"message": str, "context": list, "summary": str, "session_id": str,
+                "query_embedding": list (선택, 미리 계산한 쿼리 임베딩)}
 
         Returns:
             Dict: 응답 정보
@@ -28,22 +29,42 @@ class GeneralAgent(BaseAgent):
         self.log("일반 문의 처리 중...")
 
         # RAG로 관련 정보 검색
-        relevant_docs = self.rag.search(message)
+        relevant_docs = self.rag.search(message, embedding=input_data.get("query_embedding"))
 
         # 답변 생성
         answer = self._generate_answer(message, relevant_docs)
 
+        return self._build_response(answer, relevant_docs)
+
+    async def arun(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """일반 문의 처리 (비동기)"""
+        message = input_data["message"]
+
+        self.log("일반 문의 처리 중...")
+
+        relevant_docs = await self.rag.asearch(
+            message, embedding=input_data.get("query_embedding")
+        )
+        answer = await self.ainvoke_llm(self._build_prompt(message, relevant_docs))
+
+        return self._build_response(answer, relevant_docs)
+
+    def _build_response(self, answer: str, docs: list) -> Dict[str, Any]:
         return {
             "answer": answer,
-            "sources": relevant_docs,
+            "sources": docs,
             "needs_escalation": False,
         }
 
     def _generate_answer(self, message: str, docs: list) -> str:
         """답변 생성"""
+        return self.invoke_llm(self._build_prompt(message, docs))
+
+    def _build_prompt(self, message: str, docs: list) -> str:
+        """답변 프롬프트"""
         doc_content = "\n\n".join([doc.page_content for doc in docs[:2]])
 
-        prompt = f"""당신은 친절한 고객 서비스 담당자입니다.
+        return f"""당신은 친절한 고객 서비스 담당자입니다.
 
 참고 정보:
 {doc_content}
@@ -53,5 +74,3 @@ class GeneralAgent(BaseAgent):
 친절하고 도움이 되는 답변을 제공하세요.
 
 답변:"""
-
-        return self.invoke_llm(prompt)
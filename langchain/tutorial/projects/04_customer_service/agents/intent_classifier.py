@@ -0,0 +1,239 @@
+"""
+Intent Classifier - 라우팅 결정 로그로 학습하는 경량 분류기
+"""
+
+import json
+import math
+import os
+from collections import Counter, defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class IntentClassifier:
+    """
+    문자 n-gram TF-IDF + 카테고리 중심(centroid) 코사인 분류기
+
+    LLM이 내린 라우팅 결정(메시지, 카테고리)을 학습 데이터로 사용합니다.
+    한국어는 띄어쓰기/조사 변화가 많으므로 단어 대신 어절 내부의 문자
+    n-gram을 특징으로 씁니다. 외부 의존성 없이 희소 dict 벡터로 계산하므로
+    수천 건의 로그도 밀리초 단위로 다시 학습합니다.
+
+    학습 예시는 카테고리별로 최근 `max_examples_per_category`건만 보관하므로
+    트래픽이 늘어도 메모리와 재학습 비용이 일정합니다.
+    """
+
+    def __init__(
+        self,
+        categories: Iterable[str],
+        ngram_range: Tuple[int, int] = (2, 3),
+        min_examples: int = 5,
+        retrain_every: int = 20,
+        temperature: float = 0.05,
+        min_similarity: float = 0.3,
+        max_examples_per_category: int = 500,
+    ):
+        """
+        초기화
+
+        Args:
+            categories: 분류할 카테고리
+            ngram_range: 문자 n-gram 길이 범위 (최소, 최대)
+            min_examples: 카테고리를 예측 대상으로 삼을 최소 학습 예시 수
+            retrain_every: 새 예시가 이만큼 쌓이면 다시 학습
+            temperature: 코사인 유사도를 확률로 바꿀 때의 softmax 온도
+            min_similarity: 최고 유사도가 이보다 낮으면 신뢰도를 비례해서 낮춤
+                (학습 데이터와 닮지 않은 메시지를 확신하지 않도록)
+            max_examples_per_category: 카테고리별로 보관할 최근 예시 수
+        """
+        self.categories = list(categories)
+        self.ngram_range = ngram_range
+        self.min_examples = min_examples
+        self.retrain_every = retrain_every
+        self.temperature = temperature
+        self.min_similarity = min_similarity
+
+        self.max_examples_per_category = max_examples_per_category
+        # 카테고리별 최근 (메시지, 문자 n-gram) - 재학습 시 n-gram을 다시 만들지 않음
+        self._examples: Dict[str, deque] = {
+            category: deque(maxlen=max_examples_per_category) for category in self.categories
+        }
+        self._pending = 0
+        self._idf: Dict[str, float] = {}
+        self._unseen_idf = 1.0
+        self._centroids: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def examples(self) -> List[Tuple[str, str]]:
+        """보관 중인 학습 예시 (메시지, 카테고리)"""
+        return [
+            (message, category)
+            for category, examples in self._examples.items()
+            for message, _ in examples
+        ]
+
+    @property
+    def capacity(self) -> int:
+        """보관할 수 있는 최대 예시 수"""
+        return self.max_examples_per_category * len(self.categories)
+
+    @property
+    def trained(self) -> bool:
+        """두 개 이상의 카테고리를 구분할 수 있는지 여부"""
+        return len(self._centroids) >= 2
+
+    def add_example(self, message: str, category: str):
+        """
+        학습 예시 추가 (다음 예측 시 필요하면 다시 학습)
+
+        Args:
+            message: 고객 메시지
+            category: 라우팅된 카테고리
+        """
+        if category not in self._examples:
+            return
+        self._examples[category].append((message, self._ngrams(message)))
+        self._pending += 1
+
+    def fit(self):
+        """보관 중인 예시로 IDF와 카테고리 중심 벡터 계산"""
+        self._pending = 0
+        examples = [
+            (ngrams, category)
+            for category, category_examples in self._examples.items()
+            if len(category_examples) >= self.min_examples
+            for _, ngrams in category_examples
+        ]
+
+        document_frequency: Counter = Counter()
+        for ngrams, _ in examples:
+            document_frequency.update(ngrams.keys())
+        total = len(examples)
+        self._idf = {
+            ngram: math.log((1 + total) / (1 + df)) + 1.0
+            for ngram, df in document_frequency.items()
+        }
+        self._unseen_idf = math.log(1 + total) + 1.0
+
+        sums: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for ngrams, category in examples:
+            for ngram, weight in self._vectorize(ngrams).items():
+                sums[category][ngram] += weight
+        self._centroids = {category: self._normalize(vector) for category, vector in sums.items()}
+
+    def predict(self, message: str) -> Tuple[Optional[str], float]:
+        """
+        메시지 분류
+
+        Args:
+            message: 고객 메시지
+
+        Returns:
+            Tuple[Optional[str], float]: (카테고리, 신뢰도) - 학습 전이면 (None, 0.0)
+        """
+        if self._pending and (self._pending >= self.retrain_every or not self.trained):
+            self.fit()
+        if not self.trained:
+            return None, 0.0
+
+        vector = self._vectorize(self._ngrams(message))
+        if not vector:
+            return None, 0.0
+        similarities = {
+            category: sum(weight * centroid.get(ngram, 0.0) for ngram, weight in vector.items())
+            for category, centroid in self._centroids.items()
+        }
+
+        # 코사인 유사도 → softmax 확률, 학습 데이터와 거리가 멀면 낮춤
+        best = max(similarities.values())
+        exps = {
+            category: math.exp((similarity - best) / self.temperature)
+            for category, similarity in similarities.items()
+        }
+        category = max(exps, key=exps.get)
+        probability = exps[category] / sum(exps.values())
+        return category, probability * min(1.0, best / self.min_similarity)
+
+    def load_log(self, path: str) -> int:
+        """
+        라우팅 결정 로그(JSON Lines)에서 예시 로드 후 학습
+
+        카테고리별 최근 `max_examples_per_category`건만 남습니다.
+
+        Args:
+            path: 로그 파일 경로
+
+        Returns:
+            int: 로드한 예시 수
+        """
+        if not path or not os.path.exists(path):
+            return 0
+        loaded = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("category") in self._examples:
+                    self.add_example(record.get("message", ""), record["category"])
+                    loaded += 1
+        self.fit()
+        return min(loaded, len(self.examples))
+
+    def compact_log(self, path: str):
+        """로그를 보관 중인 예시만 남도록 다시 쓰기 (임시 파일 교체)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for message, category in self.examples:
+                f.write(json.dumps({"message": message, "category": category}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def append_log(path: str, message: str, category: str):
+        """라우팅 결정 한 건을 로그에 추가"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"message": message, "category": category}, ensure_ascii=False) + "\n")
+
+    def _ngrams(self, message: str) -> Counter:
+        """어절 양끝에 공백을 붙인 문자 n-gram 빈도"""
+        low, high = self.ngram_range
+        ngrams: Counter = Counter()
+        for word in message.lower().split():
+            padded = f" {word} "
+            for n in range(low, high + 1):
+                for i in range(len(padded) - n + 1):
+                    ngrams[padded[i : i + n]] += 1
+        return ngrams
+
+    def _vectorize(self, ngrams: Counter) -> Dict[str, float]:
+        """
+        sublinear TF x IDF 벡터 (L2 정규화)
+
+        학습에 없던 n-gram은 어느 중심과도 내적이 0이므로 벡터에서 빼되,
+        정규화에는 포함해서 일부 n-gram만 겹치는 메시지의 유사도가
+        부풀려지지 않게 합니다.
+        """
+        vector = {}
+        norm = 0.0
+        for ngram, count in ngrams.items():
+            weight = (1.0 + math.log(count)) * self._idf.get(ngram, self._unseen_idf)
+            norm += weight * weight
+            if ngram in self._idf:
+                vector[ngram] = weight
+        if not vector:
+            return {}
+        norm = math.sqrt(norm)
+        return {ngram: weight / norm for ngram, weight in vector.items()}
+
+    @staticmethod
+    def _normalize(vector: Dict[str, float]) -> Dict[str, float]:
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if not norm:
+            return {}
+        return {key: weight / norm for key, weight in vector.items()}
@@ -2,8 +2,24 @@
 Router Agent - 문의를 분류하고 라우팅
 """
 
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
+from keyword_matcher import KeywordMatcher
 from .base import BaseAgent
+from .intent_classifier import IntentClassifier
+
+# 라우팅 계층 (빠른 순)
+TIERS = ("keyword", "classifier", "llm")
+
+DEFAULT_ROUTER_CONFIG = {
+    "keyword_threshold": 0.8,
+    "min_keyword_hits": 1,
+    "classifier_enabled": True,
+    "classifier_threshold": 0.75,
+    "min_examples_per_category": 5,
+    "retrain_every": 20,
+    "max_examples_per_category": 500,
+    "decision_log": None,
+}
 
 
 class RouterAgent(BaseAgent):
@@ -25,48 +41,192 @@ class RouterAgent(BaseAgent):
         ],
     }
 
+    # 모든 카테고리 키워드를 한 번에 찾는 오토마타 (목록 변경 시 set_keywords로 재구축)
+    KEYWORD_MATCHER = KeywordMatcher(CATEGORIES)
+
+    def __init__(
+        self,
+        name: str,
+        llm,
+        verbose: bool = False,
+        router_config: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        초기화
+
+        Args:
+            name: Agent 이름
+            llm: LLM 인스턴스
+            verbose: 상세 로그 출력 여부
+            router_config: 계층별 임계값 설정 (`Config.router_config`)
+        """
+        super().__init__(name, llm, verbose)
+        self.router_config = {**DEFAULT_ROUTER_CONFIG, **(router_config or {})}
+
+        # LLM 라우팅 결정으로 학습하는 로컬 분류기
+        self.classifier: Optional[IntentClassifier] = None
+        # 마지막 압축 이후 로그에 쌓인 줄 수 (분류기 보관 한도의 2배가 되면 압축)
+        self._log_records = 0
+        if self.router_config["classifier_enabled"]:
+            self.classifier = IntentClassifier(
+                self.CATEGORIES,
+                min_examples=self.router_config["min_examples_per_category"],
+                retrain_every=self.router_config["retrain_every"],
+                max_examples_per_category=self.router_config["max_examples_per_category"],
+            )
+            loaded = self.classifier.load_log(self.router_config["decision_log"])
+            if loaded:
+                self._compact_log()
+                self.log(f"라우팅 로그 {loaded}건으로 분류기 학습 완료")
+
+    @classmethod
+    def set_keywords(cls, category: str, keywords: List[str]):
+        """
+        카테고리 키워드 목록 교체 후 매처 재구축
+
+        Args:
+            category: 카테고리
+            keywords: 새 키워드 목록
+        """
+        cls.CATEGORIES = {**cls.CATEGORIES, category: list(keywords)}
+        cls.KEYWORD_MATCHER = KeywordMatcher(cls.CATEGORIES)
+
     def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """실행하지 않고 route 메서드 사용"""
         raise NotImplementedError("RouterAgent는 route() 메서드를 사용하세요")
 
-    def route(self, message: str) -> Dict[str, str]:
+    def route(self, message: str) -> Dict[str, Any]:
         """
         메시지를 분류하고 라우팅
 
+        빠른 계층부터 시도하고, 신뢰도가 임계값 이상이면 다음 계층을
+        건너뜁니다.
+
+        1. keyword: 키워드 매칭 (한 카테고리에만 걸리면 LLM 생략)
+        2. classifier: 로그된 LLM 결정으로 학습한 로컬 분류기
+        3. llm: 두 계층 모두 불확실할 때만 LLM 호출 (결정은 분류기 학습에 사용)
+
         Args:
             message: 고객 메시지
 
         Returns:
-            Dict: 라우팅 정보 (category, confidence, agent)
+            Dict: 라우팅 정보 (category, confidence, tier)
         """
         self.log("문의 분석 중...", force=True)
 
+        category, confidence, tier = self._route_locally(message)
+
+        # 3. LLM 기반 정확한 분류
+        if confidence < self._threshold(tier):
+            category = self._classify_by_llm(message)
+            confidence, tier = self._accept_llm_decision(message, category)
+
+        return self._route_result(category, confidence, tier)
+
+    async def aroute(self, message: str) -> Dict[str, Any]:
+        """
+        `route()`의 비동기 버전 (LLM 계층만 `ainvoke`로 호출)
+
+        Args:
+            message: 고객 메시지
+
+        Returns:
+            Dict: 라우팅 정보 (category, confidence, tier)
+        """
+        self.log("문의 분석 중...", force=True)
+
+        category, confidence, tier = self._route_locally(message)
+
+        if confidence < self._threshold(tier):
+            response = await self.ainvoke_llm(self._classification_prompt(message))
+            category = self._parse_category(response)
+            confidence, tier = self._accept_llm_decision(message, category)
+
+        return self._route_result(category, confidence, tier)
+
+    def _route_locally(self, message: str) -> Tuple[Optional[str], float, str]:
+        """키워드 → 로컬 분류기 계층 (LLM 호출 없음)"""
         # 1. 키워드 기반 빠른 분류
-        keyword_category = self._classify_by_keywords(message)
+        category, confidence = self._score_keywords(message)
+        tier = "keyword"
 
-        # 2. LLM 기반 정확한 분류
-        llm_category = self._classify_by_llm(message)
+        # 2. 로컬 분류기
+        if confidence < self.router_config["keyword_threshold"] and self.classifier:
+            category, confidence = self.classifier.predict(message)
+            tier = "classifier"
+            if category is None:
+                confidence = 0.0
 
-        # 3. 결합
-        category = llm_category if llm_category else keyword_category
-        confidence = self._calculate_confidence(message, category)
+        return category, confidence, tier
 
-        self.log(f"➜ {category.title()} Agent로 전달", force=True)
+    def _accept_llm_decision(self, message: str, category: str) -> Tuple[float, str]:
+        """LLM 분류 결과의 신뢰도 계산 후 분류기 학습 데이터로 기록"""
+        self._record_decision(message, category)
+        return self._calculate_confidence(message, category), "llm"
+
+    def _route_result(self, category: str, confidence: float, tier: str) -> Dict[str, Any]:
+        self.log(f"➜ {category.title()} Agent로 전달 ({tier})", force=True)
 
         return {
             "category": category,
             "confidence": confidence,
+            "tier": tier,
         }
 
+    def _threshold(self, tier: str) -> float:
+        """계층별 LLM 생략 임계값"""
+        if tier == "keyword":
+            return self.router_config["keyword_threshold"]
+        return self.router_config["classifier_threshold"]
+
+    def _record_decision(self, message: str, category: str):
+        """LLM 라우팅 결정을 분류기 학습 데이터와 로그에 기록"""
+        if not self.classifier:
+            return
+        self.classifier.add_example(message, category)
+        path = self.router_config["decision_log"]
+        if path:
+            try:
+                IntentClassifier.append_log(path, message, category)
+            except OSError as e:
+                self.log(f"라우팅 로그 기록 실패: {e}")
+                return
+            self._log_records += 1
+            if self._log_records >= 2 * self.classifier.capacity:
+                self._compact_log()
+
+    def _compact_log(self):
+        """라우팅 로그를 분류기가 보관 중인 예시만 남도록 줄이기"""
+        path = self.router_config["decision_log"]
+        try:
+            self.classifier.compact_log(path)
+        except OSError as e:
+            self.log(f"라우팅 로그 압축 실패: {e}")
+            return
+        self._log_records = len(self.classifier.examples)
+
+    def _keyword_scores(self, message: str) -> Dict[str, int]:
+        """카테고리별 매칭된 키워드 수 (메시지를 한 번만 훑음)"""
+        return self.KEYWORD_MATCHER.counts(message)
+
+    def _score_keywords(self, message: str) -> Tuple[str, float]:
+        """
+        키워드 분류와 신뢰도
+
+        신뢰도는 매칭된 키워드 중 최고 카테고리의 비율입니다. 한
+        카테고리에만 걸리면 1.0, 두 카테고리에 똑같이 걸리면 0.5,
+        매칭 수가 `min_keyword_hits` 미만이면 0입니다.
+        """
+        scores = self._keyword_scores(message)
+        category = max(scores, key=scores.get)
+        total = sum(scores.values())
+        if scores[category] < max(1, self.router_config["min_keyword_hits"]):
+            return "general", 0.0
+        return category, scores[category] / total
+
     def _classify_by_keywords(self, message: str) -> str:
         """키워드 기반 분류"""
-        message_lower = message.lower()
-        scores = {category: 0 for category in self.CATEGORIES}
-
-        for category, keywords in self.CATEGORIES.items():
-            for keyword in keywords:
-                if keyword in message_lower:
-                    scores[category] += 1
+        scores = self._keyword_scores(message)
 
         # 점수가 가장 높은 카테고리 반환
         max_score = max(scores.values())
@@ -77,7 +237,11 @@ class RouterAgent(BaseAgent):
 
     def _classify_by_llm(self, message: str) -> str:
         """LLM 기반 정확한 분류"""
-        prompt = f"""다음 고객 문의를 분류하세요.
+        return self._parse_category(self.invoke_llm(self._classification_prompt(message)))
+
+    def _classification_prompt(self, message: str) -> str:
+        """LLM 분류 프롬프트"""
+        return f"""다음 고객 문의를 분류하세요.
 
 고객 문의: "{message}"
 
@@ -90,9 +254,9 @@ class RouterAgent(BaseAgent):
 
 카테고리:"""
 
-        response = self.invoke_llm(prompt).strip().lower()
-
-        # 응답에서 카테고리 추출
+    def _parse_category(self, response: str) -> str:
+        """LLM 응답에서 카테고리 추출"""
+        response = response.strip().lower()
         for category in self.CATEGORIES.keys():
             if category in response:
                 return category
@@ -101,11 +265,10 @@ class RouterAgent(BaseAgent):
 
     def _calculate_confidence(self, message: str, category: str) -> float:
         """분류 신뢰도 계산"""
-        message_lower = message.lower()
         keywords = self.CATEGORIES[category]
 
         # 키워드 매칭 비율
-        matches = sum(1 for keyword in keywords if keyword in message_lower)
+        matches = self._keyword_scores(message)[category]
         keyword_ratio = matches / len(keywords) if keywords else 0
 
         # 기본 신뢰도 (0.5) + 키워드 보너스
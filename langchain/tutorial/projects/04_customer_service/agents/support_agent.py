@@ -3,12 +3,16 @@ Support Agent - 기술 지원
 """
 
 from typing import Dict, Any
+from keyword_matcher import KeywordMatcher
 from .base import BaseAgent
 
 
 class SupportAgent(BaseAgent):
     """기술 지원 Agent"""
 
+    # 답변에 포함되면 에스컬레이션하는 표현
+    ESCALATION_MATCHER = KeywordMatcher({"escalation": ["확인이 어렵", "도움이 필요", "전문가"]})
+
     def __init__(self, name: str, llm, rag, verbose: bool = False):
         super().__init__(name, llm, verbose)
         self.rag = rag
@@ -18,7 +22,8 @@ class SupportAgent(BaseAgent):
         기술 지원 제공
 
         Args:
-            input_data: {"message": str, "context": list, "session_id": str}
+            input_data: {"message": str, "context": list, "summary": str, "session_id": str,
+                "query_embedding": list (선택, 미리 계산한 쿼리 임베딩)}
 
         Returns:
             Dict: 응답 정보
@@ -29,23 +34,46 @@ class SupportAgent(BaseAgent):
         self.log("기술 지원 처리 중...")
 
         # RAG로 관련 문서 검색
-        relevant_docs = self.rag.search(message, category="support")
+        relevant_docs = self.rag.search(
+            message, category="support", embedding=input_data.get("query_embedding")
+        )
 
         # 답변 생성
         answer = self._generate_answer(message, relevant_docs, context)
 
+        return self._build_response(answer, relevant_docs)
+
+    async def arun(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """기술 지원 제공 (비동기)"""
+        message = input_data["message"]
+        context = input_data.get("context", [])
+
+        self.log("기술 지원 처리 중...")
+
+        relevant_docs = await self.rag.asearch(
+            message, category="support", embedding=input_data.get("query_embedding")
+        )
+        answer = await self.ainvoke_llm(self._build_prompt(message, relevant_docs, context))
+
+        return self._build_response(answer, relevant_docs)
+
+    def _build_response(self, answer: str, docs: list) -> Dict[str, Any]:
         return {
             "answer": answer,
-            "sources": relevant_docs,
+            "sources": docs,
             "needs_escalation": self._check_escalation(answer),
         }
 
     def _generate_answer(self, message: str, docs: list, context: list) -> str:
         """답변 생성"""
+        return self.invoke_llm(self._build_prompt(message, docs, context))
+
+    def _build_prompt(self, message: str, docs: list, context: list) -> str:
+        """답변 프롬프트"""
         # 문서 내용 결합
         doc_content = "\n\n".join([doc.page_content for doc in docs[:2]])
 
-        prompt = f"""당신은 친절한 기술 지원 담당자입니다.
+        return f"""당신은 친절한 기술 지원 담당자입니다.
 
 참고 문서:
 {doc_content}
@@ -57,9 +85,6 @@ class SupportAgent(BaseAgent):
 
 답변:"""
 
-        return self.invoke_llm(prompt)
-
     def _check_escalation(self, answer: str) -> bool:
         """에스컬레이션 필요 여부 확인"""
-        escalation_keywords = ["확인이 어렵", "도움이 필요", "전문가"]
-        return any(keyword in answer for keyword in escalation_keywords)
+        return self.ESCALATION_MATCHER.contains_any(answer)
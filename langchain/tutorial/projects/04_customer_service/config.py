@@ -3,10 +3,84 @@ Configuration Management
 설정 관리
 """
 
+import asyncio
+import json
 import os
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, List, Tuple
+
+import httpx
 from langchain_openai import ChatOpenAI
 
+# 프로세스 전체에서 공유하는 LLM 인스턴스와 HTTP 연결 풀
+# (시스템/Agent마다 클라이언트를 만들면 연결 풀과 TCP/TLS 연결이 그만큼 늘어남)
+_LLM_CACHE: Dict[str, ChatOpenAI] = {}
+_HTTP_CLIENTS: Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_key(options: Dict[str, Any]) -> str:
+    return json.dumps(options, sort_keys=True, default=str)
+
+
+def get_http_clients(http_config: Dict[str, Any]) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    연결 풀 설정별로 공유하는 동기/비동기 HTTP 클라이언트
+
+    Args:
+        http_config: `Config.http_config`
+
+    Returns:
+        Tuple[httpx.Client, httpx.AsyncClient]: (동기, 비동기) 클라이언트
+    """
+    key = _cache_key(http_config)
+    with _CACHE_LOCK:
+        if key not in _HTTP_CLIENTS:
+            limits = httpx.Limits(
+                max_connections=http_config["max_connections"],
+                max_keepalive_connections=http_config["max_keepalive_connections"],
+                keepalive_expiry=http_config["keepalive_expiry"],
+            )
+            _HTTP_CLIENTS[key] = (httpx.Client(limits=limits), httpx.AsyncClient(limits=limits))
+        return _HTTP_CLIENTS[key]
+
+
+def _take_http_clients() -> List[Tuple[httpx.Client, httpx.AsyncClient]]:
+    """공유 LLM 인스턴스를 비우고 캐시에서 꺼낸 HTTP 클라이언트 반환"""
+    with _CACHE_LOCK:
+        _LLM_CACHE.clear()
+        clients = list(_HTTP_CLIENTS.values())
+        _HTTP_CLIENTS.clear()
+    return clients
+
+
+async def aclear_llm_cache():
+    """
+    공유 LLM 인스턴스를 비우고 동기/비동기 HTTP 연결 풀 종료
+
+    비동기 클라이언트의 연결은 사용한 이벤트 루프에서 닫아야 하므로,
+    서버 종료 시(FastAPI lifespan 등) 같은 루프 안에서 호출합니다.
+    """
+    clients = _take_http_clients()
+    for client, _ in clients:
+        client.close()
+    await asyncio.gather(*(async_client.aclose() for _, async_client in clients))
+
+
+def clear_llm_cache():
+    """
+    공유 LLM 인스턴스를 비우고 HTTP 연결 풀 종료 (테스트, 설정 변경 시)
+
+    이벤트 루프 밖에서만 호출할 수 있습니다. 루프 안에서는
+    `await aclear_llm_cache()`를 사용하세요.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(aclear_llm_cache())
+    else:
+        raise RuntimeError("이벤트 루프 안에서는 await aclear_llm_cache()를 사용하세요.")
+
 
 class Config:
     """시스템 설정"""
@@ -44,12 +118,59 @@ class Config:
             },
         }
 
+        # 라우팅 설정 (키워드 → 로컬 분류기 → LLM 순으로 시도)
+        self.router_config = {
+            # 키워드 신뢰도(최고 카테고리 매칭 비율)가 이 값 이상이면 LLM 생략
+            "keyword_threshold": 0.8,
+            "min_keyword_hits": 1,
+            # LLM 라우팅 결정으로 학습하는 로컬 분류기
+            "classifier_enabled": True,
+            "classifier_threshold": 0.75,
+            "min_examples_per_category": 5,
+            "retrain_every": 20,
+            # 카테고리별로 보관할 최근 학습 예시 수 (메모리/재학습 비용 상한)
+            "max_examples_per_category": 500,
+            # LLM 라우팅 결정 로그 (JSON Lines, 고객 메시지 원문이 저장되므로 opt-in).
+            # 경로를 지정하면 재시작 후에도 분류기를 이어서 학습하며, 로그는
+            # 보관 한도의 2배가 되면 보관 중인 예시만 남도록 압축됩니다.
+            "decision_log": None,
+        }
+
         # RAG 설정
         self.rag_config = {
             "chunk_size": 1000,
             "chunk_overlap": 200,
             "top_k": 3,
             "score_threshold": 0.7,
+            # 네이티브 인덱스 벡터 압축 ("none", "fp16", "int8")
+            "quantization": "none",
+        }
+
+        # LLM API HTTP 연결 풀 설정 (같은 설정의 LLM은 하나의 풀을 공유)
+        self.http_config = {
+            "max_connections": 100,
+            # 재사용을 위해 열어 둘 유휴 연결 수와 유지 시간 (초)
+            "max_keepalive_connections": 20,
+            "keepalive_expiry": 30.0,
+        }
+
+        # 세션 저장소 설정
+        self.session_config = {
+            # "memory" (프로세스 내) 또는 "sqlite" (재시작 후 유지, 여러 워커 공유)
+            "backend": "memory",
+            "path": "data/sessions.db",
+            # 최근 접근 순으로 이 수를 넘는 세션은 제거
+            "max_sessions": 10_000,
+            # 이 시간(초) 동안 대화가 없으면 만료 (None이면 만료 없음)
+            "ttl_seconds": 1800,
+            # 세션당 보관할 최근 턴 수 (이전 턴은 요약으로 합침)
+            "max_turns": 20,
+        }
+
+        # 비동기 처리 설정 (`ahandle_message`)
+        self.concurrency_config = {
+            # 동시에 처리할 최대 요청 수 (LLM API 속도 제한에 맞춰 조정)
+            "max_concurrent_requests": 32,
         }
 
         # HITL 설정
@@ -64,12 +185,20 @@ class Config:
             "enabled": True,
             "log_level": "INFO",
             "metrics_enabled": True,
+            # 응답 시간 분위수(p50/p95/p99)를 계산할 최근 시간 창 (초)
+            "window_seconds": 300,
+            # CLI 모드에서 Prometheus `/metrics`를 내보낼 로컬 포트 (None이면 사용 안 함)
+            "metrics_port": None,
         }
 
     def get_llm(self, agent_type: str) -> ChatOpenAI:
         """
         Agent 타입에 맞는 LLM 반환
 
+        모델/온도 등 설정과 연결 풀 설정이 같으면 프로세스 안에서 같은
+        인스턴스를 돌려주고, 모든 인스턴스가 `http_config`별 연결 풀 하나를
+        공유합니다.
+
         Args:
             agent_type: Agent 타입
 
@@ -77,7 +206,24 @@ class Config:
             ChatOpenAI: LLM 인스턴스
         """
         config = self.llm_config.get(agent_type, self.llm_config["general"])
-        return ChatOpenAI(**config)
+        key = _cache_key({"llm": config, "http": self.http_config})
+        with _CACHE_LOCK:
+            llm = _LLM_CACHE.get(key)
+        if llm is not None:
+            return llm
+
+        http_client, http_async_client = get_http_clients(self.http_config)
+        llm = ChatOpenAI(**config, http_client=http_client, http_async_client=http_async_client)
+        with _CACHE_LOCK:
+            return _LLM_CACHE.setdefault(key, llm)
+
+    def get_router_config(self) -> Dict[str, Any]:
+        """라우팅 설정 반환"""
+        return self.router_config.copy()
+
+    def get_session_config(self) -> Dict[str, Any]:
+        """세션 저장소 설정 반환"""
+        return self.session_config.copy()
 
     def get_rag_config(self) -> Dict[str, Any]:
         """RAG 설정 반환"""
@@ -105,6 +251,13 @@ class ProductionConfig(Config):
         self.monitoring_config["log_level"] = "WARNING"
         self.monitoring_config["metrics_enabled"] = True
 
+        # 동시 요청이 많으므로 유휴 연결을 더 오래, 더 많이 유지
+        self.http_config["max_keepalive_connections"] = 50
+        self.http_config["keepalive_expiry"] = 60.0
+
+        # 여러 워커 프로세스가 세션을 공유하도록 SQLite 사용
+        self.session_config["backend"] = "sqlite"
+
 
 class DevelopmentConfig(Config):
     """개발 설정"""
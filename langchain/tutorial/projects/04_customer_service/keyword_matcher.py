@@ -0,0 +1,140 @@
+"""
+Keyword Matcher
+Aho-Corasick 기반 다중 키워드 매처 (라우터 / HITL / 에스컬레이션 키워드 검사 공용)
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional
+
+
+class KeywordMatcher:
+    """
+    라벨별 키워드 목록을 하나의 오토마타로 컴파일한 매처
+
+    `keyword in message`를 키워드마다 반복하면 O(키워드 수 x 메시지 길이)
+    이지만, 컴파일한 오토마타는 메시지를 한 번 훑으면서 모든 라벨의
+    키워드를 찾으므로 키워드 수와 무관하게 O(메시지 길이 + 매칭 수)입니다.
+
+    결과는 `keyword in message`와 같이 부분 문자열 포함 여부 기준이며,
+    같은 키워드가 여러 번 나와도 한 번으로 셉니다. 목록이 바뀌면 새로
+    만들어야 합니다 (`RouterAgent.set_keywords()` 등).
+    """
+
+    def __init__(self, keywords: Mapping[str, Iterable[str]], ignore_case: bool = True):
+        """
+        초기화 (오토마타 컴파일)
+
+        Args:
+            keywords: 라벨 → 키워드 목록
+            ignore_case: 대소문자 무시 여부
+        """
+        self.ignore_case = ignore_case
+        self.labels: List[str] = list(keywords)
+        self.keywords: Dict[str, List[str]] = {}
+
+        # 상태별 전이, 실패 링크, 출력(키워드 번호)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        # 키워드 번호 → (라벨, 원래 키워드) 목록 (같은 키워드가 여러 라벨에 있을 수 있음)
+        self._entries: List[List[tuple]] = []
+        index_by_pattern: Dict[str, int] = {}
+
+        for label, words in keywords.items():
+            self.keywords[label] = list(words)
+            for word in self.keywords[label]:
+                pattern = self._fold(word)
+                if not pattern:
+                    continue
+                if pattern not in index_by_pattern:
+                    index_by_pattern[pattern] = len(self._entries)
+                    self._entries.append([])
+                    self._insert(pattern, index_by_pattern[pattern])
+                self._entries[index_by_pattern[pattern]].append((label, word))
+        self._build_failure_links()
+
+    def _fold(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def _insert(self, pattern: str, index: int):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(index)
+
+    def _build_failure_links(self):
+        """BFS로 실패 링크를 만들고, 실패 상태의 출력을 합쳐 둠"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _scan(self, text: str):
+        """매칭된 키워드 번호를 등장 순서대로 생성 (중복 포함)"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in self._fold(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                yield from output[state]
+
+    def find(self, text: str) -> Dict[str, List[str]]:
+        """
+        라벨별로 메시지에 포함된 키워드 (처음 등장한 순서, 중복 제거)
+
+        Args:
+            text: 검사할 텍스트
+
+        Returns:
+            Dict[str, List[str]]: 매칭된 라벨 → 키워드 목록 (매칭 없는 라벨은 제외)
+        """
+        found: Dict[str, List[str]] = {}
+        seen = set()
+        for index in self._scan(text):
+            if index in seen:
+                continue
+            seen.add(index)
+            for label, word in self._entries[index]:
+                found.setdefault(label, []).append(word)
+        return found
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """
+        라벨별 매칭된 키워드 수 (모든 라벨 포함)
+
+        Args:
+            text: 검사할 텍스트
+
+        Returns:
+            Dict[str, int]: 라벨 → 서로 다른 키워드 매칭 수
+        """
+        found = self.find(text)
+        return {label: len(found.get(label, ())) for label in self.labels}
+
+    def contains_any(self, text: str, label: Optional[str] = None) -> bool:
+        """
+        키워드가 하나라도 포함되었는지 여부 (첫 매칭에서 중단)
+
+        Args:
+            text: 검사할 텍스트
+            label: 특정 라벨의 키워드만 검사 (None이면 전체)
+        """
+        for index in self._scan(text):
+            if label is None or any(entry[0] == label for entry in self._entries[index]):
+                return True
+        return False
@@ -0,0 +1,520 @@
+"""
+Native Index Module
+pickle 없이 메모리 맵으로 여는 벡터 인덱스 포맷
+
+02_document_qa/native_index.py에서 이 프로젝트가 쓰는 부분(저장, 로드,
+단일 쿼리 검색, FAISS 변환)만 남긴 축약판입니다. 포맷은 같습니다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+
+class NativeVectorStore(VectorStore):
+    """
+    메모리 맵 기반 읽기 전용 벡터 스토어
+
+    `FAISS.save_local()`은 docstore를 pickle로 저장하므로 로드 시
+    역직렬화와 전체 인덱스 메모리 적재가 필요합니다. 이 포맷은 다음
+    파일로 구성되어 로드가 거의 즉시 끝나고, 여러 워커 프로세스가 같은
+    페이지 캐시를 공유합니다.
+
+        - vectors.npy: float32 벡터 (N x d), `np.load(mmap_mode="r")`로 로드
+        - norms.npy: 벡터별 제곱 노름 (L2 거리 계산용)
+        - ids.npy: 문서 ID (고정 길이 바이트 배열)
+        - docs.sqlite: 위치별 텍스트와 메타데이터 (필요한 행만 조회)
+        - meta.json: 포맷 정보 (마지막에 기록되어 저장 완료 표시 역할)
+
+    `quantization`("fp16", "int8")으로 저장하면 codes.npy(과 int8의 경우
+    차원별 offset/scale인 scales.npy)가 추가됩니다. 검색은 압축 코드를
+    전수 스캔해 `k * rerank_factor`개 후보를 고른 뒤, 후보 행만 vectors.npy에서
+    읽어 정확한 거리로 다시 정렬하므로 자주 접근하는 페이지는 코드 크기
+    (1/2, 1/4)로 줄어듭니다.
+
+    거리 점수는 FAISS `IndexFlatL2`와 같은 제곱 L2 거리입니다.
+    문서를 추가/삭제하려면 `to_faiss()`로 변환해야 합니다.
+    """
+
+    FORMAT = "native-v1"
+    META_FILE = "meta.json"
+    VECTORS_FILE = "vectors.npy"
+    NORMS_FILE = "norms.npy"
+    IDS_FILE = "ids.npy"
+    DOCS_FILE = "docs.sqlite"
+    CODES_FILE = "codes.npy"
+    SCALES_FILE = "scales.npy"
+    QUANTIZATIONS = ("none", "fp16", "int8")
+
+    # 검색 시 한 번에 계산할 벡터 수 (메모리 사용량 제한)
+    SEARCH_BLOCK = 65536
+    # 보관할 필터별 위치 마스크 수
+    MASK_CACHE_SIZE = 64
+
+    def __init__(self, path: str, embedding: Embeddings):
+        """
+        초기화 (`load()` 사용 권장)
+
+        Args:
+            path: 인덱스 디렉토리 경로
+            embedding: 쿼리 임베딩 모델
+        """
+        with open(os.path.join(path, self.META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != self.FORMAT:
+            raise ValueError(f"지원하지 않는 인덱스 포맷입니다: {meta.get('format')}")
+
+        self.path = path
+        self.embedding = embedding
+        self.normalize_L2 = bool(meta.get("normalize_L2", False))
+        self.vectors = np.load(os.path.join(path, self.VECTORS_FILE), mmap_mode="r")
+        self.norms = np.load(os.path.join(path, self.NORMS_FILE), mmap_mode="r")
+        self.ids = np.load(os.path.join(path, self.IDS_FILE), mmap_mode="r")
+
+        self.quantization = meta.get("quantization", "none")
+        self.rerank_factor = int(meta.get("rerank_factor", 1))
+        self.codes: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+        if self.quantization != "none":
+            self.codes = np.load(os.path.join(path, self.CODES_FILE), mmap_mode="r")
+        if self.quantization == "int8":
+            self.scales = np.load(os.path.join(path, self.SCALES_FILE))
+
+        db_path = os.path.join(path, self.DOCS_FILE)
+        self._conn = sqlite3.connect(
+            f"file:{db_path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._conn_lock = threading.Lock()
+
+        # 메타데이터 키별 값 열과 필터별 마스크 (읽기 전용이므로 다시 로드할 때까지 유효)
+        self._mask_lock = threading.Lock()
+        self._columns: Dict[str, List[Any]] = {}
+        self._masks: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self.embedding
+
+    def __len__(self) -> int:
+        return int(self.vectors.shape[0])
+
+    @classmethod
+    def is_native(cls, path: str) -> bool:
+        """디렉토리가 네이티브 포맷 인덱스인지 확인"""
+        return os.path.exists(os.path.join(path, cls.META_FILE))
+
+    @classmethod
+    def load(cls, path: str, embedding: Embeddings) -> "NativeVectorStore":
+        """
+        네이티브 포맷 인덱스 로드
+
+        Args:
+            path: 인덱스 디렉토리 경로
+            embedding: 쿼리 임베딩 모델
+
+        Returns:
+            NativeVectorStore: 벡터 스토어
+        """
+        return cls(path, embedding)
+
+    # ---- 저장 ----
+
+    @classmethod
+    def write(
+        cls,
+        path: str,
+        vectors: np.ndarray,
+        texts: List[str],
+        metadatas: List[dict],
+        ids: List[str],
+        normalize_L2: bool = False,
+        quantization: str = "none",
+        rerank_factor: int = 4,
+    ):
+        """
+        벡터와 문서를 네이티브 포맷으로 저장
+
+        각 파일을 임시 이름으로 쓴 뒤 교체하고, meta.json을 마지막에
+        기록합니다.
+
+        Args:
+            path: 인덱스 디렉토리 경로
+            vectors: float32 벡터 (N x d)
+            texts: 위치별 텍스트
+            metadatas: 위치별 메타데이터
+            ids: 위치별 문서 ID
+            normalize_L2: 쿼리 벡터 L2 정규화 여부
+            quantization: 검색용 압축 코드 ("none", "fp16", "int8")
+            rerank_factor: 압축 코드 검색 시 정확한 거리로 다시 정렬할 후보 배수
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if not (len(vectors) == len(texts) == len(metadatas) == len(ids)):
+            raise ValueError("벡터, 텍스트, 메타데이터, ID 개수가 다릅니다.")
+        if quantization not in cls.QUANTIZATIONS:
+            raise ValueError(f"지원하지 않는 양자화 방식입니다: {quantization}")
+        if rerank_factor < 1:
+            raise ValueError("rerank_factor는 1 이상이어야 합니다.")
+
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, cls.META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+
+        encoded_ids = [doc_id.encode("utf-8") for doc_id in ids]
+        id_width = max((len(doc_id) for doc_id in encoded_ids), default=1) or 1
+
+        cls._save_npy(path, cls.VECTORS_FILE, vectors)
+        cls._save_npy(path, cls.NORMS_FILE, np.einsum("ij,ij->i", vectors, vectors))
+        cls._save_npy(path, cls.IDS_FILE, np.array(encoded_ids, dtype=f"S{id_width}"))
+        if quantization == "fp16":
+            cls._save_npy(path, cls.CODES_FILE, vectors.astype(np.float16))
+        elif quantization == "int8":
+            codes, scales = cls._quantize_int8(vectors)
+            cls._save_npy(path, cls.CODES_FILE, codes)
+            cls._save_npy(path, cls.SCALES_FILE, scales)
+        for filename in (cls.CODES_FILE, cls.SCALES_FILE):
+            stale = os.path.join(path, filename)
+            if os.path.exists(stale) and (
+                quantization == "none" or (quantization == "fp16" and filename == cls.SCALES_FILE)
+            ):
+                os.remove(stale)
+
+        db_path = os.path.join(path, cls.DOCS_FILE)
+        tmp_db = db_path + ".tmp"
+        if os.path.exists(tmp_db):
+            os.remove(tmp_db)
+        conn = sqlite3.connect(tmp_db)
+        try:
+            conn.execute(
+                "CREATE TABLE chunks (position INTEGER PRIMARY KEY, id TEXT, text TEXT, metadata TEXT)"
+            )
+            conn.executemany(
+                "INSERT INTO chunks VALUES (?, ?, ?, ?)",
+                (
+                    (position, doc_id, text, json.dumps(metadata, ensure_ascii=False))
+                    for position, (doc_id, text, metadata) in enumerate(zip(ids, texts, metadatas))
+                ),
+            )
+            conn.execute("CREATE INDEX chunks_id ON chunks (id)")
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_db, db_path)
+
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "format": cls.FORMAT,
+                    "count": int(len(vectors)),
+                    "dim": int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+                    "normalize_L2": normalize_L2,
+                    "quantization": quantization,
+                    "rerank_factor": rerank_factor,
+                },
+                f,
+            )
+        os.replace(meta_path + ".tmp", meta_path)
+
+    @staticmethod
+    def _save_npy(path: str, filename: str, array: np.ndarray):
+        target = os.path.join(path, filename)
+        tmp = target + ".tmp.npy"
+        np.save(tmp, array)
+        os.replace(tmp, target)
+
+    @staticmethod
+    def _quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        차원별 최소/최대값 기준 8비트 균일 양자화
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (uint8 코드 N x d, [offset, scale] 2 x d)
+        """
+        if not len(vectors):
+            dim = vectors.shape[1] if vectors.ndim == 2 else 0
+            return np.zeros((0, dim), dtype=np.uint8), np.zeros((2, dim), dtype=np.float32)
+
+        offset = vectors.min(axis=0)
+        scale = (vectors.max(axis=0) - offset) / 255.0
+        scale[scale == 0] = 1.0
+        codes = np.empty(vectors.shape, dtype=np.uint8)
+        for start in range(0, len(vectors), NativeVectorStore.SEARCH_BLOCK):
+            block = vectors[start : start + NativeVectorStore.SEARCH_BLOCK]
+            codes[start : start + len(block)] = np.clip(np.rint((block - offset) / scale), 0, 255)
+        return codes, np.stack([offset, scale]).astype(np.float32)
+
+    @classmethod
+    def save_faiss(
+        cls,
+        path: str,
+        store: Any,
+        vectors: Optional[np.ndarray] = None,
+        quantization: str = "none",
+        rerank_factor: int = 4,
+    ):
+        """
+        LangChain FAISS 벡터 스토어를 네이티브 포맷으로 저장
+
+        Args:
+            path: 인덱스 디렉토리 경로
+            store: `langchain_community.vectorstores.FAISS` 인스턴스
+            vectors: 원본 float 벡터 (양자화 인덱스처럼 복원이 근사인 경우 지정)
+            quantization: 검색용 압축 코드 ("none", "fp16", "int8")
+            rerank_factor: 압축 코드 검색 시 다시 정렬할 후보 배수
+        """
+        from langchain_community.vectorstores.utils import DistanceStrategy
+
+        if store.distance_strategy != DistanceStrategy.EUCLIDEAN_DISTANCE:
+            raise ValueError("네이티브 포맷은 EUCLIDEAN_DISTANCE 인덱스만 지원합니다.")
+
+        count = store.index.ntotal
+        if vectors is None:
+            vectors = store.index.reconstruct_n(0, count) if count else np.zeros((0, store.index.d), dtype=np.float32)
+        texts, metadatas, ids = [], [], []
+        for position in range(count):
+            doc_id = store.index_to_docstore_id[position]
+            doc = store.docstore.search(doc_id)
+            texts.append(doc.page_content)
+            metadatas.append(doc.metadata)
+            ids.append(doc_id)
+        cls.write(
+            path,
+            vectors,
+            texts,
+            metadatas,
+            ids,
+            normalize_L2=store._normalize_L2,
+            quantization=quantization,
+            rerank_factor=rerank_factor,
+        )
+
+    def to_faiss(self, embedding: Optional[Embeddings] = None) -> Any:
+        """
+        수정 가능한 LangChain FAISS 벡터 스토어로 변환 (전체를 메모리에 적재)
+
+        Args:
+            embedding: 임베딩 모델 (기본: 현재 모델)
+
+        Returns:
+            FAISS: 벡터 스토어
+        """
+        import faiss
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        from langchain_community.vectorstores import FAISS
+
+        index = faiss.IndexFlatL2(int(self.vectors.shape[1]))
+        if len(self):
+            index.add(np.ascontiguousarray(self.vectors, dtype=np.float32))
+
+        docs = {}
+        index_to_docstore_id = {}
+        for position, doc in enumerate(self.iter_documents()):
+            docs[doc.id] = doc
+            index_to_docstore_id[position] = doc.id
+
+        return FAISS(
+            embedding_function=embedding or self.embedding,
+            index=index,
+            docstore=InMemoryDocstore(docs),
+            index_to_docstore_id=index_to_docstore_id,
+            normalize_L2=self.normalize_L2,
+        )
+
+    # ---- 조회 ----
+
+    def get_documents(self, positions: Iterable[int]) -> List[Document]:
+        """
+        위치로 문서 조회 (입력 순서 유지)
+
+        Args:
+            positions: 벡터 위치 리스트
+
+        Returns:
+            List[Document]: 문서 리스트
+        """
+        positions = [int(position) for position in positions]
+        if not positions:
+            return []
+
+        placeholders = ",".join("?" * len(positions))
+        with self._conn_lock:
+            rows = self._conn.execute(
+                f"SELECT position, id, text, metadata FROM chunks WHERE position IN ({placeholders})",
+                positions,
+            ).fetchall()
+
+        by_position = {
+            row[0]: Document(id=row[1], page_content=row[2], metadata=json.loads(row[3]))
+            for row in rows
+        }
+        return [by_position[position] for position in positions]
+
+    def iter_documents(self) -> Iterator[Document]:
+        """모든 문서를 위치 순서대로 반환하는 제너레이터"""
+        with self._conn_lock:
+            rows = self._conn.execute(
+                "SELECT id, text, metadata FROM chunks ORDER BY position"
+            ).fetchall()
+        for doc_id, text, metadata in rows:
+            yield Document(id=doc_id, page_content=text, metadata=json.loads(metadata))
+
+    def iter_metadatas(self) -> Iterator[dict]:
+        """모든 메타데이터를 위치 순서대로 반환하는 제너레이터"""
+        with self._conn_lock:
+            rows = self._conn.execute("SELECT metadata FROM chunks ORDER BY position").fetchall()
+        for (metadata,) in rows:
+            yield json.loads(metadata)
+
+    # ---- 검색 ----
+
+    def search_positions(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        벡터로 가장 가까운 위치 검색
+
+        Args:
+            embedding: 쿼리 벡터
+            k: 반환할 개수
+            mask: 위치별 허용 여부 (bool 배열, None이면 전체)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (제곱 L2 거리, 위치) - 가까운 순
+        """
+        query = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        if k <= 0 or not len(self):
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+
+        if self.normalize_L2:
+            query = query / max(float(np.linalg.norm(query)), 1e-12)
+        query_norm = float(query @ query)
+
+        # 압축 코드로는 후보를 넉넉히 고른 뒤 원본 벡터로 다시 정렬
+        final_k = k
+        if self.codes is not None:
+            k = k * self.rerank_factor
+
+        best_scores = np.empty(0, dtype=np.float32)
+        best_positions = np.empty(0, dtype=np.int64)
+        total = len(self)
+        for start in range(0, total, self.SEARCH_BLOCK):
+            stop = min(start + self.SEARCH_BLOCK, total)
+            scores = self.norms[start:stop] - 2.0 * self._block_dot(start, stop, query) + query_norm
+            if mask is not None:
+                scores = np.where(mask[start:stop], scores, np.inf)
+
+            take = min(k, stop - start)
+            top = np.argpartition(scores, take - 1)[:take]
+            best_scores = np.concatenate([best_scores, scores[top].astype(np.float32)])
+            best_positions = np.concatenate([best_positions, top + start])
+            if len(best_scores) > k:
+                keep = np.argpartition(best_scores, k - 1)[:k]
+                best_scores, best_positions = best_scores[keep], best_positions[keep]
+
+        finite = np.isfinite(best_scores)
+        scores, positions = best_scores[finite], best_positions[finite]
+        if self.codes is not None and len(positions):
+            # 메모리 맵에서 순서대로 읽도록 위치를 정렬하여 정확한 거리 계산
+            positions = np.sort(positions)
+            diffs = np.asarray(self.vectors[positions], dtype=np.float32) - query
+            scores = np.einsum("ij,ij->i", diffs, diffs)
+
+        order = np.argsort(scores, kind="stable")[:final_k]
+        return scores[order], positions[order]
+
+    def _block_dot(self, start: int, stop: int, query: np.ndarray) -> np.ndarray:
+        """위치 [start, stop) 벡터와 쿼리의 내적 (압축 코드가 있으면 코드로 근사)"""
+        if self.codes is None:
+            return self.vectors[start:stop] @ query
+        if self.scales is None:
+            return self.codes[start:stop].astype(np.float32) @ query
+        # x ≈ offset + code * scale 이므로 x·q = code·(scale*q) + offset·q
+        offset, scale = self.scales
+        return self.codes[start:stop].astype(np.float32) @ (query * scale) + float(query @ offset)
+
+    def metadata_mask(self, filter: Dict[str, Any]) -> np.ndarray:
+        """
+        메타데이터가 조건과 일치하는 위치 마스크
+
+        Args:
+            filter: 메타데이터 조건 (키별 값 또는 허용 값 리스트)
+
+        같은 필터의 마스크는 캐시하고, 메타데이터 JSON은 키마다 한 번만
+        디코딩하므로 반복되는 필터 검색은 docs.sqlite를 다시 읽지 않습니다.
+
+        Returns:
+            np.ndarray: 위치별 일치 여부 (읽기 전용 bool 배열)
+        """
+        cache_key = json.dumps(filter, sort_keys=True, ensure_ascii=False, default=str)
+        with self._mask_lock:
+            mask = self._masks.get(cache_key)
+            if mask is not None:
+                self._masks.move_to_end(cache_key)
+                return mask
+
+            mask = np.ones(len(self), dtype=bool)
+            for key, value in filter.items():
+                allowed = value if isinstance(value, list) else [value]
+                mask &= np.fromiter(
+                    (item in allowed for item in self._metadata_column(key)), dtype=bool, count=len(self)
+                )
+            mask.flags.writeable = False
+            self._masks[cache_key] = mask
+            while len(self._masks) > self.MASK_CACHE_SIZE:
+                self._masks.popitem(last=False)
+            return mask
+
+    def _metadata_column(self, key: str) -> List[Any]:
+        """위치 순서의 메타데이터 `key` 값 목록 (없으면 None, 호출 측에서 lock 보유)"""
+        if key not in self._columns:
+            self._columns[key] = [metadata.get(key) for metadata in self.iter_metadatas()]
+        return self._columns[key]
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        mask: Optional[np.ndarray] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        """벡터로 유사 문서와 거리 점수 검색 (mask/filter로 사전 필터링)"""
+        if filter:
+            filter_mask = self.metadata_mask(filter)
+            mask = filter_mask if mask is None else mask & filter_mask
+        scores, positions = self.search_positions(embedding, k, mask=mask)
+        documents = self.get_documents(positions)
+        return list(zip(documents, (float(score) for score in scores)))
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """쿼리로 유사 문서와 거리 점수 검색"""
+        return self.similarity_search_with_score_by_vector(
+            self.embedding.embed_query(query), k, **kwargs
+        )
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        """쿼리로 유사 문서 검색"""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        return self._euclidean_relevance_score_fn
+
+    def add_texts(self, texts: Iterable[str], metadatas=None, **kwargs: Any) -> List[str]:
+        raise NotImplementedError("NativeVectorStore는 읽기 전용입니다. to_faiss()로 변환하세요.")
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, **kwargs: Any):
+        raise NotImplementedError("NativeVectorStore.write()로 저장한 뒤 load()를 사용하세요.")
@@ -3,28 +3,46 @@ RAG System for Customer Service
 고객 서비스용 RAG 시스템
 """
 
+import asyncio
 from typing import List, Optional
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from pathlib import Path
 
+from knowledge.embedding_cache import CachedEmbeddings
+from knowledge.native_index import NativeVectorStore
+
 
 class CustomerServiceRAG:
     """고객 서비스 RAG 시스템"""
 
-    def __init__(self, data_path: str = None, verbose: bool = False):
+    def __init__(
+        self,
+        data_path: str = None,
+        verbose: bool = False,
+        cache_dir: Optional[str] = None,
+        quantization: str = "none",
+    ):
         """
         초기화
 
         Args:
             data_path: 지식 데이터 경로
             verbose: 상세 로그
+            cache_dir: 임베딩 캐시 경로 (기본: data_path/embedding_cache)
+            quantization: 네이티브 인덱스 검색용 벡터 압축 ("none", "fp16", "int8").
+                압축 코드로 후보를 고른 뒤 원본 벡터로 다시 정렬합니다.
         """
         self.verbose = verbose
+        self.quantization = quantization
         self.data_path = data_path or str(Path(__file__).parent / "data")
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        self.vectorstore: Optional[FAISS] = None
+        self.embeddings = CachedEmbeddings(
+            OpenAIEmbeddings(model="text-embedding-3-small"),
+            cache_dir or str(Path(self.data_path) / "embedding_cache"),
+            model_name="text-embedding-3-small",
+        )
+        self.vectorstore: Optional[FAISS | NativeVectorStore] = None
 
         # 초기화
         self._initialize()
@@ -32,16 +50,26 @@ class CustomerServiceRAG:
     def _initialize(self):
         """RAG 시스템 초기화"""
         try:
-            # 기존 인덱스 로드 시도
+            # 네이티브 인덱스(메모리 맵) 우선 로드 - pickle 역직렬화 없이 즉시 로드
+            native_path = Path(self.data_path) / "native_index"
             index_path = Path(self.data_path) / "faiss_index"
-            if index_path.exists():
-                self.vectorstore = FAISS.load_local(
+            if NativeVectorStore.is_native(str(native_path)):
+                self.vectorstore = NativeVectorStore.load(str(native_path), self.embeddings)
+                if self.vectorstore.quantization != self.quantization:
+                    # 양자화 설정이 바뀌면 원본 벡터로 다시 저장
+                    self._save_native(self.vectorstore.to_faiss(self.embeddings))
+                if self.verbose:
+                    print(f"[RAG] 네이티브 인덱스 로드 완료 ({len(self.vectorstore)}개 벡터)")
+            elif index_path.exists():
+                # 기존 FAISS 인덱스를 네이티브 포맷으로 변환
+                faiss_store = FAISS.load_local(
                     str(index_path),
                     self.embeddings,
                     allow_dangerous_deserialization=True
                 )
+                self._save_native(faiss_store)
                 if self.verbose:
-                    print("[RAG] 기존 인덱스 로드 완료")
+                    print("[RAG] 기존 인덱스 로드 및 네이티브 포맷 변환 완료")
             else:
                 # 새로 구축
                 self._build_index()
@@ -72,21 +100,40 @@ class CustomerServiceRAG:
             ),
         ]
 
-        self.vectorstore = FAISS.from_documents(sample_docs, self.embeddings)
+        faiss_store = FAISS.from_documents(sample_docs, self.embeddings)
 
-        # 저장
-        index_path = Path(self.data_path) / "faiss_index"
-        index_path.parent.mkdir(parents=True, exist_ok=True)
-        self.vectorstore.save_local(str(index_path))
+        # 네이티브 포맷으로 저장 후 메모리 맵으로 다시 열기
+        self._save_native(faiss_store)
 
         if self.verbose:
             print(f"[RAG] {len(sample_docs)}개 문서 인덱싱 완료")
+            print(f"[RAG] 임베딩 캐시: {self.embeddings.get_stats()}")
+
+    def _save_native(self, faiss_store: FAISS):
+        """FAISS 스토어를 네이티브 포맷으로 저장 후 메모리 맵으로 다시 열기"""
+        native_path = str(Path(self.data_path) / "native_index")
+        NativeVectorStore.save_faiss(native_path, faiss_store, quantization=self.quantization)
+        self.vectorstore = NativeVectorStore.load(native_path, self.embeddings)
+
+    def embed_query(self, query: str) -> List[float]:
+        """
+        검색 쿼리 임베딩 (임베딩 캐시는 문서에만 적용되므로 매번 모델 호출)
+
+        라우팅과 동시에 미리 계산해 두고 `search(embedding=...)`에 넘기면
+        카테고리가 정해진 뒤에는 로컬 인덱스 검색만 남습니다.
+        """
+        return self.embeddings.embed_query(query)
+
+    async def aembed_query(self, query: str) -> List[float]:
+        """`embed_query()`를 스레드에서 실행"""
+        return await asyncio.to_thread(self.embed_query, query)
 
     def search(
         self,
         query: str,
         category: Optional[str] = None,
-        k: int = 3
+        k: int = 3,
+        embedding: Optional[List[float]] = None,
     ) -> List[Document]:
         """
         지식 베이스 검색
@@ -95,6 +142,7 @@ class CustomerServiceRAG:
             query: 검색 쿼리
             category: 카테고리 필터
             k: 반환할 문서 수
+            embedding: 미리 계산한 쿼리 임베딩 (없으면 query를 임베딩)
 
         Returns:
             List[Document]: 관련 문서
@@ -104,14 +152,16 @@ class CustomerServiceRAG:
 
         try:
             # 카테고리 필터링
-            if category:
-                results = self.vectorstore.similarity_search(
-                    query,
-                    k=k,
-                    filter={"category": category}
-                )
+            search_kwargs = {"filter": {"category": category}} if category else {}
+            if embedding is not None:
+                results = [
+                    doc
+                    for doc, _ in self.vectorstore.similarity_search_with_score_by_vector(
+                        embedding, k=k, **search_kwargs
+                    )
+                ]
             else:
-                results = self.vectorstore.similarity_search(query, k=k)
+                results = self.vectorstore.similarity_search(query, k=k, **search_kwargs)
 
             if self.verbose:
                 print(f"[RAG] {len(results)}개 관련 문서 발견")
@@ -122,3 +172,13 @@ class CustomerServiceRAG:
             if self.verbose:
                 print(f"[RAG] 검색 오류: {e}")
             return []
+
+    async def asearch(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        k: int = 3,
+        embedding: Optional[List[float]] = None,
+    ) -> List[Document]:
+        """`search()`를 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.search, query, category, k, embedding)
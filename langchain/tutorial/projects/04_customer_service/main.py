@@ -6,8 +6,10 @@ Customer Service Agent System - Main Entry Point
 import os
 import sys
 import argparse
+import asyncio
+import time
 import uuid
-from datetime import datetime
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from typing import Optional
 
@@ -17,9 +19,12 @@ from agents.billing_agent import BillingAgent
 from agents.general_agent import GeneralAgent
 from agents.escalation_agent import EscalationAgent
 from knowledge.rag_system import CustomerServiceRAG
+from middleware.concurrency import ConcurrencyLimiter, SessionLocks
 from middleware.hitl import HumanInTheLoop
+from middleware.metrics import PROMETHEUS_CONTENT_TYPE, start_metrics_server
 from middleware.monitoring import Monitor
-from config import Config
+from middleware.session_store import create_session_store, make_turn
+from config import Config, aclear_llm_cache
 
 # 환경 변수 로드
 load_dotenv()
@@ -38,15 +43,23 @@ class CustomerServiceSystem:
         self.config = config or Config()
 
         # 컴포넌트 초기화
-        self.rag = CustomerServiceRAG(verbose=self.config.verbose)
+        self.rag = CustomerServiceRAG(
+            verbose=self.config.verbose,
+            quantization=self.config.rag_config["quantization"],
+        )
         self.hitl = HumanInTheLoop()
-        self.monitor = Monitor()
+        session_config = self.config.get_session_config()
+        self.monitor = Monitor(
+            max_sessions=session_config["max_sessions"],
+            window_seconds=self.config.monitoring_config["window_seconds"],
+        )
 
         # Agent 초기화
         self.router = RouterAgent(
             "Router",
             self.config.get_llm("router"),
-            verbose=self.config.verbose
+            verbose=self.config.verbose,
+            router_config=self.config.get_router_config(),
         )
 
         self.agents = {
@@ -77,8 +90,14 @@ class CustomerServiceSystem:
             verbose=self.config.verbose
         )
 
-        # 세션 관리
-        self.sessions = {}
+        # 세션 관리 (LRU + 유휴 TTL, 세션당 최근 턴만 보관)
+        self.sessions = create_session_store(session_config)
+
+        # 비동기 처리: 세션별 순서 보장 + 전역 동시 실행 제한
+        self.session_locks = SessionLocks()
+        self.limiter = ConcurrencyLimiter(
+            self.config.concurrency_config["max_concurrent_requests"]
+        )
 
     def handle_message(self, message: str, session_id: Optional[str] = None) -> dict:
         """
@@ -100,9 +119,13 @@ class CustomerServiceSystem:
 
         try:
             # 1. 라우팅
+            route_started = time.perf_counter()
             route_result = self.router.route(message)
             category = route_result["category"]
             confidence = route_result["confidence"]
+            self.monitor.track_routing(
+                route_result["tier"], time.perf_counter() - route_started
+            )
 
             if self.config.verbose:
                 print(f"\n[Router] 카테고리: {category} (신뢰도: {confidence:.0%})")
@@ -111,62 +134,155 @@ class CustomerServiceSystem:
             agent = self.agents.get(category, self.agents["general"])
 
             # 3. 세션 컨텍스트 조회
-            context = self.sessions.get(session_id, [])
+            session = self.sessions.get(session_id)
 
             # 4. Agent 실행
-            response = agent.run({
-                "message": message,
-                "context": context,
-                "session_id": session_id,
-            })
+            agent_input = self._agent_input(message, session_id, session)
+            response = agent.run(agent_input)
 
             # 5. 에스컬레이션 필요 여부 확인
             if response.get("needs_escalation"):
-                escalation_result = self.escalation.run({
-                    "message": message,
-                    "response": response,
-                    "context": context,
-                })
+                escalation_result = self.escalation.run(
+                    self._escalation_input(message, response, agent_input)
+                )
                 if escalation_result.get("escalated"):
                     response = escalation_result
 
-            # 6. 세션 업데이트
-            self._update_session(session_id, message, response)
+            # 6-7. 세션 업데이트, 모니터링 종료
+            return self._complete(session_id, message, response, category, confidence)
 
-            # 7. 모니터링 종료
-            self.monitor.track_response(
-                session_id,
-                response,
-                category,
-                confidence
-            )
+        except Exception as e:
+            return self._error_result(session_id, e)
 
-            return {
-                "response": response.get("answer", ""),
-                "agent": category,
-                "confidence": confidence,
-                "sources": response.get("sources", []),
-                "session_id": session_id,
-            }
+    async def ahandle_message(self, message: str, session_id: Optional[str] = None) -> dict:
+        """
+        고객 메시지 처리 (비동기)
 
-        except Exception as e:
-            self.monitor.track_error(session_id, str(e))
-            return {
-                "response": "죄송합니다. 일시적인 오류가 발생했습니다. 잠시 후 다시 시도해주세요.",
-                "error": str(e),
-                "session_id": session_id,
-            }
-
-    def _update_session(self, session_id: str, message: str, response: dict):
-        """세션 업데이트"""
-        if session_id not in self.sessions:
-            self.sessions[session_id] = []
-
-        self.sessions[session_id].append({
-            "timestamp": datetime.now().isoformat(),
+        `handle_message()`와 같은 단계를 LLM `ainvoke`로 실행합니다.
+        쿼리 임베딩은 라우팅과 동시에 계산하고, 같은 세션의 메시지는 도착
+        순서대로 하나씩, 다른 세션은 병렬로 처리합니다. 전체 동시 처리 수는
+        `Config.concurrency_config["max_concurrent_requests"]`로 제한합니다.
+
+        Args:
+            message: 고객 메시지
+            session_id: 세션 ID (없으면 새로 생성)
+
+        Returns:
+            dict: 응답 정보
+        """
+        if not session_id:
+            session_id = str(uuid.uuid4())
+
+        # 세션 순서를 먼저 확보해야 대기 중인 요청이 전역 슬롯을 차지하지 않음
+        async with self.session_locks.hold(session_id), self.limiter.hold():
+            self.monitor.track_request(session_id, message)
+
+            embedding_task = asyncio.create_task(self.rag.aembed_query(message))
+            # 쓰이지 않은 임베딩 실패가 경고로 남지 않도록 결과를 회수
+            embedding_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+            try:
+                # 1. 라우팅 (RAG 쿼리 임베딩과 동시에)
+                route_started = time.perf_counter()
+                route_result = await self.router.aroute(message)
+                category = route_result["category"]
+                confidence = route_result["confidence"]
+                self.monitor.track_routing(
+                    route_result["tier"], time.perf_counter() - route_started
+                )
+
+                if self.config.verbose:
+                    print(f"\n[Router] 카테고리: {category} (신뢰도: {confidence:.0%})")
+
+                # 2-3. Agent 선택, 세션 컨텍스트 조회
+                agent = self.agents.get(category, self.agents["general"])
+                session = await self.sessions.aget(session_id)
+
+                # 4. Agent 실행 (임베딩 실패 시 Agent가 직접 임베딩)
+                agent_input = self._agent_input(message, session_id, session)
+                try:
+                    agent_input["query_embedding"] = await embedding_task
+                except Exception:
+                    pass
+                response = await agent.arun(agent_input)
+
+                # 5. 에스컬레이션 필요 여부 확인
+                if response.get("needs_escalation"):
+                    escalation_result = await self.escalation.arun(
+                        self._escalation_input(message, response, agent_input)
+                    )
+                    if escalation_result.get("escalated"):
+                        response = escalation_result
+
+                # 6. 세션 업데이트 (SQLite 잠금 대기가 다른 세션을 막지 않도록 스레드에서)
+                await self.sessions.aappend(session_id, make_turn(message, response, category))
+
+                # 7. 모니터링 종료
+                return self._track_completion(session_id, response, category, confidence)
+
+            except Exception as e:
+                return self._error_result(session_id, e)
+            finally:
+                embedding_task.cancel()
+
+    def _agent_input(self, message: str, session_id: str, session) -> dict:
+        """Agent 입력 (세션의 최근 턴과 요약 포함)"""
+        return {
+            "message": message,
+            "context": session.turns if session else [],
+            "summary": session.summary if session else None,
+            "session_id": session_id,
+        }
+
+    @staticmethod
+    def _escalation_input(message: str, response: dict, agent_input: dict) -> dict:
+        """에스컬레이션 Agent 입력"""
+        return {
             "message": message,
             "response": response,
-        })
+            "context": agent_input["context"],
+        }
+
+    def _complete(
+        self, session_id: str, message: str, response: dict, category: str, confidence: float
+    ) -> dict:
+        """세션 업데이트, 모니터링 종료 후 응답 정보 반환"""
+        # 6. 세션 업데이트
+        self._update_session(session_id, message, response, category)
+
+        # 7. 모니터링 종료
+        return self._track_completion(session_id, response, category, confidence)
+
+    def _track_completion(
+        self, session_id: str, response: dict, category: str, confidence: float
+    ) -> dict:
+        """모니터링 종료 후 응답 정보 반환"""
+        self.monitor.track_response(
+            session_id,
+            response,
+            category,
+            confidence
+        )
+
+        return {
+            "response": response.get("answer", ""),
+            "agent": category,
+            "confidence": confidence,
+            "sources": response.get("sources", []),
+            "session_id": session_id,
+        }
+
+    def _error_result(self, session_id: str, error: Exception) -> dict:
+        """오류 응답 정보 (모니터링에 기록)"""
+        self.monitor.track_error(session_id, str(error))
+        return {
+            "response": "죄송합니다. 일시적인 오류가 발생했습니다. 잠시 후 다시 시도해주세요.",
+            "error": str(error),
+            "session_id": session_id,
+        }
+
+    def _update_session(self, session_id: str, message: str, response: dict, agent: str):
+        """세션 업데이트 (출처 문서 등을 뺀 답변 텍스트만 저장)"""
+        self.sessions.append(session_id, make_turn(message, response, agent))
 
     def run_interactive(self):
         """대화형 CLI 모드"""
@@ -220,9 +336,11 @@ class CustomerServiceSystem:
             pass
 
 
-def run_cli_mode(verbose: bool = False):
+def run_cli_mode(verbose: bool = False, metrics_port: Optional[int] = None):
     """CLI 모드 실행"""
     config = Config(verbose=verbose)
+    if metrics_port is not None:
+        config.monitoring_config["metrics_port"] = metrics_port
 
     # API 키 확인
     if not os.getenv("OPENAI_API_KEY"):
@@ -230,6 +348,12 @@ def run_cli_mode(verbose: bool = False):
         sys.exit(1)
 
     system = CustomerServiceSystem(config)
+
+    port = config.monitoring_config["metrics_port"]
+    if port is not None:
+        start_metrics_server(system.monitor.to_prometheus, port)
+        print(f"📈 메트릭: http://localhost:{port}/metrics")
+
     system.run_interactive()
 
 
@@ -237,13 +361,20 @@ def run_api_mode(port: int = 8000):
     """API 모드 실행 (FastAPI)"""
     try:
         from fastapi import FastAPI
+        from fastapi.responses import PlainTextResponse
         from fastapi.middleware.cors import CORSMiddleware
         import uvicorn
     except ImportError:
         print("❌ FastAPI를 설치해주세요: pip install fastapi uvicorn")
         sys.exit(1)
 
-    app = FastAPI(title="Customer Service API")
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        # 공유 HTTP 연결 풀 종료 (비동기 클라이언트는 서버 이벤트 루프에서 닫음)
+        await aclear_llm_cache()
+
+    app = FastAPI(title="Customer Service API", lifespan=lifespan)
 
     # CORS 설정
     app.add_middleware(
@@ -266,7 +397,7 @@ def run_api_mode(port: int = 8000):
         if not message:
             return {"error": "message is required"}
 
-        result = system.handle_message(message, session_id)
+        result = await system.ahandle_message(message, session_id)
         return result
 
     @app.get("/health")
@@ -274,6 +405,13 @@ def run_api_mode(port: int = 8000):
         """헬스 체크"""
         return {"status": "healthy"}
 
+    @app.get("/metrics")
+    async def metrics():
+        """Prometheus 메트릭"""
+        return PlainTextResponse(
+            system.monitor.to_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE
+        )
+
     print(f"🚀 API 서버 시작: http://localhost:{port}")
     uvicorn.run(app, host="0.0.0.0", port=port)
 
@@ -290,6 +428,9 @@ def main():
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="상세 출력"
     )
+    parser.add_argument(
+        "--metrics-port", type=int, help="CLI 모드에서 Prometheus 메트릭을 내보낼 포트"
+    )
     parser.add_argument(
         "--demo", action="store_true", help="데모 모드 (샘플 대화)"
     )
@@ -301,7 +442,7 @@ def main():
     elif args.demo:
         print("데모 모드는 구현 예정입니다.")
     else:
-        run_cli_mode(args.verbose)
+        run_cli_mode(args.verbose, args.metrics_port)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+"""
+Concurrency Middleware
+비동기 요청 처리용 세션별 순서 보장과 전역 동시 실행 제한
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+
+class SessionLocks:
+    """
+    세션 ID별 asyncio 잠금
+
+    같은 세션의 메시지는 도착 순서대로 하나씩 처리하고, 다른 세션은
+    서로 기다리지 않습니다. 잠금을 기다리거나 쥔 요청이 없어지면 항목을
+    지우므로 세션 수만큼 쌓이지 않습니다.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._users: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, session_id: str) -> AsyncIterator[None]:
+        """세션 잠금을 쥔 채로 블록 실행"""
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        self._users[session_id] = self._users.get(session_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._users[session_id] -= 1
+            if not self._users[session_id]:
+                del self._users[session_id]
+                del self._locks[session_id]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+class ConcurrencyLimiter:
+    """
+    전역 동시 실행 수 제한 (asyncio.Semaphore)
+
+    세마포어는 처음 사용한 이벤트 루프에 묶이므로, 루프가 바뀌면
+    (테스트에서 `asyncio.run()`을 여러 번 호출하는 경우 등) 새로 만듭니다.
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("동시 실행 수는 1 이상이어야 합니다.")
+        self.limit = limit
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.active = 0
+        self.peak = 0
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        """슬롯을 하나 쥔 채로 블록 실행"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = loop
+        async with self._semaphore:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                yield
+            finally:
+                self.active -= 1
@@ -5,6 +5,8 @@ Human-in-the-Loop Middleware
 
 from typing import Dict, Any, List
 
+from keyword_matcher import KeywordMatcher
+
 
 class HumanInTheLoop:
     """Human-in-the-Loop 구현"""
@@ -17,6 +19,9 @@ class HumanInTheLoop:
         "해지", "terminate",
     ]
 
+    # 중요 작업 키워드 오토마타 (목록 변경 시 set_critical_actions로 재구축)
+    CRITICAL_MATCHER = KeywordMatcher({"critical": CRITICAL_ACTIONS})
+
     def __init__(self, confidence_threshold: float = 0.7):
         """
         초기화
@@ -27,6 +32,17 @@ class HumanInTheLoop:
         self.confidence_threshold = confidence_threshold
         self.approval_log = []
 
+    @classmethod
+    def set_critical_actions(cls, actions: List[str]):
+        """
+        중요 작업 키워드 목록 교체 후 매처 재구축
+
+        Args:
+            actions: 새 키워드 목록
+        """
+        cls.CRITICAL_ACTIONS = list(actions)
+        cls.CRITICAL_MATCHER = KeywordMatcher({"critical": cls.CRITICAL_ACTIONS})
+
     def requires_approval(self, message: str, confidence: float = 1.0) -> bool:
         """
         승인 필요 여부 확인
@@ -38,10 +54,8 @@ class HumanInTheLoop:
         Returns:
             bool: 승인 필요 여부
         """
-        # 중요 작업 키워드 확인
-        has_critical_action = any(
-            action in message for action in self.CRITICAL_ACTIONS
-        )
+        # 중요 작업 키워드 확인 (대소문자 무시, 한 번의 스캔)
+        has_critical_action = self.CRITICAL_MATCHER.contains_any(message)
 
         # 신뢰도가 낮은 경우
         low_confidence = confidence < self.confidence_threshold
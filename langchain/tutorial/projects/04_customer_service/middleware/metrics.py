@@ -0,0 +1,271 @@
+"""
+Streaming Metrics
+고정 메모리 지연 시간 히스토그램과 Prometheus 텍스트 포맷 내보내기
+"""
+
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class LogHistogram:
+    """
+    로그 간격 버킷 히스토그램 (DDSketch 방식)
+
+    값 v를 버킷 ceil(log_gamma(v))에 세므로 어떤 분위수든 상대 오차
+    `relative_accuracy` 이내로 계산합니다. 버킷 수는 값의 범위(최대/최소 비)에만
+    의존하고 요청 수와 무관하며, `max_buckets`를 넘으면 가장 작은 버킷부터
+    합칩니다 (낮은 분위수만 부정확해짐). 버킷별 개수를 더하면 되므로
+    워커/시간 구간별 히스토그램을 그대로 합칠 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        min_value: float = 1e-6,
+        max_buckets: int = 2048,
+    ):
+        """
+        초기화
+
+        Args:
+            relative_accuracy: 분위수 상대 오차 (0.01 = 1%)
+            min_value: 이 값 이하는 0으로 취급
+            max_buckets: 최대 버킷 수
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy는 0과 1 사이여야 합니다.")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float):
+        """값 기록"""
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: "LogHistogram") -> "LogHistogram":
+        """
+        다른 히스토그램을 합침 (같은 `relative_accuracy`여야 함)
+
+        Returns:
+            LogHistogram: self
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("relative_accuracy가 다른 히스토그램은 합칠 수 없습니다.")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        분위수 (0 <= q <= 1, 기록이 없으면 None)
+
+        Args:
+            q: 분위 (0.95 = p95)
+        """
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # 버킷 (gamma^(key-1), gamma^key]의 대표값 (상대 오차가 가장 작은 점)
+                value = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def _collapse(self):
+        smallest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(smallest)
+
+
+class RollingHistogram:
+    """
+    최근 `window_seconds` 동안의 값과 전체 누적 값을 함께 유지하는 히스토그램
+
+    시간 창을 `slots`개 구간으로 나눈 링 버퍼에 구간별 `LogHistogram`을
+    두고, 조회할 때 창 안의 구간만 합칩니다. 메모리는 (구간 수 + 1) x 버킷 수로
+    고정입니다.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 300,
+        slots: int = 10,
+        relative_accuracy: float = 0.01,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        초기화
+
+        Args:
+            window_seconds: 시간 창 길이 (초)
+            slots: 시간 창을 나눌 구간 수 (클수록 창 경계가 정확)
+            relative_accuracy: 분위수 상대 오차
+            clock: 현재 시각 함수 (테스트용)
+        """
+        self.window_seconds = window_seconds
+        self.slots = slots
+        self.relative_accuracy = relative_accuracy
+        self.clock = clock
+        self._slot_seconds = window_seconds / slots
+        self._ring: List[Tuple[int, LogHistogram]] = [
+            (-1, LogHistogram(relative_accuracy)) for _ in range(slots)
+        ]
+        self.total = LogHistogram(relative_accuracy)
+        self._lock = threading.Lock()
+
+    def record(self, value: float):
+        """값 기록"""
+        slot = int(self.clock() // self._slot_seconds)
+        position = slot % self.slots
+        with self._lock:
+            if self._ring[position][0] != slot:
+                self._ring[position] = (slot, LogHistogram(self.relative_accuracy))
+            self._ring[position][1].record(value)
+            self.total.record(value)
+
+    def window(self) -> LogHistogram:
+        """최근 `window_seconds` 동안의 히스토그램 (구간들을 합친 사본)"""
+        current = int(self.clock() // self._slot_seconds)
+        merged = LogHistogram(self.relative_accuracy)
+        with self._lock:
+            for slot, histogram in self._ring:
+                if current - self.slots < slot <= current:
+                    merged.merge(histogram)
+        return merged
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "NaN"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_counter(
+    name: str, help_text: str, values: Iterable[Tuple[Mapping[str, str], float]]
+) -> List[str]:
+    """
+    Prometheus counter 줄 목록
+
+    Args:
+        name: 메트릭 이름 (`_total`로 끝나야 함)
+        help_text: 설명
+        values: (라벨, 값) 목록
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    lines += [f"{name}{_labels(labels)} {_number(value)}" for labels, value in values]
+    return lines
+
+
+def format_summary(
+    name: str,
+    help_text: str,
+    histograms: Iterable[Tuple[Mapping[str, str], RollingHistogram]],
+    quantiles: Sequence[float] = (0.5, 0.95, 0.99),
+) -> List[str]:
+    """
+    Prometheus summary 줄 목록
+
+    분위수는 최근 시간 창 기준, `_sum`/`_count`는 전체 누적 값입니다
+    (Prometheus 클라이언트 라이브러리의 summary와 같은 의미).
+
+    Args:
+        name: 메트릭 이름
+        help_text: 설명
+        histograms: (라벨, 히스토그램) 목록
+        quantiles: 내보낼 분위수
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+    for labels, histogram in histograms:
+        window = histogram.window()
+        for q in quantiles:
+            value = window.quantile(q)
+            lines.append(
+                f"{name}{_labels({**labels, 'quantile': str(q)})} {_number(math.nan if value is None else value)}"
+            )
+        lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.total.sum)}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.total.count}")
+    return lines
+
+
+def start_metrics_server(
+    render: Callable[[], str], port: int = 9100, host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """
+    `/metrics` 경로로 Prometheus 텍스트를 내보내는 HTTP 서버를 백그라운드 스레드로 시작
+
+    Args:
+        render: Prometheus 텍스트를 만드는 함수 (`Monitor.to_prometheus` 등)
+        port: 포트 (0이면 임의 포트)
+        host: 바인드 주소 (기본은 로컬에서만 스크레이프)
+
+    Returns:
+        ThreadingHTTPServer: 실행 중인 서버 (`shutdown()`으로 종료)
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -4,19 +4,57 @@ Monitoring Middleware
 """
 
 import time
-from typing import Dict, Any, List
-from collections import defaultdict
+from typing import Dict, Any, List, Sequence
+from collections import Counter, OrderedDict, deque
 from datetime import datetime
 
+from .metrics import RollingHistogram, format_counter, format_summary
+
 
 class Monitor:
-    """시스템 모니터링"""
+    """
+    시스템 모니터링
+
+    지표는 고정 메모리 스트리밍 히스토그램(`RollingHistogram`)에 기록하므로
+    요청 수가 늘어도 메모리가 늘지 않습니다. 분위수는 최근 `window_seconds`
+    기준, 평균과 건수는 전체 누적 기준입니다.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        window_seconds: float = 300,
+        quantiles: Sequence[float] = (0.5, 0.95, 0.99),
+        max_errors: int = 100,
+    ):
+        """
+        초기화
+
+        Args:
+            max_sessions: 세션별 추적 정보를 보관할 최대 세션 수 (최근 활동 순 LRU)
+            window_seconds: 분위수를 계산할 최근 시간 창 (초)
+            quantiles: 통계/Prometheus로 내보낼 분위수
+            max_errors: 보관할 최근 에러 수
+        """
+        self.max_sessions = max_sessions
+        self.window_seconds = window_seconds
+        self.quantiles = tuple(quantiles)
+        self.sessions: "OrderedDict[str, Dict]" = OrderedDict()
+        self.total_sessions = 0
 
-    def __init__(self):
-        """초기화"""
-        self.sessions: Dict[str, Dict] = {}
-        self.metrics: Dict[str, List] = defaultdict(list)
-        self.errors: List[Dict] = []
+        # 카테고리/계층별 히스토그램
+        self.response_time: Dict[str, RollingHistogram] = {}
+        self.confidence: Dict[str, RollingHistogram] = {}
+        self.routing_latency: Dict[str, RollingHistogram] = {}
+        self.satisfaction: Counter = Counter()
+
+        self.errors: deque = deque(maxlen=max_errors)
+        self.total_errors = 0
+
+    def _histogram(self, series: Dict[str, RollingHistogram], key: str) -> RollingHistogram:
+        if key not in series:
+            series[key] = RollingHistogram(self.window_seconds)
+        return series[key]
 
     def track_request(self, session_id: str, message: str):
         """
@@ -27,17 +65,22 @@ class Monitor:
             message: 메시지
         """
         if session_id not in self.sessions:
+            self.total_sessions += 1
             self.sessions[session_id] = {
                 "start_time": time.time(),
-                "messages": [],
+                "message_count": 0,
                 "agent_switches": 0,
                 "errors": 0,
             }
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
 
-        self.sessions[session_id]["messages"].append({
-            "timestamp": datetime.now().isoformat(),
-            "message": message,
-        })
+        # 메시지 원문은 세션 저장소에 있으므로 여기서는 횟수만 기록
+        session = self.sessions[session_id]
+        session["message_count"] += 1
+        session["last_message_at"] = datetime.now().isoformat()
+        session["request_started"] = time.perf_counter()
+        self.sessions.move_to_end(session_id)
 
     def track_response(
         self,
@@ -55,13 +98,58 @@ class Monitor:
             category: 카테고리
             confidence: 신뢰도
         """
-        if session_id in self.sessions:
-            elapsed = time.time() - self.sessions[session_id]["start_time"]
+        session = self.sessions.get(session_id)
+        if session and "request_started" in session:
+            # 세션 시작이 아니라 이번 요청 시작부터의 응답 시간
+            elapsed = time.perf_counter() - session.pop("request_started")
+            self._histogram(self.response_time, category).record(elapsed)
+            self._histogram(self.confidence, category).record(confidence)
 
-            # 메트릭 기록
-            self.metrics["response_time"].append(elapsed)
-            self.metrics["confidence"].append(confidence)
-            self.metrics["category"].append(category)
+    def track_routing(self, tier: str, latency: float):
+        """
+        라우팅 계층 추적
+
+        Args:
+            tier: 분류를 결정한 계층 ("keyword", "classifier", "llm")
+            latency: 라우팅 소요 시간 (초)
+        """
+        self._histogram(self.routing_latency, tier).record(latency)
+
+    def get_routing_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        라우팅 계층별 처리 비율(hit rate)과 지연 시간
+
+        Returns:
+            Dict: 계층별 {count, hit_rate, avg_latency_ms, p95_latency_ms}
+        """
+        total = sum(histogram.total.count for histogram in self.routing_latency.values())
+        stats = {}
+        for tier, histogram in self.routing_latency.items():
+            p95 = histogram.window().quantile(0.95)
+            stats[tier] = {
+                "count": histogram.total.count,
+                "hit_rate": histogram.total.count / total,
+                "avg_latency_ms": histogram.total.mean * 1000,
+                "p95_latency_ms": p95 * 1000 if p95 is not None else 0,
+            }
+        return stats
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        카테고리별 응답 시간 분위수 (최근 `window_seconds` 기준)
+
+        Returns:
+            Dict: 카테고리별 {count, p50_ms, p95_ms, p99_ms, ...}
+        """
+        stats = {}
+        for category, histogram in self.response_time.items():
+            window = histogram.window()
+            if not window.count:
+                continue
+            stats[category] = {"count": window.count}
+            for q in self.quantiles:
+                stats[category][f"p{q * 100:g}_ms"] = window.quantile(q) * 1000
+        return stats
 
     def track_error(self, session_id: str, error: str):
         """
@@ -71,6 +159,7 @@ class Monitor:
             session_id: 세션 ID
             error: 에러 메시지
         """
+        self.total_errors += 1
         self.errors.append({
             "session_id": session_id,
             "timestamp": datetime.now().isoformat(),
@@ -79,6 +168,7 @@ class Monitor:
 
         if session_id in self.sessions:
             self.sessions[session_id]["errors"] += 1
+            self.sessions[session_id].pop("request_started", None)
 
     def track_satisfaction(self, session_id: str, rating: int):
         """
@@ -88,7 +178,7 @@ class Monitor:
             session_id: 세션 ID
             rating: 평점 (1-5)
         """
-        self.metrics["satisfaction"].append(rating)
+        self.satisfaction[rating] += 1
 
         if session_id in self.sessions:
             self.sessions[session_id]["satisfaction"] = rating
@@ -100,18 +190,65 @@ class Monitor:
         Returns:
             Dict: 통계 정보
         """
-        response_times = self.metrics.get("response_time", [])
-        satisfactions = self.metrics.get("satisfaction", [])
-        confidences = self.metrics.get("confidence", [])
+        def mean(series: Dict[str, RollingHistogram]) -> float:
+            count = sum(histogram.total.count for histogram in series.values())
+            return sum(histogram.total.sum for histogram in series.values()) / count if count else 0
+
+        ratings = sum(self.satisfaction.values())
 
         return {
-            "total_sessions": len(self.sessions),
-            "total_errors": len(self.errors),
-            "avg_response_time": sum(response_times) / len(response_times) if response_times else 0,
-            "avg_satisfaction": sum(satisfactions) / len(satisfactions) if satisfactions else 0,
-            "avg_confidence": sum(confidences) / len(confidences) if confidences else 0,
+            "total_sessions": self.total_sessions,
+            "tracked_sessions": len(self.sessions),
+            "total_errors": self.total_errors,
+            "avg_response_time": mean(self.response_time),
+            "avg_satisfaction": (
+                sum(rating * count for rating, count in self.satisfaction.items()) / ratings
+                if ratings else 0
+            ),
+            "avg_confidence": mean(self.confidence),
+            "latency": self.get_latency_stats(),
+            "routing": self.get_routing_stats(),
         }
 
+    def to_prometheus(self) -> str:
+        """
+        Prometheus 텍스트 포맷 (`/metrics` 응답 본문)
+
+        Returns:
+            str: exposition format 0.0.4 텍스트
+        """
+        lines: List[str] = []
+        lines += format_counter(
+            "customer_service_sessions_total", "Sessions started.", [({}, self.total_sessions)]
+        )
+        lines += format_counter(
+            "customer_service_errors_total", "Failed requests.", [({}, self.total_errors)]
+        )
+        lines += format_summary(
+            "customer_service_response_seconds",
+            "Response time per agent category.",
+            [({"category": category}, histogram) for category, histogram in self.response_time.items()],
+            self.quantiles,
+        )
+        lines += format_summary(
+            "customer_service_routing_seconds",
+            "Routing latency per tier.",
+            [({"tier": tier}, histogram) for tier, histogram in self.routing_latency.items()],
+            self.quantiles,
+        )
+        lines += format_summary(
+            "customer_service_routing_confidence",
+            "Routing confidence per agent category.",
+            [({"category": category}, histogram) for category, histogram in self.confidence.items()],
+            self.quantiles,
+        )
+        lines += format_counter(
+            "customer_service_satisfaction_total",
+            "Satisfaction ratings.",
+            [({"rating": str(rating)}, count) for rating, count in sorted(self.satisfaction.items())],
+        )
+        return "\n".join(lines) + "\n"
+
     def print_stats(self):
         """통계 출력"""
         stats = self.get_stats()
@@ -124,4 +261,18 @@ class Monitor:
         print(f"평균 만족도: {stats['avg_satisfaction']:.1f}/5")
         print(f"평균 신뢰도: {stats['avg_confidence']:.1%}")
         print(f"오류 수: {stats['total_errors']}")
+        if stats["latency"]:
+            print(f"응답 시간 분위수 (최근 {self.window_seconds:g}초):")
+            for category, latency in stats["latency"].items():
+                percentiles = ", ".join(
+                    f"{key[:-3]} {value:.0f}ms" for key, value in latency.items() if key != "count"
+                )
+                print(f"  - {category}: {latency['count']}건, {percentiles}")
+        if stats["routing"]:
+            print("라우팅 계층:")
+            for tier, tier_stats in stats["routing"].items():
+                print(
+                    f"  - {tier}: {tier_stats['count']}건 ({tier_stats['hit_rate']:.0%}), "
+                    f"평균 {tier_stats['avg_latency_ms']:.1f}ms"
+                )
         print("=" * 60)
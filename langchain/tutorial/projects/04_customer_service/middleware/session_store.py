@@ -0,0 +1,403 @@
+"""
+Session Store
+대화 세션 저장소 (LRU + 유휴 TTL 제거, 세션당 턴 수 제한, SQLite 영속화)
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# (기존 요약, 잘려 나간 턴들) → 새 요약
+Summarizer = Callable[[Optional[str], List[Dict[str, Any]]], str]
+
+
+def summarize_turns(
+    summary: Optional[str], dropped: List[Dict[str, Any]], max_chars: int = 1000
+) -> str:
+    """
+    잘려 나간 턴을 한 줄씩 요약에 덧붙임 (LLM 호출 없음)
+
+    요약이 `max_chars`를 넘으면 오래된 줄부터 버립니다.
+    """
+    lines = summary.splitlines() if summary else []
+    for turn in dropped:
+        lines.append(f"- 고객: {turn.get('message', '')[:80]} → {turn.get('answer', '')[:80]}")
+    while len(lines) > 1 and sum(len(line) + 1 for line in lines) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+def make_turn(message: str, response: Dict[str, Any], agent: Optional[str] = None) -> Dict[str, Any]:
+    """
+    세션에 저장할 턴 (JSON으로 저장 가능한 필드만)
+
+    응답 dict 전체(출처 문서 등)를 보관하지 않고 답변 텍스트만 남깁니다.
+    """
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "message": message,
+        "answer": response.get("answer", ""),
+        "agent": agent,
+        "escalated": bool(response.get("escalated", False)),
+    }
+
+
+@dataclass
+class Session:
+    """대화 세션"""
+
+    session_id: str
+    turns: List[Dict[str, Any]] = field(default_factory=list)
+    summary: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+
+
+class SessionStore(ABC):
+    """
+    세션 저장소 인터페이스
+
+    - 최근 접근 순 LRU: 세션 수가 `max_sessions`를 넘으면 가장 오래 쓰지 않은 세션 제거
+    - 유휴 TTL: `ttl_seconds` 동안 접근이 없으면 만료 (None이면 만료 없음)
+    - 세션당 최근 `max_turns`턴만 보관하고 이전 턴은 `summarizer`로 요약에 합침
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        ttl_seconds: Optional[float] = 1800,
+        max_turns: int = 20,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        if max_sessions < 1 or max_turns < 1:
+            raise ValueError("max_sessions와 max_turns는 1 이상이어야 합니다.")
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_turns = max_turns
+        self.summarizer = summarizer or summarize_turns
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Session]:
+        """세션 조회 (없거나 만료되면 None, 조회 시 최근 접근 시각 갱신)"""
+
+    @abstractmethod
+    def append(self, session_id: str, turn: Dict[str, Any]) -> Session:
+        """턴 추가 (세션이 없으면 생성, 턴 수 제한과 세션 수 제한 적용)"""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """세션 삭제"""
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """만료된 세션 일괄 제거 후 제거한 수 반환"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """보관 중인 세션 수"""
+
+    async def aget(self, session_id: str) -> Optional[Session]:
+        """`get()`을 스레드에서 실행 (잠금 대기가 이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.get, session_id)
+
+    async def aappend(self, session_id: str, turn: Dict[str, Any]) -> Session:
+        """`append()`를 스레드에서 실행 (잠금 대기가 이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.append, session_id, turn)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def _expired(self, last_access: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - last_access > self.ttl_seconds
+
+    def _trim(self, session: Session):
+        """최근 `max_turns`턴만 남기고 나머지는 요약으로"""
+        overflow = len(session.turns) - self.max_turns
+        if overflow > 0:
+            session.summary = self.summarizer(session.summary, session.turns[:overflow])
+            del session.turns[:overflow]
+
+
+class InMemorySessionStore(SessionStore):
+    """프로세스 메모리 세션 저장소 (OrderedDict 기반 LRU)"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            now = time.time()
+            if self._expired(session.last_access, now):
+                del self._sessions[session_id]
+                return None
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def append(self, session_id: str, turn: Dict[str, Any]) -> Session:
+        with self._lock:
+            now = time.time()
+            session = self._sessions.get(session_id)
+            if session is None or self._expired(session.last_access, now):
+                session = Session(session_id, created_at=now)
+                self._sessions[session_id] = session
+            session.turns.append(turn)
+            session.last_access = now
+            self._trim(session)
+            self._sessions.move_to_end(session_id)
+            self._evict(now)
+            return session
+
+    async def aget(self, session_id: str) -> Optional[Session]:
+        # 메모리 조회는 바로 끝나므로 스레드 전환 없이 실행
+        return self.get(session_id)
+
+    async def aappend(self, session_id: str, turn: Dict[str, Any]) -> Session:
+        return self.append(session_id, turn)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._purge(time.time())
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _purge(self, now: float) -> int:
+        # 최근 접근 순이므로 앞쪽(오래된 쪽)부터 만료 여부 확인
+        removed = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if not self._expired(session.last_access, now):
+                break
+            self._sessions.popitem(last=False)
+            removed += 1
+        return removed
+
+    def _evict(self, now: float):
+        self._purge(now)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite 세션 저장소
+
+    재시작 후에도 세션이 유지되고, 같은 DB 파일을 여러 워커 프로세스가
+    공유할 수 있습니다 (WAL 모드, 쓰기는 즉시 잠금 트랜잭션). 스레드마다
+    별도 연결을 사용합니다.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        session_id TEXT PRIMARY KEY,
+        summary TEXT,
+        created_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access);
+    CREATE TABLE IF NOT EXISTS turns (
+        session_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (session_id, seq)
+    );
+    """
+
+    def __init__(self, path: str = "sessions.db", timeout: float = 30.0, **kwargs):
+        """
+        초기화
+
+        Args:
+            path: SQLite 파일 경로
+            timeout: 다른 프로세스가 쓰는 동안 잠금을 기다릴 최대 시간 (초)
+            **kwargs: `SessionStore` 옵션 (max_sessions, ttl_seconds, max_turns, summarizer)
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.timeout = timeout
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._connection().executescript(self.SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """쓰기 잠금을 먼저 잡는 트랜잭션 (읽고 고치는 사이 다른 프로세스가 끼어들지 않도록)"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get(self, session_id: str) -> Optional[Session]:
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT summary, created_at, last_access FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[2], now):
+                self._delete(conn, session_id)
+                return None
+            conn.execute(
+                "UPDATE sessions SET last_access = ? WHERE session_id = ?", (now, session_id)
+            )
+            return Session(
+                session_id,
+                turns=self._turns(conn, session_id),
+                summary=row[0],
+                created_at=row[1],
+                last_access=now,
+            )
+
+    def append(self, session_id: str, turn: Dict[str, Any]) -> Session:
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT summary, created_at, last_access FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is not None and self._expired(row[2], now):
+                self._delete(conn, session_id)
+                row = None
+            if row is None:
+                conn.execute(
+                    "INSERT INTO sessions (session_id, summary, created_at, last_access) VALUES (?, NULL, ?, ?)",
+                    (session_id, now, now),
+                )
+                summary, created_at = None, now
+            else:
+                summary, created_at = row[0], row[1]
+
+            conn.execute(
+                "INSERT INTO turns (session_id, seq, data) VALUES "
+                "(?, COALESCE((SELECT MAX(seq) FROM turns WHERE session_id = ?), 0) + 1, ?)",
+                (session_id, session_id, json.dumps(turn, ensure_ascii=False)),
+            )
+            session = Session(
+                session_id,
+                turns=self._turns(conn, session_id),
+                summary=summary,
+                created_at=created_at,
+                last_access=now,
+            )
+
+            overflow = len(session.turns) - self.max_turns
+            if overflow > 0:
+                self._trim(session)
+                conn.execute(
+                    "DELETE FROM turns WHERE session_id = ? AND seq IN "
+                    "(SELECT seq FROM turns WHERE session_id = ? ORDER BY seq LIMIT ?)",
+                    (session_id, session_id, overflow),
+                )
+            conn.execute(
+                "UPDATE sessions SET summary = ?, last_access = ? WHERE session_id = ?",
+                (session.summary, now, session_id),
+            )
+            self._evict(conn, now)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._transaction() as conn:
+            return self._delete(conn, session_id)
+
+    def purge_expired(self) -> int:
+        with self._transaction() as conn:
+            return self._purge(conn, time.time())
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self):
+        """현재 스레드의 연결 종료"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _turns(conn: sqlite3.Connection, session_id: str) -> List[Dict[str, Any]]:
+        rows = conn.execute(
+            "SELECT data FROM turns WHERE session_id = ? ORDER BY seq", (session_id,)
+        ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, session_id: str) -> bool:
+        conn.execute("DELETE FROM turns WHERE session_id = ?", (session_id,))
+        return conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount > 0
+
+    def _purge(self, conn: sqlite3.Connection, now: float) -> int:
+        if self.ttl_seconds is None:
+            return 0
+        cutoff = now - self.ttl_seconds
+        conn.execute(
+            "DELETE FROM turns WHERE session_id IN (SELECT session_id FROM sessions WHERE last_access < ?)",
+            (cutoff,),
+        )
+        return conn.execute("DELETE FROM sessions WHERE last_access < ?", (cutoff,)).rowcount
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        self._purge(conn, now)
+        overflow = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - self.max_sessions
+        if overflow > 0:
+            oldest = conn.execute(
+                "SELECT session_id FROM sessions ORDER BY last_access LIMIT ?", (overflow,)
+            ).fetchall()
+            for (session_id,) in oldest:
+                self._delete(conn, session_id)
+
+
+def create_session_store(config: Optional[Dict[str, Any]] = None) -> SessionStore:
+    """
+    설정으로 세션 저장소 생성
+
+    Args:
+        config: `Config.session_config` ("backend": "memory" 또는 "sqlite", "path",
+            max_sessions, ttl_seconds, max_turns)
+
+    Returns:
+        SessionStore: 세션 저장소
+    """
+    options = dict(config or {})
+    backend = options.pop("backend", "memory")
+    path = options.pop("path", "sessions.db")
+    if backend == "sqlite":
+        return SQLiteSessionStore(path, **options)
+    if backend == "memory":
+        return InMemorySessionStore(**options)
+    raise ValueError(f"지원하지 않는 세션 저장소입니다: {backend} (가능: memory, sqlite)")
@@ -0,0 +1,124 @@
+"""
+비동기 요청 처리 부하 테스트 (Fake LLM / Fake RAG)
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from config import Config  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    """지연 후 고정 답변을 돌려주는 Fake LLM (동시 호출 수 기록)"""
+
+    def __init__(self, answer, delay):
+        self.answer = answer
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    def invoke(self, prompt):
+        time.sleep(self.delay)
+        return FakeResponse(self.answer)
+
+    async def ainvoke(self, prompt):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return FakeResponse(self.answer)
+
+
+class FakeRAG:
+    """쿼리 임베딩에 지연이 있는 Fake RAG"""
+
+    embed_delay = 0.0
+
+    def __init__(self, *args, **kwargs):
+        self.embedded_searches = 0
+
+    def embed_query(self, query):
+        time.sleep(self.embed_delay)
+        return [0.0]
+
+    async def aembed_query(self, query):
+        await asyncio.sleep(self.embed_delay)
+        return [0.0]
+
+    def search(self, query, category=None, k=3, embedding=None):
+        return []
+
+    async def asearch(self, query, category=None, k=3, embedding=None):
+        if embedding is not None:
+            self.embedded_searches += 1
+        return []
+
+
+def make_system(monkeypatch, llm_delay, embed_delay=0.0, max_concurrent=8):
+    monkeypatch.setattr(main, "CustomerServiceRAG", FakeRAG)
+    monkeypatch.setattr(FakeRAG, "embed_delay", embed_delay)
+    llms = {}
+
+    def get_llm(self, agent_type):
+        answer = "general" if agent_type == "router" else f"{agent_type} 답변"
+        return llms.setdefault(agent_type, FakeLLM(answer, llm_delay))
+
+    monkeypatch.setattr(Config, "get_llm", get_llm)
+    config = Config()
+    config.router_config.update(classifier_enabled=False, decision_log=None)
+    config.concurrency_config["max_concurrent_requests"] = max_concurrent
+    return main.CustomerServiceSystem(config), llms
+
+
+def test_sessions_run_in_parallel_with_per_session_order(monkeypatch):
+    """세션 간 병렬 처리, 세션 내 순서 보장, 전역 동시 실행 제한 테스트"""
+    system, llms = make_system(monkeypatch, llm_delay=0.05, max_concurrent=8)
+    sessions = [f"s{i}" for i in range(20)]
+
+    async def load():
+        return await asyncio.gather(*[
+            system.ahandle_message(f"{session_id} 메시지 {turn}", session_id)
+            for turn in range(3)
+            for session_id in sessions
+        ])
+
+    started = time.perf_counter()
+    results = asyncio.run(load())
+    elapsed = time.perf_counter() - started
+
+    # 직렬이면 60건 x (라우팅 + 답변) = 6초
+    assert elapsed < 3.0
+    assert all(result["response"] == "general 답변" for result in results)
+    assert system.limiter.peak == 8
+    assert llms["general"].peak <= 8
+    for session_id in sessions:
+        turns = system.sessions.get(session_id).turns
+        assert [turn["message"] for turn in turns] == [f"{session_id} 메시지 {t}" for t in range(3)]
+    assert len(system.session_locks) == 0
+
+
+def test_query_embedding_overlaps_routing(monkeypatch):
+    """RAG 쿼리 임베딩이 라우팅 LLM 호출과 동시에 진행되는지 테스트"""
+    system, _ = make_system(monkeypatch, llm_delay=0.2, embed_delay=0.2)
+
+    started = time.perf_counter()
+    result = asyncio.run(system.ahandle_message("알려주세요", "s1"))
+    elapsed = time.perf_counter() - started
+
+    # 라우팅 0.2초 + 답변 0.2초, 임베딩 0.2초는 라우팅과 겹침
+    assert result["agent"] == "general"
+    assert elapsed < 0.55
+    assert system.rag.embedded_searches == 1
+    assert system.monitor.get_stats()["latency"]["general"]["count"] == 1
@@ -0,0 +1,58 @@
+"""
+설정 / LLM 인스턴스 공유 테스트
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from config import Config, ProductionConfig  # noqa: E402
+
+
+def test_llm_instances_and_connection_pool_are_shared(monkeypatch):
+    """같은 설정의 LLM은 재사용하고 모든 LLM이 연결 풀 하나를 공유하는지 테스트"""
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    config.clear_llm_cache()
+    try:
+        first, second = Config(), Config()
+        router = first.get_llm("router")
+        assert second.get_llm("router") is router
+        assert first.get_llm("unknown") is first.get_llm("general")
+
+        support = first.get_llm("support")
+        assert support is not router
+        assert support.http_client is router.http_client
+        assert support.http_async_client is router.http_async_client
+
+        # 연결 풀 설정이 다르면 별도 풀
+        production = ProductionConfig().get_llm("router")
+        assert production is not router
+        assert production.http_client is not router.http_client
+        assert production.http_client is config.get_http_clients(ProductionConfig().http_config)[0]
+    finally:
+        config.clear_llm_cache()
+
+
+def test_clear_llm_cache_closes_sync_and_async_clients():
+    """캐시를 비울 때 동기/비동기 연결 풀을 모두 닫는지 테스트"""
+    sync_client, async_client = config.get_http_clients(Config().http_config)
+    config.clear_llm_cache()
+    assert sync_client.is_closed
+    assert async_client.is_closed
+
+    async def inside_loop():
+        with pytest.raises(RuntimeError):
+            config.clear_llm_cache()
+        clients = config.get_http_clients(Config().http_config)
+        await config.aclear_llm_cache()
+        return clients
+
+    sync_client, async_client = asyncio.run(inside_loop())
+    assert sync_client.is_closed
+    assert async_client.is_closed
+    assert not config._HTTP_CLIENTS
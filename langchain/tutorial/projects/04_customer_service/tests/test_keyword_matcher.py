@@ -0,0 +1,66 @@
+"""
+키워드 매처 테스트
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.router import RouterAgent  # noqa: E402
+from keyword_matcher import KeywordMatcher  # noqa: E402
+from middleware.hitl import HumanInTheLoop  # noqa: E402
+
+
+def naive_counts(keywords, text):
+    text = text.lower()
+    return {label: sum(1 for word in words if word.lower() in text) for label, words in keywords.items()}
+
+
+def test_matches_naive_substring_search():
+    """겹치는/포함 관계 키워드를 포함해 `keyword in text`와 같은 결과인지 테스트"""
+    rng = random.Random(0)
+    alphabet = "가나다라ab "
+    keywords = {
+        label: list({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(40)})
+        for label in ("support", "billing", "general")
+    }
+    keywords["billing"].append(keywords["support"][0])  # 여러 라벨에 있는 키워드
+    matcher = KeywordMatcher(keywords)
+
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet + "AB") for _ in range(rng.randint(0, 30)))
+        assert matcher.counts(text) == naive_counts(keywords, text)
+        assert matcher.contains_any(text) == any(naive_counts(keywords, text).values())
+        assert matcher.contains_any(text, "general") == bool(naive_counts(keywords, text)["general"])
+
+
+def test_find_order_and_duplicates():
+    """등장 순서, 중복 제거, 대소문자 옵션 테스트"""
+    matcher = KeywordMatcher({"billing": ["환불", "Refund"], "support": ["안돼", "안 돼", "돼"]})
+    assert matcher.find("REFUND 해주세요, 환불 안 돼요 환불") == {
+        "billing": ["Refund", "환불"],
+        "support": ["안 돼", "돼"],
+    }
+    assert matcher.counts("아무 내용") == {"billing": 0, "support": 0}
+    assert not KeywordMatcher({"billing": ["Refund"]}, ignore_case=False).contains_any("refund")
+
+
+def test_router_and_hitl_rebuild_on_update():
+    """키워드 목록을 바꾸면 매처가 다시 만들어지는지 테스트"""
+    router_categories = RouterAgent.CATEGORIES
+    critical_actions = HumanInTheLoop.CRITICAL_ACTIONS
+    try:
+        RouterAgent.set_keywords("billing", RouterAgent.CATEGORIES["billing"] + ["인보이스"])
+        assert RouterAgent.KEYWORD_MATCHER.counts("인보이스 재발송")["billing"] == 1
+
+        hitl = HumanInTheLoop()
+        assert hitl.requires_approval("Refund please")
+        assert not hitl.requires_approval("계정 탈퇴")
+        HumanInTheLoop.set_critical_actions(critical_actions + ["탈퇴"])
+        assert hitl.requires_approval("계정 탈퇴")
+    finally:
+        RouterAgent.CATEGORIES = router_categories
+        RouterAgent.KEYWORD_MATCHER = KeywordMatcher(router_categories)
+        HumanInTheLoop.set_critical_actions(critical_actions)
@@ -0,0 +1,86 @@
+"""
+스트리밍 메트릭 테스트
+"""
+
+import os
+import random
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from middleware.metrics import LogHistogram, RollingHistogram, start_metrics_server  # noqa: E402
+from middleware.monitoring import Monitor  # noqa: E402
+
+
+def exact_quantile(values, q):
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def test_quantiles_within_relative_accuracy_and_mergeable():
+    """분위수 상대 오차와 병합 결과가 한 번에 기록한 것과 같은지 테스트"""
+    rng = random.Random(0)
+    values = [rng.lognormvariate(-2, 1) for _ in range(5000)]
+    whole, first, second = LogHistogram(), LogHistogram(), LogHistogram()
+    for i, value in enumerate(values):
+        whole.record(value)
+        (first if i % 2 else second).record(value)
+    merged = first.merge(second)
+
+    for q in (0.5, 0.95, 0.99):
+        expected = exact_quantile(values, q)
+        assert abs(whole.quantile(q) - expected) <= 0.01 * expected
+        assert merged.quantile(q) == whole.quantile(q)
+    assert merged.count == 5000
+    assert len(whole.buckets) < 1000
+    assert LogHistogram().quantile(0.5) is None
+
+
+def test_rolling_window_drops_old_values():
+    """시간 창이 지나면 분위수에서 빠지고 누적 값에는 남는지 테스트"""
+    now = [0.0]
+    histogram = RollingHistogram(window_seconds=60, slots=6, clock=lambda: now[0])
+    for _ in range(10):
+        histogram.record(5.0)
+    now[0] = 30
+    histogram.record(0.1)
+    assert histogram.window().count == 11
+
+    now[0] = 65
+    window = histogram.window()
+    assert window.count == 1
+    assert abs(window.quantile(0.99) - 0.1) < 0.002
+    assert histogram.total.count == 11
+
+
+def test_monitor_percentiles_and_prometheus_export():
+    """카테고리별 분위수와 Prometheus 텍스트/HTTP 내보내기 테스트"""
+    monitor = Monitor()
+    for i in range(20):
+        monitor.track_request(f"s{i}", "문의")
+        monitor.track_response(f"s{i}", {}, "billing" if i % 2 else "support", 0.9)
+    monitor.track_routing("keyword", 0.001)
+    monitor.track_satisfaction("s1", 5)
+    monitor.track_error("s2", "timeout")
+
+    stats = monitor.get_stats()
+    assert set(stats["latency"]) == {"billing", "support"}
+    assert stats["latency"]["billing"]["count"] == 10
+    assert {"p50_ms", "p95_ms", "p99_ms"} <= set(stats["latency"]["billing"])
+    assert abs(stats["avg_confidence"] - 0.9) < 1e-9
+    assert stats["total_errors"] == 1
+
+    text = monitor.to_prometheus()
+    assert "# TYPE customer_service_response_seconds summary" in text
+    assert 'customer_service_response_seconds{category="support",quantile="0.95"}' in text
+    assert 'customer_service_response_seconds_count{category="support"} 10' in text
+    assert 'customer_service_routing_seconds_count{tier="keyword"} 1' in text
+    assert 'customer_service_satisfaction_total{rating="5"} 1' in text
+
+    server = start_metrics_server(monitor.to_prometheus, port=0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "customer_service_sessions_total 20" in response.read().decode("utf-8")
+    finally:
+        server.shutdown()
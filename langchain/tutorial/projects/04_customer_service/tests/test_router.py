@@ -0,0 +1,132 @@
+"""
+계층형 라우터 테스트
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.intent_classifier import IntentClassifier  # noqa: E402
+from agents.router import RouterAgent  # noqa: E402
+from middleware.monitoring import Monitor  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class CountingLLM:
+    """정해진 카테고리를 답하고 호출 횟수를 기록하는 Fake LLM"""
+
+    def __init__(self, category="general"):
+        self.category = category
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return FakeResponse(self.category)
+
+
+TRAINING = {
+    "support": ["앱이 자꾸 꺼져요", "로그인이 되지 않아요", "화면이 멈췄어요", "앱이 느려요", "업데이트 후 꺼짐"],
+    "billing": ["영수증 발급해 주세요", "돈이 두 번 빠져나갔어요", "인보이스 재발송", "영수증이 안 와요", "돈이 빠져나갔어요"],
+}
+
+
+def test_keyword_fast_path_skips_llm():
+    """키워드가 한 카테고리에만 걸리면 LLM을 호출하지 않는지 테스트"""
+    llm = CountingLLM()
+    router = RouterAgent("Router", llm, router_config={"classifier_enabled": False})
+
+    result = router.route("환불 해주세요")
+    assert (result["category"], result["tier"], result["confidence"]) == ("billing", "keyword", 1.0)
+    assert llm.calls == 0
+
+    # 두 카테고리에 걸리면 (신뢰도 0.5) LLM으로 결정
+    llm.category = "support"
+    result = router.route("결제 오류가 났어요")
+    assert (result["category"], result["tier"]) == ("support", "llm")
+    assert llm.calls == 1
+
+
+def test_classifier_learns_from_llm_decisions():
+    """LLM 결정 로그로 학습한 분류기가 이후 LLM 호출을 대신하는지 테스트"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        log_path = os.path.join(tmpdir, "logs", "routing.jsonl")
+        config = {"decision_log": log_path, "min_examples_per_category": 3}
+
+        # 학습 전에는 LLM이 결정하고 로그에 기록
+        llm = CountingLLM("support")
+        router = RouterAgent("Router", llm, router_config=config)
+        assert router.route("앱이 자꾸 꺼져요")["tier"] == "llm"
+        with open(log_path, encoding="utf-8") as f:
+            assert json.loads(f.readline()) == {"message": "앱이 자꾸 꺼져요", "category": "support"}
+
+        for category, messages in TRAINING.items():
+            for message in messages:
+                IntentClassifier.append_log(log_path, message, category)
+
+        # 재시작 시 로그로 학습된 분류기가 LLM 대신 결정
+        llm = CountingLLM()
+        router = RouterAgent("Router", llm, router_config=config)
+        result = router.route("영수증이 두 번 왔어요")
+        assert (result["category"], result["tier"]) == ("billing", "classifier")
+        assert result["confidence"] >= 0.75
+        assert router.route("앱이 자꾸 멈춰요")["category"] == "support"
+        assert llm.calls == 0
+
+        # 분류기도 불확실하면 LLM 호출
+        assert router.route("안녕하세요")["tier"] == "llm"
+        assert llm.calls == 1
+
+
+def test_intent_classifier_untrained():
+    """학습 예시가 부족하면 예측하지 않는지 테스트"""
+    classifier = IntentClassifier(["support", "billing"], min_examples=2)
+    classifier.add_example("앱이 꺼져요", "support")
+    classifier.add_example("청구서 문의", "billing")
+    classifier.add_example("알 수 없음", "unknown")
+    assert classifier.predict("앱이 꺼져요") == (None, 0.0)
+    assert len(classifier.examples) == 2
+
+
+def test_decision_log_and_examples_are_bounded():
+    """분류기 예시가 카테고리별 한도로 제한되고 로그가 같은 크기로 압축되는지 테스트"""
+    assert RouterAgent("Router", CountingLLM()).router_config["decision_log"] is None
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        log_path = os.path.join(tmpdir, "routing.jsonl")
+        config = {"decision_log": log_path, "max_examples_per_category": 2}
+        llm = CountingLLM("support")
+        router = RouterAgent("Router", llm, router_config=config)
+        # 키워드에 걸리지 않는 메시지만 LLM으로 분류되어 기록됨
+        for i in range(20):
+            router.route(f"앱 꺼짐 {i}번째")
+
+        assert llm.calls == 20
+        assert len(router.classifier.examples) == 2
+        with open(log_path, encoding="utf-8") as f:
+            lines = f.readlines()
+        # 보관 한도(2 x 3개 카테고리)의 2배가 되면 압축
+        assert len(lines) < 2 * router.classifier.capacity
+
+        reloaded = RouterAgent("Router", CountingLLM(), router_config=config)
+        assert reloaded.classifier.examples == [("앱 꺼짐 18번째", "support"), ("앱 꺼짐 19번째", "support")]
+        with open(log_path, encoding="utf-8") as f:
+            assert len(f.readlines()) == 2
+
+
+def test_monitor_routing_stats():
+    """계층별 hit rate 집계 테스트"""
+    monitor = Monitor()
+    for tier, latency in [("keyword", 0.001), ("keyword", 0.003), ("llm", 0.5), ("classifier", 0.002)]:
+        monitor.track_routing(tier, latency)
+
+    stats = monitor.get_stats()["routing"]
+    assert stats["keyword"]["hit_rate"] == 0.5
+    assert stats["keyword"]["avg_latency_ms"] == 2.0
+    assert stats["llm"]["count"] == 1
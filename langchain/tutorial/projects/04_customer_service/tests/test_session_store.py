@@ -0,0 +1,129 @@
+"""
+세션 저장소 테스트
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from middleware.monitoring import Monitor  # noqa: E402
+from middleware.session_store import (  # noqa: E402
+    InMemorySessionStore,
+    SQLiteSessionStore,
+    create_session_store,
+    make_turn,
+)
+
+
+def turn(i):
+    return make_turn(f"질문 {i}", {"answer": f"답변 {i}", "sources": [object()]}, "support")
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def factory(**kwargs):
+        if request.param == "sqlite":
+            return SQLiteSessionStore(str(tmp_path / "sessions.db"), **kwargs)
+        return InMemorySessionStore(**kwargs)
+
+    return factory
+
+
+def test_turn_cap_folds_into_summary(make_store):
+    """세션당 최근 턴만 남기고 이전 턴은 요약에 들어가는지 테스트"""
+    store = make_store(max_turns=3)
+    for i in range(5):
+        store.append("s1", turn(i))
+
+    session = store.get("s1")
+    assert [t["message"] for t in session.turns] == ["질문 2", "질문 3", "질문 4"]
+    assert "sources" not in session.turns[0]
+    assert session.summary.splitlines() == ["- 고객: 질문 0 → 답변 0", "- 고객: 질문 1 → 답변 1"]
+
+
+def test_lru_and_idle_ttl(make_store, monkeypatch):
+    """세션 수 제한(LRU)과 유휴 TTL 만료 테스트"""
+    import middleware.session_store as session_store
+
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, "time", lambda: now[0])
+    store = make_store(max_sessions=2, ttl_seconds=60)
+
+    store.append("a", turn(0))
+    now[0] += 1
+    store.append("b", turn(0))
+    now[0] += 1
+    assert store.get("a") is not None  # a가 최근 사용
+    now[0] += 1
+    store.append("c", turn(0))
+    assert store.get("b") is None
+    assert len(store) == 2
+
+    now[0] += 61
+    assert store.get("a") is None
+    assert store.purge_expired() == 1
+    assert len(store) == 0
+
+
+def _append_many(path, worker):
+    store = SQLiteSessionStore(path, max_turns=100)
+    for i in range(10):
+        store.append("shared", make_turn(f"{worker}-{i}", {"answer": ""}))
+
+
+def test_sqlite_survives_restart_and_is_shared(tmp_path):
+    """SQLite 저장소가 재시작 후 유지되고 여러 프로세스가 공유하는지 테스트"""
+    path = str(tmp_path / "sessions.db")
+    create_session_store({"backend": "sqlite", "path": path}).append("s1", turn(0))
+    assert create_session_store({"backend": "sqlite", "path": path}).get("s1").turns[0]["answer"] == "답변 0"
+
+    workers = [multiprocessing.Process(target=_append_many, args=(path, w)) for w in range(3)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    assert len(SQLiteSessionStore(path, max_turns=100).get("shared").turns) == 30
+
+    with pytest.raises(ValueError):
+        create_session_store({"backend": "redis"})
+
+
+def test_monitor_sessions_are_bounded():
+    """모니터의 세션별 추적 정보도 최대 세션 수로 제한되는지 테스트"""
+    monitor = Monitor(max_sessions=2)
+    for session_id in ["a", "b", "a", "c"]:
+        monitor.track_request(session_id, "문의")
+
+    assert list(monitor.sessions) == ["a", "c"]
+    assert monitor.sessions["a"]["message_count"] == 2
+    assert monitor.get_stats()["total_sessions"] == 3
+
+
+def test_async_calls_wait_for_sqlite_lock_off_the_event_loop(tmp_path):
+    """다른 연결이 쓰기 잠금을 쥐고 있어도 이벤트 루프는 계속 도는지 테스트"""
+    path = str(tmp_path / "sessions.db")
+    store = SQLiteSessionStore(path, timeout=5)
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+
+    async def run():
+        task = asyncio.create_task(store.aappend("s1", turn(0)))
+        ticks = 0
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks += 1
+        assert not task.done()
+        blocker.execute("COMMIT")
+        await task
+        return ticks, await store.aget("s1")
+
+    ticks, session = asyncio.run(run())
+    blocker.close()
+    assert ticks == 10
+    assert [t["message"] for t in session.turns] == ["질문 0"]